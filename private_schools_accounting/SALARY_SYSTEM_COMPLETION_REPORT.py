@@ -21,7 +21,7 @@ def generate_completion_report():
     # 1. الملفات المنشأة
     print("📁 الملفات المنشأة:")
     files_created = [
-        "update_db_for_salaries.py",
+        "core/database/migrations.py",
         "ui/pages/salaries/__init__.py", 
         "ui/pages/salaries/salaries_page.py",
         "ui/pages/salaries/add_salary_dialog.py"
@@ -112,7 +112,7 @@ def generate_completion_report():
     # 6. تعليمات التشغيل
     print("🚀 تعليمات التشغيل:")
     instructions = [
-        "1. قم بتشغيل 'python update_db_for_salaries.py' لإنشاء جدول الرواتب",
+        "1. جدول الرواتب يُنشأ تلقائياً بترحيلات قاعدة البيانات عند بدء التشغيل (أو 'python migrate_database.py')",
         "2. قم بتشغيل التطبيق الرئيسي 'python main.py'",
         "3. اختر 'الرواتب' من القائمة الجانبية",
         "4. استخدم زر 'إضافة راتب' لإضافة رواتب جديدة",
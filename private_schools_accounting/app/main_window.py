@@ -19,6 +19,7 @@ import config
 from core.auth.login_manager import auth_manager
 from core.utils.logger import log_user_action
 from core.backup.backup_manager import backup_manager
+from app.page_registry import PAGE_SPECS, PageRegistry, PageSpec
 
 
 class MainWindow(QMainWindow):
@@ -32,6 +33,15 @@ class MainWindow(QMainWindow):
         self.current_page = None
         self.pages = {}
         self.sidebar_buttons = {}
+        self.quick_backup_worker = None
+        
+        # الصفحات تُنشأ عند أول عرض لها (انظر navigate_to_page)
+        self.page_registry = PageRegistry(
+            PAGE_SPECS,
+            fallback=self.create_fallback_page,
+            on_created=self.on_page_created,
+            prefetch=config.PAGE_PREFETCH_ENABLED
+        )
         
         self.setup_window()
         self.create_ui()
@@ -43,6 +53,9 @@ class MainWindow(QMainWindow):
         # عرض الصفحة الرئيسية
         self.show_dashboard()
         
+        # الاتصال بخدمة النسخ الاحتياطية في الخلفية بعد ظهور النافذة
+        QTimer.singleShot(config.BACKUP_SERVICE_START_DELAY_MS, self.start_backup_service)
+        
         log_user_action("تم فتح النافذة الرئيسية")
     
     def setup_window(self):
@@ -285,9 +298,6 @@ class MainWindow(QMainWindow):
             self.pages_stack.setObjectName("pagesStack")
             content_layout.addWidget(self.pages_stack)
             
-            # تحميل الصفحات
-            self.load_pages()
-            
         except Exception as e:
             logging.error(f"خطأ في إنشاء منطقة المحتوى: {e}")
             raise
@@ -341,234 +351,52 @@ class MainWindow(QMainWindow):
             logging.error(f"خطأ في إنشاء معلومات المستخدم: {e}")
             return QFrame()
     
-    def load_pages(self):
-        """تحميل صفحات التطبيق"""
-        try:
-            # صفحة لوحة التحكم
-            self.load_dashboard_page()
-            
-            # صفحة المدارس
-            self.load_schools_page()
-            
-            # صفحة الطلاب
-            self.load_students_page()
-            
-            # صفحة المعلمين
-            self.load_teachers_page()
-            
-            # صفحة الموظفين
-            self.load_employees_page()
-            
-            # صفحة الأقساط
-            self.load_installments_page()
-            
-            # صفحة الرسوم الإضافية
-            self.load_additional_fees_page()
-            
-            # صفحة الواردات الخارجية
-            self.load_external_income_page()
-            
-            # صفحة المصروفات
-            self.load_expenses_page()
-            
-            # صفحة الرواتب
-            self.load_salaries_page()
-            
-            # صفحة النسخ الاحتياطية
-            self.load_backup_page()
-            
-            # الصفحات الشكلية
-            self.load_placeholder_pages()
-            
-        except Exception as e:
-            logging.error(f"خطأ في تحميل الصفحات: {e}")
-            raise
-    
-    def load_dashboard_page(self):
-        """تحميل صفحة لوحة التحكم"""
-        try:
-            from ui.pages.dashboard.dashboard_page import DashboardPage
-            
-            dashboard = DashboardPage()
-            self.pages["dashboard"] = dashboard
-            self.pages_stack.addWidget(dashboard)
-            
-        except Exception as e:
-            logging.error(f"خطأ في تحميل صفحة لوحة التحكم: {e}")
-            # إنشاء صفحة بديلة
-            placeholder = self.create_placeholder_page("لوحة التحكم", "مرحباً بك في نظام حسابات المدارس الأهلية")
-            self.pages["dashboard"] = placeholder
-            self.pages_stack.addWidget(placeholder)
-    
-    def load_schools_page(self):
-        """تحميل صفحة المدارس"""
-        try:
-            from ui.pages.schools.schools_page import SchoolsPage
-            
-            schools = SchoolsPage()
-            self.pages["schools"] = schools
-            self.pages_stack.addWidget(schools)
-            
-        except Exception as e:
-            logging.error(f"خطأ في تحميل صفحة المدارس: {e}")
-            # إنشاء صفحة بديلة
-            placeholder = self.create_placeholder_page("المدارس", "صفحة إدارة المدارس")
-            self.pages["schools"] = placeholder
-            self.pages_stack.addWidget(placeholder)
-    
-    def load_students_page(self):
-        """تحميل صفحة الطلاب"""
-        try:
-            from ui.pages.students.students_page import StudentsPage
-            students = StudentsPage()
-            self.pages["students"] = students
-            self.pages_stack.addWidget(students)
-        except Exception as e:
-            logging.error(f"خطأ في تحميل صفحة الطلاب: {e}")
-            # إنشاء صفحة بديلة
-            placeholder = self.create_placeholder_page("الطلاب", "صفحة إدارة الطلاب")
-            self.pages["students"] = placeholder
-            self.pages_stack.addWidget(placeholder)
-    
-    def load_teachers_page(self):
-        """تحميل صفحة المعلمين"""
-        try:
-            from ui.pages.teachers.teachers_page import TeachersPage
-            teachers = TeachersPage()
-            self.pages["teachers"] = teachers
-            self.pages_stack.addWidget(teachers)
-        except Exception as e:
-            logging.error(f"خطأ في تحميل صفحة المعلمين: {e}")
-            # إنشاء صفحة بديلة
-            placeholder = self.create_placeholder_page("المعلمين", "صفحة إدارة المعلمين")
-            self.pages["teachers"] = placeholder
-            self.pages_stack.addWidget(placeholder)
-    
-    def load_employees_page(self):
-        """تحميل صفحة الموظفين"""
-        try:
-            from ui.pages.employees.employees_page import EmployeesPage
-            employees = EmployeesPage()
-            self.pages["employees"] = employees
-            self.pages_stack.addWidget(employees)
-        except Exception as e:
-            logging.error(f"خطأ في تحميل صفحة الموظفين: {e}")
-            # إنشاء صفحة بديلة
-            placeholder = self.create_placeholder_page("الموظفين", "صفحة إدارة الموظفين")
-            self.pages["employees"] = placeholder
-            self.pages_stack.addWidget(placeholder)
-    
-    def load_installments_page(self):
-        """تحميل صفحة الأقساط"""
-        try:
-            from ui.pages.installments.installments_page import InstallmentsPage
-            
-            installments = InstallmentsPage()
-            self.pages["installments"] = installments
-            self.pages_stack.addWidget(installments)
-            
-        except Exception as e:
-            logging.error(f"خطأ في تحميل صفحة الأقساط: {e}")
-            # إنشاء صفحة بديلة
-            placeholder = self.create_placeholder_page("الأقساط", "صفحة إدارة الأقساط")
-            self.pages["installments"] = placeholder
-            self.pages_stack.addWidget(placeholder)
-    
-    def load_additional_fees_page(self):
-        """تحميل صفحة الرسوم الإضافية"""
-        try:
-            from ui.pages.additional_fees.additional_fees_page import AdditionalFeesPage
-            
-            additional_fees = AdditionalFeesPage()
-            self.pages["additional_fees"] = additional_fees
-            self.pages_stack.addWidget(additional_fees)
-            
-        except Exception as e:
-            logging.error(f"خطأ في تحميل صفحة الرسوم الإضافية: {e}")
-            # إنشاء صفحة بديلة
-            placeholder = self.create_placeholder_page("الرسوم الإضافية", "صفحة إدارة الرسوم الإضافية")
-            self.pages["additional_fees"] = placeholder
-            self.pages_stack.addWidget(placeholder)
-    
-    def load_external_income_page(self):
-        """تحميل صفحة الواردات الخارجية"""
-        try:
-            from ui.pages.external_income.external_income_page import ExternalIncomePage
-            
-            external_income = ExternalIncomePage()
-            self.pages["external_income"] = external_income
-            self.pages_stack.addWidget(external_income)
-            
-        except Exception as e:
-            logging.error(f"خطأ في تحميل صفحة الواردات الخارجية: {e}")
-            # إنشاء صفحة بديلة
-            placeholder = self.create_placeholder_page("الواردات الخارجية", "صفحة إدارة الواردات الخارجية")
-            self.pages["external_income"] = placeholder
-            self.pages_stack.addWidget(placeholder)
-    
-    def load_expenses_page(self):
-        """تحميل صفحة المصروفات"""
+    def on_page_created(self, page_name: str, page_widget):
+        """إضافة الصفحة إلى المكدس بعد إنشائها لأول مرة"""
+        self.pages[page_name] = page_widget
+        self.pages_stack.addWidget(page_widget)
+        # صفحة النسخ الاحتياطية تبلغ النافذة ببدء استعادة قاعدة البيانات وانتهائها
+        if hasattr(page_widget, 'restore_started'):
+            page_widget.restore_started.connect(self.on_restore_started)
+            page_widget.restore_completed.connect(self.on_restore_completed)
+
+    def unload_pages(self, keep=()):
+        """إزالة الصفحات المنشأة (عدا keep) لتُبنى من جديد عند عرضها التالي"""
+        for page_name, page_widget in self.page_registry.unload(keep).items():
+            self.pages.pop(page_name, None)
+            self.pages_stack.removeWidget(page_widget)
+            page_widget.deleteLater()
+
+    def on_restore_started(self):
+        """إيقاف عمل بقية الصفحات على قاعدة البيانات طوال الاستعادة
+
+        الصفحات الأخرى تُزال مع مؤقتاتها وعمليات بحثها، والتنقل معطل حتى تنتهي الاستعادة
+        """
         try:
-            from ui.pages.expenses.expenses_page import ExpensesPage
-            
-            expenses = ExpensesPage()
-            self.pages["expenses"] = expenses
-            self.pages_stack.addWidget(expenses)
+            self.sidebar_frame.setEnabled(False)
+            self.menuBar().setEnabled(False)
+            self.unload_pages(keep=[self.current_page])
+            self.statusBar().showMessage("جاري استعادة قاعدة البيانات...")
             
         except Exception as e:
-            logging.error(f"خطأ في تحميل صفحة المصروفات: {e}")
-            # إنشاء صفحة بديلة
-            placeholder = self.create_placeholder_page("المصروفات", "صفحة إدارة المصروفات")
-            self.pages["expenses"] = placeholder
-            self.pages_stack.addWidget(placeholder)
-    
-    def load_salaries_page(self):
-        """تحميل صفحة الرواتب"""
-        try:
-            from ui.pages.salaries.salaries_page import SalariesPage
-            salaries = SalariesPage()
-            self.pages["salaries"] = salaries
-            self.pages_stack.addWidget(salaries)
-        except Exception as e:
-            logging.error(f"خطأ في تحميل صفحة الرواتب: {e}")
-            # إنشاء صفحة بديلة
-            placeholder = self.create_placeholder_page("الرواتب", "صفحة إدارة الرواتب")
-            self.pages["salaries"] = placeholder
-            self.pages_stack.addWidget(placeholder)
-    
-    def load_backup_page(self):
-        """تحميل صفحة النسخ الاحتياطية"""
-        try:
-            from ui.pages.backup.backup_page import BackupPage
-            backup = BackupPage()
-            self.pages["backup"] = backup
-            self.pages_stack.addWidget(backup)
-        except Exception as e:
-            logging.error(f"خطأ في تحميل صفحة النسخ الاحتياطية: {e}")
-            # إنشاء صفحة بديلة
-            placeholder = self.create_placeholder_page("النسخ الاحتياطية", "صفحة إدارة النسخ الاحتياطية")
-            self.pages["backup"] = placeholder
-            self.pages_stack.addWidget(placeholder)
-    
-    def load_placeholder_pages(self):
-        """تحميل الصفحات الشكلية"""
+            logging.error(f"خطأ في إيقاف الصفحات أثناء الاستعادة: {e}")
+
+    def on_restore_completed(self, success: bool):
+        """إعادة التنقل بعد الاستعادة؛ الصفحات تُبنى من قاعدة البيانات الحالية عند عرضها"""
         try:
-            placeholder_pages = [
-                ("reports", "التقارير"),
-                ("settings", "الإعدادات")
-            ]
+            self.sidebar_frame.setEnabled(True)
+            self.menuBar().setEnabled(True)
+            self.statusBar().showMessage("تمت استعادة قاعدة البيانات" if success else "جاهز")
+            if success:
+                log_user_action("تمت استعادة قاعدة البيانات وإعادة بناء الصفحات")
             
-            for page_name, page_title in placeholder_pages:
-                placeholder = self.create_placeholder_page(
-                    page_title, 
-                    f"صفحة {page_title} قيد التطوير..."
-                )
-                self.pages[page_name] = placeholder
-                self.pages_stack.addWidget(placeholder)
-                
         except Exception as e:
-            logging.error(f"خطأ في تحميل الصفحات الشكلية: {e}")
-    
+            logging.error(f"خطأ في إعادة الصفحات بعد الاستعادة: {e}")
+
+    def create_fallback_page(self, spec: PageSpec):
+        """صفحة بديلة للصفحات قيد التطوير أو التي فشل تحميلها"""
+        return self.create_placeholder_page(spec.title, spec.message)
+
     def create_placeholder_page(self, title: str, message: str):
         """إنشاء صفحة بديلة"""
         try:
@@ -591,15 +419,15 @@ class MainWindow(QMainWindow):
     def navigate_to_page(self, page_name: str):
         """الانتقال إلى صفحة معينة"""
         try:
-            if page_name not in self.pages:
+            if page_name not in self.page_registry:
                 logging.warning(f"الصفحة غير موجودة: {page_name}")
                 return
 
             # تحديث حالة الأزرار
             self.update_sidebar_buttons(page_name)
 
-            # عرض الصفحة
-            page_widget = self.pages[page_name]
+            # عرض الصفحة (تُستورد وتُنشأ عند أول عرض)
+            page_widget = self.page_registry.page(page_name)
             self.pages_stack.setCurrentWidget(page_widget)
 
             # تحديث عنوان الصفحة
@@ -614,6 +442,9 @@ class MainWindow(QMainWindow):
             # تسجيل الإجراء
             log_user_action("تم الانتقال إلى صفحة", page_name)
 
+            # استيراد الصفحات المتوقع فتحها بعد هذه الصفحة في الخلفية
+            self.page_registry.prefetch_after(page_name)
+
         except Exception as e:
             logging.error(f"خطأ في الانتقال إلى الصفحة {page_name}: {e}")
     
@@ -629,23 +460,7 @@ class MainWindow(QMainWindow):
     def update_page_title(self, page_name: str):
         """تحديث عنوان الصفحة"""
         try:
-            titles = {
-                "dashboard": "لوحة التحكم",
-                "schools": "المدارس",
-                "students": "الطلاب",
-                "teachers": "المعلمين",
-                "employees": "الموظفين",
-                "installments": "الأقساط",
-                "additional_fees": "الرسوم الإضافية",
-                "reports": "التقارير",
-                "external_income": "الواردات الخارجية",
-                "expenses": "المصروفات",
-                "salaries": "الرواتب",
-                "backup": "النسخ الاحتياطية",
-                "settings": "الإعدادات"
-            }
-            
-            title = titles.get(page_name, "غير معروف")
+            title = self.page_registry.spec(page_name).title if page_name in self.page_registry else "غير معروف"
             self.page_title.setText(title)
             
         except Exception as e:
@@ -711,11 +526,37 @@ class MainWindow(QMainWindow):
             # رسالة الحالة
             statusbar.showMessage("جاهز")
             
-            # معلومات إضافية (يمكن إضافتها لاحقاً)
+            # حالة خدمة النسخ الاحتياطية
+            self.backup_status_label = QLabel(backup_manager.status_text())
+            self.backup_status_label.setObjectName("backupStatusLabel")
+            statusbar.addPermanentWidget(self.backup_status_label)
+            
+            self.backup_status_timer = QTimer(self)
+            self.backup_status_timer.timeout.connect(self.update_backup_status)
             
         except Exception as e:
             logging.error(f"خطأ في إعداد شريط الحالة: {e}")
     
+    def start_backup_service(self):
+        """بدء تهيئة خدمة النسخ الاحتياطية في خيط خلفي ومتابعة حالتها"""
+        try:
+            backup_manager.start()
+            self.update_backup_status()
+            self.backup_status_timer.start(500)
+            
+        except Exception as e:
+            logging.error(f"خطأ في بدء خدمة النسخ الاحتياطية: {e}")
+    
+    def update_backup_status(self):
+        """عرض حالة خدمة النسخ الاحتياطية وإيقاف المتابعة عند اكتمال التهيئة"""
+        try:
+            self.backup_status_label.setText(backup_manager.status_text())
+            if backup_manager.state in (backup_manager.READY, backup_manager.FAILED):
+                self.backup_status_timer.stop()
+                
+        except Exception as e:
+            logging.error(f"خطأ في تحديث حالة النسخ الاحتياطي: {e}")
+    
     def setup_session_timer(self):
         """إعداد مؤقت الجلسة"""
         try:
@@ -998,6 +839,7 @@ class MainWindow(QMainWindow):
                 # تنظيف الموارد
                 if hasattr(self, 'session_timer'):
                     self.session_timer.stop()
+                self.page_registry.shutdown()
                 
                 auth_manager.logout()
                 log_user_action("تم إغلاق التطبيق")
@@ -1043,16 +885,19 @@ class MainWindow(QMainWindow):
             logging.error(f"خطأ في العودة لصفحة الطلاب: {e}")
     
     def create_quick_backup(self):
-        """إنشاء نسخة احتياطية سريعة"""
+        """إنشاء نسخة احتياطية سريعة في خيط عامل دون تجميد النافذة"""
         try:
-            from PyQt5.QtWidgets import QProgressDialog, QMessageBox
-            from PyQt5.QtCore import QThread, pyqtSignal
+            from PyQt5.QtWidgets import QProgressDialog
             from datetime import datetime
+            from ui.pages.backup.backup_page import BackupWorker
+            
+            if self.quick_backup_worker is not None:
+                return
             
             # عرض حوار التقدم
             progress = QProgressDialog(
                 "جاري إنشاء النسخة الاحتياطية...",
-                None, 0, 0, self
+                None, 0, 100, self
             )
             progress.setWindowTitle("نسخ احتياطي سريع")
             progress.setModal(True)
@@ -1061,36 +906,45 @@ class MainWindow(QMainWindow):
             # إنشاء وصف للنسخة الاحتياطية
             description = f"نسخة احتياطية سريعة - {datetime.now().strftime('%Y-%m-%d %H:%M')}"
             
-            # إنشاء النسخة الاحتياطية
-            success, message = backup_manager.create_backup(description)
-
-            # إغلاق حوار التقدم
-            progress.close()
-
-            if success:
-                # عرض رسالة النجاح المبسطة دون التكرار
-                QMessageBox.information(
-                    self, "نجح النسخ الاحتياطي",
-                    message
-                )
-                # تسجيل الإجراء مع وصف النسخ الاحتياطي السريع
-                log_user_action("backup quick", description)
-            else:
-                # تحقق من تعطيل النظام
-                if "disabled" in message.lower():
-                    QMessageBox.critical(
-                        self, "خطأ في النسخ الاحتياطي",
-                        "نظام النسخ الاحتياطي معطل. يرجى التحقق من صحة API Key واسم البوكت في ملف الإعدادات (config.py)."
-                    )
-                else:
-                    QMessageBox.critical(
-                        self, "خطأ في النسخ الاحتياطي",
-                        f"فشل في إنشاء النسخة الاحتياطية:\n\n{message}"
-                    )
-                
+            # إنشاء النسخة الاحتياطية (لقطة قاعدة البيانات ثم الرفع) في الخلفية
+            self.quick_backup_worker = BackupWorker(description)
+            self.quick_backup_worker.progress.connect(progress.setLabelText)
+            self.quick_backup_worker.percent.connect(progress.setValue)
+            self.quick_backup_worker.finished.connect(
+                lambda success, message: self.quick_backup_finished(progress, description, success, message)
+            )
+            self.quick_backup_worker.start()
+            
         except Exception as e:
             logging.error(f"خطأ في النسخ الاحتياطي السريع: {e}")
             QMessageBox.critical(
                 self, "خطأ", 
                 f"حدث خطأ أثناء النسخ الاحتياطي:\n{e}"
-            )
\ No newline at end of file
+            )
+    
+    def quick_backup_finished(self, progress, description, success, message):
+        """عرض نتيجة النسخ الاحتياطي السريع"""
+        # إغلاق حوار التقدم
+        progress.close()
+        self.quick_backup_worker = None
+        
+        if success:
+            # عرض رسالة النجاح المبسطة دون التكرار
+            QMessageBox.information(
+                self, "نجح النسخ الاحتياطي",
+                message
+            )
+            # تسجيل الإجراء مع وصف النسخ الاحتياطي السريع
+            log_user_action("backup quick", description)
+        else:
+            # تحقق من تعطيل النظام
+            if "disabled" in message.lower():
+                QMessageBox.critical(
+                    self, "خطأ في النسخ الاحتياطي",
+                    "نظام النسخ الاحتياطي معطل. يرجى التحقق من صحة API Key واسم البوكت في ملف الإعدادات (config.py)."
+                )
+            else:
+                QMessageBox.critical(
+                    self, "خطأ في النسخ الاحتياطي",
+                    f"فشل في إنشاء النسخة الاحتياطية:\n\n{message}"
+                )
\ No newline at end of file
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+سجل صفحات النافذة الرئيسية
+كل صفحة تُستورد وتُبنى عند أول عرض لها بدلاً من بناء جميع الصفحات عند بدء التشغيل،
+مع استيراد مسبق في الخلفية لوحدات الصفحات المتوقع فتحها بعد الصفحة الحالية
+"""
+
+import importlib
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.utils.startup_profiler import startup_profiler
+
+
+@dataclass(frozen=True)
+class PageSpec:
+    """تعريف صفحة: مكان صنفها وعنوانها والصفحات المتوقع فتحها بعدها
+
+    الصفحة بلا module تُعرض كصفحة بديلة بالرسالة message (صفحة قيد التطوير)
+    """
+    name: str
+    title: str
+    module: str = ""
+    class_name: str = ""
+    message: str = ""
+    prefetch: Tuple[str, ...] = ()
+
+
+PAGE_SPECS = (
+    PageSpec("dashboard", "لوحة التحكم", "ui.pages.dashboard.dashboard_page", "DashboardPage",
+             "مرحباً بك في نظام حسابات المدارس الأهلية", ("students", "schools", "installments")),
+    PageSpec("schools", "المدارس", "ui.pages.schools.schools_page", "SchoolsPage",
+             "صفحة إدارة المدارس", ("students",)),
+    PageSpec("students", "الطلاب", "ui.pages.students.students_page", "StudentsPage",
+             "صفحة إدارة الطلاب", ("installments", "additional_fees")),
+    PageSpec("teachers", "المعلمين", "ui.pages.teachers.teachers_page", "TeachersPage",
+             "صفحة إدارة المعلمين", ("employees", "salaries")),
+    PageSpec("employees", "الموظفين", "ui.pages.employees.employees_page", "EmployeesPage",
+             "صفحة إدارة الموظفين", ("teachers", "salaries")),
+    PageSpec("installments", "الأقساط", "ui.pages.installments.installments_page", "InstallmentsPage",
+             "صفحة إدارة الأقساط", ("students", "additional_fees")),
+    PageSpec("additional_fees", "الرسوم الإضافية", "ui.pages.additional_fees.additional_fees_page",
+             "AdditionalFeesPage", "صفحة إدارة الرسوم الإضافية", ("students", "installments")),
+    PageSpec("external_income", "الواردات الخارجية", "ui.pages.external_income.external_income_page",
+             "ExternalIncomePage", "صفحة إدارة الواردات الخارجية", ("expenses",)),
+    PageSpec("expenses", "المصروفات", "ui.pages.expenses.expenses_page", "ExpensesPage",
+             "صفحة إدارة المصروفات", ("external_income", "salaries")),
+    PageSpec("salaries", "الرواتب", "ui.pages.salaries.salaries_page", "SalariesPage",
+             "صفحة إدارة الرواتب", ("teachers", "employees")),
+    PageSpec("backup", "النسخ الاحتياطية", "ui.pages.backup.backup_page", "BackupPage",
+             "صفحة إدارة النسخ الاحتياطية"),
+    PageSpec("reports", "التقارير", message="صفحة التقارير قيد التطوير..."),
+    PageSpec("settings", "الإعدادات", message="صفحة الإعدادات قيد التطوير..."),
+)
+
+
+class PageRegistry:
+    """إنشاء الصفحات عند الطلب والاحتفاظ بها بعد أول إنشاء
+
+    fallback: دالة تُنشئ صفحة بديلة لتعريف الصفحة (للصفحات قيد التطوير أو عند فشل البناء)
+    on_created: تُستدعى بـ (الاسم، الصفحة) بعد إنشاء كل صفحة، مثلاً لإضافتها إلى مكدس الصفحات
+    prefetch: تفعيل الاستيراد المسبق في الخلفية لوحدات الصفحات التالية المتوقعة
+
+    البناء نفسه يتم دائماً في الخيط المستدعي (خيط الواجهة)، والخلفية تستورد الوحدات فقط
+    """
+
+    def __init__(self, specs: Iterable[PageSpec], fallback: Callable[[PageSpec], Any],
+                 on_created: Optional[Callable[[str, Any], None]] = None, prefetch: bool = True):
+        self._specs: Dict[str, PageSpec] = {spec.name: spec for spec in specs}
+        self._fallback = fallback
+        self._on_created = on_created
+        self._prefetch_enabled = prefetch
+        self._pages: Dict[str, Any] = {}
+        self._imports: Dict[str, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._specs
+
+    def spec(self, name: str) -> PageSpec:
+        return self._specs[name]
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._pages
+
+    def loaded_pages(self) -> Dict[str, Any]:
+        """الصفحات التي أُنشئت حتى الآن"""
+        return dict(self._pages)
+
+    def unload(self, keep: Iterable[str] = ()) -> Dict[str, Any]:
+        """إسقاط الصفحات المنشأة (عدا keep) لتُبنى من جديد عند طلبها التالي
+
+        بعد استبدال قاعدة البيانات (الاستعادة) تُبنى الصفحات من البيانات الجديدة
+
+        Returns:
+            الصفحات المُسقطة، ليزيلها المستدعي من الواجهة
+        """
+        keep = set(keep)
+        unloaded = {name: page for name, page in self._pages.items() if name not in keep}
+        for name in unloaded:
+            del self._pages[name]
+        return unloaded
+
+    def page(self, name: str) -> Any:
+        """الصفحة بالاسم، مع استيرادها وإنشائها عند أول طلب"""
+        if name not in self._pages:
+            spec = self._specs[name]
+            self._pages[name] = self._build(spec)
+            if self._on_created:
+                self._on_created(name, self._pages[name])
+        return self._pages[name]
+
+    def _build(self, spec: PageSpec) -> Any:
+        if not spec.module:
+            return self._fallback(spec)
+        try:
+            with startup_profiler.phase(f"page:{spec.name}"):
+                # إن كان الاستيراد جارياً في الخلفية ينتظر import_module اكتماله (قفل الوحدة)
+                page_class = getattr(importlib.import_module(spec.module), spec.class_name)
+                page = page_class()
+            logging.info(f"تم إنشاء صفحة {spec.title}")
+            return page
+        except Exception as e:
+            logging.error(f"خطأ في تحميل صفحة {spec.title}: {e}")
+            return self._fallback(spec)
+
+    def prefetch(self, names: Iterable[str]) -> List[str]:
+        """استيراد وحدات الصفحات في خيط خلفي دون إنشائها
+
+        Returns:
+            أسماء الصفحات التي بدأ استيرادها
+        """
+        if not self._prefetch_enabled:
+            return []
+        started = []
+        for name in names:
+            spec = self._specs.get(name)
+            if spec is None or not spec.module or name in self._pages or spec.module in self._imports:
+                continue
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="page-prefetch")
+            self._imports[spec.module] = self._executor.submit(self._import_quietly, spec)
+            started.append(name)
+        return started
+
+    def prefetch_after(self, name: str) -> List[str]:
+        """استيراد الصفحات المتوقع فتحها بعد الصفحة name"""
+        spec = self._specs.get(name)
+        return self.prefetch(spec.prefetch) if spec else []
+
+    @staticmethod
+    def _import_quietly(spec: PageSpec):
+        try:
+            importlib.import_module(spec.module)
+        except Exception as e:
+            # الخطأ يظهر مرة أخرى ويُعالج عند بناء الصفحة
+            logging.warning(f"تعذر الاستيراد المسبق لصفحة {spec.title}: {e}")
+
+    def wait_for_prefetch(self, timeout: Optional[float] = None):
+        """انتظار اكتمال الاستيرادات المسبقة الجارية"""
+        for future in list(self._imports.values()):
+            future.result(timeout)
+
+    def shutdown(self):
+        """إيقاف خيط الاستيراد المسبق وإلغاء ما لم يبدأ بعد"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -17,11 +17,11 @@ def comprehensive_test():
     try:
         # 1. اختبار الاتصال بقاعدة البيانات
         print("\n1️⃣ اختبار الاتصال بقاعدة البيانات...")
-        conn = db_manager.get_connection()
-        if conn:
-            print("✅ تم الاتصال بقاعدة البيانات بنجاح")
-        else:
-            errors.append("❌ فشل في الاتصال بقاعدة البيانات")
+        with db_manager.get_connection() as conn:
+            if conn:
+                print("✅ تم الاتصال بقاعدة البيانات بنجاح")
+            else:
+                errors.append("❌ فشل في الاتصال بقاعدة البيانات")
         
         # 2. اختبار هيكل الجداول
         print("\n2️⃣ اختبار هيكل الجداول...")
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+تجهيزات pytest المشتركة لاختبارات قاعدة البيانات
+قاعدة بيانات مؤقتة مهيأة بالمخطط الكامل، ومدرستان وثلاثة طلاب أساسيون؛
+الصفوف الخاصة باختبار معين تُضاف في ملفه
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# إضافة مسار المشروع
+project_root = Path(__file__).resolve().parent
+sys.path.insert(0, str(project_root))
+
+from core.database.connection import DatabaseManager
+from core.utils.money import Money
+
+SCHOOLS = [(1, "أ", "ابتدائية"), (2, "ب", "ابتدائية")]
+
+STUDENT_COLUMNS = ("id", "name", "school_id", "grade", "section", "gender", "total_fee", "start_date")
+
+STUDENTS = [
+    (1, "أحمد", 1, "الأول", "أ", "ذكر", Money(1000), "2025-09-01"),
+    (2, "علي", 1, "الأول", "أ", "ذكر", Money(500), "2025-09-01"),
+    (3, "سارة", 2, "الأول", "أ", "أنثى", Money(750), "2025-09-01"),
+]
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """مدير قاعدة بيانات على ملف مؤقت، يُغلق بعد الاختبار"""
+    manager = DatabaseManager(tmp_path / "test.db")
+    manager.initialize_database()
+    yield manager
+    manager.close_connection()
+
+
+@pytest.fixture
+def school_manager(manager):
+    """قاعدة بيانات بالمدرستين 1 و2"""
+    manager.insert_many("schools", ("id", "name_ar", "school_types"), SCHOOLS)
+    return manager
+
+
+@pytest.fixture
+def seeded_manager(school_manager):
+    """المدرستان مع ثلاثة طلاب: أحمد (1000) وعلي (500) في المدرسة 1، وسارة (750) في المدرسة 2"""
+    school_manager.insert_many("students", STUDENT_COLUMNS, STUDENTS)
+    return school_manager
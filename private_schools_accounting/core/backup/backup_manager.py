@@ -1,99 +1,159 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-مدير النسخ الاحتياطية - Supabase Storage
-يدير عمليات رفع وعرض النسخ الاحتياطية من قاعدة البيانات على Supabase
+مدير النسخ الاحتياطية
+يدير عمليات رفع وعرض النسخ الاحتياطية من قاعدة البيانات على مخزن النسخ المحدد في
+config.BACKUP_STORAGE_BACKEND (مجلد محلي أو S3 أو Supabase)
+
+المخزن ومكتبته لا يُنشآن عند الاستيراد: backup_manager خدمة كسولة تُهيئ
+المدير الفعلي عند أول استخدام أو في خيط خلفي بعد ظهور النافذة الرئيسية
 """
 
 import os
 import shutil
 import sqlite3
 import logging
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
-import tempfile
+from typing import Callable, List, Dict, Optional, Tuple
 import zipfile
 
-try:
-    from supabase import create_client  # type: ignore
-except ImportError:
-    create_client = None
-    logging.warning("supabase library not installed; backup functionality disabled.")
 """StorageException for handling storage errors; using generic Exception as fallback."""
 StorageException = Exception
 
 import config
+from core.backup.catalog import BackupCatalog
+from core.backup.incremental import IncrementalBackupStore, Manifest
+from core.backup.storage import ObjectStore, StoredObject, create_store
+from core.backup.upload import UploadProgress, upload_file
+from core.database.snapshot import ProgressCallback, snapshot_service
 
 
 class BackupManager:
     """مدير النسخ الاحتياطية"""
     
-    def __init__(self):
-        """تهيئة مدير النسخ الاحتياطية"""
+    def __init__(self, store: Optional[ObjectStore] = None, reconcile: bool = True):
+        """تهيئة مدير النسخ الاحتياطية
+
+        Args:
+            store: مخزن النسخ (يُنشأ من config.BACKUP_STORAGE_BACKEND افتراضياً)
+            reconcile: مطابقة فهرس النسخ المحلي مع المخزن في خيط خلفي
+        """
         self.logger = logging.getLogger(__name__)
-        # تحقق من توفر عميل Supabase
-        if create_client is None:
-            self.logger.error("Supabase client not available; backup functionality is disabled.")
-            raise Exception("مكتبة Supabase غير مثبتة. يرجى تثبيتها باستخدام: pip install supabase")
-        
-        # تهيئة عميل Supabase
         try:
-            self.supabase = create_client(config.SUPABASE_URL, config.SUPABASE_KEY)
-            self.bucket_name = config.SUPABASE_BUCKET
-            self.setup_storage()
-        except Exception as e:
-            self.logger.error(f"فشل في تهيئة Supabase: {e}")
-            raise Exception(f"فشل في الاتصال بـ Supabase: {e}")
-    
-    def setup_storage(self):
-        """إعداد التخزين على Supabase"""
-        try:
-            # التحقق من وجود البكت بدون محاولة إنشاؤه
-            self.logger.info(f"محاولة الاتصال بـ Supabase Storage...")
-            
-            # نجرب فقط الوصول للبكت الموجود
-            # إذا كان موجود سيعمل، إذا لم يكن موجود فسنتعامل مع الخطأ في create_backup
-            self.logger.info(f"سنستخدم بكت التخزين: {self.bucket_name}")
-                
+            self.store = store or create_store()
+            # الرفع على أجزاء قابلة للاستئناف بدلاً من رفع الأرشيف كاملاً من الذاكرة
+            self.upload_target = self.store.upload_target()
+            self.incremental = IncrementalBackupStore(self.store)
+            self.catalog = BackupCatalog(config.BACKUP_CATALOG_PATH, self.store.identity)
         except Exception as e:
-            self.logger.warning(f"تحذير في إعداد التخزين: {type(e).__name__}: {e}")
-            # لا نرمي خطأ هنا، فقط تحذير
+            self.logger.error(f"فشل في تهيئة مخزن النسخ الاحتياطية: {e}")
+            raise
+        # المطابقة تتسلسل مع تعديلات الفهرس حتى لا تمحو نسخة أُضيفت أثناء تصفح المخزن
+        self._catalog_lock = threading.Lock()
+        self._reconcile_thread = None
+        self._reconcile_start_lock = threading.Lock()
+        self._reconcile_listeners: List[Callable[[bool], None]] = []
+        # الاستعادة تستبدل قاعدة البيانات: لا تبدأ أثناء إنشاء نسخة ولا تُنشأ نسخة أثناءها
+        self._operation_lock = threading.Lock()
+        self._active_backups = 0
+        self._restoring = False
+        self.logger.info(f"مخزن النسخ الاحتياطية: {self.store.title}")
+        if reconcile:
+            self.start_reconcile()
     
-    def create_backup(self, description: str = "") -> Tuple[bool, str]:
+    def create_backup(self, description: str = "",
+                      progress: Optional[ProgressCallback] = None,
+                      upload_progress: Optional[UploadProgress] = None,
+                      kind: str = "manual") -> Tuple[bool, str]:
         """
-        إنشاء نسخة احتياطية جديدة ورفعها على Supabase
+        إنشاء نسخة احتياطية جديدة ورفعها على مخزن النسخ
+        
+        مع config.BACKUP_INCREMENTAL تُرفع أجزاء اللقطة الجديدة فقط مع بيان النسخة؛
+        وإلا يُكتب أرشيف ZIP في مجلد الرفع المعلق ويُرفع على أجزاء، وإن انقطع الرفع بقي
+        الأرشيف وحالة رفعه ليُستأنف من حيث توقف عند النسخة الاحتياطية التالية
         
         Args:
             description: وصف النسخة الاحتياطية
+            progress: دالة تقدم لقطة قاعدة البيانات (الصفحات المنسوخة، الإجمالي)
+            upload_progress: دالة تقدم الرفع (البايتات المعالجة، الحجم الكلي)
+            kind: نوع النسخة ومجلدها على المخزن (daily أو weekly أو manual)
             
         Returns:
             tuple: (نجح العملية, رسالة النتيجة)
         """
+        if kind not in config.BACKUP_KINDS:
+            return False, f"نوع نسخة احتياطية غير معروف: {kind}"
+        refusal = self._begin_operation(restore=False)
+        if refusal:
+            return False, refusal
+        try:
+            return self._create_backup(description, progress, upload_progress, kind)
+        finally:
+            self._end_operation(restore=False)
+    
+    def _begin_operation(self, restore: bool) -> Optional[str]:
+        """حجز عملية نسخ أو استعادة
+        
+        Returns:
+            رسالة الرفض إن تعارضت مع عملية جارية، وإلا None
+        """
+        with self._operation_lock:
+            if self._restoring:
+                return "استعادة قاعدة البيانات جارية، حاول مرة أخرى بعد انتهائها"
+            if not restore:
+                self._active_backups += 1
+            elif self._active_backups:
+                return "نسخة احتياطية قيد الإنشاء، حاول الاستعادة بعد انتهائها"
+            else:
+                self._restoring = True
+        return None
+    
+    def _end_operation(self, restore: bool):
+        with self._operation_lock:
+            if restore:
+                self._restoring = False
+            else:
+                self._active_backups -= 1
+    
+    def _create_backup(self, description: str, progress: Optional[ProgressCallback],
+                       upload_progress: Optional[UploadProgress], kind: str) -> Tuple[bool, str]:
+        """إنشاء النسخة بعد حجزها (انظر create_backup)"""
         try:
             # التحقق من وجود قاعدة البيانات
             if not config.DATABASE_PATH.exists():
                 return False, "قاعدة البيانات غير موجودة"
             
+            # إكمال رفع النسخ السابقة التي انقطع رفعها
+            self.resume_pending_uploads()
+            
             # إنشاء اسم الملف بالتاريخ والوقت
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            if config.BACKUP_INCREMENTAL:
+                return self._create_incremental_backup(f"backup_{timestamp}", description,
+                                                       progress, upload_progress, kind)
             backup_filename = f"backup_{timestamp}.zip"
-            
-            # إنشاء ملف مؤقت للنسخة الاحتياطية
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.zip') as temp_file:
-                temp_path = temp_file.name
+            # مجلد النوع يحفظ مجلد الوجهة للأرشيف المعلق حتى يُستأنف رفعه
+            archive_path = config.BACKUP_PENDING_DIR / kind / backup_filename
+            archive_path.parent.mkdir(exist_ok=True)
+            partial_path = archive_path.with_name(f"{backup_filename}.part")
+            snapshot_path = archive_path.with_name(f"{backup_filename}.db")
             
             try:
-                # إنشاء أرشيف ZIP يحتوي على قاعدة البيانات
-                with zipfile.ZipFile(temp_path, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+                # لقطة متسقة من قاعدة البيانات دون إيقاف الكتابة من الواجهة
+                snapshot = snapshot_service.snapshot(snapshot_path, progress)
+                
+                # إنشاء أرشيف ZIP يحتوي على اللقطة (يُضغط من الملف على دفعات دون تحميله في الذاكرة)
+                with zipfile.ZipFile(partial_path, 'w', zipfile.ZIP_DEFLATED) as zip_file:
                     # إضافة قاعدة البيانات
-                    zip_file.write(config.DATABASE_PATH, "schools.db")
+                    zip_file.write(snapshot.path, "schools.db")
                     
                     # إضافة ملف معلومات النسخة الاحتياطية
                     backup_info = {
                         "created_at": datetime.now().isoformat(),
                         "description": description,
-                        "database_size": os.path.getsize(config.DATABASE_PATH),
+                        "database_size": snapshot.size,
                         "version": config.APP_VERSION
                     }
                     
@@ -105,32 +165,16 @@ class BackupManager:
                     ])
                     
                     zip_file.writestr("backup_info.txt", info_content.encode('utf-8'))
-                
-                # رفع على Supabase - طريقة مبسطة مثل المثال الناجح
-                self.logger.info("محاولة رفع النسخة الاحتياطية على Supabase...")
-                folder_path = f"backups/{datetime.now().strftime('%Y/%m')}"
-                file_path = f"{folder_path}/{backup_filename}"
-                
-                # قراءة الملف كما في المثال الناجح
-                with open(temp_path, 'rb') as f:
-                    data = f.read()
-                
-                # رفع الملف بنفس الطريقة البسيطة
-                upload_result = self.supabase.storage.from_(self.bucket_name).upload(file_path, data)
-                
-                # التحقق من النتيجة مثل المثال الناجح
-                if hasattr(upload_result, 'error') and upload_result.error:
-                    error_msg = f"فشل في رفع النسخة الاحتياطية: {upload_result.error}"
-                    self.logger.error(error_msg)
-                    return False, error_msg
-                
-                self.logger.info(f"تم إنشاء النسخة الاحتياطية على Supabase: {file_path}, النتيجة: {upload_result}")
-                return True, f"تم إنشاء النسخة الاحتياطية بنجاح على Supabase\nالملف: {backup_filename}"
-                    
+                # الأرشيف لا يظهر في مجلد الرفع المعلق إلا كاملاً
+                os.replace(partial_path, archive_path)
             finally:
-                # حذف الملف المؤقت
-                if os.path.exists(temp_path):
-                    os.unlink(temp_path)
+                # حذف الملفات المؤقتة
+                for path in (partial_path, snapshot_path):
+                    if path.exists():
+                        path.unlink()
+            
+            file_path = self._upload_archive(archive_path, upload_progress, description)
+            return True, f"تم إنشاء النسخة الاحتياطية بنجاح على {self.store.title}\nالملف: {backup_filename}\nالمسار: {file_path}"
                     
         except StorageException as e:
             error_msg = f"خطأ في التخزين: {e}"
@@ -142,62 +186,189 @@ class BackupManager:
             self.logger.error(error_msg)
             return False, error_msg
     
+    def _create_incremental_backup(self, name: str, description: str,
+                                   progress: Optional[ProgressCallback],
+                                   upload_progress: Optional[UploadProgress],
+                                   kind: str) -> Tuple[bool, str]:
+        """لقطة من قاعدة البيانات تُرفع أجزاؤها الجديدة فقط مع بيان النسخة"""
+        snapshot_path = config.BACKUP_PENDING_DIR / f"{name}.db"
+        try:
+            snapshot = snapshot_service.snapshot(snapshot_path, progress)
+            manifest = self.incremental.write(snapshot.path, name, description,
+                                              snapshot.schema_version, upload_progress, kind=kind)
+        finally:
+            if snapshot_path.exists():
+                snapshot_path.unlink()
+        self._catalog_add(self._manifest_entry(manifest))
+        return True, (
+            f"تم إنشاء النسخة الاحتياطية التزايدية بنجاح على {self.store.title}\nالنسخة: {name}\n"
+            f"البيانات الجديدة المرفوعة: {self._format_file_size(manifest.uploaded_size)} "
+            f"من أصل {self._format_file_size(manifest.database_size)}"
+        )
+    
+    def _remote_path(self, backup_filename: str, kind: str) -> str:
+        """مسار النسخة على المخزن (النوع/السنة/الشهر) من التاريخ في اسم الملف"""
+        timestamp_str = backup_filename[len("backup_"):-len(".zip")]
+        try:
+            backup_date = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
+        except ValueError:
+            backup_date = datetime.now()
+        return f"{kind}/{backup_date.strftime('%Y/%m')}/{backup_filename}"
+    
+    def _upload_archive(self, archive_path: Path,
+                        upload_progress: Optional[UploadProgress] = None,
+                        description: str = "") -> str:
+        """رفع أرشيف من مجلد الرفع المعلق وحذفه بعد النجاح
+
+        عند الفشل يبقى الأرشيف وحالة رفعه للاستئناف، ويُرمى الاستثناء
+
+        Returns:
+            مسار النسخة على التخزين
+        """
+        file_path = self._remote_path(archive_path.name, archive_path.parent.name)
+        self.logger.info(f"رفع النسخة الاحتياطية على {self.store.title}: {file_path}")
+        upload_file(self.upload_target, archive_path, file_path, upload_progress)
+        entry = self._archive_entry(StoredObject(file_path, archive_path.stat().st_size))
+        entry['description'] = description
+        archive_path.unlink()
+        self._catalog_add(entry)
+        self.logger.info(f"تم إنشاء النسخة الاحتياطية على {self.store.title}: {file_path}")
+        return file_path
+    
+    def resume_pending_uploads(self) -> int:
+        """استئناف رفع الأرشيفات المعلقة من محاولات سابقة
+
+        الفشل هنا لا يمنع النسخة الجديدة؛ يبقى الأرشيف للمحاولة التالية
+
+        Returns:
+            عدد الأرشيفات التي اكتمل رفعها
+        """
+        uploaded = 0
+        for archive_path in sorted(config.BACKUP_PENDING_DIR.glob("*/backup_*.zip")):
+            try:
+                self._upload_archive(archive_path)
+                uploaded += 1
+            except Exception as e:
+                self.logger.error(f"تعذر استئناف رفع النسخة الاحتياطية {archive_path.name}: {e}")
+        return uploaded
+    
     def list_backups(self) -> List[Dict]:
         """
-        قائمة بجميع النسخ الاحتياطية المتاحة على Supabase
+        قائمة بجميع النسخ الاحتياطية من الفهرس المحلي (دون الرجوع إلى المخزن)
+        
+        لا تنتظر المطابقة مع المخزن أبداً: قبل أول مطابقة ناجحة قد تكون القائمة ناقصة
+        (is_catalog_synced)، والمستمعون المسجلون بـ add_reconcile_listener يُبلغون عند انتهائها
         
         Returns:
-            قائمة بالنسخ الاحتياطية مع معلوماتها
+            قائمة بالنسخ الاحتياطية مع معلوماتها، الأحدث أولاً
         """
         try:
-            backups = []
-            
-            # جلب قائمة الملفات من Supabase
-            result = self.supabase.storage.from_(self.bucket_name).list("backups", {
-                "limit": 100,
-                "sortBy": {"column": "created_at", "order": "desc"}
-            })
-            
-            for item in result:
-                if self._is_backup_folder(item):
-                    # جلب الملفات من هذا المجلد
-                    folder_files = self.supabase.storage.from_(self.bucket_name).list(
-                        f"backups/{item['name']}", {"limit": 100}
-                    )
-                    
-                    for folder_item in folder_files:
-                        if self._is_backup_folder(folder_item):
-                            # مجلد شهر، جلب الملفات منه
-                            month_files = self.supabase.storage.from_(self.bucket_name).list(
-                                f"backups/{item['name']}/{folder_item['name']}", {"limit": 100}
-                            )
-                            
-                            for file_item in month_files:
-                                if file_item['name'].endswith('.zip'):
-                                    backup_info = self._parse_backup_info(
-                                        f"backups/{item['name']}/{folder_item['name']}/{file_item['name']}",
-                                        file_item
-                                    )
-                                    if backup_info:
-                                        backups.append(backup_info)
-            
-            # ترتيب النسخ حسب التاريخ (الأحدث أولاً)
-            backups.sort(key=lambda x: x['created_at'], reverse=True)
-            
-            return backups
+            return [self._format_entry(entry) for entry in self.catalog.entries()]
             
         except Exception as e:
             self.logger.error(f"خطأ في جلب قائمة النسخ الاحتياطية: {e}")
             return []
     
-    def _is_backup_folder(self, item: Dict) -> bool:
-        """التحقق من أن العنصر مجلد وليس ملف"""
-        return item.get('id') is None and 'name' in item
+    @property
+    def is_catalog_synced(self) -> bool:
+        """هل طوبق الفهرس مع المخزن مرة واحدة على الأقل؟"""
+        return self.catalog.reconciled_at is not None
+    
+    def add_reconcile_listener(self, callback: Callable[[bool], None]):
+        """تسجيل دالة تُستدعى بنتيجة كل مطابقة (من خيط المطابقة، لا من خيط الواجهة)"""
+        self._reconcile_listeners.append(callback)
     
-    def _parse_backup_info(self, file_path: str, file_item: Dict) -> Optional[Dict]:
-        """استخراج معلومات النسخة الاحتياطية"""
+    def remove_reconcile_listener(self, callback: Callable[[bool], None]):
+        if callback in self._reconcile_listeners:
+            self._reconcile_listeners.remove(callback)
+    
+    def start_reconcile(self) -> bool:
+        """بدء مطابقة الفهرس مع المخزن في خيط خلفي
+
+        Returns:
+            True إن بدأت مطابقة جديدة (False إن كانت هناك مطابقة جارية)
+        """
+        # قفل مستقل عن _catalog_lock الذي تحجزه المطابقة طوال تصفح المخزن
+        with self._reconcile_start_lock:
+            if self._reconcile_thread is not None and self._reconcile_thread.is_alive():
+                return False
+            self._reconcile_thread = threading.Thread(
+                target=self.reconcile_catalog, name="backup-catalog", daemon=True
+            )
+            self._reconcile_thread.start()
+        return True
+    
+    def reconcile_catalog(self) -> bool:
+        """مطابقة الفهرس المحلي مع النسخ الموجودة فعلاً على المخزن
+
+        Returns:
+            True إن نجحت المطابقة (عند الفشل يبقى الفهرس كما هو)
+        """
+        try:
+            with self._catalog_lock:
+                known = {entry['path']: entry for entry in self.catalog.entries()}
+                backups = self._scan_backups()
+                # وصف أرشيفات ZIP لا يظهر في مسارها، فيُحتفظ به من الفهرس
+                for backup in backups:
+                    if not backup['description'] and backup['path'] in known:
+                        backup['description'] = known[backup['path']].get('description', "")
+                self.catalog.replace(backups)
+            self.logger.info(f"تمت مطابقة فهرس النسخ الاحتياطية: {len(backups)} نسخة")
+            success = True
+        except Exception as e:
+            self.logger.error(f"خطأ في مطابقة فهرس النسخ الاحتياطية: {e}")
+            success = False
+        for callback in list(self._reconcile_listeners):
+            try:
+                callback(success)
+            except Exception as e:
+                self.logger.warning(f"تحذير: فشل إبلاغ مستمع مطابقة الفهرس: {e}")
+        return success
+    
+    def _catalog_add(self, entry: Dict):
+        with self._catalog_lock:
+            self.catalog.add(entry)
+    
+    def _catalog_remove(self, paths: List[str]):
+        with self._catalog_lock:
+            self.catalog.remove(paths)
+    
+    def _scan_backups(self) -> List[Dict]:
+        """تصفح المخزن لجميع النسخ (للمطابقة فقط)"""
+        backups = []
+        
+        # أرشيفات ZIP في مجلدات الأنواع، ومجلد backups للنسخ السابقة لتقسيم الأنواع
+        for prefix in (*config.BACKUP_KINDS, "backups"):
+            for stored in self.store.list(prefix):
+                if stored.key.endswith('.zip'):
+                    backup_info = self._archive_entry(stored)
+                    if backup_info:
+                        backups.append(backup_info)
+        
+        # النسخ التزايدية من بياناتها (تُقرأ من النسخ المحلية عند توفرها)
+        for key in self.incremental.list_keys():
+            backups.append(self._manifest_entry(self.incremental.read_manifest(key)))
+        return backups
+    
+    @staticmethod
+    def _manifest_entry(manifest: Manifest) -> Dict:
+        return {
+            'filename': manifest.name,
+            'path': manifest.key,
+            'created_at': manifest.created_at,
+            'size': manifest.database_size,
+            'description': manifest.description,
+            'incremental': True,
+        }
+    
+    @staticmethod
+    def _is_incremental(file_path: str) -> bool:
+        return file_path.endswith(".json")
+    
+    def _archive_entry(self, stored: StoredObject) -> Optional[Dict]:
+        """استخراج معلومات النسخة الاحتياطية من مسار أرشيف ZIP"""
         try:
-            filename = file_item['name']
+            filename = stored.key.rsplit('/', 1)[-1]
             
             # استخراج التاريخ من اسم الملف
             if filename.startswith('backup_') and filename.endswith('.zip'):
@@ -211,13 +382,11 @@ class BackupManager:
                 
                 return {
                     'filename': filename,
-                    'path': file_path,
-                    'created_at': backup_date,
-                    'size': file_item.get('metadata', {}).get('size', 0),
-                    'formatted_date': backup_date.strftime("%Y-%m-%d %H:%M:%S"),
-                    'formatted_size': self._format_file_size(
-                        file_item.get('metadata', {}).get('size', 0)
-                    )
+                    'path': stored.key,
+                    'created_at': backup_date.isoformat(timespec="seconds"),
+                    'size': stored.size,
+                    'description': "",
+                    'incremental': False,
                 }
                 
         except Exception as e:
@@ -225,6 +394,16 @@ class BackupManager:
             
         return None
     
+    def _format_entry(self, entry: Dict) -> Dict:
+        """نسخة الفهرس بالحقول المعروضة في الواجهة"""
+        backup_date = datetime.fromisoformat(entry['created_at'])
+        return dict(
+            entry,
+            created_at=backup_date,
+            formatted_date=backup_date.strftime("%Y-%m-%d %H:%M:%S"),
+            formatted_size=self._format_file_size(entry['size']),
+        )
+    
     def _format_file_size(self, size_bytes: int) -> str:
         """تنسيق حجم الملف"""
         if size_bytes < 1024:
@@ -245,13 +424,8 @@ class BackupManager:
         Returns:
             رابط التحميل أو None في حالة الخطأ
         """
-        if self.supabase is None:
-            return None
         try:
-            result = self.supabase.storage.from_(self.bucket_name).create_signed_url(
-                file_path, expires_in
-            )
-            return result.get('signedURL')
+            return self.store.url(file_path, expires_in)
             
         except Exception as e:
             self.logger.error(f"خطأ في إنشاء رابط التحميل: {e}")
@@ -259,7 +433,7 @@ class BackupManager:
     
     def delete_backup(self, file_path: str) -> Tuple[bool, str]:
         """
-        حذف نسخة احتياطية من Supabase
+        حذف نسخة احتياطية من مخزن النسخ
         
         Args:
             file_path: مسار الملف
@@ -268,92 +442,275 @@ class BackupManager:
             tuple: (نجح العملية, رسالة النتيجة)
         """
         try:
-            result = self.supabase.storage.from_(self.bucket_name).remove([file_path])
-            
-            if result:
+            if self._is_incremental(file_path):
+                removed_chunks = self.incremental.delete(file_path)
+                self._catalog_remove([file_path])
                 self.logger.info(f"تم حذف النسخة الاحتياطية: {file_path}")
-                return True, "تم حذف النسخة الاحتياطية بنجاح"
-            else:
-                return False, "فشل في حذف النسخة الاحتياطية"
+                return True, f"تم حذف النسخة الاحتياطية بنجاح\nالأجزاء المحذوفة: {removed_chunks}"
+            
+            self.store.delete([file_path])
+            self._catalog_remove([file_path])
+            self.logger.info(f"تم حذف النسخة الاحتياطية: {file_path}")
+            return True, "تم حذف النسخة الاحتياطية بنجاح"
                 
         except Exception as e:
             error_msg = f"خطأ في حذف النسخة الاحتياطية: {e}"
             self.logger.error(error_msg)
             return False, error_msg
     
-    def cleanup_old_backups(self, keep_days: int = 30) -> Tuple[bool, str]:
+    def restore_backup(self, file_path: str,
+                       progress: Optional[UploadProgress] = None) -> Tuple[bool, str]:
         """
-        تنظيف النسخ الاحتياطية القديمة على Supabase
+        استعادة قاعدة البيانات من نسخة على مخزن النسخ (تزايدية أو أرشيف ZIP)
+        
+        تُبنى النسخة في ملف مؤقت ويُتحقق من سلامتها قبل استبدال قاعدة البيانات الحالية
         
         Args:
-            keep_days: عدد الأيام للاحتفاظ بالنسخ
+            file_path: مسار النسخة
+            progress: دالة تقدم إعادة البناء للنسخ التزايدية (البايتات المكتوبة، الحجم الكلي)
             
         Returns:
             tuple: (نجح العملية, رسالة النتيجة)
         """
+        refusal = self._begin_operation(restore=True)
+        if refusal:
+            return False, refusal
         try:
-            backups = self.list_backups()
-            cutoff_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-            cutoff_date = cutoff_date.replace(day=cutoff_date.day - keep_days)
+            return self._restore_backup(file_path, progress)
+        finally:
+            self._end_operation(restore=True)
+    
+    def _restore_backup(self, file_path: str, progress: Optional[UploadProgress]) -> Tuple[bool, str]:
+        """استعادة النسخة بعد حجز العملية (انظر restore_backup)"""
+        from core.database.connection import db_manager
+        
+        restore_path = config.BACKUP_PENDING_DIR / "restore.db"
+        archive_path = config.BACKUP_PENDING_DIR / "restore.zip"
+        try:
+            if self._is_incremental(file_path):
+                self.incremental.restore(file_path, restore_path, progress)
+            else:
+                # الأرشيف يُنزل إلى ملف ويُفك منه، فلا يُحمل كاملاً في الذاكرة
+                self.store.download(file_path, archive_path)
+                with zipfile.ZipFile(archive_path) as zip_file:
+                    with zip_file.open("schools.db") as source, open(restore_path, "wb") as target:
+                        shutil.copyfileobj(source, target)
             
-            deleted_count = 0
-            for backup in backups:
-                if backup['created_at'] < cutoff_date:
-                    success, _ = self.delete_backup(backup['path'])
-                    if success:
-                        deleted_count += 1
+            conn = sqlite3.connect(str(restore_path))
+            try:
+                check = conn.execute("PRAGMA quick_check").fetchone()[0]
+            finally:
+                conn.close()
+            if check != "ok":
+                return False, f"النسخة الاحتياطية تالفة: {check}"
             
-            message = f"تم حذف {deleted_count} نسخة احتياطية قديمة"
-            self.logger.info(message)
-            return True, message
+            if not db_manager.restore_database(str(restore_path)):
+                return False, "فشل في استعادة قاعدة البيانات"
+            self.logger.info(f"تمت استعادة قاعدة البيانات من: {file_path}")
+            return True, "تمت استعادة قاعدة البيانات بنجاح"
             
         except Exception as e:
-            error_msg = f"خطأ في تنظيف النسخ الاحتياطية: {e}"
+            error_msg = f"خطأ في استعادة النسخة الاحتياطية: {e}"
             self.logger.error(error_msg)
             return False, error_msg
+        finally:
+            for path in (restore_path, archive_path):
+                if path.exists():
+                    path.unlink()
     
-    def get_backup_url(self, file_path: str, expires_in: int = 3600) -> Optional[str]:
+    def cleanup_old_backups(self, keep_days: int = 30) -> Tuple[bool, str]:
         """
-        الحصول على رابط تحميل النسخة الاحتياطية من Supabase
+        تنظيف النسخ الاحتياطية القديمة على مخزن النسخ
         
         Args:
-            file_path: مسار الملف
-            expires_in: مدة صلاحية الرابط بالثواني
+            keep_days: عدد الأيام للاحتفاظ بالنسخ
             
         Returns:
-            رابط التحميل أو None في حالة الخطأ
+            tuple: (نجح العملية, رسالة النتيجة)
         """
         try:
-            result = self.supabase.storage.from_(self.bucket_name).create_signed_url(
-                file_path, expires_in
-            )
-            return result.get('signedURL')
+            # النسخ القديمة من الفهرس المحلي دون تصفح المخزن؛ قبل مطابقته لا يُحذف شيء
+            # وتبدأ المطابقة في الخلفية بدلاً من انتظارها في الخيط المستدعي
+            if not self.is_catalog_synced:
+                self.start_reconcile()
+                return False, "قائمة النسخ الاحتياطية لم تُطابق مع المخزن بعد، حاول مرة أخرى بعد قليل"
+            cutoff_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            cutoff_date -= timedelta(days=keep_days)
+            old_paths = [backup['path'] for backup in self.list_backups() if backup['created_at'] < cutoff_date]
+            
+            # الأرشيفات تُحذف دفعة واحدة، والنسخ التزايدية مع أجزائها غير المستخدمة في مرور واحد
+            archives = [path for path in old_paths if not self._is_incremental(path)]
+            manifests = [path for path in old_paths if self._is_incremental(path)]
+            if archives:
+                self.store.delete(archives)
+            if manifests:
+                self.incremental.delete_many(manifests)
+            self._catalog_remove(old_paths)
+            deleted_count = len(old_paths)
+            
+            message = f"تم حذف {deleted_count} نسخة احتياطية قديمة"
+            self.logger.info(message)
+            return True, message
             
         except Exception as e:
-            self.logger.error(f"خطأ في إنشاء رابط التحميل: {e}")
-            return None
+            error_msg = f"خطأ في تنظيف النسخ الاحتياطية: {e}"
+            self.logger.error(error_msg)
+            return False, error_msg
 
 
-# إنشاء مثيل مشترك من مدير النسخ الاحتياطية - تجنب None
-backup_manager = None
+class BackupService:
+    """وصول كسول إلى مدير النسخ الاحتياطية مع حالة جاهزية صريحة
 
-def get_backup_manager():
-    """الحصول على مثيل من مدير النسخ الاحتياطية مع إعادة المحاولة"""
-    global backup_manager
-    if backup_manager is None:
+    المدير الفعلي (ومعه مخزن النسخ ومكتبته) يُنشأ دائماً في خيط خلفي، عند
+    استدعاء start() أو عند أول استخدام. عمليات النسخ لا تنتظر التهيئة: قبل
+    جاهزية الخدمة أو عند فشلها تعيد نتيجة فشل برسالة بدلاً من رمي استثناء.
+    """
+
+    NOT_STARTED = "not_started"
+    INITIALIZING = "initializing"
+    READY = "ready"
+    FAILED = "failed"
+
+    STATUS_TEXTS = {
+        NOT_STARTED: "النسخ الاحتياطي: لم يبدأ الاتصال",
+        INITIALIZING: "النسخ الاحتياطي: جاري الاتصال...",
+        READY: "النسخ الاحتياطي: جاهز",
+        FAILED: "النسخ الاحتياطي: غير متاح",
+    }
+
+    def __init__(self, factory=BackupManager):
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._state = self.NOT_STARTED
+        self._manager = None
+        self._error = ""
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    @property
+    def error(self) -> str:
+        """رسالة فشل التهيئة الأخيرة"""
+        return self._error
+
+    @property
+    def is_ready(self) -> bool:
+        return self._state == self.READY
+
+    def status_text(self) -> str:
+        """وصف الحالة لعرضه في الواجهة"""
+        text = self.STATUS_TEXTS[self._state]
+        if self._state == self.FAILED and self._error:
+            text = f"{text} ({self._error})"
+        return text
+
+    def start(self) -> bool:
+        """بدء التهيئة في خيط خلفي إن لم تبدأ بعد أو فشلت سابقاً (إعادة المحاولة)
+
+        Returns:
+            True إن بدأت تهيئة جديدة
+        """
+        return self._start((self.NOT_STARTED, self.FAILED))
+
+    def _start(self, states: Tuple[str, ...]) -> bool:
+        """بدء التهيئة في خيط خلفي إن كانت الحالة الحالية من states"""
+        with self._lock:
+            if self._state not in states:
+                return False
+            self._state = self.INITIALIZING
+            self._error = ""
+            self._done.clear()
+        threading.Thread(target=self._initialize, name="backup-service-init", daemon=True).start()
+        return True
+
+    def _initialize(self):
         try:
-            backup_manager = BackupManager()
+            manager = self._factory()
         except Exception as e:
-            import logging
             logging.error(f"فشل في تهيئة مدير النسخ الاحتياطية: {e}")
-            # إرجاع كائن وهمي بدلاً من None لتجنب NoneType errors
-            class DummyBackupManager:
-                def create_backup(self, description=""):
-                    return False, f"فشل في تهيئة النظام: {e}"
-                def list_backups(self):
-                    return []
-            backup_manager = DummyBackupManager()
-    return backup_manager
-
-# تهيئة فورية
-backup_manager = get_backup_manager()
+            self._manager, self._error, self._state = None, str(e), self.FAILED
+        else:
+            self._manager, self._state = manager, self.READY
+            logging.info("خدمة النسخ الاحتياطية جاهزة")
+        finally:
+            self._done.set()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[BackupManager]:
+        """انتظار المدير الفعلي حتى المهلة (تبدأ التهيئة في الخلفية إن لم تبدأ)
+
+        للسكربتات والخيوط العاملة فقط؛ خيط الواجهة يستخدم العمليات مباشرة ولا ينتظر
+
+        Returns:
+            المدير، أو None إن فشلت التهيئة أو انتهت المهلة
+        """
+        self._start((self.NOT_STARTED,))
+        self._done.wait(timeout)
+        return self._manager
+
+    def _ready_manager(self) -> Optional[BackupManager]:
+        """المدير إن كانت الخدمة جاهزة، وإلا تبدأ التهيئة في الخلفية دون انتظار"""
+        if not self.is_ready:
+            self._start((self.NOT_STARTED,))
+            return None
+        return self._manager
+
+    def _unavailable_message(self) -> str:
+        if self._state == self.FAILED:
+            return f"خدمة النسخ الاحتياطية غير متاحة: {self._error}"
+        return "خدمة النسخ الاحتياطية قيد التهيئة، حاول مرة أخرى بعد قليل"
+
+    def create_backup(self, description: str = "",
+                      progress: Optional[ProgressCallback] = None,
+                      upload_progress: Optional[UploadProgress] = None,
+                      kind: str = "manual") -> Tuple[bool, str]:
+        manager = self._ready_manager()
+        if manager is None:
+            return False, self._unavailable_message()
+        return manager.create_backup(description, progress, upload_progress, kind)
+
+    def list_backups(self) -> List[Dict]:
+        manager = self._ready_manager()
+        return manager.list_backups() if manager else []
+
+    def get_backup_url(self, file_path: str, expires_in: int = 3600) -> Optional[str]:
+        manager = self._ready_manager()
+        return manager.get_backup_url(file_path, expires_in) if manager else None
+
+    def delete_backup(self, file_path: str) -> Tuple[bool, str]:
+        manager = self._ready_manager()
+        if manager is None:
+            return False, self._unavailable_message()
+        return manager.delete_backup(file_path)
+
+    def restore_backup(self, file_path: str,
+                       progress: Optional[UploadProgress] = None) -> Tuple[bool, str]:
+        manager = self._ready_manager()
+        if manager is None:
+            return False, self._unavailable_message()
+        return manager.restore_backup(file_path, progress)
+
+    def cleanup_old_backups(self, keep_days: int = 30) -> Tuple[bool, str]:
+        manager = self._ready_manager()
+        if manager is None:
+            return False, self._unavailable_message()
+        return manager.cleanup_old_backups(keep_days)
+
+    def __getattr__(self, name):
+        # بقية خصائص المدير (مثل store) تُقرأ من المدير الفعلي بعد تهيئته
+        if name.startswith("_"):
+            raise AttributeError(name)
+        manager = self._ready_manager()
+        if manager is None:
+            raise AttributeError(f"{name}: {self._unavailable_message()}")
+        return getattr(manager, name)
+
+
+# الخدمة المشتركة: لا اتصال بمخزن النسخ حتى أول استخدام أو استدعاء start()
+backup_manager = BackupService()
+
+
+def get_backup_manager() -> Optional[BackupManager]:
+    """الحصول على مدير النسخ الاحتياطية الفعلي (None إن فشلت تهيئته)"""
+    return backup_manager.get()
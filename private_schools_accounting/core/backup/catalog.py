@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+فهرس محلي للنسخ الاحتياطية
+قائمة النسخ تُقرأ من ملف JSON محلي يُحدّث عند إنشاء كل نسخة وحذفها، بدلاً من تصفح
+مجلدات المخزن في كل مرة تُفتح فيها صفحة النسخ أو يُنفذ التنظيف. المطابقة مع المخزن
+(reconcile) تجري في الخلفية وتستبدل محتوى الفهرس بما هو موجود فعلاً
+
+الفهرس خارج قاعدة البيانات عمداً: استعادة نسخة قديمة لا تعيده إلى حالة قديمة
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+CATALOG_FORMAT = 1
+
+
+class BackupCatalog:
+    """فهرس النسخ على مخزن واحد
+
+    كل نسخة قاموس بالحقول: path, filename, created_at (ISO), size, description, incremental
+
+    Args:
+        path: ملف الفهرس
+        store_id: معرف المخزن؛ فهرس محفوظ لمخزن آخر يُعامل كفهرس فارغ يحتاج مطابقة
+    """
+
+    def __init__(self, path: Union[str, Path], store_id: str):
+        self.path = Path(path)
+        self.store_id = store_id
+        self._lock = threading.Lock()
+        self._backups: Dict[str, dict] = {}
+        self._reconciled_at: Optional[str] = None
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logging.warning(f"تجاهل فهرس نسخ احتياطية تالف {self.path}: {e}")
+            return
+        if data.get("format") != CATALOG_FORMAT or data.get("store") != self.store_id:
+            return
+        self._backups = data.get("backups", {})
+        self._reconciled_at = data.get("reconciled_at")
+
+    def _save(self):
+        data = {
+            "format": CATALOG_FORMAT,
+            "store": self.store_id,
+            "reconciled_at": self._reconciled_at,
+            "backups": self._backups,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        partial = self.path.with_name(self.path.name + ".part")
+        partial.write_text(json.dumps(data, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(partial, self.path)
+
+    @property
+    def reconciled_at(self) -> Optional[str]:
+        """وقت آخر مطابقة مع المخزن (None إن لم يُطابق بعد)"""
+        return self._reconciled_at
+
+    def entries(self) -> List[dict]:
+        """النسخ في الفهرس، الأحدث أولاً"""
+        with self._lock:
+            backups = [dict(entry) for entry in self._backups.values()]
+        backups.sort(key=lambda entry: entry["created_at"], reverse=True)
+        return backups
+
+    def add(self, entry: dict):
+        with self._lock:
+            self._backups[entry["path"]] = dict(entry)
+            self._save()
+
+    def remove(self, paths: Iterable[str]):
+        with self._lock:
+            for path in paths:
+                self._backups.pop(path, None)
+            self._save()
+
+    def replace(self, entries: Iterable[dict]):
+        """استبدال محتوى الفهرس بنتيجة مطابقة كاملة مع المخزن"""
+        with self._lock:
+            self._backups = {entry["path"]: dict(entry) for entry in entries}
+            self._reconciled_at = datetime.now().isoformat(timespec="seconds")
+            self._save()
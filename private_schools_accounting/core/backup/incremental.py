@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+النسخ الاحتياطي التزايدي بعناوين المحتوى
+لقطة قاعدة البيانات تُقسم إلى أجزاء ثابتة الحجم (مضاعفات صفحة SQLite)، ويُخزن كل جزء
+مضغوطاً باسم بصمته SHA-256 مرة واحدة فقط. كل نسخة ملف بيان (manifest) صغير يسرد
+بصمات أجزائها بالترتيب، فلا يُرفع في النسخة اليومية إلا الأجزاء التي تغيرت صفحاتها
+
+التخطيط على المخزن:
+    chunks/ab/abcdef...                       جزء مضغوط بـ zlib
+    manual/2025/01/backup_20250101_120000.json  بيان النسخة في مجلد نوعها (daily/weekly/manual)
+
+نسخ البيانات محفوظة محلياً أيضاً، فتُعرف الأجزاء المرفوعة سابقاً دون استعلام المخزن
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import zlib
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Set, Tuple, Union
+
+import config
+from core.backup.storage import ObjectStore
+
+# تُستدعى بعد كل جزء بـ (البايتات المعالجة، الحجم الكلي)
+ChunkProgress = Callable[[int, int], None]
+
+MANIFEST_FORMAT = 1
+CHUNKS_PREFIX = "chunks"
+
+
+@dataclass(frozen=True)
+class Manifest:
+    """بيان نسخة تزايدية: بصمات أجزاء قاعدة البيانات بالترتيب ومعلومات النسخة"""
+    name: str
+    created_at: str
+    description: str
+    app_version: str
+    schema_version: int
+    database_size: int
+    chunk_size: int
+    chunks: Tuple[str, ...]
+    # نوع النسخة ومجلدها على المخزن: daily أو weekly أو manual
+    kind: str = "manual"
+    # حجم الأجزاء الجديدة التي رُفعت مع هذه النسخة (بعد الضغط)
+    uploaded_size: int = 0
+    format: int = MANIFEST_FORMAT
+
+    @property
+    def key(self) -> str:
+        created = datetime.fromisoformat(self.created_at)
+        return f"{self.kind}/{created.strftime('%Y/%m')}/{self.name}.json"
+
+    def to_json(self) -> bytes:
+        data = asdict(self)
+        data["chunks"] = list(self.chunks)
+        return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+    @classmethod
+    def from_json(cls, raw: bytes) -> "Manifest":
+        data = json.loads(raw.decode("utf-8"))
+        if data.get("format") != MANIFEST_FORMAT:
+            raise ValueError(f"صيغة بيان غير مدعومة: {data.get('format')}")
+        data["chunks"] = tuple(data["chunks"])
+        return cls(**data)
+
+
+def chunk_key(digest: str) -> str:
+    return f"{CHUNKS_PREFIX}/{digest[:2]}/{digest}"
+
+
+def iter_chunks(path: Union[str, Path], chunk_size: int) -> Iterator[Tuple[str, bytes]]:
+    """أجزاء الملف مع بصماتها، جزءاً جزءاً دون تحميل الملف كاملاً"""
+    with open(path, "rb") as source:
+        while True:
+            data = source.read(chunk_size)
+            if not data:
+                return
+            yield hashlib.sha256(data).hexdigest(), data
+
+
+class IncrementalBackupStore:
+    """كتابة النسخ التزايدية وقراءتها وحذفها على مخزن كائنات
+
+    Args:
+        store: المخزن البعيد
+        cache_dir: مجلد النسخ المحلية من البيانات (config.BACKUP_MANIFEST_CACHE_DIR افتراضياً)
+    """
+
+    def __init__(self, store: ObjectStore, cache_dir: Optional[Union[str, Path]] = None):
+        self.store = store
+        self.cache_dir = Path(cache_dir or config.BACKUP_MANIFEST_CACHE_DIR)
+        # الكتابة والحذف متسلسلان: نسخة قيد الكتابة تعتمد على أجزاء موجودة لا يشير إليها
+        # بيانها بعد، فالحذف المتزامن كان سيعدها غير مستخدمة ويحذفها
+        self._lock = threading.Lock()
+
+    def _cache_path(self, key: str) -> Path:
+        return self.cache_dir.joinpath(*key.split("/"))
+
+    def _cache(self, manifest: Manifest):
+        path = self._cache_path(manifest.key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(manifest.to_json())
+
+    def cached_manifests(self) -> List[Manifest]:
+        manifests = []
+        for path in sorted(self.cache_dir.rglob("*.json")):
+            try:
+                manifests.append(Manifest.from_json(path.read_bytes()))
+            except (OSError, ValueError, TypeError) as e:
+                logging.warning(f"تجاهل بيان نسخة محلي تالف {path}: {e}")
+        return manifests
+
+    def known_chunks(self) -> Set[str]:
+        """بصمات الأجزاء الموجودة على المخزن حسب البيانات المحفوظة محلياً"""
+        return {digest for manifest in self.cached_manifests() for digest in manifest.chunks}
+
+    def write(self, snapshot_path: Union[str, Path], name: str, description: str = "",
+              schema_version: int = 0, progress: Optional[ChunkProgress] = None,
+              chunk_size: Optional[int] = None, kind: str = "manual") -> Manifest:
+        """رفع لقطة كنسخة تزايدية: الأجزاء الجديدة أولاً ثم البيان
+
+        البيان يُكتب آخراً، فالنسخة لا تظهر إلا بعد وجود جميع أجزائها
+        """
+        with self._lock:
+            chunk_size = chunk_size or config.BACKUP_CHUNK_SIZE
+            size = os.path.getsize(snapshot_path)
+            known = self.known_chunks()
+            digests, uploaded_size, done = [], 0, 0
+
+            for digest, data in iter_chunks(snapshot_path, chunk_size):
+                if digest not in known:
+                    compressed = zlib.compress(data)
+                    self.store.put(chunk_key(digest), compressed)
+                    known.add(digest)
+                    uploaded_size += len(compressed)
+                digests.append(digest)
+                done += len(data)
+                if progress is not None:
+                    progress(done, size)
+
+            manifest = Manifest(
+                name=name,
+                created_at=datetime.now().isoformat(timespec="seconds"),
+                description=description,
+                app_version=config.APP_VERSION,
+                schema_version=schema_version,
+                database_size=size,
+                chunk_size=chunk_size,
+                chunks=tuple(digests),
+                kind=kind,
+                uploaded_size=uploaded_size,
+            )
+            self.store.put(manifest.key, manifest.to_json())
+            self._cache(manifest)
+            logging.info(
+                f"تم رفع النسخة التزايدية {name}: {len(digests)} جزء، "
+                f"الجديد منها {uploaded_size} بايت من أصل {size}"
+            )
+            return manifest
+
+    def list_keys(self) -> List[str]:
+        """مسارات البيانات على المخزن"""
+        return [stored.key for kind in config.BACKUP_KINDS
+                for stored in self.store.list(kind) if stored.key.endswith(".json")]
+
+    def read_manifest(self, key: str) -> Manifest:
+        """البيان من النسخة المحلية إن وُجدت، وإلا من المخزن (ويُحفظ محلياً)"""
+        path = self._cache_path(key)
+        if path.exists():
+            return Manifest.from_json(path.read_bytes())
+        manifest = Manifest.from_json(self.store.get(key))
+        self._cache(manifest)
+        return manifest
+
+    def restore(self, key: str, target_path: Union[str, Path],
+                progress: Optional[ChunkProgress] = None) -> Manifest:
+        """إعادة بناء ملف قاعدة البيانات من أجزاء النسخة key مع التحقق من بصمة كل جزء"""
+        manifest = self.read_manifest(key)
+        target_path = Path(target_path)
+        partial_path = target_path.with_name(target_path.name + ".part")
+        done = 0
+        try:
+            with open(partial_path, "wb") as target:
+                for digest in manifest.chunks:
+                    data = zlib.decompress(self.store.get(chunk_key(digest)))
+                    if hashlib.sha256(data).hexdigest() != digest:
+                        raise ValueError(f"جزء تالف في النسخة {manifest.name}: {digest}")
+                    target.write(data)
+                    done += len(data)
+                    if progress is not None:
+                        progress(done, manifest.database_size)
+            if done != manifest.database_size:
+                raise ValueError(f"حجم النسخة المستعادة {done} لا يطابق البيان {manifest.database_size}")
+            os.replace(partial_path, target_path)
+        finally:
+            if partial_path.exists():
+                partial_path.unlink()
+        return manifest
+
+    def delete(self, key: str) -> int:
+        """حذف نسخة والأجزاء التي لا تشير إليها أي نسخة أخرى
+
+        Returns:
+            عدد الأجزاء المحذوفة
+        """
+        return self.delete_many([key])
+
+    def delete_many(self, keys: List[str]) -> int:
+        """حذف عدة نسخ ثم الأجزاء غير المستخدمة في مرور واحد على البيانات المتبقية
+
+        Returns:
+            عدد الأجزاء المحذوفة
+        """
+        with self._lock:
+            candidates = set()
+            for key in keys:
+                candidates.update(self.read_manifest(key).chunks)
+            self.store.delete(keys)
+            for key in keys:
+                cache_path = self._cache_path(key)
+                if cache_path.exists():
+                    cache_path.unlink()
+
+            # الأجزاء المشتركة تُحسب من جميع البيانات على المخزن لا من النسخ المحلية فقط
+            referenced = set()
+            for other_key in self.list_keys():
+                referenced.update(self.read_manifest(other_key).chunks)
+            orphaned = sorted(candidates - referenced)
+            self.store.delete(chunk_key(digest) for digest in orphaned)
+            logging.info(f"تم حذف {len(keys)} نسخة تزايدية و{len(orphaned)} جزء غير مستخدم")
+            return len(orphaned)
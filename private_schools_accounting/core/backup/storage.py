@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+مخازن النسخ الاحتياطية
+واجهة واحدة (put/get/list/delete/url مع وجهة رفع قابلة للاستئناف) لمسارات نصية مثل
+"manual/2025/01/backup_20250101_120000.json"، ولها ثلاثة تنفيذات يُختار منها في config.py:
+
+    local     مجلد محلي أو مجلد شبكة (NAS)، يعمل دون اتصال بالإنترنت
+    s3        أي تخزين متوافق مع S3 (AWS أو MinIO أو Wasabi...) عبر مكتبة boto3
+    supabase  Supabase Storage
+
+مكتبات التخزين السحابي تُستورد عند إنشاء المخزن فقط لأنها ثقيلة ولا تلزم عند بدء التشغيل
+"""
+
+import json
+import os
+import shutil
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional, Union
+
+import config
+from core.backup.upload import LocalUploadTarget, SupabaseUploadTarget, UploadExpired, UploadTarget
+
+
+@dataclass(frozen=True)
+class StoredObject:
+    """كائن على المخزن: مساره وحجمه بالبايت"""
+    key: str
+    size: int = 0
+
+
+class ObjectStore(ABC):
+    """مخزن كائنات بمسارات نصية مفصولة بـ /"""
+
+    # اسم المخزن في الرسائل
+    title = ""
+
+    @property
+    @abstractmethod
+    def identity(self) -> str:
+        """معرف ثابت لموقع المخزن (يربط الفهرس المحلي بمخزنه)"""
+
+    @abstractmethod
+    def put(self, key: str, data: bytes):
+        """كتابة الكائن key (يستبدل الموجود)"""
+
+    @abstractmethod
+    def get(self, key: str) -> bytes:
+        """قراءة الكائن key (يرمي FileNotFoundError إن لم يوجد)"""
+
+    def download(self, key: str, path: Union[str, Path]):
+        """تنزيل الكائن key إلى الملف path (يرمي FileNotFoundError إن لم يوجد)
+
+        للكائنات الكبيرة كأرشيفات ZIP: المخازن تكتبه إلى الملف تدريجياً دون تحميله في الذاكرة
+        """
+        Path(path).write_bytes(self.get(key))
+
+    @abstractmethod
+    def list(self, prefix: str) -> List[StoredObject]:
+        """جميع الكائنات تحت prefix بما فيها المجلدات الفرعية، مرتبة بالمسار"""
+
+    @abstractmethod
+    def delete(self, keys: Iterable[str]):
+        """حذف الكائنات (المسارات غير الموجودة تُتجاهل)"""
+
+    def url(self, key: str, expires_in: int = 3600) -> Optional[str]:
+        """رابط تحميل الكائن، أو None إن لم يدعمه المخزن"""
+        return None
+
+    @abstractmethod
+    def upload_target(self) -> UploadTarget:
+        """وجهة رفع الملفات الكبيرة على أجزاء قابلة للاستئناف"""
+
+
+class LocalObjectStore(ObjectStore):
+    """مخزن كائنات في مجلد محلي أو مجلد شبكة: كل مسار ملف تحت root"""
+
+    title = "المجلد المحلي"
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+
+    @property
+    def identity(self) -> str:
+        return f"local:{self.root.resolve()}"
+
+    def _path(self, key: str) -> Path:
+        return self.root.joinpath(*key.split("/"))
+
+    def put(self, key: str, data: bytes):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(path.name + ".part")
+        partial.write_bytes(data)
+        os.replace(partial, path)
+
+    def get(self, key: str) -> bytes:
+        return self._path(key).read_bytes()
+
+    def download(self, key: str, path: Union[str, Path]):
+        shutil.copyfile(self._path(key), path)
+
+    def list(self, prefix: str) -> List[StoredObject]:
+        base = self._path(prefix)
+        if not base.is_dir():
+            return []
+        objects = []
+        for path in base.rglob("*"):
+            if path.is_file() and not path.name.endswith(".part"):
+                objects.append(StoredObject(path.relative_to(self.root).as_posix(), path.stat().st_size))
+        return sorted(objects, key=lambda stored: stored.key)
+
+    def delete(self, keys: Iterable[str]):
+        for key in keys:
+            path = self._path(key)
+            if path.exists():
+                path.unlink()
+
+    def url(self, key: str, expires_in: int = 3600) -> Optional[str]:
+        path = self._path(key)
+        return path.resolve().as_uri() if path.exists() else None
+
+    def upload_target(self) -> UploadTarget:
+        return LocalUploadTarget(self.root)
+
+
+class SupabaseObjectStore(ObjectStore):
+    """مخزن كائنات على بكت في Supabase Storage
+
+    القوائم تُجلب صفحة صفحة حتى آخرها، فلا تُقتطع عند حد الصفحة الواحدة
+    """
+
+    title = "Supabase Storage"
+    PAGE_SIZE = 1000
+
+    def __init__(self, client, bucket_name: str, url: str = "", key: str = ""):
+        self.client = client
+        self.bucket_name = bucket_name
+        self.bucket = client.storage.from_(bucket_name)
+        self._url, self._key = url, key
+
+    @property
+    def identity(self) -> str:
+        return f"supabase:{self._url}/{self.bucket_name}"
+
+    @classmethod
+    def from_config(cls) -> "SupabaseObjectStore":
+        try:
+            from supabase import create_client  # type: ignore
+        except ImportError:
+            raise Exception("مكتبة Supabase غير مثبتة. يرجى تثبيتها باستخدام: pip install supabase")
+        try:
+            client = create_client(config.SUPABASE_URL, config.SUPABASE_KEY)
+        except Exception as e:
+            raise Exception(f"فشل في الاتصال بـ Supabase: {e}")
+        return cls(client, config.SUPABASE_BUCKET, config.SUPABASE_URL, config.SUPABASE_KEY)
+
+    def put(self, key: str, data: bytes):
+        self.bucket.upload(key, data, {"content-type": "application/octet-stream", "x-upsert": "true"})
+
+    def get(self, key: str) -> bytes:
+        try:
+            return self.bucket.download(key)
+        except Exception as e:
+            raise FileNotFoundError(f"{key}: {e}") from e
+
+    def download(self, key: str, path: Union[str, Path]):
+        # مكتبة supabase تعيد الكائن كاملاً في الذاكرة، فيُنزل مباشرة من واجهة التخزين
+        import httpx
+        headers = {"Authorization": f"Bearer {self._key}", "apikey": self._key}
+        endpoint = f"{self._url.rstrip('/')}/storage/v1/object/{self.bucket_name}/{key}"
+        with httpx.stream("GET", endpoint, headers=headers, timeout=60) as response:
+            # Supabase يعيد 400 للكائن غير الموجود
+            if response.status_code in (400, 404):
+                raise FileNotFoundError(key)
+            response.raise_for_status()
+            with open(path, "wb") as target:
+                for data in response.iter_bytes(config.BACKUP_UPLOAD_CHUNK_SIZE):
+                    target.write(data)
+
+    def _list_folder(self, folder: str) -> List[dict]:
+        items, offset = [], 0
+        while True:
+            page = self.bucket.list(folder, {"limit": self.PAGE_SIZE, "offset": offset,
+                                             "sortBy": {"column": "name", "order": "asc"}})
+            items.extend(page)
+            if len(page) < self.PAGE_SIZE:
+                return items
+            offset += self.PAGE_SIZE
+
+    def list(self, prefix: str) -> List[StoredObject]:
+        objects, folders = [], [prefix.strip("/")]
+        while folders:
+            folder = folders.pop()
+            for item in self._list_folder(folder):
+                path = f"{folder}/{item['name']}"
+                # المجلدات في Supabase عناصر بدون id
+                if item.get("id") is None:
+                    folders.append(path)
+                else:
+                    objects.append(StoredObject(path, (item.get("metadata") or {}).get("size", 0)))
+        return sorted(objects, key=lambda stored: stored.key)
+
+    def delete(self, keys: Iterable[str]):
+        keys = list(keys)
+        if keys:
+            self.bucket.remove(keys)
+
+    def url(self, key: str, expires_in: int = 3600) -> Optional[str]:
+        return self.bucket.create_signed_url(key, expires_in).get("signedURL")
+
+    def upload_target(self) -> UploadTarget:
+        return SupabaseUploadTarget(self._url, self._key, self.bucket_name)
+
+
+class S3UploadTarget(UploadTarget):
+    """رفع قابل للاستئناف بالرفع متعدد الأجزاء في S3
+
+    معرف الرفع يحمل المسار ورقم الرفع، والإزاحة مجموع أحجام الأجزاء المستلمة على الخادم.
+    S3 يشترط 5 ميجابايت على الأقل لكل جزء عدا الأخير
+    """
+
+    def __init__(self, client, bucket_name: str):
+        self.client = client
+        self.bucket_name = bucket_name
+        self._parts = {}
+
+    def start(self, key: str, size: int) -> str:
+        response = self.client.create_multipart_upload(Bucket=self.bucket_name, Key=key,
+                                                       ContentType="application/zip")
+        handle = json.dumps([key, response["UploadId"]])
+        self._parts[handle] = []
+        return handle
+
+    def offset(self, handle: str) -> int:
+        key, upload_id = json.loads(handle)
+        parts = []
+        try:
+            paginator = self.client.get_paginator("list_parts")
+            for page in paginator.paginate(Bucket=self.bucket_name, Key=key, UploadId=upload_id):
+                parts.extend(page.get("Parts", []))
+        except self.client.exceptions.NoSuchUpload:
+            raise UploadExpired(handle)
+        self._parts[handle] = [{"PartNumber": part["PartNumber"], "ETag": part["ETag"], "Size": part["Size"]}
+                               for part in parts]
+        return sum(part["Size"] for part in parts)
+
+    def append(self, handle: str, offset: int, data: bytes) -> int:
+        key, upload_id = json.loads(handle)
+        parts = self._parts.setdefault(handle, [])
+        part_number = len(parts) + 1
+        response = self.client.upload_part(Bucket=self.bucket_name, Key=key, UploadId=upload_id,
+                                           PartNumber=part_number, Body=data)
+        parts.append({"PartNumber": part_number, "ETag": response["ETag"], "Size": len(data)})
+        return offset + len(data)
+
+    def finish(self, handle: str, key: str):
+        _, upload_id = json.loads(handle)
+        parts = [{"PartNumber": part["PartNumber"], "ETag": part["ETag"]} for part in self._parts.pop(handle, [])]
+        self.client.complete_multipart_upload(Bucket=self.bucket_name, Key=key, UploadId=upload_id,
+                                              MultipartUpload={"Parts": parts})
+
+
+class S3ObjectStore(ObjectStore):
+    """مخزن كائنات على بكت متوافق مع S3"""
+
+    title = "S3"
+
+    def __init__(self, client, bucket_name: str):
+        self.client = client
+        self.bucket_name = bucket_name
+
+    @property
+    def identity(self) -> str:
+        return f"s3:{self.client.meta.endpoint_url}/{self.bucket_name}"
+
+    @classmethod
+    def from_config(cls) -> "S3ObjectStore":
+        try:
+            import boto3  # type: ignore
+        except ImportError:
+            raise Exception("مكتبة boto3 غير مثبتة. يرجى تثبيتها باستخدام: pip install boto3")
+        client = boto3.client(
+            "s3",
+            endpoint_url=config.BACKUP_S3_ENDPOINT_URL or None,
+            region_name=config.BACKUP_S3_REGION or None,
+            aws_access_key_id=config.BACKUP_S3_ACCESS_KEY or None,
+            aws_secret_access_key=config.BACKUP_S3_SECRET_KEY or None,
+        )
+        return cls(client, config.BACKUP_S3_BUCKET)
+
+    def put(self, key: str, data: bytes):
+        self.client.put_object(Bucket=self.bucket_name, Key=key, Body=data)
+
+    def get(self, key: str) -> bytes:
+        try:
+            return self.client.get_object(Bucket=self.bucket_name, Key=key)["Body"].read()
+        except self.client.exceptions.NoSuchKey as e:
+            raise FileNotFoundError(key) from e
+
+    def download(self, key: str, path: Union[str, Path]):
+        try:
+            self.client.download_file(self.bucket_name, key, str(path))
+        except self.client.exceptions.ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                raise FileNotFoundError(key) from e
+            raise
+
+    def list(self, prefix: str) -> List[StoredObject]:
+        objects = []
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=f"{prefix.strip('/')}/"):
+            objects.extend(StoredObject(item["Key"], item["Size"]) for item in page.get("Contents", []))
+        return sorted(objects, key=lambda stored: stored.key)
+
+    def delete(self, keys: Iterable[str]):
+        keys = list(keys)
+        # S3 يحذف 1000 كائن على الأكثر في الطلب الواحد
+        for start in range(0, len(keys), 1000):
+            self.client.delete_objects(Bucket=self.bucket_name, Delete={
+                "Objects": [{"Key": key} for key in keys[start:start + 1000]], "Quiet": True,
+            })
+
+    def url(self, key: str, expires_in: int = 3600) -> Optional[str]:
+        return self.client.generate_presigned_url(
+            "get_object", Params={"Bucket": self.bucket_name, "Key": key}, ExpiresIn=expires_in
+        )
+
+    def upload_target(self) -> UploadTarget:
+        return S3UploadTarget(self.client, self.bucket_name)
+
+
+# أسماء المخازن في config.BACKUP_STORAGE_BACKEND
+BACKENDS = {
+    "local": LocalObjectStore,
+    "s3": S3ObjectStore,
+    "supabase": SupabaseObjectStore,
+}
+
+
+def _backend_class(backend: Optional[str] = None):
+    backend = backend or config.BACKUP_STORAGE_BACKEND
+    try:
+        return BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"مخزن نسخ احتياطية غير معروف: {backend}") from None
+
+
+def backend_title(backend: Optional[str] = None) -> str:
+    """اسم المخزن المحدد في config.BACKUP_STORAGE_BACKEND للعرض (دون إنشائه)"""
+    return _backend_class(backend).title
+
+
+def create_store(backend: Optional[str] = None) -> ObjectStore:
+    """إنشاء مخزن النسخ الاحتياطية المحدد في config.BACKUP_STORAGE_BACKEND"""
+    store_class = _backend_class(backend)
+    if store_class is LocalObjectStore:
+        return LocalObjectStore(config.BACKUP_LOCAL_ROOT)
+    return store_class.from_config()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+رفع النسخ الاحتياطية على أجزاء قابلة للاستئناف
+الملف يُقرأ ويُرفع جزءاً جزءاً فلا يتجاوز استهلاك الذاكرة حجم جزء واحد مهما كبرت قاعدة البيانات،
+وحالة الرفع تُحفظ بجوار الأرشيف فيستأنف الرفع الفاشل من آخر بايت استلمه الخادم بدلاً من البداية
+
+وجهة الرفع تتبع نموذج tus: بدء رفع بطول معروف، ثم الاستعلام عن الإزاحة المستلمة،
+ثم إلحاق الأجزاء عند تلك الإزاحة، ثم الإنهاء
+"""
+
+import base64
+import json
+import logging
+import os
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+import config
+
+# تُستدعى بعد كل جزء بـ (البايتات المرفوعة، الحجم الكلي)
+UploadProgress = Callable[[int, int], None]
+
+STATE_SUFFIX = ".upload.json"
+
+
+class UploadExpired(Exception):
+    """انتهت صلاحية الرفع الجاري على الخادم ويجب بدؤه من جديد"""
+
+
+class UploadTarget(ABC):
+    """وجهة رفع بأجزاء قابلة للاستئناف"""
+
+    @abstractmethod
+    def start(self, key: str, size: int) -> str:
+        """بدء رفع جديد للمسار key بحجم size
+
+        Returns:
+            معرف الرفع المستخدم في بقية العمليات (يُحفظ للاستئناف)
+        """
+
+    @abstractmethod
+    def offset(self, handle: str) -> int:
+        """عدد البايتات التي استلمها الخادم (يرمي UploadExpired إن لم يعد الرفع موجوداً)"""
+
+    @abstractmethod
+    def append(self, handle: str, offset: int, data: bytes) -> int:
+        """إلحاق data عند الإزاحة offset
+
+        Returns:
+            الإزاحة الجديدة
+        """
+
+    def finish(self, handle: str, key: str):
+        """إنهاء الرفع بعد استلام جميع البايتات"""
+
+
+class LocalUploadTarget(UploadTarget):
+    """وجهة رفع إلى مجلد محلي: الأجزاء تُلحق بملف جزئي يُعاد تسميته عند الاكتمال
+
+    تُستخدم بديلاً محلياً عن التخزين السحابي في الاختبارات
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+        self._uploads = self.root / ".uploads"
+
+    def _partial(self, handle: str) -> Path:
+        return self._uploads / handle
+
+    def start(self, key: str, size: int) -> str:
+        self._uploads.mkdir(parents=True, exist_ok=True)
+        handle = uuid.uuid4().hex
+        self._partial(handle).touch()
+        return handle
+
+    def offset(self, handle: str) -> int:
+        partial = self._partial(handle)
+        if not partial.exists():
+            raise UploadExpired(handle)
+        return partial.stat().st_size
+
+    def append(self, handle: str, offset: int, data: bytes) -> int:
+        with open(self._partial(handle), "r+b") as partial:
+            # ما بعد offset بقايا كتابة لم تكتمل
+            partial.truncate(offset)
+            partial.seek(offset)
+            partial.write(data)
+            return partial.tell()
+
+    def finish(self, handle: str, key: str):
+        target = self.root / key
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(self._partial(handle), target)
+
+
+class SupabaseUploadTarget(UploadTarget):
+    """رفع قابل للاستئناف إلى Supabase Storage عبر بروتوكول tus
+
+    Supabase يقبل أجزاء بحجم 6 ميجابايت بالضبط (عدا الأخير)، ورابط الرفع صالح لمدة 24 ساعة
+    """
+
+    TUS_VERSION = "1.0.0"
+
+    def __init__(self, url: str, key: str, bucket: str, timeout: float = 60):
+        import httpx  # يأتي مع مكتبة supabase، ويُستورد هنا حتى لا يُحمل عند بدء التشغيل
+        self.endpoint = f"{url.rstrip('/')}/storage/v1/upload/resumable"
+        self.bucket = bucket
+        self.client = httpx.Client(timeout=timeout, headers={
+            "Authorization": f"Bearer {key}",
+            "apikey": key,
+            "Tus-Resumable": self.TUS_VERSION,
+        })
+
+    @staticmethod
+    def _metadata(**values: str) -> str:
+        return ",".join(f"{name} {base64.b64encode(value.encode('utf-8')).decode('ascii')}"
+                        for name, value in values.items())
+
+    def start(self, key: str, size: int) -> str:
+        response = self.client.post(self.endpoint, headers={
+            "Upload-Length": str(size),
+            "Upload-Metadata": self._metadata(bucketName=self.bucket, objectName=key,
+                                              contentType="application/zip"),
+            "x-upsert": "false",
+        })
+        response.raise_for_status()
+        return response.headers["Location"]
+
+    def offset(self, handle: str) -> int:
+        response = self.client.head(handle)
+        if response.status_code in (404, 410):
+            raise UploadExpired(handle)
+        response.raise_for_status()
+        return int(response.headers["Upload-Offset"])
+
+    def append(self, handle: str, offset: int, data: bytes) -> int:
+        response = self.client.patch(handle, content=data, headers={
+            "Upload-Offset": str(offset),
+            "Content-Type": "application/offset+octet-stream",
+        })
+        if response.status_code in (404, 410):
+            raise UploadExpired(handle)
+        response.raise_for_status()
+        return int(response.headers["Upload-Offset"])
+
+
+def state_path(archive_path: Union[str, Path]) -> Path:
+    """ملف حالة الرفع بجوار الأرشيف"""
+    return Path(f"{archive_path}{STATE_SUFFIX}")
+
+
+def _load_state(archive_path: Path, key: str, size: int) -> Optional[dict]:
+    path = state_path(archive_path)
+    if not path.exists():
+        return None
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    # حالة لأرشيف آخر أو لمسار آخر لا تُستأنف
+    if state.get("key") != key or state.get("size") != size:
+        return None
+    return state
+
+
+def upload_file(target: UploadTarget, archive_path: Union[str, Path], key: str,
+                progress: Optional[UploadProgress] = None,
+                chunk_size: Optional[int] = None) -> int:
+    """رفع ملف إلى target على أجزاء، مع استئناف رفع سابق لنفس الملف والمسار إن وُجد
+
+    عند الفشل تبقى حالة الرفع محفوظة ويُستأنف من آخر إزاحة في الاستدعاء التالي؛
+    وعند النجاح تُحذف
+
+    Returns:
+        عدد البايتات المرفوعة في هذا الاستدعاء
+    """
+    archive_path = Path(archive_path)
+    chunk_size = chunk_size or config.BACKUP_UPLOAD_CHUNK_SIZE
+    size = archive_path.stat().st_size
+
+    state = _load_state(archive_path, key, size)
+    offset = 0
+    if state is not None:
+        try:
+            offset = target.offset(state["handle"])
+            logging.info(f"استئناف رفع {key} من {offset} من أصل {size} بايت")
+        except UploadExpired:
+            state = None
+    if state is None:
+        state = {"key": key, "size": size, "handle": target.start(key, size)}
+        state_path(archive_path).write_text(json.dumps(state, ensure_ascii=False), encoding="utf-8")
+
+    sent = 0
+    with open(archive_path, "rb") as archive:
+        archive.seek(offset)
+        while offset < size:
+            data = archive.read(chunk_size)
+            new_offset = target.append(state["handle"], offset, data)
+            # إزاحة لم تتقدم (أو تجاوزت ما أُرسل) تعني رفعاً متعثراً: يبقى ملف الحالة
+            # ويُستأنف لاحقاً بدلاً من تكرار نفس الجزء بلا نهاية
+            if not offset < new_offset <= offset + len(data):
+                raise ValueError(f"إزاحة غير متوقعة من الخادم لرفع {key}: {new_offset} بعد {offset}")
+            sent += new_offset - offset
+            offset = new_offset
+            # الخادم قد يستلم جزءاً فقط من البيانات
+            archive.seek(offset)
+            if progress is not None:
+                progress(offset, size)
+
+    target.finish(state["handle"], key)
+    state_path(archive_path).unlink()
+    return sent
@@ -7,34 +7,152 @@
 import sqlite3
 import logging
 import os
+import re
+import threading
 from pathlib import Path
 from contextlib import contextmanager
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Sequence
 
 import config
+from core.database.pool import ConnectionPool
+from core.database import migrations, search_index, snapshot
+from core.utils.money import Money
+from core.utils.startup_profiler import startup_profiler
+
+# أعمدة المبالغ المالية المخزنة كأعداد صحيحة بالفلس (النوع المعلن MONEY)
+MONEY_COLUMNS = {
+    "students": ("total_fee",),
+    "installments": ("amount",),
+    "additional_fees": ("amount",),
+    "teachers": ("monthly_salary",),
+    "employees": ("monthly_salary",),
+    "salaries": ("base_salary", "paid_amount"),
+    "expenses": ("amount",),
+    "external_income": ("amount",),
+}
+
+# فهارس فلاتر التاريخ (المفردة والمركبة مع المدرسة أو نوع الموظف)
+# الجداول غير الموجودة تُتجاوز (قاعدة بيانات لم تُرحل بعد)
+DATE_INDEXES = {
+    "expenses": (("expense_date",), ("school_id", "expense_date")),
+    "external_income": (("income_date",), ("school_id", "income_date")),
+    "salaries": (("payment_date",), ("staff_type", "payment_date")),
+}
+
+
+def _convert_money(value: bytes) -> Money:
+    """تحويل قيمة عمود MONEY المخزنة بالفلس إلى Money"""
+    try:
+        return Money.from_minor(int(value))
+    except ValueError:
+        # قيمة عشرية متبقية من قبل الترحيل
+        return Money.from_minor(round(float(value)))
+
+
+def register_money_types():
+    """تسجيل محول Money عند الكتابة ومحول MONEY عند القراءة في sqlite3"""
+    sqlite3.register_adapter(Money, lambda money: money.minor)
+    sqlite3.register_converter("MONEY", _convert_money)
+    # PARSE_DECLTYPES يفعّل محولات DATE/TIMESTAMP الافتراضية؛ نبقي التواريخ نصوصاً كما كانت
+    sqlite3.register_converter("DATE", bytes.decode)
+    sqlite3.register_converter("TIMESTAMP", bytes.decode)
 
 
 class DatabaseManager:
     """مدير قاعدة البيانات"""
     
-    def __init__(self):
+    def __init__(self, db_path: Optional[Path] = None):
         """تهيئة مدير قاعدة البيانات"""
-        self.db_path = config.DATABASE_PATH
-        self.connection = None
-        
-    def get_connection(self) -> sqlite3.Connection:
-        """الحصول على اتصال قاعدة البيانات"""
+        self.db_path = db_path or config.DATABASE_PATH
+        register_money_types()
+        self.pool = ConnectionPool(
+            self.db_path,
+            on_connect=self.configure_connection,
+            # MONEY في تعريف العمود أو "[MONEY]" في اسم العمود المجمع يعيد Money
+            detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+            cached_statements=config.DATABASE_STATEMENT_CACHE_SIZE
+        )
+        self.pragmas = dict(config.DATABASE_PRAGMAS)
+        self._checkpoint_timer = None
+        self._checkpoint_interval = 0
+    
+    @property
+    def connection(self) -> Optional[sqlite3.Connection]:
+        """اتصال الكتابة الحالي (للتوافق مع الشيفرة القديمة)"""
+        return self.pool._writer
+    
+    def configure_connection(self, connection: sqlite3.Connection):
+        """إعداد كل اتصال جديد يفتحه المجمع بتطبيق ملف PRAGMA من الإعدادات"""
+        for name, value in self.pragmas.items():
+            if not name.isidentifier():
+                raise ValueError(f"اسم PRAGMA غير صالح: {name}")
+            connection.execute(f"PRAGMA {name} = {value}")
+        # دالة توحيد النص العربي التي تستدعيها triggers فهارس البحث قبل الترحيل 8
+        search_index.register_functions(connection)
+    
+    def checkpoint(self, mode: str = "PASSIVE") -> Optional[sqlite3.Row]:
+        """تنفيذ نقطة تفتيش WAL لنقل الصفحات إلى ملف قاعدة البيانات الرئيسي"""
+        if mode.upper() not in ("PASSIVE", "FULL", "RESTART", "TRUNCATE"):
+            raise ValueError(f"نمط نقطة تفتيش غير صالح: {mode}")
         try:
-            if self.connection is None:
-                self.connection = sqlite3.connect(
-                    str(self.db_path),
-                    check_same_thread=False
-                )
-                self.connection.row_factory = sqlite3.Row
-                # تفعيل المفاتيح الأجنبية
-                self.connection.execute("PRAGMA foreign_keys = ON")
-                
-            return self.connection
+            with self.pool.writer() as conn:
+                # النتيجة: (busy, log, checkpointed)
+                return conn.execute(f"PRAGMA wal_checkpoint({mode.upper()})").fetchone()
+        except Exception as e:
+            logging.error(f"خطأ في نقطة تفتيش WAL: {e}")
+            raise
+    
+    def start_checkpoint_task(self, interval: Optional[int] = None):
+        """بدء نقطة تفتيش دورية في الخلفية لإبقاء ملف WAL محدود الحجم"""
+        self.stop_checkpoint_task()
+        self._checkpoint_interval = config.DATABASE_CHECKPOINT_INTERVAL if interval is None else interval
+        if self._checkpoint_interval > 0:
+            self._schedule_checkpoint()
+    
+    def _schedule_checkpoint(self):
+        """جدولة نقطة التفتيش التالية"""
+        self._checkpoint_timer = threading.Timer(self._checkpoint_interval, self._run_checkpoint)
+        self._checkpoint_timer.daemon = True
+        self._checkpoint_timer.start()
+    
+    def _run_checkpoint(self):
+        """تنفيذ نقطة التفتيش المجدولة ثم إعادة الجدولة"""
+        try:
+            # TRUNCATE يعيد ملف WAL إلى الصفر إن لم يكن هناك قرّاء نشطون
+            self.checkpoint("TRUNCATE")
+        except Exception as e:
+            logging.warning(f"تحذير: فشلت نقطة التفتيش الدورية: {e}")
+        finally:
+            # لا يُعاد الجدول إن أُوقفت المهمة أو استُبدلت بمؤقت آخر أثناء التنفيذ
+            if self._checkpoint_timer is threading.current_thread():
+                self._schedule_checkpoint()
+    
+    def stop_checkpoint_task(self):
+        """إيقاف نقطة التفتيش الدورية"""
+        if self._checkpoint_timer is not None:
+            timer, self._checkpoint_timer = self._checkpoint_timer, None
+            timer.cancel()
+    
+    @contextmanager
+    def get_connection(self) -> Iterator[sqlite3.Connection]:
+        """حجز اتصال الكتابة المشترك طوال مدة الكتلة (عبر pool.writer())"""
+        try:
+            with self.pool.writer() as conn:
+                yield conn
+            
+        except Exception as e:
+            logging.error(f"خطأ في الاتصال بقاعدة البيانات: {e}")
+            raise
+    
+    def get_read_connection(self) -> sqlite3.Connection:
+        """الحصول على اتصال القراءة الخاص بالخيط الحالي"""
+        try:
+            # داخل كتلة كتابة نقرأ من اتصال الكتابة لرؤية التغييرات غير المؤكدة
+            if self.pool.in_writer():
+                # الخيط يحجز الكاتب في كتلة خارجية، فالاتصال يبقى محجوزاً بعد هذه الكتلة
+                with self.pool.writer() as conn:
+                    return conn
+            return self.pool.get_reader()
             
         except Exception as e:
             logging.error(f"خطأ في الاتصال بقاعدة البيانات: {e}")
@@ -42,24 +160,69 @@ class DatabaseManager:
     
     @contextmanager
     def get_cursor(self):
-        """الحصول على cursor مع إدارة تلقائية للموارد"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        """الحصول على cursor للكتابة مع إدارة تلقائية للموارد
+        
+        عند الاستدعاء داخل transaction() أو get_cursor() آخر لا يتم التأكيد هنا،
+        بل تتولاه الكتلة الخارجية
+        """
+        nested = self.pool.in_writer()
+        with self.pool.writer() as conn:
+            cursor = conn.cursor()
+            try:
+                yield cursor
+                if not nested:
+                    conn.commit()
+            except Exception as e:
+                if not nested:
+                    conn.rollback()
+                logging.error(f"خطأ في قاعدة البيانات: {e}")
+                raise
+            finally:
+                cursor.close()
+    
+    @contextmanager
+    def get_read_cursor(self):
+        """الحصول على cursor للقراءة فقط من اتصال الخيط الحالي (بدون commit)"""
+        cursor = self.get_read_connection().cursor()
         try:
             yield cursor
-            conn.commit()
         except Exception as e:
-            conn.rollback()
             logging.error(f"خطأ في قاعدة البيانات: {e}")
             raise
         finally:
             cursor.close()
     
+    @contextmanager
+    def transaction(self):
+        """تجميع عدة عمليات كتابة في معاملة واحدة تُؤكد مرة واحدة
+        
+        مثال:
+            with db_manager.transaction() as cursor:
+                cursor.execute("INSERT ...")
+                db_manager.execute_update("UPDATE ...")
+        """
+        nested = self.pool.in_writer()
+        with self.pool.writer() as conn:
+            cursor = conn.cursor()
+            try:
+                if not conn.in_transaction:
+                    # حجز قفل الكتابة من البداية لتجنب فشل الترقية لاحقاً
+                    conn.execute("BEGIN IMMEDIATE")
+                yield cursor
+                if not nested:
+                    conn.commit()
+            except Exception as e:
+                if not nested:
+                    conn.rollback()
+                logging.error(f"خطأ في المعاملة، تم التراجع عنها: {e}")
+                raise
+            finally:
+                cursor.close()
+    
     def close_connection(self):
-        """إغلاق اتصال قاعدة البيانات"""
-        if self.connection:
-            self.connection.close()
-            self.connection = None
+        """إغلاق جميع اتصالات قاعدة البيانات"""
+        self.stop_checkpoint_task()
+        self.pool.close_all()
     
     def initialize_database(self) -> bool:
         """تهيئة قاعدة البيانات وإنشاء الجداول"""
@@ -69,186 +232,159 @@ class DatabaseManager:
         except Exception as e:
             logging.error(f"خطأ في إنشاء مجلد قاعدة البيانات: {e}")
             raise
-        # إنشاء الجداول (أي أخطاء ستُنقِل إلى الأعلى)
-        self.create_tables()
+        # تطبيق ترحيلات المخطط المعلقة (أي أخطاء ستُنقل إلى الأعلى)
+        # إن كان المخطط محدثاً يُقرأ PRAGMA user_version فقط دون أي DDL
+        with startup_profiler.phase("migrations"):
+            migrations.migrate(self)
         logging.info("تم تهيئة قاعدة البيانات بنجاح")
         return True
     
-    def create_tables(self):
-        """إنشاء جداول قاعدة البيانات"""
+    def migrate_money_columns(self, conn: Optional[sqlite3.Connection] = None) -> List[str]:
+        """
+        ترحيل أعمدة المبالغ المعلنة DECIMAL (المخزنة فعلياً كـ REAL) إلى MONEY بالفلس
+        
+        SQLite لا يدعم تغيير نوع عمود، لذا يُعاد بناء كل جدول يحتاج الترحيل
+        (إنشاء جدول جديد، نسخ البيانات مع التحويل، حذف القديم، إعادة التسمية)
+        
+        Args:
+            conn: اتصال الكتابة داخل معاملة قائمة والمفاتيح الأجنبية موقفة (من محرك الترحيل)،
+                  وإلا يُنفذ الترحيل في معاملة خاصة به
+        
+        Returns:
+            أسماء الجداول التي تم ترحيلها
+        """
+        if conn is not None:
+            pending = self._pending_money_columns(conn)
+            for table, columns in pending.items():
+                self._rebuild_money_table(conn, table, columns)
+            if pending:
+                logging.info(f"تم ترحيل أعمدة المبالغ إلى الفلس في الجداول: {', '.join(pending)}")
+            return list(pending)
+        
+        with self.pool.writer() as conn:
+            pending = self._pending_money_columns(conn)
+        if not pending:
+            return []
+        
+        with self.pool.writer() as conn:
+            # يجب إيقاف المفاتيح الأجنبية خارج المعاملة حتى لا يحذف DROP TABLE السجلات التابعة
+            conn.execute("PRAGMA foreign_keys = OFF")
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    for table, columns in pending.items():
+                        self._rebuild_money_table(conn, table, columns)
+                    violations = conn.execute("PRAGMA foreign_key_check").fetchall()
+                    if violations:
+                        raise sqlite3.IntegrityError(f"انتهاك المفاتيح الأجنبية بعد الترحيل: {len(violations)}")
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+            except Exception as e:
+                logging.error(f"خطأ في ترحيل أعمدة المبالغ: {e}")
+                raise
+            finally:
+                conn.execute("PRAGMA foreign_keys = ON")
+        
+        logging.info(f"تم ترحيل أعمدة المبالغ إلى الفلس في الجداول: {', '.join(pending)}")
+        return list(pending)
+    
+    @staticmethod
+    def _pending_money_columns(conn: sqlite3.Connection) -> Dict[str, List[str]]:
+        """أعمدة المبالغ التي لم تُرحل بعد إلى MONEY، لكل جدول موجود"""
+        pending = {}
+        for table, columns in MONEY_COLUMNS.items():
+            declared = {row[1]: (row[2] or '').upper() for row in conn.execute(f"PRAGMA table_info({table})")}
+            # العمود بدون نوع معلن لا يمكن تحديد وحدته بأمان فيُترك كما هو
+            legacy = [column for column in columns if declared.get(column) not in (None, '', 'MONEY')]
+            if legacy:
+                pending[table] = legacy
+        return pending
+    
+    def _rebuild_money_table(self, conn: sqlite3.Connection, table: str, money_columns: List[str]):
+        """إعادة بناء جدول واحد بأعمدة MONEY"""
+        create_sql = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()[0]
+        dependents = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL",
+            (table,)
+        ).fetchall()
+        # آخر معرف مستخدم (AUTOINCREMENT) حتى لا يُعاد استخدام معرفات السجلات المحذوفة
+        sequence = None
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_sequence'").fetchone():
+            sequence = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)).fetchone()
+        columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+        
+        temp_table = f"{table}__money_new"
+        new_sql = re.sub(
+            rf'^\s*CREATE\s+TABLE\s+(IF\s+NOT\s+EXISTS\s+)?["`\[]?{table}["`\]]?',
+            f"CREATE TABLE {temp_table}", create_sql, count=1, flags=re.IGNORECASE
+        )
+        for column in money_columns:
+            # استبدال اسم النوع (مع الدقة إن وجدت) الذي يلي اسم العمود في تعريفه
+            new_sql, replaced = re.subn(
+                rf'(\b{column}\s+)[A-Za-z]+(\s*\(\s*\d+\s*(,\s*\d+\s*)?\))?',
+                r'\1MONEY', new_sql, count=1
+            )
+            if not replaced:
+                raise sqlite3.OperationalError(f"تعذر تحديد نوع العمود {table}.{column}")
+        
+        select_list = ", ".join(
+            f"CASE WHEN {column} IS NULL THEN NULL ELSE CAST(ROUND({column} * {config.MONEY_MINOR_UNITS}) AS INTEGER) END"
+            if column in money_columns else column
+            for column in columns
+        )
+        conn.execute(new_sql)
+        conn.execute(f"INSERT INTO {temp_table} ({', '.join(columns)}) SELECT {select_list} FROM {table}")
+        conn.execute(f"DROP TABLE {table}")
+        conn.execute(f"ALTER TABLE {temp_table} RENAME TO {table}")
+        for (sql,) in dependents:
+            conn.execute(sql)
+        if sequence is not None:
+            conn.execute(
+                "UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?", (sequence[0], table)
+            )
+    
+    def create_date_indexes(self, cursor, tables: Optional[Iterable[str]] = None):
+        """إنشاء فهارس أعمدة التاريخ لتصبح فلاتر الشهر والسنة بحثاً في نطاق من الفهرس"""
         try:
-            with self.get_cursor() as cursor:
-                # جدول المستخدمين (للمصادقة)
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS users (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        username TEXT UNIQUE NOT NULL DEFAULT 'admin',
-                        password_hash TEXT NOT NULL,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                
-                # جدول المدارس
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS schools (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        name_ar TEXT NOT NULL,
-                        name_en TEXT,
-                        logo_path TEXT,
-                        address TEXT,
-                        phone TEXT,
-                        principal_name TEXT,
-                        school_types TEXT NOT NULL,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                
-                # جدول الطلاب
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS students (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        name TEXT NOT NULL,
-                        national_id_number TEXT,
-                        school_id INTEGER NOT NULL,
-                        grade TEXT NOT NULL,
-                        section TEXT NOT NULL,
-                        academic_year TEXT,
-                        gender TEXT NOT NULL,
-                        phone TEXT,
-                        guardian_name TEXT,
-                        guardian_phone TEXT,
-                        total_fee DECIMAL(10,2) NOT NULL,
-                        start_date DATE NOT NULL,
-                        status TEXT DEFAULT 'نشط',
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (school_id) REFERENCES schools(id) ON DELETE CASCADE
+            for table in tables or DATE_INDEXES:
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+                if cursor.fetchone() is None:
+                    continue
+                for columns in DATE_INDEXES[table]:
+                    cursor.execute(
+                        f"CREATE INDEX IF NOT EXISTS idx_{table}_{'_'.join(columns)} ON {table}({', '.join(columns)})"
                     )
-                """)
-                
-                # جدول الأقساط
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS installments (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        student_id INTEGER NOT NULL,
-                        amount DECIMAL(10,2) NOT NULL,
-                        payment_date DATE NOT NULL,
-                        payment_time TIME NOT NULL,
-                        notes TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE
-                    )
-                """)
-                
-                # جدول الرسوم الإضافية
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS additional_fees (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        student_id INTEGER NOT NULL,
-                        fee_type TEXT NOT NULL,
-                        amount DECIMAL(10,2) NOT NULL,
-                        paid BOOLEAN DEFAULT FALSE,
-                        payment_date DATE,
-                        added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        notes TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE
-                    )
-                """)
-                
-                # جدول المعلمين
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS teachers (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        name TEXT NOT NULL,
-                        school_id INTEGER NOT NULL,
-                        class_hours INTEGER NOT NULL DEFAULT 0,
-                        monthly_salary DECIMAL(10,2) NOT NULL,
-                        phone TEXT,
-                        notes TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (school_id) REFERENCES schools(id) ON DELETE CASCADE
-                    )
-                """)
-                
-                # جدول الموظفين
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS employees (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        name TEXT NOT NULL,
-                        school_id INTEGER NOT NULL,
-                        job_type TEXT NOT NULL CHECK (job_type IN ('عامل', 'حارس', 'كاتب', 'مخصص')),
-                        monthly_salary DECIMAL(10,2) NOT NULL,
-                        phone TEXT,
-                        notes TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (school_id) REFERENCES schools(id) ON DELETE CASCADE
-                    )
-                """)
-                
-                # جدول إعدادات التطبيق
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS app_settings (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        setting_key TEXT UNIQUE NOT NULL,
-                        setting_value TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                
-                # إنشاء الفهارس لتحسين الأداء
-                self.create_indexes(cursor)
-                
-                logging.info("تم إنشاء جداول قاعدة البيانات بنجاح")
-                
         except Exception as e:
-            logging.error(f"خطأ في إنشاء جداول قاعدة البيانات: {e}")
+            logging.error(f"خطأ في إنشاء فهارس التاريخ: {e}")
             raise
     
-    def create_indexes(self, cursor):
-        """إنشاء فهارس قاعدة البيانات"""
-        try:
-            # فهارس الطلاب
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_students_school_id ON students(school_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_students_name ON students(name)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_students_grade ON students(grade)")
-            
-            # فهارس الأقساط
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_installments_student_id ON installments(student_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_installments_payment_date ON installments(payment_date)")
-            
-            # فهارس الرسوم الإضافية
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_additional_fees_student_id ON additional_fees(student_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_additional_fees_paid ON additional_fees(paid)")
-            # تمت إزالة فهرسة العمود due_date لأنه لم يعد موجوداً بعد التعديل
-            
-            # فهارس المعلمين
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_teachers_school_id ON teachers(school_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_teachers_name ON teachers(name)")
-            
-            # فهارس الموظفين
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_employees_school_id ON employees(school_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_employees_name ON employees(name)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_employees_job_type ON employees(job_type)")
-            
-            logging.info("تم إنشاء فهارس قاعدة البيانات بنجاح")
-            
-        except Exception as e:
-            logging.error(f"خطأ في إنشاء فهارس قاعدة البيانات: {e}")
-            raise
+    @staticmethod
+    def _is_read_only(query: str) -> bool:
+        """هل الاستعلام للقراءة فقط؟ (يحدد الاتصال الذي يُنفذ عليه)"""
+        keyword = query.lstrip().split(None, 1)[0].upper() if query.strip() else ""
+        if keyword == "PRAGMA":
+            # PRAGMA مع إسناد يغير حالة الاتصال أو قاعدة البيانات
+            return "=" not in query
+        return keyword in ("SELECT", "WITH", "EXPLAIN", "VALUES")
     
     def execute_query(self, query: str, params: tuple = ()) -> List[sqlite3.Row]:
         """تنفيذ استعلام SELECT وإرجاع النتائج"""
         try:
-            with self.get_cursor() as cursor:
-                cursor.execute(query, params)
+            # بعض الشيفرة القديمة تمرر INSERT/UPDATE هنا، فتُوجه إلى اتصال الكتابة
+            if not self._is_read_only(query):
+                with self.get_cursor() as cursor:
+                    cursor.execute(query, params)
+                    return cursor.fetchall()
+            
+            cursor = self.get_read_connection().execute(query, params)
+            try:
                 return cursor.fetchall()
+            finally:
+                cursor.close()
                 
         except Exception as e:
             logging.error(f"خطأ في تنفيذ الاستعلام: {e}")
@@ -257,9 +393,16 @@ class DatabaseManager:
     def execute_fetch_one(self, query: str, params: tuple = ()) -> Optional[sqlite3.Row]:
         """تنفيذ استعلام SELECT وإرجاع صف واحد"""
         try:
-            with self.get_cursor() as cursor:
-                cursor.execute(query, params)
+            if not self._is_read_only(query):
+                with self.get_cursor() as cursor:
+                    cursor.execute(query, params)
+                    return cursor.fetchone()
+            
+            cursor = self.get_read_connection().execute(query, params)
+            try:
                 return cursor.fetchone()
+            finally:
+                cursor.close()
                 
         except Exception as e:
             logging.error(f"خطأ في تنفيذ الاستعلام (fetch_one): {e}")
@@ -287,10 +430,92 @@ class DatabaseManager:
             logging.error(f"خطأ في تنفيذ الإدخال: {e}")
             raise
     
+    def execute_many(self, query: str, params_seq: Iterable[Sequence],
+                     chunk_size: Optional[int] = None) -> int:
+        """
+        تنفيذ استعلام واحد على عدة صفوف داخل معاملة واحدة
+        
+        Args:
+            query: استعلام INSERT/UPDATE/DELETE بمعاملات
+            params_seq: تسلسل معاملات الصفوف (يمكن أن يكون مولداً)
+            chunk_size: عدد الصفوف في كل دفعة executemany (None = دفعة واحدة)
+            
+        Returns:
+            إجمالي عدد الصفوف المتأثرة
+        """
+        try:
+            total = 0
+            with self.transaction() as cursor:
+                for chunk in self._chunked(params_seq, chunk_size):
+                    cursor.executemany(query, chunk)
+                    total += cursor.rowcount
+            return total
+            
+        except Exception as e:
+            logging.error(f"خطأ في تنفيذ العملية المجمعة: {e}")
+            raise
+    
+    def insert_many(self, table: str, columns: Sequence[str], rows: Iterable[Sequence],
+                    chunk_size: Optional[int] = None) -> int:
+        """إدخال عدة صفوف في جدول داخل معاملة واحدة وإرجاع عدد الصفوف المدخلة"""
+        self._check_identifiers(table, *columns)
+        placeholders = ", ".join("?" for _ in columns)
+        query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+        return self.execute_many(query, rows, chunk_size)
+    
+    def upsert_many(self, table: str, columns: Sequence[str], rows: Iterable[Sequence],
+                    conflict_columns: Sequence[str],
+                    update_columns: Optional[Sequence[str]] = None,
+                    chunk_size: Optional[int] = None) -> int:
+        """
+        إدخال أو تحديث عدة صفوف (INSERT ... ON CONFLICT DO UPDATE) داخل معاملة واحدة
+        
+        Args:
+            conflict_columns: أعمدة القيد الفريد الذي يحدد التعارض
+            update_columns: الأعمدة المحدثة عند التعارض (الافتراضي: باقي الأعمدة)
+        """
+        if update_columns is None:
+            update_columns = [c for c in columns if c not in conflict_columns]
+        self._check_identifiers(table, *columns, *conflict_columns, *update_columns)
+        
+        placeholders = ", ".join("?" for _ in columns)
+        if update_columns:
+            assignments = ", ".join(f"{c} = excluded.{c}" for c in update_columns)
+            action = f"DO UPDATE SET {assignments}"
+        else:
+            action = "DO NOTHING"
+        query = (
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) "
+            f"ON CONFLICT ({', '.join(conflict_columns)}) {action}"
+        )
+        return self.execute_many(query, rows, chunk_size)
+    
+    @staticmethod
+    def _chunked(rows: Iterable[Sequence], chunk_size: Optional[int]) -> Iterator[List[Sequence]]:
+        """تقسيم الصفوف إلى دفعات"""
+        if not chunk_size:
+            yield rows if isinstance(rows, list) else list(rows)
+            return
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    
+    @staticmethod
+    def _check_identifiers(*names: str):
+        """التحقق من أسماء الجداول والأعمدة قبل إدراجها في نص الاستعلام"""
+        for name in names:
+            if not name.isidentifier():
+                raise ValueError(f"اسم غير صالح في الاستعلام: {name}")
+    
     def get_table_info(self, table_name: str) -> List[Dict[str, Any]]:
         """الحصول على معلومات جدول"""
         try:
-            with self.get_cursor() as cursor:
+            with self.get_read_cursor() as cursor:
                 cursor.execute(f"PRAGMA table_info({table_name})")
                 columns = cursor.fetchall()
                 return [dict(column) for column in columns]
@@ -302,8 +527,8 @@ class DatabaseManager:
     def backup_database(self, backup_path: str) -> bool:
         """إنشاء نسخة احتياطية من قاعدة البيانات"""
         try:
-            import shutil
-            shutil.copy2(str(self.db_path), backup_path)
+            # لقطة متسقة بواجهة النسخ في SQLite بدلاً من نسخ الملف أثناء الكتابة
+            snapshot.create_snapshot(self.db_path, backup_path)
             logging.info(f"تم إنشاء نسخة احتياطية في: {backup_path}")
             return True
             
@@ -312,21 +537,54 @@ class DatabaseManager:
             return False
     
     def restore_database(self, backup_path: str) -> bool:
-        """استعادة قاعدة البيانات من نسخة احتياطية"""
+        """استعادة قاعدة البيانات من نسخة احتياطية
+
+        تُنسخ النسخة إلى ملف مؤقت في مجلد قاعدة البيانات ويُتحقق منها وتُرحّل هناك،
+        ثم تحل محل الملف الحالي بـ os.replace؛ عند أي فشل يبقى الملف الحالي كما هو
+        """
+        import shutil
+        # مهمة نقاط الحفظ تتوقف أثناء الاستبدال وتُستأنف بعده في جميع الحالات
+        checkpointing = self._checkpoint_timer is not None
+        self.stop_checkpoint_task()
+        db_path = Path(self.db_path)
+        temp_path = db_path.with_name(f"{db_path.name}.restore")
         try:
-            import shutil
-            # إغلاق الاتصال الحالي
-            self.close_connection()
-            
-            # استعادة النسخة الاحتياطية
-            shutil.copy2(backup_path, str(self.db_path))
-            
+            shutil.copy2(backup_path, str(temp_path))
+
+            # التحقق من سلامة النسخة وترحيلها إلى المخطط الحالي قبل أن تحل محل الملف الحالي
+            staged = DatabaseManager(temp_path)
+            try:
+                with staged.pool.writer() as conn:
+                    result = conn.execute("PRAGMA quick_check").fetchone()[0]
+                if result != "ok":
+                    raise sqlite3.DatabaseError(f"النسخة الاحتياطية تالفة: {result}")
+                migrations.migrate(staged)
+                # نقل صفحات WAL إلى الملف المؤقت قبل إغلاقه
+                staged.checkpoint("TRUNCATE")
+            finally:
+                staged.close_connection()
+
+            # الاستبدال مع حجز الكاتب ومنع الخيوط الأخرى من فتح قرّاء على الملف القديم
+            with self.pool.exclusive():
+                # حذف ملفات WAL المتبقية حتى لا تُطبق على الملف المستعاد
+                for suffix in ("-wal", "-shm"):
+                    sidecar = Path(f"{db_path}{suffix}")
+                    if sidecar.exists():
+                        sidecar.unlink()
+                os.replace(temp_path, db_path)
+
             logging.info(f"تم استعادة قاعدة البيانات من: {backup_path}")
             return True
-            
+
         except Exception as e:
             logging.error(f"خطأ في استعادة قاعدة البيانات: {e}")
             return False
+        finally:
+            for path in (temp_path, Path(f"{temp_path}-wal"), Path(f"{temp_path}-shm")):
+                if path.exists():
+                    path.unlink()
+            if checkpointing:
+                self.start_checkpoint_task(self._checkpoint_interval)
     
     def __del__(self):
         """مدمر الفئة - إغلاق الاتصال"""
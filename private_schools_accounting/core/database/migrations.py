@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ترحيل مخطط قاعدة البيانات بإصدارات مرقمة
+رقم آخر ترحيل مطبق يُحفظ في PRAGMA user_version، وعند بدء التشغيل تُطبق الترحيلات
+الأحدث منه فقط في معاملة واحدة، فإن كان المخطط محدثاً لا يُنفذ أي DDL
+
+تحل محل سكربتات التحديث المنفصلة وإنشاء الجداول داخل الصفحات
+
+قواعد إضافة ترحيل:
+- يُضاف في آخر MIGRATIONS برقم أكبر من السابق، ولا يُعدل ترحيل سبق نشره
+- الترحيلات 1-7 تُطبق أيضاً على قواعد بيانات أُنشئت قبل نظام الإصدارات (user_version = 0)
+  لذلك هي قابلة للتكرار (IF NOT EXISTS وفحص الأعمدة)؛ الترحيلات الأحدث لا تحتاج ذلك
+"""
+
+import logging
+import sqlite3
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+
+from core.database import search_index, summaries
+from core.utils.startup_profiler import startup_profiler
+
+BASE_TABLES = (
+    # جدول المستخدمين (للمصادقة)
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE NOT NULL DEFAULT 'admin',
+        password_hash TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    # جدول المدارس
+    """
+    CREATE TABLE IF NOT EXISTS schools (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name_ar TEXT NOT NULL,
+        name_en TEXT,
+        logo_path TEXT,
+        address TEXT,
+        phone TEXT,
+        principal_name TEXT,
+        school_types TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    # جدول الطلاب
+    """
+    CREATE TABLE IF NOT EXISTS students (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        national_id_number TEXT,
+        school_id INTEGER NOT NULL,
+        grade TEXT NOT NULL,
+        section TEXT NOT NULL,
+        academic_year TEXT,
+        gender TEXT NOT NULL,
+        phone TEXT,
+        guardian_name TEXT,
+        guardian_phone TEXT,
+        total_fee MONEY NOT NULL,
+        start_date DATE NOT NULL,
+        status TEXT DEFAULT 'نشط',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (school_id) REFERENCES schools(id) ON DELETE CASCADE
+    )
+    """,
+    # جدول الأقساط
+    """
+    CREATE TABLE IF NOT EXISTS installments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        student_id INTEGER NOT NULL,
+        amount MONEY NOT NULL,
+        payment_date DATE NOT NULL,
+        payment_time TIME NOT NULL,
+        notes TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE
+    )
+    """,
+    # جدول الرسوم الإضافية
+    """
+    CREATE TABLE IF NOT EXISTS additional_fees (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        student_id INTEGER NOT NULL,
+        fee_type TEXT NOT NULL,
+        amount MONEY NOT NULL,
+        paid BOOLEAN DEFAULT FALSE,
+        payment_date DATE,
+        added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        notes TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE
+    )
+    """,
+    # جدول المعلمين
+    """
+    CREATE TABLE IF NOT EXISTS teachers (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        school_id INTEGER NOT NULL,
+        class_hours INTEGER NOT NULL DEFAULT 0,
+        monthly_salary MONEY NOT NULL,
+        phone TEXT,
+        notes TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (school_id) REFERENCES schools(id) ON DELETE CASCADE
+    )
+    """,
+    # جدول الموظفين
+    """
+    CREATE TABLE IF NOT EXISTS employees (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        school_id INTEGER NOT NULL,
+        job_type TEXT NOT NULL CHECK (job_type IN ('عامل', 'حارس', 'كاتب', 'مخصص')),
+        monthly_salary MONEY NOT NULL,
+        phone TEXT,
+        notes TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (school_id) REFERENCES schools(id) ON DELETE CASCADE
+    )
+    """,
+    # جدول إعدادات التطبيق
+    """
+    CREATE TABLE IF NOT EXISTS app_settings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        setting_key TEXT UNIQUE NOT NULL,
+        setting_value TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+)
+
+BASE_INDEXES = (
+    # فهارس الطلاب
+    "CREATE INDEX IF NOT EXISTS idx_students_school_id ON students(school_id)",
+    "CREATE INDEX IF NOT EXISTS idx_students_name ON students(name)",
+    "CREATE INDEX IF NOT EXISTS idx_students_grade ON students(grade)",
+    # فهارس الأقساط
+    "CREATE INDEX IF NOT EXISTS idx_installments_student_id ON installments(student_id)",
+    "CREATE INDEX IF NOT EXISTS idx_installments_payment_date ON installments(payment_date)",
+    # فهارس الرسوم الإضافية
+    "CREATE INDEX IF NOT EXISTS idx_additional_fees_student_id ON additional_fees(student_id)",
+    "CREATE INDEX IF NOT EXISTS idx_additional_fees_paid ON additional_fees(paid)",
+    # فهارس المعلمين
+    "CREATE INDEX IF NOT EXISTS idx_teachers_school_id ON teachers(school_id)",
+    "CREATE INDEX IF NOT EXISTS idx_teachers_name ON teachers(name)",
+    # فهارس الموظفين
+    "CREATE INDEX IF NOT EXISTS idx_employees_school_id ON employees(school_id)",
+    "CREATE INDEX IF NOT EXISTS idx_employees_name ON employees(name)",
+    "CREATE INDEX IF NOT EXISTS idx_employees_job_type ON employees(job_type)",
+)
+
+# أعمدة أضافها update_db_schema.py لقواعد البيانات الأقدم من تعريف جدول الطلاب الحالي
+STUDENT_COLUMNS = (
+    ("national_id_number", "TEXT"),
+    ("academic_year", "TEXT"),
+    ("guardian_name", "TEXT"),
+    ("guardian_phone", "TEXT"),
+    ("status", "TEXT DEFAULT 'نشط'"),
+)
+
+# كانت تُنشأ عند فتح صفحتي المصروفات والواردات الخارجية
+MOVEMENT_TABLES = (
+    """
+    CREATE TABLE IF NOT EXISTS expenses (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        school_id INTEGER NOT NULL,
+        title VARCHAR(255) NOT NULL,
+        amount MONEY NOT NULL,
+        category VARCHAR(100),
+        expense_date DATE NOT NULL,
+        notes TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (school_id) REFERENCES schools(id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS external_income (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        school_id INTEGER NOT NULL,
+        title VARCHAR(255) NOT NULL,
+        amount MONEY NOT NULL,
+        category VARCHAR(100),
+        income_date DATE NOT NULL,
+        notes TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (school_id) REFERENCES schools(id)
+    )
+    """,
+)
+
+# كان يُنشأ بالسكربت update_db_for_salaries.py
+SALARIES_TABLE = (
+    """
+    CREATE TABLE IF NOT EXISTS salaries (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        staff_type TEXT NOT NULL CHECK (staff_type IN ('teacher', 'employee')),
+        staff_id INTEGER NOT NULL,
+        staff_name TEXT NOT NULL,
+        base_salary MONEY NOT NULL,
+        paid_amount MONEY NOT NULL,
+        from_date DATE NOT NULL,
+        to_date DATE NOT NULL,
+        days_count INTEGER NOT NULL,
+        payment_date DATE NOT NULL,
+        payment_time TIME NOT NULL,
+        notes TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_salaries_staff_type ON salaries(staff_type)",
+    "CREATE INDEX IF NOT EXISTS idx_salaries_staff_id ON salaries(staff_id)",
+    "CREATE INDEX IF NOT EXISTS idx_salaries_payment_date ON salaries(payment_date)",
+    "CREATE INDEX IF NOT EXISTS idx_salaries_from_date ON salaries(from_date)",
+    "CREATE INDEX IF NOT EXISTS idx_salaries_to_date ON salaries(to_date)",
+)
+
+
+def _execute_all(*statements: str) -> Callable[[Any, sqlite3.Cursor], None]:
+    """ترحيل ينفذ عبارات DDL بالترتيب"""
+    def apply(manager, cursor: sqlite3.Cursor):
+        for statement in statements:
+            cursor.execute(statement)
+    return apply
+
+
+def _add_student_columns(manager, cursor: sqlite3.Cursor):
+    cursor.execute("PRAGMA table_info(students)")
+    existing = {row[1] for row in cursor.fetchall()}
+    for column, definition in STUDENT_COLUMNS:
+        if column not in existing:
+            cursor.execute(f"ALTER TABLE students ADD COLUMN {column} {definition}")
+
+
+def _migrate_money_columns(manager, cursor: sqlite3.Cursor):
+    manager.migrate_money_columns(cursor.connection)
+
+
+def _search_and_date_indexes(manager, cursor: sqlite3.Cursor):
+    search_index.ensure_search_indexes(cursor)
+    manager.create_date_indexes(cursor)
+
+
+def _summaries(manager, cursor: sqlite3.Cursor):
+    summaries.ensure_summaries(cursor)
+
+
+def _portable_search_triggers(manager, cursor: sqlite3.Cursor):
+    # triggers الإصدار 6 تستدعي normalize_ar فتفشل الكتابة من خارج البرنامج
+    for table in search_index.SEARCH_INDEXES:
+        search_index.drop_search_triggers(cursor, table)
+    search_index.ensure_search_indexes(cursor)
+
+
+@dataclass(frozen=True)
+class Migration:
+    """ترحيل واحد: رقمه ووصفه والدالة التي تطبقه بـ (مدير قاعدة البيانات، cursor المعاملة)"""
+    version: int
+    description: str
+    apply: Callable[[Any, sqlite3.Cursor], None]
+
+
+MIGRATIONS = (
+    Migration(1, "الجداول الأساسية وفهارسها", _execute_all(*BASE_TABLES, *BASE_INDEXES)),
+    Migration(2, "أعمدة الطلاب المضافة بعد الإصدار الأول", _add_student_columns),
+    Migration(3, "جدولا المصروفات والواردات الخارجية", _execute_all(*MOVEMENT_TABLES)),
+    Migration(4, "جدول الرواتب وفهارسه", _execute_all(*SALARIES_TABLE)),
+    Migration(5, "أعمدة المبالغ بالفلس (MONEY)", _migrate_money_columns),
+    Migration(6, "فهارس البحث والتاريخ", _search_and_date_indexes),
+    Migration(7, "جداول الملخصات وtriggers تحديثها", _summaries),
+    Migration(8, "triggers فهارس البحث بدوال SQLite المدمجة", _portable_search_triggers),
+)
+
+# إصدار المخطط الذي يتوقعه البرنامج
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """إصدار مخطط قاعدة البيانات المحفوظ (0 لقاعدة بيانات جديدة أو أقدم من نظام الإصدارات)"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def pending_migrations(version: int, target: Optional[int] = None) -> List[Migration]:
+    """الترحيلات الأحدث من version حتى target (آخر ترحيل افتراضياً)"""
+    target = SCHEMA_VERSION if target is None else target
+    return [migration for migration in MIGRATIONS if version < migration.version <= target]
+
+
+def migrate(manager, target: Optional[int] = None) -> List[int]:
+    """تطبيق الترحيلات المعلقة في معاملة واحدة
+
+    إن كان المخطط محدثاً يُقرأ user_version فقط دون أي DDL. عند فشل أي ترحيل
+    يُتراجع عن جميع ترحيلات هذا التشغيل ويبقى الإصدار السابق كما هو
+
+    Args:
+        manager: مدير قاعدة البيانات (DatabaseManager)
+        target: آخر إصدار يُطبق (للاختبار)، افتراضياً SCHEMA_VERSION
+
+    Returns:
+        أرقام الترحيلات المطبقة
+    """
+    with manager.pool.writer() as conn:
+        version = schema_version(conn)
+        if version > SCHEMA_VERSION:
+            message = f"إصدار مخطط قاعدة البيانات ({version}) أحدث من إصدار البرنامج ({SCHEMA_VERSION})"
+            logging.error(message)
+            raise sqlite3.DatabaseError(message)
+        if not pending_migrations(version, target):
+            return []
+
+        # إعادة بناء الجداول في ترحيل المبالغ تتطلب إيقاف المفاتيح الأجنبية خارج المعاملة
+        # حتى لا يحذف DROP TABLE السجلات التابعة، ويُتحقق منها قبل التأكيد
+        conn.execute("PRAGMA foreign_keys = OFF")
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.cursor()
+            try:
+                # قراءة الإصدار مرة أخرى بعد حجز القفل في حال رحّلتها عملية أخرى
+                pending = pending_migrations(schema_version(conn), target)
+                for migration in pending:
+                    with startup_profiler.phase(f"migration:{migration.version}"):
+                        migration.apply(manager, cursor)
+                    cursor.execute(f"PRAGMA user_version = {migration.version}")
+                violations = conn.execute("PRAGMA foreign_key_check").fetchall()
+                if violations:
+                    raise sqlite3.IntegrityError(f"انتهاك المفاتيح الأجنبية بعد الترحيل: {len(violations)}")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+        except Exception as e:
+            logging.error(f"خطأ في ترحيل مخطط قاعدة البيانات: {e}")
+            raise
+        finally:
+            conn.execute("PRAGMA foreign_keys = ON")
+
+    for migration in pending:
+        logging.info(f"تم تطبيق ترحيل قاعدة البيانات {migration.version}: {migration.description}")
+    return [migration.version for migration in pending]
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+تحميل القوائم الكبيرة على صفحات بطريقة keyset
+بدلاً من fetchall() على كامل النتيجة، تُجلب كل صفحة بشرط (مفتاح الترتيب) > (آخر صف محمل)
+"""
+
+import logging
+import sqlite3
+from typing import Optional, List, Sequence, Tuple, Any
+
+import config
+from core.database.connection import DatabaseManager, db_manager
+
+# حجم الصفحة الافتراضي لصفحات القوائم
+DEFAULT_PAGE_SIZE = config.LIST_PAGE_SIZE
+
+
+class KeysetPager:
+    """جلب صفحات متتالية من استعلام مرتب بمفتاح فريد
+
+    query: استعلام SELECT بالفلاتر فقط (بدون ORDER BY أو LIMIT)
+    order_by: أعمدة الترتيب من نتيجة الاستعلام بنفس الاتجاه، وآخرها فريد (عادة id)
+    """
+
+    def __init__(self, query: str, params: Sequence = (),
+                 order_by: Sequence[Tuple[str, str]] = (("id", "ASC"),),
+                 page_size: Optional[int] = None, manager: Optional[DatabaseManager] = None):
+        if not order_by:
+            raise ValueError("يجب تحديد عمود ترتيب واحد على الأقل")
+        directions = {direction.upper() for _, direction in order_by}
+        if len(directions) != 1 or not directions <= {"ASC", "DESC"}:
+            raise ValueError("أعمدة الترتيب يجب أن تكون بنفس الاتجاه (ASC أو DESC)")
+        DatabaseManager._check_identifiers(*(column for column, _ in order_by))
+
+        self.query = query
+        self.params = tuple(params)
+        self.order_by = list(order_by)
+        self.page_size = page_size or DEFAULT_PAGE_SIZE
+        self.manager = manager or db_manager
+
+        self._columns = [column for column, _ in self.order_by]
+        self._direction = directions.pop()
+
+    def _order_clause(self) -> str:
+        return ", ".join(f"{column} {self._direction}" for column in self._columns)
+
+    def fetch_page(self, after: Optional[sqlite3.Row] = None) -> List[sqlite3.Row]:
+        """جلب الصفحة التالية بعد الصف after (أو الصفحة الأولى)"""
+        try:
+            sql = f"SELECT * FROM ({self.query}) AS page_source"
+            params: List[Any] = list(self.params)
+            if after is not None:
+                keys = ", ".join(self._columns)
+                placeholders = ", ".join("?" for _ in self._columns)
+                operator = ">" if self._direction == "ASC" else "<"
+                sql += f" WHERE ({keys}) {operator} ({placeholders})"
+                params.extend(after[column] for column in self._columns)
+            sql += f" ORDER BY {self._order_clause()} LIMIT ?"
+            params.append(self.page_size)
+            return self.manager.execute_query(sql, tuple(params))
+
+        except Exception as e:
+            logging.error(f"خطأ في جلب صفحة من القائمة: {e}")
+            raise
+
+    def fetch_all(self) -> List[sqlite3.Row]:
+        """جلب جميع الصفوف بنفس الترتيب (للطباعة والتصدير)"""
+        sql = f"SELECT * FROM ({self.query}) AS page_source ORDER BY {self._order_clause()}"
+        return self.manager.execute_query(sql, self.params)
+
+    def aggregate(self, select_list: str, params: Sequence = ()) -> Optional[sqlite3.Row]:
+        """حساب مجاميع على كامل النتيجة المفلترة، مثل 'COUNT(*) AS count'
+
+        params: معاملات العلامات ? الموجودة في select_list نفسها
+        """
+        sql = f"SELECT {select_list} FROM ({self.query}) AS page_source"
+        return self.manager.execute_fetch_one(sql, tuple(params) + self.params)
+
+    def count(self) -> int:
+        """عدد صفوف النتيجة المفلترة"""
+        row = self.aggregate("COUNT(*) AS count")
+        return row['count'] if row else 0
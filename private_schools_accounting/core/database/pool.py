@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+مجمع اتصالات قاعدة البيانات
+اتصال كتابة واحد مخصص مشترك بين الخيوط، واتصال قراءة مستقل لكل خيط
+"""
+
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, Tuple, Union
+
+
+class ConnectionPool:
+    """مجمع اتصالات: كاتب واحد وعدة قرّاء (قارئ لكل خيط)"""
+
+    def __init__(self, db_path: Union[str, Path],
+                 on_connect: Optional[Callable[[sqlite3.Connection], None]] = None,
+                 detect_types: int = 0, cached_statements: int = 128):
+        """
+        تهيئة المجمع
+
+        Args:
+            db_path: مسار ملف قاعدة البيانات
+            on_connect: دالة تُستدعى على كل اتصال جديد (لإعداد PRAGMA وغيرها)
+            detect_types: خيارات تحويل الأنواع الممررة إلى sqlite3.connect
+            cached_statements: حجم ذاكرة العبارات المجهزة في كل اتصال
+        """
+        self.db_path = str(db_path)
+        self.on_connect = on_connect
+        self.detect_types = detect_types
+        self.cached_statements = cached_statements
+
+        # اتصال الكتابة وقفله (RLock للسماح بالاستدعاء المتداخل من نفس الخيط)
+        self._writer = None
+        self._writer_lock = threading.RLock()
+        self._local = threading.local()
+
+        # اتصالات القراءة مفهرسة بمعرف الخيط مع الجيل الذي فُتحت فيه؛
+        # exclusive() يرفع الجيل فيعيد كل خيط فتح قارئه عند طلبه التالي
+        self._readers: Dict[int, Tuple[sqlite3.Connection, int]] = {}
+        self._readers_lock = threading.Lock()
+        self._generation = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """فتح اتصال جديد وإعداده"""
+        # check_same_thread=False ليتمكن المجمع من إغلاق الاتصالات من أي خيط،
+        # أما الاستخدام الفعلي فمقيد بخيط واحد لكل قارئ وبالقفل للكاتب
+        connection = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            detect_types=self.detect_types,
+            cached_statements=self.cached_statements
+        )
+        connection.row_factory = sqlite3.Row
+        if self.on_connect is not None:
+            self.on_connect(connection)
+        return connection
+
+    def _get_writer(self) -> sqlite3.Connection:
+        """اتصال الكتابة (يُستدعى مع حجز _writer_lock عبر writer())"""
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = self._connect()
+            return self._writer
+
+    @contextmanager
+    def writer(self):
+        """حجز اتصال الكتابة للخيط الحالي طوال مدة الكتلة"""
+        with self._writer_lock:
+            self._local.depth = getattr(self._local, 'depth', 0) + 1
+            try:
+                yield self._get_writer()
+            finally:
+                self._local.depth -= 1
+
+    def in_writer(self) -> bool:
+        """هل يحجز الخيط الحالي اتصال الكتابة؟ (لتوجيه القراءة إليه ورؤية التغييرات غير المؤكدة)"""
+        return getattr(self._local, 'depth', 0) > 0
+
+    def get_reader(self) -> sqlite3.Connection:
+        """الحصول على اتصال القراءة الخاص بالخيط الحالي"""
+        thread_id = threading.get_ident()
+        with self._readers_lock:
+            entry = self._readers.get(thread_id)
+            if entry is not None:
+                connection, generation = entry
+                if generation == self._generation:
+                    return connection
+                # قارئ على ملف استُبدل: يغلقه خيطه المالك فقط
+                try:
+                    connection.close()
+                except Exception as e:
+                    logging.warning(f"تحذير: فشل إغلاق اتصال قراءة قديم: {e}")
+
+            self._prune_dead_readers()
+            connection = self._connect()
+            self._readers[thread_id] = (connection, self._generation)
+            logging.debug(f"تم فتح اتصال قراءة جديد للخيط {thread_id} (عدد القرّاء: {len(self._readers)})")
+            return connection
+
+    def _prune_dead_readers(self):
+        """إغلاق اتصالات القراءة الخاصة بخيوط انتهت"""
+        alive = {thread.ident for thread in threading.enumerate()}
+        for thread_id in list(self._readers):
+            if thread_id not in alive:
+                try:
+                    self._readers.pop(thread_id)[0].close()
+                except Exception as e:
+                    logging.warning(f"تحذير: فشل إغلاق اتصال قراءة قديم: {e}")
+
+    def reader_count(self) -> int:
+        """عدد اتصالات القراءة المفتوحة حالياً"""
+        with self._readers_lock:
+            return len(self._readers)
+
+    def release_reader(self):
+        """إغلاق اتصال القراءة الخاص بالخيط الحالي (يُستدعى في نهاية الخيوط العاملة)"""
+        with self._readers_lock:
+            entry = self._readers.pop(threading.get_ident(), None)
+        if entry is not None:
+            entry[0].close()
+
+    def _close_readers(self):
+        """إغلاق اتصالات القراءة (يُستدعى مع حجز _readers_lock)"""
+        for connection, _ in self._readers.values():
+            try:
+                connection.close()
+            except Exception as e:
+                logging.warning(f"تحذير: فشل إغلاق اتصال قراءة: {e}")
+        self._readers.clear()
+
+    def _close_writer(self):
+        """إغلاق اتصال الكتابة (يُستدعى مع حجز _writer_lock)"""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def close_all(self):
+        """إغلاق جميع الاتصالات"""
+        with self._readers_lock:
+            self._close_readers()
+
+        with self._writer_lock:
+            self._close_writer()
+
+    @contextmanager
+    def exclusive(self):
+        """حجز المجمع لاستبدال ملف قاعدة البيانات طوال مدة الكتلة
+
+        الكاتب محجوز ويُغلق، وطلب أي قارئ ينتظر حتى نهاية الكتلة. قرّاء الخيوط الأخرى
+        لا تُغلق من هنا بل تُعلَّم قديمة، ويعيد كل خيط فتح قارئه عند طلبه التالي.
+        الخيط الحالي يستطيع الكتابة داخل الكتلة عبر writer() لكن لا يطلب قارئاً
+        """
+        with self._writer_lock, self._readers_lock:
+            self._generation += 1
+            self._close_writer()
+            yield
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+سجل الاستعلامات المسماة
+كل استعلام قائمة يُعرّف مرة واحدة مع فلاتره، ويُبنى نصه بشكل ثابت لكل مجموعة فلاتر نشطة
+(الشروط بترتيب تعريفها ومسافات موحدة)، فيعيد sqlite3 استخدام العبارة المجهزة من ذاكرته
+(cached_statements) بدلاً من تحليل الاستعلام من جديد عند كل تغيير في قيم الفلاتر
+
+مثال:
+    query, params = build_query("expenses.list", school_id=3, search=None)
+    rows = db_manager.execute_query(query, params)
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Sequence, Tuple
+
+from core.database.search_index import search_clause
+
+# القيم النصية بين علامتي اقتباس مفردتين لا تُوحد المسافات داخلها
+_LITERAL = re.compile(r"('(?:[^']|'')*')")
+
+
+@dataclass(frozen=True)
+class QueryFilter:
+    """شرط اختياري في استعلام مسمى
+
+    عدد علامات ? في الشرط يحدد قيمة الفلتر: شرط بلا معاملات يُفعّل بـ True،
+    وشرط بمعامل واحد يأخذ القيمة نفسها، وبعدة معاملات يأخذ تسلسلاً بنفس العدد
+    """
+    name: str
+    condition: str
+
+    @property
+    def param_count(self) -> int:
+        return self.condition.count("?")
+
+
+@dataclass(frozen=True)
+class NamedQuery:
+    """استعلام مسمى: نص SELECT بدون WHERE، وفلاتره الاختيارية وترتيبه"""
+    name: str
+    sql: str
+    filters: Tuple[QueryFilter, ...] = ()
+    order_by: str = ""
+
+    def filter(self, name: str) -> QueryFilter:
+        for query_filter in self.filters:
+            if query_filter.name == name:
+                return query_filter
+        raise ValueError(f"فلتر غير معروف '{name}' في الاستعلام {self.name}")
+
+
+_registry: Dict[str, NamedQuery] = {}
+
+
+def canonical_sql(sql: str) -> str:
+    """توحيد المسافات خارج القيم النصية حتى يتطابق نص الاستعلام نفسه في كل مرة"""
+    parts = _LITERAL.split(sql)
+    return "".join(part if index % 2 else re.sub(r"\s+", " ", part) for index, part in enumerate(parts)).strip()
+
+
+def register_query(name: str, sql: str, filters: Iterable[Tuple[str, str]] = (),
+                   order_by: str = "") -> NamedQuery:
+    """تسجيل استعلام مسمى
+
+    Args:
+        name: اسم الاستعلام، مثل "students.list"
+        sql: نص SELECT بدون WHERE أو ORDER BY
+        filters: أزواج (اسم الفلتر، الشرط) بالترتيب الذي تُضاف به إلى WHERE
+        order_by: نص ORDER BY بدون الكلمة نفسها
+    """
+    if name in _registry:
+        raise ValueError(f"الاستعلام مسجل مسبقاً: {name}")
+    query = NamedQuery(name, canonical_sql(sql),
+                       tuple(QueryFilter(filter_name, canonical_sql(condition)) for filter_name, condition in filters),
+                       canonical_sql(order_by))
+    if len({query_filter.name for query_filter in query.filters}) != len(query.filters):
+        raise ValueError(f"أسماء فلاتر مكررة في الاستعلام: {name}")
+    _registry[name] = query
+    return query
+
+
+def get_query(name: str) -> NamedQuery:
+    try:
+        return _registry[name]
+    except KeyError:
+        raise ValueError(f"استعلام غير مسجل: {name}") from None
+
+
+@lru_cache(maxsize=256)
+def query_shape(name: str, active: Tuple[str, ...]) -> str:
+    """نص الاستعلام للفلاتر النشطة active (بترتيب تعريفها)، محفوظ لكل مجموعة"""
+    query = get_query(name)
+    sql = query.sql
+    conditions = [query.filter(filter_name).condition for filter_name in active]
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    if query.order_by:
+        sql += f" ORDER BY {query.order_by}"
+    return sql
+
+
+def build_query(name: str, **filters: Any) -> Tuple[str, tuple]:
+    """نص الاستعلام ومعاملاته لقيم الفلاتر المعطاة
+
+    الفلتر بقيمة None أو False أو غير الممرر لا يُضاف إلى الشرط
+
+    Returns:
+        (النص، المعاملات)
+    """
+    query = get_query(name)
+    for filter_name in filters:
+        query.filter(filter_name)
+
+    active, params = [], []
+    for query_filter in query.filters:
+        value = filters.get(query_filter.name)
+        if value is None or value is False:
+            continue
+        active.append(query_filter.name)
+        if query_filter.param_count == 1:
+            params.append(value)
+        elif query_filter.param_count > 1:
+            values = tuple(value)
+            if len(values) != query_filter.param_count:
+                raise ValueError(
+                    f"الفلتر {query_filter.name} يحتاج {query_filter.param_count} قيم، وأُعطي {len(values)}"
+                )
+            params.extend(values)
+    return query_shape(name, tuple(active)), tuple(params)
+
+
+def registered_queries() -> Sequence[str]:
+    return sorted(_registry)
+
+
+# قائمة الطلاب مع أرصدتهم (بدون ترتيب؛ يرتبها KeysetPager)
+register_query(
+    "students.list",
+    """
+    SELECT s.id, s.name, sc.name_ar as school_name,
+           s.grade, s.section, s.gender,
+           s.phone, s.status, s.start_date, s.total_fee,
+           b.installments_paid, b.outstanding, b.last_payment_date
+    FROM students s
+    LEFT JOIN schools sc ON s.school_id = sc.id
+    JOIN student_balances b ON b.student_id = s.id
+    """,
+    filters=(
+        ("school_id", "s.school_id = ?"),
+        ("grade", "s.grade = ?"),
+        ("status", "s.status = ?"),
+        ("gender", "s.gender = ?"),
+        ("has_outstanding", "b.outstanding > 0"),
+        ("settled", "b.outstanding <= 0"),
+        # قيمة الفلتر تعبير MATCH من match_expression
+        ("search", search_clause("students", "s.id")),
+    ),
+)
+
+# قائمة المصروفات
+register_query(
+    "expenses.list",
+    """
+    SELECT e.id, e.title, e.amount, e.category, e.expense_date,
+           e.notes, s.name_ar as school_name, e.created_at
+    FROM expenses e
+    LEFT JOIN schools s ON e.school_id = s.id
+    """,
+    filters=(
+        ("school_id", "e.school_id = ?"),
+        ("category", "e.category = ?"),
+        # قيمة الفلتر حدا DateBounds بالترتيب
+        ("date_range", "e.expense_date >= ? AND e.expense_date < ?"),
+        ("search", search_clause("expenses", "e.id")),
+    ),
+    order_by="e.expense_date DESC, e.created_at DESC",
+)
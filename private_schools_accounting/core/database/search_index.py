@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+فهارس البحث النصي (FTS5) للأسماء والملاحظات
+تُخزن النصوص بعد توحيد الكتابة العربية، وتبقى متزامنة مع الجداول الأصلية عبر triggers
+
+التوحيد داخل triggers مكتوب بدوال SQLite المدمجة (replace وlower)، فالكتابة من
+sqlite3 أو أي أداة خارجية لا تحتاج دالة مسجلة من البرنامج
+"""
+
+import logging
+import sqlite3
+from typing import Iterable, Optional, Sequence, Tuple
+
+from core.utils.arabic import DIACRITICS, LETTER_FORMS, normalize_arabic
+
+# دالة التوحيد المسجلة على كل اتصال في DatabaseManager.configure_connection؛
+# triggers الفهارس لم تعد تستدعيها، لكن قواعد البيانات قبل الترحيل 8 ما زالت تحتاجها
+NORMALIZE_FUNCTION = "normalize_ar"
+
+# الجدول الأصلي ← الأعمدة المفهرسة للبحث
+SEARCH_INDEXES = {
+    "students": ("name",),
+    "teachers": ("name", "phone"),
+    "employees": ("name", "phone"),
+    "expenses": ("title", "notes"),
+    "external_income": ("title", "notes"),
+    "additional_fees": ("notes",),
+    "salaries": ("staff_name",),
+}
+
+
+def register_functions(connection: sqlite3.Connection):
+    """تسجيل دالة التوحيد التي تستدعيها triggers الفهارس القديمة"""
+    connection.create_function(NORMALIZE_FUNCTION, 1, normalize_arabic, deterministic=True)
+
+
+def fts_table(table: str) -> str:
+    """اسم جدول FTS الخاص بجدول أصلي"""
+    return f"{table}_fts"
+
+
+def _object_exists(cursor: sqlite3.Cursor, object_type: str, name: str) -> bool:
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = ? AND name = ?", (object_type, name))
+    return cursor.fetchone() is not None
+
+
+# عدد استدعاءات replace المتداخلة في كل استعلام فرعي (محلل SQLite يرفض التداخل العميق)
+_REPLACEMENTS_PER_STEP = 20
+
+
+def normalized_select(columns: Sequence[str], id_expression: str = "id",
+                      prefix: str = "", source: str = "") -> str:
+    """استعلام SELECT يعيد (id, الأعمدة بعد توحيدها كما تفعل normalize_arabic) بدوال SQLite المدمجة
+
+    الاستبدالات موزعة على استعلامات فرعية متتالية بدلاً من تعبير واحد متداخل.
+    lower في SQLite لا تغير إلا الحروف اللاتينية، ومقطع unicode61 يوحد حالة الباقي
+
+    مثال:
+        normalized_select(("name",), "new.id", "new.")          # داخل trigger
+        normalized_select(("name",), source=" FROM students")   # لإعادة ملء الفهرس
+    """
+    replacements = [(char, "") for char in DIACRITICS] + list(LETTER_FORMS.items())
+    selected = [f"{id_expression} AS id"] + [f"{prefix}{column} AS {column}" for column in columns]
+    query = f"SELECT {', '.join(selected)}{source}"
+    for start in range(0, len(replacements), _REPLACEMENTS_PER_STEP):
+        step = replacements[start:start + _REPLACEMENTS_PER_STEP]
+        selected = ["id"]
+        for column in columns:
+            expression = column
+            for char, replacement in step:
+                expression = f"replace({expression}, '{char}', '{replacement}')"
+            if start + _REPLACEMENTS_PER_STEP >= len(replacements):
+                expression = f"lower({expression})"
+            selected.append(f"{expression} AS {column}")
+        query = f"SELECT {', '.join(selected)} FROM ({query})"
+    return query
+
+
+def ensure_search_index(cursor: sqlite3.Cursor, table: str) -> bool:
+    """إنشاء جدول FTS وtriggers المزامنة لجدول واحد إن لم تكن موجودة
+
+    يُعاد ملء الفهرس إن كان جديداً أو فُقدت triggers (مثلاً بعد إعادة بناء الجدول الأصلي)
+
+    Returns:
+        True إن كان الجدول الأصلي موجوداً وأصبح فهرسه جاهزاً
+    """
+    columns = SEARCH_INDEXES[table]
+    index = fts_table(table)
+    if not _object_exists(cursor, "table", table):
+        return False
+
+    triggers = {f"{index}_ai", f"{index}_ad", f"{index}_au"}
+    needs_rebuild = not _object_exists(cursor, "table", index) or not all(
+        _object_exists(cursor, "trigger", name) for name in triggers
+    )
+
+    column_list = ", ".join(columns)
+    # بدون علامات التشكيل بعد التوحيد؛ prefix لتسريع البحث بأول حرفين أو ثلاثة
+    cursor.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {index} USING fts5(
+            {column_list}, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+        )
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {index}_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {index}(rowid, {column_list}) {normalized_select(columns, 'new.id', 'new.')};
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {index}_ad AFTER DELETE ON {table} BEGIN
+            DELETE FROM {index} WHERE rowid = old.id;
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {index}_au AFTER UPDATE OF id, {column_list} ON {table} BEGIN
+            DELETE FROM {index} WHERE rowid = old.id;
+            INSERT INTO {index}(rowid, {column_list}) {normalized_select(columns, 'new.id', 'new.')};
+        END
+    """)
+
+    if needs_rebuild:
+        rebuild_search_index(cursor, table)
+    return True
+
+
+def drop_search_triggers(cursor: sqlite3.Cursor, table: str):
+    """حذف triggers مزامنة فهرس جدول (ensure_search_index يعيد إنشاءها ويعيد ملء الفهرس)"""
+    index = fts_table(table)
+    for suffix in ("ai", "ad", "au"):
+        cursor.execute(f"DROP TRIGGER IF EXISTS {index}_{suffix}")
+
+
+def rebuild_search_index(cursor: sqlite3.Cursor, table: str):
+    """إعادة ملء فهرس البحث من الجدول الأصلي (بعد تغيير قواعد التوحيد مثلاً)"""
+    columns = SEARCH_INDEXES[table]
+    index = fts_table(table)
+    cursor.execute(f"DELETE FROM {index}")
+    cursor.execute(f"""
+        INSERT INTO {index}(rowid, {', '.join(columns)})
+        {normalized_select(columns, source=f' FROM {table}')}
+    """)
+    logging.info(f"تم بناء فهرس البحث {index}")
+
+
+def ensure_search_indexes(cursor: sqlite3.Cursor, tables: Optional[Iterable[str]] = None):
+    """إنشاء فهارس البحث لكل الجداول الموجودة (الجداول غير المنشأة بعد تُتجاوز)"""
+    try:
+        for table in tables or SEARCH_INDEXES:
+            ensure_search_index(cursor, table)
+    except Exception as e:
+        logging.error(f"خطأ في إنشاء فهارس البحث: {e}")
+        raise
+
+
+def match_expression(text: str, columns: Optional[Sequence[str]] = None) -> Optional[str]:
+    """تحويل نص البحث إلى تعبير MATCH: كل كلمة بادئة، وجميع الكلمات مطلوبة
+
+    يعيد None إن لم يبقَ من النص ما يُبحث عنه
+    """
+    terms = []
+    for word in (normalize_arabic(text) or "").split():
+        # علامات الاقتباس تمنع تفسير الرموز كصيغة FTS5
+        terms.append('"' + word.replace('"', '""') + '"*')
+    if not terms:
+        return None
+    expression = " ".join(terms)
+    if columns:
+        expression = "{" + " ".join(columns) + "} : (" + expression + ")"
+    return expression
+
+
+def search_condition(table: str, id_column: str, text: str,
+                     columns: Optional[Sequence[str]] = None) -> Optional[Tuple[str, str]]:
+    """شرط WHERE يحصر النتائج في الصفوف المطابقة لنص البحث
+
+    مثال:
+        condition = search_condition("students", "s.id", "احمد")
+        if condition:
+            query += f" AND {condition[0]}"
+            params.append(condition[1])
+    """
+    clause = search_clause(table, id_column)
+    expression = match_expression(text, columns)
+    if expression is None:
+        return None
+    return clause, expression
+
+
+def search_clause(table: str, id_column: str) -> str:
+    """نص شرط البحث بمعامل واحد هو تعبير MATCH (ثابت لكل جدول، لسجل الاستعلامات)"""
+    if table not in SEARCH_INDEXES:
+        raise ValueError(f"لا يوجد فهرس بحث للجدول: {table}")
+    index = fts_table(table)
+    return f"{id_column} IN (SELECT rowid FROM {index} WHERE {index} MATCH ?)"
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+لقطات متسقة من قاعدة البيانات أثناء عمل البرنامج
+تُنسخ الصفحات بواجهة النسخ الاحتياطي في SQLite (Connection.backup) على خطوات مع تقرير التقدم،
+بدلاً من نسخ الملف مباشرة الذي قد يلتقط ملفاً ممزقاً أثناء الكتابة
+
+اتصال المصدر يبقي معاملة قراءة مفتوحة طوال النسخ فتكون اللقطة لحظة واحدة ثابتة:
+مع WAL لا تحجب هذه المعاملة الكتابة من الواجهة، ولا يُعاد النسخ من البداية عند كل تعديل
+"""
+
+import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+import config
+
+# تُستدعى بعد كل خطوة بـ (الصفحات المنسوخة، إجمالي الصفحات)
+ProgressCallback = Callable[[int, int], None]
+
+
+@dataclass(frozen=True)
+class SnapshotInfo:
+    """نتيجة لقطة: ملفها وحجمها وعدد صفحاتها وإصدار مخططها"""
+    path: Path
+    size: int
+    page_count: int
+    schema_version: int
+    duration_ms: float
+
+
+def create_snapshot(source_path: Union[str, Path], target_path: Union[str, Path],
+                    progress: Optional[ProgressCallback] = None,
+                    pages_per_step: Optional[int] = None,
+                    step_sleep: Optional[float] = None) -> SnapshotInfo:
+    """نسخ قاعدة البيانات source_path إلى ملف مستقل target_path
+
+    يُكتب الملف باسم مؤقت ثم يُعاد تسميته، فلا يظهر target_path إلا كاملاً
+
+    Args:
+        progress: دالة التقدم (الصفحات المنسوخة، الإجمالي)
+        pages_per_step: عدد الصفحات في كل خطوة (config.BACKUP_SNAPSHOT_PAGES_PER_STEP افتراضياً)
+        step_sleep: التوقف بين الخطوات بالثواني (config.BACKUP_SNAPSHOT_STEP_SLEEP افتراضياً)
+    """
+    pages_per_step = pages_per_step or config.BACKUP_SNAPSHOT_PAGES_PER_STEP
+    step_sleep = config.BACKUP_SNAPSHOT_STEP_SLEEP if step_sleep is None else step_sleep
+    target_path = Path(target_path)
+    partial_path = target_path.with_name(target_path.name + ".part")
+    started = time.perf_counter()
+
+    if not Path(source_path).exists():
+        raise FileNotFoundError(f"قاعدة البيانات غير موجودة: {source_path}")
+    target_path.parent.mkdir(parents=True, exist_ok=True)
+    if partial_path.exists():
+        partial_path.unlink()
+
+    source = sqlite3.connect(str(source_path), isolation_level=None, check_same_thread=False)
+    try:
+        source.execute(f"PRAGMA busy_timeout = {config.DATABASE_PRAGMAS.get('busy_timeout', 5000)}")
+        # معاملة القراءة تثبت اللقطة عند هذه اللحظة حتى نهاية النسخ
+        source.execute("BEGIN")
+        schema_version = source.execute("PRAGMA user_version").fetchone()[0]
+
+        target = sqlite3.connect(str(partial_path))
+        try:
+            def report(status: int, remaining: int, total: int):
+                if progress is not None:
+                    progress(total - remaining, total)
+
+            source.backup(target, pages=pages_per_step, progress=report, sleep=step_sleep)
+            source.execute("COMMIT")
+            # اللقطة ملف واحد مستقل بدون WAL
+            target.execute("PRAGMA journal_mode = DELETE")
+            page_count = target.execute("PRAGMA page_count").fetchone()[0]
+        finally:
+            target.close()
+    except Exception as e:
+        logging.error(f"خطأ في إنشاء لقطة قاعدة البيانات: {e}")
+        if partial_path.exists():
+            partial_path.unlink()
+        raise
+    finally:
+        source.close()
+
+    os.replace(partial_path, target_path)
+    info = SnapshotInfo(
+        path=target_path,
+        size=target_path.stat().st_size,
+        page_count=page_count,
+        schema_version=schema_version,
+        duration_ms=round((time.perf_counter() - started) * 1000, 3),
+    )
+    logging.info(f"تم إنشاء لقطة قاعدة البيانات: {target_path} ({info.page_count} صفحة، {info.duration_ms:.0f} مللي ثانية)")
+    return info
+
+
+class SnapshotService:
+    """إنشاء لقطات قاعدة البيانات في الخيط المستدعي أو في خيط عامل واحد
+
+    db_path: قاعدة البيانات المصدر (config.DATABASE_PATH افتراضياً وقت الاستدعاء)
+    """
+
+    def __init__(self, db_path: Optional[Union[str, Path]] = None):
+        self._db_path = db_path
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def db_path(self) -> Path:
+        return Path(self._db_path or config.DATABASE_PATH)
+
+    def snapshot(self, target_path: Union[str, Path],
+                 progress: Optional[ProgressCallback] = None) -> SnapshotInfo:
+        """إنشاء لقطة في الخيط الحالي (للاستدعاء من خيوط عاملة مثل BackupWorker)"""
+        return create_snapshot(self.db_path, target_path, progress)
+
+    def snapshot_async(self, target_path: Union[str, Path],
+                       progress: Optional[ProgressCallback] = None) -> Future:
+        """إنشاء لقطة في خيط عامل؛ اللقطات المتتالية تُنفذ بالترتيب
+
+        progress تُستدعى من الخيط العامل، فعلى الواجهة تمريرها عبر إشارة Qt
+
+        Returns:
+            Future نتيجته SnapshotInfo
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-snapshot")
+        return self._executor.submit(self.snapshot, target_path, progress)
+
+    def shutdown(self, wait: bool = True):
+        """إيقاف الخيط العامل"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+# خدمة اللقطات المشتركة لقاعدة بيانات البرنامج
+snapshot_service = SnapshotService()
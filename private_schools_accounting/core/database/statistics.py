@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+استعلامات لوحات الإحصائيات
+كل لوحة تُحسب باستعلام واحد بتجميع شرطي (SUM(CASE WHEN ...)) بدلاً من استعلام لكل رقم
+"""
+
+import logging
+from dataclasses import dataclass, fields
+from datetime import date
+from typing import Optional, Type, TypeVar
+
+from core.database.connection import DatabaseManager, db_manager
+from core.utils.date_range import current_month_bounds
+from core.utils.money import Money
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class SalaryStatistics:
+    """إحصائيات صفحة الرواتب"""
+    total_count: int = 0
+    total_amount: Money = Money(0)
+    teachers_count: int = 0
+    employees_count: int = 0
+    monthly_count: int = 0
+    monthly_amount: Money = Money(0)
+    monthly_teachers: int = 0
+    monthly_employees: int = 0
+
+
+@dataclass(frozen=True)
+class StudentStatistics:
+    """إحصائيات صفحة الطلاب"""
+    total_count: int = 0
+    active_count: int = 0
+
+
+@dataclass(frozen=True)
+class StudentBalance:
+    """رصيد طالب واحد من جدول أرصدة الطلاب"""
+    total_fee: Money = Money(0)
+    installments_paid: Money = Money(0)
+    installments_count: int = 0
+    outstanding: Money = Money(0)
+    last_payment_date: Optional[str] = None  # YYYY-MM-DD
+    additional_fees_total: Money = Money(0)
+    additional_fees_paid: Money = Money(0)
+
+    @property
+    def additional_fees_due(self) -> Money:
+        """الرسوم الإضافية غير المدفوعة"""
+        return self.additional_fees_total - self.additional_fees_paid
+
+
+@dataclass(frozen=True)
+class DashboardStatistics:
+    """بطاقات لوحة التحكم"""
+    schools_count: int = 0
+    students_count: int = 0
+    total_fees: Money = Money(0)
+    paid_fees: Money = Money(0)
+    additional_fees_paid: Money = Money(0)
+
+    @property
+    def remaining_fees(self) -> Money:
+        """الأقساط المتبقية"""
+        return self.total_fees - self.paid_fees
+
+
+@dataclass(frozen=True)
+class PeriodTotals:
+    """مجموع نوع حركة (مصروفات، واردات...) في الشهر والسنة الحاليين"""
+    month_total: Money = Money(0)
+    year_total: Money = Money(0)
+
+
+def _fetch(result_type: Type[T], query: str, params: tuple, manager: Optional[DatabaseManager]) -> T:
+    """تنفيذ استعلام صف واحد وبناء كائن النتيجة من أعمدته (بنفس أسماء الحقول)"""
+    row = (manager or db_manager).execute_fetch_one(query, params)
+    if row is None:
+        return result_type()
+    return result_type(**{field.name: row[field.name] for field in fields(result_type)})
+
+
+def salary_statistics(manager: Optional[DatabaseManager] = None,
+                      today: Optional[date] = None) -> SalaryStatistics:
+    """إحصائيات الرواتب العامة والشهر الحالي في مرور واحد على جدول الرواتب"""
+    try:
+        in_month = "payment_date >= ? AND payment_date < ?"
+        query = f"""
+            SELECT COUNT(*) AS total_count,
+                   COALESCE(SUM(paid_amount), 0) AS "total_amount [MONEY]",
+                   COALESCE(SUM(CASE WHEN staff_type = 'teacher' THEN 1 ELSE 0 END), 0) AS teachers_count,
+                   COALESCE(SUM(CASE WHEN staff_type = 'employee' THEN 1 ELSE 0 END), 0) AS employees_count,
+                   COALESCE(SUM(CASE WHEN {in_month} THEN 1 ELSE 0 END), 0) AS monthly_count,
+                   COALESCE(SUM(CASE WHEN {in_month} THEN paid_amount ELSE 0 END), 0) AS "monthly_amount [MONEY]",
+                   COALESCE(SUM(CASE WHEN staff_type = 'teacher' AND {in_month} THEN 1 ELSE 0 END), 0) AS monthly_teachers,
+                   COALESCE(SUM(CASE WHEN staff_type = 'employee' AND {in_month} THEN 1 ELSE 0 END), 0) AS monthly_employees
+            FROM salaries
+        """
+        return _fetch(SalaryStatistics, query, current_month_bounds(today) * 4, manager)
+
+    except Exception as e:
+        logging.error(f"خطأ في حساب إحصائيات الرواتب: {e}")
+        raise
+
+
+def student_statistics(manager: Optional[DatabaseManager] = None) -> StudentStatistics:
+    """عدد الطلاب الكلي والنشطين في مرور واحد"""
+    try:
+        query = """
+            SELECT COUNT(*) AS total_count,
+                   COALESCE(SUM(CASE WHEN status = 'نشط' THEN 1 ELSE 0 END), 0) AS active_count
+            FROM students
+        """
+        return _fetch(StudentStatistics, query, (), manager)
+
+    except Exception as e:
+        logging.error(f"خطأ في حساب إحصائيات الطلاب: {e}")
+        raise
+
+
+def student_balance(student_id: int, manager: Optional[DatabaseManager] = None) -> StudentBalance:
+    """رصيد الطالب المحدث عبر triggers (قراءة صف واحد بدلاً من جمع أقساطه ورسومه)"""
+    try:
+        query = """
+            SELECT total_fee, installments_paid, installments_count, outstanding, last_payment_date,
+                   additional_fees_total, additional_fees_paid
+            FROM student_balances
+            WHERE student_id = ?
+        """
+        return _fetch(StudentBalance, query, (student_id,), manager)
+
+    except Exception as e:
+        logging.error(f"خطأ في قراءة رصيد الطالب {student_id}: {e}")
+        raise
+
+
+def dashboard_statistics(manager: Optional[DatabaseManager] = None) -> DashboardStatistics:
+    """جميع بطاقات لوحة التحكم من جدول ملخص المدارس (صف لكل مدرسة) باستعلام واحد"""
+    try:
+        query = """
+            SELECT (SELECT COUNT(*) FROM schools) AS schools_count,
+                   COALESCE(SUM(students_count), 0) AS students_count,
+                   COALESCE(SUM(total_fees), 0) AS "total_fees [MONEY]",
+                   COALESCE(SUM(installments_paid), 0) AS "paid_fees [MONEY]",
+                   COALESCE(SUM(additional_fees_paid), 0) AS "additional_fees_paid [MONEY]"
+            FROM school_summary
+        """
+        return _fetch(DashboardStatistics, query, (), manager)
+
+    except Exception as e:
+        logging.error(f"خطأ في حساب إحصائيات لوحة التحكم: {e}")
+        raise
+
+
+def period_totals(kind: str, manager: Optional[DatabaseManager] = None,
+                  today: Optional[date] = None) -> PeriodTotals:
+    """مجموع الشهر والسنة الحاليين لنوع حركة من ملخص الأشهر (بضعة صفوف لكل شهر)
+
+    kind: أحد أنواع monthly_summary مثل 'expenses' أو 'external_income'
+    """
+    try:
+        today = today or date.today()
+        query = """
+            SELECT COALESCE(SUM(CASE WHEN month = ? THEN total ELSE 0 END), 0) AS "month_total [MONEY]",
+                   COALESCE(SUM(total), 0) AS "year_total [MONEY]"
+            FROM monthly_summary
+            WHERE month >= ? AND month <= ? AND kind = ?
+        """
+        params = (today.strftime("%Y-%m"), f"{today.year}-01", f"{today.year}-12", kind)
+        return _fetch(PeriodTotals, query, params, manager)
+
+    except Exception as e:
+        logging.error(f"خطأ في حساب مجاميع الفترة ({kind}): {e}")
+        raise
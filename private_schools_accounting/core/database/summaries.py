@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+جداول الملخصات المحدثة تلقائياً
+تُحدَّث عبر triggers داخل نفس معاملة الإضافة أو التعديل أو الحذف، فتصبح قراءة
+مجاميع لوحة التحكم والمدارس قراءة صفوف قليلة بدلاً من SUM على كامل الجداول
+"""
+
+import logging
+import sqlite3
+from typing import Dict, List, Optional, Sequence
+
+SUMMARY_TABLES = {
+    # رصيد كل طالب: القسط الكلي والمدفوع والمتبقي وآخر دفعة والرسوم الإضافية
+    "student_balances": """
+        CREATE TABLE student_balances (
+            student_id INTEGER PRIMARY KEY,
+            school_id INTEGER NOT NULL,
+            total_fee MONEY NOT NULL DEFAULT 0,
+            installments_paid MONEY NOT NULL DEFAULT 0,
+            installments_count INTEGER NOT NULL DEFAULT 0,
+            outstanding MONEY NOT NULL DEFAULT 0,
+            last_payment_date DATE,
+            additional_fees_total MONEY NOT NULL DEFAULT 0,
+            additional_fees_paid MONEY NOT NULL DEFAULT 0
+        )
+    """,
+    # مجاميع كل مدرسة
+    "school_summary": """
+        CREATE TABLE school_summary (
+            school_id INTEGER PRIMARY KEY,
+            students_count INTEGER NOT NULL DEFAULT 0,
+            total_fees MONEY NOT NULL DEFAULT 0,
+            installments_paid MONEY NOT NULL DEFAULT 0,
+            additional_fees_total MONEY NOT NULL DEFAULT 0,
+            additional_fees_paid MONEY NOT NULL DEFAULT 0,
+            expenses_total MONEY NOT NULL DEFAULT 0,
+            income_total MONEY NOT NULL DEFAULT 0
+        )
+    """,
+    # مجاميع كل شهر (YYYY-MM) لكل مدرسة ونوع حركة؛ الرواتب غير مرتبطة بمدرسة فتُسجل للمدرسة 0
+    "monthly_summary": """
+        CREATE TABLE monthly_summary (
+            month TEXT NOT NULL,
+            school_id INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            entries INTEGER NOT NULL DEFAULT 0,
+            total MONEY NOT NULL DEFAULT 0,
+            PRIMARY KEY (month, school_id, kind)
+        ) WITHOUT ROWID
+    """,
+    # مجاميع كل نوع من الرسوم الإضافية
+    "fee_type_summary": """
+        CREATE TABLE fee_type_summary (
+            fee_type TEXT PRIMARY KEY,
+            entries INTEGER NOT NULL DEFAULT 0,
+            total MONEY NOT NULL DEFAULT 0,
+            paid_total MONEY NOT NULL DEFAULT 0
+        )
+    """,
+}
+
+# الصفوف التي كل قيمها أصفار تعادل الصفوف غير الموجودة عند التحقق
+NON_ZERO = {
+    "student_balances": "1",
+    "school_summary": (
+        "students_count != 0 OR total_fees != 0 OR installments_paid != 0 OR additional_fees_total != 0 "
+        "OR additional_fees_paid != 0 OR expenses_total != 0 OR income_total != 0"
+    ),
+    "monthly_summary": "entries != 0 OR total != 0",
+    "fee_type_summary": "entries != 0 OR total != 0 OR paid_total != 0",
+}
+
+
+def _upsert(table: str, conflict: str, values: Dict[str, str], source: str = "") -> str:
+    """إضافة صف الملخص أو زيادة قيمه بالفروقات (كل الأعمدة غير المفتاحية تُجمع)"""
+    keys = [key.strip() for key in conflict.split(",")]
+    updates = ", ".join(f"{column} = {column} + excluded.{column}" for column in values if column not in keys)
+    return (
+        f"INSERT INTO {table} ({', '.join(values)}) SELECT {', '.join(values.values())} {source} "
+        f"ON CONFLICT({conflict}) DO UPDATE SET {updates}"
+    )
+
+
+def _school_of(alias: str) -> str:
+    """مصدر مدرسة الطالب لحركات الطالب (من الرصيد، لأن سجل الطالب يُحذف قبل حركاته المتتالية)"""
+    return f"FROM student_balances WHERE student_id = {alias}.student_id"
+
+
+def _student_changes(alias: str, sign: str) -> List[str]:
+    """أثر سجل طالب على ملخص مدرسته (ومعه ما بقي من أقساطه ورسومه)"""
+    balance = f"(SELECT {{column}} FROM student_balances WHERE student_id = {alias}.id)"
+    remaining = {
+        column: f"{sign}COALESCE({balance.format(column=column)}, 0)"
+        for column in ("installments_paid", "additional_fees_total", "additional_fees_paid")
+    }
+    return [
+        _upsert("school_summary", "school_id", {
+            "school_id": f"{alias}.school_id",
+            "students_count": f"{sign}1",
+            "total_fees": f"{sign}COALESCE({alias}.total_fee, 0)",
+            **remaining,
+        }),
+        _upsert("monthly_summary", "month, school_id, kind", {
+            "month": "substr(payment_date, 1, 7)",
+            "school_id": f"{alias}.school_id",
+            "kind": "'installments'",
+            "entries": f"{sign}COUNT(*)",
+            "total": f"{sign}COALESCE(SUM(amount), 0)",
+        }, f"FROM installments WHERE student_id = {alias}.id GROUP BY substr(payment_date, 1, 7)"),
+    ]
+
+
+def _installment_changes(alias: str, sign: str) -> List[str]:
+    amount = f"{sign}COALESCE({alias}.amount, 0)"
+    return [
+        f"UPDATE student_balances SET installments_paid = installments_paid + {amount}, "
+        f"outstanding = outstanding - ({amount}), installments_count = installments_count + {sign}1, "
+        f"last_payment_date = (SELECT MAX(payment_date) FROM installments WHERE student_id = {alias}.student_id) "
+        f"WHERE student_id = {alias}.student_id",
+        _upsert("school_summary", "school_id", {
+            "school_id": "school_id",
+            "installments_paid": amount,
+        }, _school_of(alias)),
+        _upsert("monthly_summary", "month, school_id, kind", {
+            "month": f"substr({alias}.payment_date, 1, 7)",
+            "school_id": "school_id",
+            "kind": "'installments'",
+            "entries": f"{sign}1",
+            "total": amount,
+        }, _school_of(alias)),
+    ]
+
+
+def _additional_fee_changes(alias: str, sign: str) -> List[str]:
+    amount = f"{sign}COALESCE({alias}.amount, 0)"
+    paid = f"{sign}(CASE WHEN {alias}.paid THEN COALESCE({alias}.amount, 0) ELSE 0 END)"
+    return [
+        f"UPDATE student_balances SET additional_fees_total = additional_fees_total + {amount}, "
+        f"additional_fees_paid = additional_fees_paid + {paid} WHERE student_id = {alias}.student_id",
+        _upsert("school_summary", "school_id", {
+            "school_id": "school_id",
+            "additional_fees_total": amount,
+            "additional_fees_paid": paid,
+        }, _school_of(alias)),
+        _upsert("fee_type_summary", "fee_type", {
+            "fee_type": f"{alias}.fee_type",
+            "entries": f"{sign}1",
+            "total": amount,
+            "paid_total": paid,
+        }),
+    ]
+
+
+def _school_movement_changes(kind: str, date_column: str, total_column: str):
+    """أثر حركة مالية مرتبطة بمدرسة (مصروف أو وارد) على ملخص المدرسة والشهر"""
+    def changes(alias: str, sign: str) -> List[str]:
+        amount = f"{sign}COALESCE({alias}.amount, 0)"
+        return [
+            _upsert("school_summary", "school_id", {
+                "school_id": f"{alias}.school_id",
+                total_column: amount,
+            }),
+            _upsert("monthly_summary", "month, school_id, kind", {
+                "month": f"substr({alias}.{date_column}, 1, 7)",
+                "school_id": f"{alias}.school_id",
+                "kind": f"'{kind}'",
+                "entries": f"{sign}1",
+                "total": amount,
+            }),
+        ]
+    return changes
+
+
+def _salary_changes(alias: str, sign: str) -> List[str]:
+    return [
+        _upsert("monthly_summary", "month, school_id, kind", {
+            "month": f"substr({alias}.payment_date, 1, 7)",
+            "school_id": "0",
+            "kind": "'salaries'",
+            "entries": f"{sign}1",
+            "total": f"{sign}COALESCE({alias}.paid_amount, 0)",
+        }),
+    ]
+
+
+# الجدول المصدر ← (الأعمدة المؤثرة عند التعديل، دالة أثر الصف)
+SOURCES = {
+    "students": (("school_id", "total_fee"), _student_changes),
+    "installments": (("student_id", "amount", "payment_date"), _installment_changes),
+    "additional_fees": (("student_id", "fee_type", "amount", "paid"), _additional_fee_changes),
+    "expenses": (("school_id", "amount", "expense_date"),
+                 _school_movement_changes("expenses", "expense_date", "expenses_total")),
+    "external_income": (("school_id", "amount", "income_date"),
+                        _school_movement_changes("external_income", "income_date", "income_total")),
+    "salaries": (("paid_amount", "payment_date"), _salary_changes),
+}
+
+
+def _trigger_statements(table: str) -> Dict[str, str]:
+    """triggers الإضافة والحذف والتعديل لجدول مصدر: التعديل = طرح القديم ثم إضافة الجديد"""
+    columns, changes = SOURCES[table]
+    inserted, deleted = changes("new", "+"), changes("old", "-")
+    if table == "students":
+        # صف الرصيد يُنشأ قبل احتساب الطالب ويُحذف بعد طرح ما بقي فيه
+        inserted = [
+            "INSERT OR REPLACE INTO student_balances (student_id, school_id, total_fee, outstanding) "
+            "VALUES (new.id, new.school_id, COALESCE(new.total_fee, 0), COALESCE(new.total_fee, 0))"
+        ] + inserted
+        deleted = deleted + ["DELETE FROM student_balances WHERE student_id = old.id"]
+        updated = changes("old", "-") + [
+            "UPDATE student_balances SET school_id = new.school_id, total_fee = COALESCE(new.total_fee, 0), "
+            "outstanding = COALESCE(new.total_fee, 0) - installments_paid WHERE student_id = new.id"
+        ] + changes("new", "+")
+    else:
+        updated = deleted + inserted
+
+    def body(statements: Sequence[str]) -> str:
+        return "".join(f"    {statement};\n" for statement in statements)
+
+    return {
+        f"{table}_summary_ai": f"CREATE TRIGGER {table}_summary_ai AFTER INSERT ON {table} BEGIN\n{body(inserted)}END",
+        f"{table}_summary_ad": f"CREATE TRIGGER {table}_summary_ad AFTER DELETE ON {table} BEGIN\n{body(deleted)}END",
+        f"{table}_summary_au": (
+            f"CREATE TRIGGER {table}_summary_au AFTER UPDATE OF {', '.join(columns)} ON {table} "
+            f"BEGIN\n{body(updated)}END"
+        ),
+    }
+
+
+def _object_exists(cursor: sqlite3.Cursor, object_type: str, name: str) -> bool:
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = ? AND name = ?", (object_type, name))
+    return cursor.fetchone() is not None
+
+
+def _definition(cursor: sqlite3.Cursor, object_type: str, name: str) -> Optional[str]:
+    """نص CREATE المحفوظ للكائن في sqlite_master (None إن لم يكن موجوداً)"""
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type = ? AND name = ?", (object_type, name))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def _ensure_object(cursor: sqlite3.Cursor, object_type: str, name: str, create_sql: str) -> bool:
+    """إنشاء الكائن، أو إعادة إنشائه إن اختلف تعريفه المحفوظ عن الحالي
+
+    Returns:
+        True إن أُنشئ الكائن أو أُعيد إنشاؤه
+    """
+    create_sql = create_sql.strip()
+    current = _definition(cursor, object_type, name)
+    if current == create_sql:
+        return False
+    if current is not None:
+        cursor.execute(f"DROP {object_type.upper()} {name}")
+    cursor.execute(create_sql)
+    return True
+
+
+def ensure_summaries(cursor: sqlite3.Cursor) -> bool:
+    """إنشاء جداول الملخصات وtriggers الجداول المصدر الموجودة
+
+    تُعاد تعبئة الملخصات من البداية إن كانت جديدة أو نقص أي trigger أو تغير تعريف
+    جدول أو trigger (مثلاً جدول مصدر أُنشئ لاحقاً، أو عمود ملخص أُضيف في إصدار أحدث،
+    أو قاعدة بيانات مستعادة من نسخة قديمة)
+
+    Returns:
+        True إن تمت إعادة التعبئة
+    """
+    try:
+        needs_rebuild = False
+        for table, create_sql in SUMMARY_TABLES.items():
+            needs_rebuild |= _ensure_object(cursor, "table", table, create_sql)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_student_balances_school_id ON student_balances(school_id)")
+        # ترتيب قائمة الطلاب حسب المتبقي
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_student_balances_outstanding ON student_balances(outstanding, student_id)"
+        )
+
+        for table in SOURCES:
+            if not _object_exists(cursor, "table", table):
+                continue
+            for name, create_sql in _trigger_statements(table).items():
+                needs_rebuild |= _ensure_object(cursor, "trigger", name, create_sql)
+
+        if needs_rebuild:
+            rebuild_summaries(cursor)
+        return needs_rebuild
+
+    except Exception as e:
+        logging.error(f"خطأ في إنشاء جداول الملخصات: {e}")
+        raise
+
+
+def rebuild_summaries(cursor: sqlite3.Cursor):
+    """إعادة حساب جميع الملخصات من الجداول المصدر"""
+    try:
+        for table in SUMMARY_TABLES:
+            cursor.execute(f"DELETE FROM {table}")
+
+        cursor.execute("""
+            INSERT INTO student_balances (student_id, school_id, total_fee, installments_paid, installments_count,
+                                          outstanding, last_payment_date,
+                                          additional_fees_total, additional_fees_paid)
+            SELECT s.id, s.school_id, COALESCE(s.total_fee, 0),
+                   COALESCE(i.paid, 0), COALESCE(i.entries, 0),
+                   COALESCE(s.total_fee, 0) - COALESCE(i.paid, 0), i.last_payment_date,
+                   COALESCE(f.total, 0), COALESCE(f.paid, 0)
+            FROM students s
+            LEFT JOIN (SELECT student_id, SUM(COALESCE(amount, 0)) AS paid, COUNT(*) AS entries,
+                              MAX(payment_date) AS last_payment_date
+                       FROM installments GROUP BY student_id) i ON i.student_id = s.id
+            LEFT JOIN (SELECT student_id, SUM(COALESCE(amount, 0)) AS total,
+                              SUM(CASE WHEN paid THEN COALESCE(amount, 0) ELSE 0 END) AS paid
+                       FROM additional_fees GROUP BY student_id) f ON f.student_id = s.id
+        """)
+        cursor.execute("""
+            INSERT INTO school_summary (school_id, students_count, total_fees, installments_paid,
+                                        additional_fees_total, additional_fees_paid)
+            SELECT school_id, COUNT(*), SUM(total_fee), SUM(installments_paid),
+                   SUM(additional_fees_total), SUM(additional_fees_paid)
+            FROM student_balances GROUP BY school_id
+        """)
+        cursor.execute("""
+            INSERT INTO monthly_summary (month, school_id, kind, entries, total)
+            SELECT substr(i.payment_date, 1, 7), b.school_id, 'installments', COUNT(*), SUM(COALESCE(i.amount, 0))
+            FROM installments i JOIN student_balances b ON b.student_id = i.student_id
+            GROUP BY 1, 2
+        """)
+        cursor.execute("""
+            INSERT INTO fee_type_summary (fee_type, entries, total, paid_total)
+            SELECT fee_type, COUNT(*), SUM(COALESCE(amount, 0)),
+                   SUM(CASE WHEN paid THEN COALESCE(amount, 0) ELSE 0 END)
+            FROM additional_fees GROUP BY fee_type
+        """)
+
+        for table, kind, date_column, total_column in (
+            ("expenses", "expenses", "expense_date", "expenses_total"),
+            ("external_income", "external_income", "income_date", "income_total"),
+        ):
+            if not _object_exists(cursor, "table", table):
+                continue
+            cursor.execute(_upsert("school_summary", "school_id", {
+                "school_id": "school_id",
+                total_column: "SUM(COALESCE(amount, 0))",
+            }, f"FROM {table} WHERE 1 GROUP BY school_id"))
+            cursor.execute(f"""
+                INSERT INTO monthly_summary (month, school_id, kind, entries, total)
+                SELECT substr({date_column}, 1, 7), school_id, '{kind}', COUNT(*), SUM(COALESCE(amount, 0))
+                FROM {table} GROUP BY 1, 2
+            """)
+
+        if _object_exists(cursor, "table", "salaries"):
+            cursor.execute("""
+                INSERT INTO monthly_summary (month, school_id, kind, entries, total)
+                SELECT substr(payment_date, 1, 7), 0, 'salaries', COUNT(*), SUM(COALESCE(paid_amount, 0))
+                FROM salaries GROUP BY 1
+            """)
+
+        logging.info("تمت إعادة بناء جداول الملخصات")
+
+    except Exception as e:
+        logging.error(f"خطأ في إعادة بناء جداول الملخصات: {e}")
+        raise
+
+
+def verify_summaries(manager) -> Dict[str, int]:
+    """مقارنة الملخصات الحالية بإعادة حسابها دون تعديل قاعدة البيانات
+
+    Returns:
+        عدد الصفوف المختلفة لكل جدول ملخص (فارغ إن كانت جميعها مطابقة)
+    """
+    mismatches = {}
+    with manager.pool.writer() as conn:
+        conn.execute("SAVEPOINT verify_summaries")
+        try:
+            cursor = conn.cursor()
+            for table in SUMMARY_TABLES:
+                cursor.execute(f"CREATE TEMP TABLE current_{table} AS SELECT * FROM {table} WHERE {NON_ZERO[table]}")
+            rebuild_summaries(cursor)
+            for table in SUMMARY_TABLES:
+                expected = f"SELECT * FROM {table} WHERE {NON_ZERO[table]}"
+                current = f"SELECT * FROM current_{table}"
+                cursor.execute(f"""
+                    SELECT (SELECT COUNT(*) FROM ({expected} EXCEPT {current}))
+                         + (SELECT COUNT(*) FROM ({current} EXCEPT {expected}))
+                """)
+                different = cursor.fetchone()[0]
+                if different:
+                    mismatches[table] = different
+        finally:
+            conn.execute("ROLLBACK TO verify_summaries")
+            conn.execute("RELEASE verify_summaries")
+    return mismatches
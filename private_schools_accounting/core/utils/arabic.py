@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+توحيد كتابة النصوص العربية للبحث
+حتى يطابق "احمد" الاسم "أحمد" و"فاطمه" الاسم "فاطمة"
+"""
+
+import re
+from typing import Optional
+
+# التشكيل (الفتحة والضمة والكسرة والتنوين والشدة والسكون...) والألف الخنجرية والتطويل
+DIACRITICS = "".join(
+    chr(code)
+    for start, end in ((0x0610, 0x061A), (0x064B, 0x065F), (0x0670, 0x0670), (0x06D6, 0x06ED), (0x0640, 0x0640))
+    for code in range(start, end + 1)
+)
+_DIACRITICS = re.compile(f"[{DIACRITICS}]")
+
+# أشكال الحروف التي تُكتب بأكثر من طريقة
+LETTER_FORMS = {
+    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
+    "ؤ": "و",
+    "ئ": "ي",
+    "ى": "ي",
+    "ة": "ه",
+    # الأرقام العربية الهندية (أرقام الهواتف)
+    "٠": "0", "١": "1", "٢": "2", "٣": "3", "٤": "4",
+    "٥": "5", "٦": "6", "٧": "7", "٨": "8", "٩": "9",
+}
+_LETTER_FORMS = str.maketrans(LETTER_FORMS)
+
+
+def normalize_arabic(text: Optional[str]) -> Optional[str]:
+    """توحيد النص للمقارنة: حذف التشكيل وتوحيد الهمزات والتاء المربوطة والألف المقصورة
+
+    تُستخدم عند تحويل نص البحث، وفهرس البحث يطبق نفس الجدولين في SQL
+    (search_index.normalized_select)، لذلك أي تغيير فيهما يتطلب إعادة بناء الفهرس
+    """
+    if text is None:
+        return None
+    text = _DIACRITICS.sub("", str(text))
+    return text.translate(_LETTER_FORMS).casefold()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+حدود الفترات الزمنية لفلاتر التاريخ
+بدلاً من strftime('%Y-%m', column) = ? (التي تمنع استخدام الفهرس) نقارن العمود نفسه
+بحدين نصيين: column >= البداية AND column < النهاية
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Optional, Tuple, Union
+
+DateLike = Union[date, datetime, str]
+
+# (البداية ضمناً، النهاية استثناءً) بصيغة YYYY-MM-DD كما تُخزن التواريخ
+DateBounds = Tuple[str, str]
+
+
+def _as_date(value: DateLike) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def day_bounds(start: DateLike, end: Optional[DateLike] = None) -> DateBounds:
+    """فترة من يوم start إلى نهاية يوم end (ضمناً)
+
+    النهاية المستثناة هي اليوم التالي، فتدخل القيم المخزنة مع وقت مثل '2025-01-31 10:00'
+    """
+    start_date = _as_date(start)
+    end_date = _as_date(end) if end is not None else start_date
+    return start_date.isoformat(), (end_date + timedelta(days=1)).isoformat()
+
+
+def month_bounds(year: int, month: int) -> DateBounds:
+    """فترة شهر كامل"""
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start.isoformat(), end.isoformat()
+
+
+def year_bounds(year: int) -> DateBounds:
+    """فترة سنة كاملة"""
+    return date(year, 1, 1).isoformat(), date(year + 1, 1, 1).isoformat()
+
+
+def current_month_bounds(today: Optional[date] = None) -> DateBounds:
+    """فترة الشهر الحالي"""
+    today = today or date.today()
+    return month_bounds(today.year, today.month)
+
+
+def current_year_bounds(today: Optional[date] = None) -> DateBounds:
+    """فترة السنة الحالية"""
+    return year_bounds((today or date.today()).year)
+
+
+def range_condition(column: str) -> str:
+    """شرط WHERE للفترة، معاملاه هما حدا DateBounds بالترتيب
+
+    مثال:
+        query += f" AND {range_condition('e.expense_date')}"
+        params.extend(month_bounds(2025, 1))
+    """
+    return f"{column} >= ? AND {column} < ?"
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+نوع المبالغ المالية المشترك
+يُخزن المبلغ كعدد صحيح بالوحدة الصغرى (الفلس) لتكون الجمع والمقارنة دقيقة
+"""
+
+from decimal import Decimal, ROUND_HALF_UP, InvalidOperation
+from fractions import Fraction
+from typing import Union
+
+import config
+
+# عدد الوحدات الصغرى في الوحدة الكبرى (1 دينار = 1000 فلس)
+MINOR_UNITS = config.MONEY_MINOR_UNITS
+
+Number = Union[int, float, Decimal, str]
+
+
+class Money:
+    """مبلغ مالي بدقة الفلس
+
+    يقبل العمليات الحسابية مع مبالغ أخرى أو أرقام عادية (تُفسر بالدينار)،
+    ويدعم float() و format() لتبقى شيفرة العرض الحالية مثل f"{amount:,.2f}" تعمل كما هي
+    """
+
+    __slots__ = ('_minor',)
+
+    def __init__(self, amount: Union['Money', Number, None] = 0):
+        """إنشاء مبلغ من قيمة بالدينار"""
+        if isinstance(amount, Money):
+            self._minor = amount._minor
+        else:
+            self._minor = self._to_minor(amount)
+
+    @classmethod
+    def from_minor(cls, minor: int) -> 'Money':
+        """إنشاء مبلغ من قيمة بالفلس (كما هي مخزنة في قاعدة البيانات)"""
+        money = cls.__new__(cls)
+        money._minor = int(minor)
+        return money
+
+    @staticmethod
+    def _to_minor(amount: Union[Number, None]) -> int:
+        """تحويل قيمة بالدينار إلى فلس مع التقريب"""
+        if amount is None or amount == "":
+            return 0
+        if isinstance(amount, bool):
+            raise TypeError("لا يمكن تحويل قيمة منطقية إلى مبلغ")
+        if isinstance(amount, int):
+            return amount * MINOR_UNITS
+        try:
+            # str() للأرقام العشرية تتجنب أخطاء التمثيل الثنائي (0.1 + 0.2)
+            value = Decimal(str(amount).replace(",", "").strip())
+        except InvalidOperation:
+            raise ValueError(f"قيمة مبلغ غير صالحة: {amount}")
+        return int((value * MINOR_UNITS).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+    @property
+    def minor(self) -> int:
+        """المبلغ بالفلس"""
+        return self._minor
+
+    def to_decimal(self) -> Decimal:
+        """المبلغ بالدينار كـ Decimal"""
+        return Decimal(self._minor) / MINOR_UNITS
+
+    # التحويلات
+
+    def __float__(self) -> float:
+        return self._minor / MINOR_UNITS
+
+    def __int__(self) -> int:
+        return int(self.to_decimal())
+
+    def __round__(self, ndigits=None):
+        return round(self.to_decimal(), ndigits)
+
+    def __bool__(self) -> bool:
+        return self._minor != 0
+
+    def __format__(self, spec: str) -> str:
+        if not spec:
+            return str(self)
+        return format(self.to_decimal(), spec)
+
+    def __str__(self) -> str:
+        if self._minor % MINOR_UNITS == 0:
+            return str(self._minor // MINOR_UNITS)
+        return format(self.to_decimal().normalize(), 'f')
+
+    def __repr__(self) -> str:
+        return f"Money('{self}')"
+
+    # العمليات الحسابية
+
+    @classmethod
+    def _coerce(cls, other):
+        """تحويل الطرف الآخر إلى فلس، أو None إن لم يكن مبلغاً أو رقماً"""
+        if isinstance(other, Money):
+            return other._minor
+        if isinstance(other, (int, float, Decimal)) and not isinstance(other, bool):
+            return cls._to_minor(other)
+        return None
+
+    def _exact(self, other):
+        """قيمتا الطرفين ككسرين دقيقين للمقارنة، أو None إن لم يكن الطرف الآخر مبلغاً أو رقماً
+
+        المقارنة دون تقريب حتى تبقى متسقة مع __hash__: Money(1) لا يساوي 1.0004
+        """
+        if isinstance(other, Money):
+            return self._minor, other._minor
+        if isinstance(other, (int, float, Decimal)) and not isinstance(other, bool):
+            return Fraction(self._minor, MINOR_UNITS), Fraction(other)
+        return None
+
+    def __add__(self, other):
+        minor = self._coerce(other)
+        if minor is None:
+            return NotImplemented
+        return Money.from_minor(self._minor + minor)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        minor = self._coerce(other)
+        if minor is None:
+            return NotImplemented
+        return Money.from_minor(self._minor - minor)
+
+    def __rsub__(self, other):
+        minor = self._coerce(other)
+        if minor is None:
+            return NotImplemented
+        return Money.from_minor(minor - self._minor)
+
+    def __mul__(self, factor):
+        if isinstance(factor, Money) or isinstance(factor, bool) or not isinstance(factor, (int, float, Decimal)):
+            return NotImplemented
+        product = Decimal(self._minor) * Decimal(str(factor))
+        return Money.from_minor(int(product.quantize(Decimal(1), rounding=ROUND_HALF_UP)))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, Money):
+            # نسبة بين مبلغين
+            return self._minor / other._minor
+        if isinstance(other, bool) or not isinstance(other, (int, float, Decimal)):
+            return NotImplemented
+        quotient = Decimal(self._minor) / Decimal(str(other))
+        return Money.from_minor(int(quotient.quantize(Decimal(1), rounding=ROUND_HALF_UP)))
+
+    def __neg__(self):
+        return Money.from_minor(-self._minor)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return Money.from_minor(abs(self._minor))
+
+    # المقارنات
+
+    def __eq__(self, other):
+        values = self._exact(other)
+        if values is None:
+            return NotImplemented
+        return values[0] == values[1]
+
+    def __lt__(self, other):
+        values = self._exact(other)
+        if values is None:
+            return NotImplemented
+        return values[0] < values[1]
+
+    def __le__(self, other):
+        values = self._exact(other)
+        if values is None:
+            return NotImplemented
+        return values[0] <= values[1]
+
+    def __gt__(self, other):
+        values = self._exact(other)
+        if values is None:
+            return NotImplemented
+        return values[0] > values[1]
+
+    def __ge__(self, other):
+        values = self._exact(other)
+        if values is None:
+            return NotImplemented
+        return values[0] >= values[1]
+
+    def __hash__(self):
+        # بصمة الكسر الدقيق تساوي بصمة أي int أو float أو Decimal يساويه
+        return hash(Fraction(self._minor, MINOR_UNITS))
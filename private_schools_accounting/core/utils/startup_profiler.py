@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+تتبع زمن بدء التشغيل
+يسجل زمن كل مرحلة (إعداد السجلات، قاعدة البيانات، نافذة الدخول، النافذة الرئيسية، كل صفحة)
+وزمن استيراد كل وحدة بأسلوب python -X importtime، ثم يكتب تقريراً JSON ونصياً في مجلد السجلات
+
+التفعيل: python main.py --profile-startup أو متغير البيئة SCHOOLS_PROFILE_STARTUP=1
+
+هذه الوحدة لا تستورد config ولا أي وحدة من المشروع حتى يُقاس زمن استيرادها أيضاً
+"""
+
+import builtins
+import importlib.util
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+STARTUP_FLAG = "--profile-startup"
+STARTUP_ENV = "SCHOOLS_PROFILE_STARTUP"
+REPORT_NAME = "startup_profile"
+
+# عدد الوحدات الأبطأ المعروضة في التقرير النصي
+TOP_IMPORTS = 30
+
+
+class StartupProfiler:
+    """قياس مراحل بدء التشغيل وزمن الاستيراد (معطل ما لم يُستدعَ start)
+
+    المراحل المعلمة waiting (انتظار المستخدم مثل نافذة الدخول) تُطرح من الزمن الكلي
+    ومن زمن المراحل التي تحتويها
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._start = 0.0
+        self._thread = None
+        self._depth = 0
+        self._phases: List[Dict[str, Any]] = []
+        self._imports: Dict[str, Dict[str, Any]] = {}
+        self._import_stack: List[List[Any]] = []
+        self._original_import = None
+
+    def enable_from(self, argv: List[str], environ: Mapping[str, str] = os.environ) -> bool:
+        """تفعيل التتبع إن مُرر الخيار --profile-startup أو ضُبط متغير البيئة
+
+        الخيار يُزال من argv حتى لا يصل إلى QApplication
+        """
+        requested = STARTUP_FLAG in argv
+        while STARTUP_FLAG in argv:
+            argv.remove(STARTUP_FLAG)
+        requested = requested or environ.get(STARTUP_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+        if requested:
+            self.start()
+        return requested
+
+    def start(self):
+        """بدء القياس وتركيب مؤقت الاستيراد"""
+        if self.enabled:
+            return
+        self.enabled = True
+        self._start = time.perf_counter()
+        self._thread = threading.current_thread()
+        self._depth = 0
+        self._phases = []
+        self._imports = {}
+        self._import_stack = []
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def stop(self):
+        """إيقاف القياس وإعادة دالة الاستيراد الأصلية"""
+        if self._original_import is not None and builtins.__import__ == self._timed_import:
+            builtins.__import__ = self._original_import
+        self._original_import = None
+        self.enabled = False
+
+    def _elapsed_ms(self, since: Optional[float] = None) -> float:
+        return (time.perf_counter() - (self._start if since is None else since)) * 1000
+
+    @staticmethod
+    def _resolve(name: str, globals_: Optional[dict], level: int) -> str:
+        if level == 0:
+            return name
+        package = (globals_ or {}).get("__package__") or ""
+        try:
+            return importlib.util.resolve_name("." * level + name, package)
+        except (ImportError, ValueError):
+            return name
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original_import
+        module_name = self._resolve(name, globals, level)
+        # الوحدات المحملة مسبقاً واستيرادات الخيوط الأخرى لا تُقاس
+        if (module_name in sys.modules or module_name in self._imports
+                or threading.current_thread() is not self._thread):
+            return original(name, globals, locals, fromlist, level)
+
+        frame = [module_name, 0.0]
+        self._import_stack.append(frame)
+        started = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - started
+            self._import_stack.pop()
+            if self._import_stack:
+                self._import_stack[-1][1] += elapsed
+            if module_name in sys.modules and module_name not in self._imports:
+                self._imports[module_name] = {
+                    "module": module_name,
+                    "self_ms": round((elapsed - frame[1]) * 1000, 3),
+                    "cumulative_ms": round(elapsed * 1000, 3),
+                    "depth": len(self._import_stack),
+                }
+
+    @contextmanager
+    def phase(self, name: str, waiting: bool = False):
+        """قياس مرحلة (لا تكلفة عند تعطيل التتبع)"""
+        if not self.enabled or threading.current_thread() is not self._thread:
+            yield
+            return
+        started = time.perf_counter()
+        depth = self._depth
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if self.enabled:
+                self._phases.append({
+                    "name": name,
+                    "start_ms": round((started - self._start) * 1000, 3),
+                    "duration_ms": round(self._elapsed_ms(started), 3),
+                    "depth": depth,
+                    "waiting": waiting,
+                })
+
+    def _active_phases(self) -> List[Dict[str, Any]]:
+        """المراحل بترتيب البدء، مع زمنها بعد طرح مراحل الانتظار الداخلة فيها"""
+        phases = sorted(self._phases, key=lambda item: (item["start_ms"], item["depth"]))
+        waits = [item for item in phases if item["waiting"]]
+        result = []
+        for item in phases:
+            end = item["start_ms"] + item["duration_ms"]
+            waited = sum(
+                wait["duration_ms"] for wait in waits
+                if wait is not item and wait["depth"] > item["depth"]
+                and item["start_ms"] <= wait["start_ms"] and wait["start_ms"] + wait["duration_ms"] <= end
+            )
+            active = item["duration_ms"] if item["waiting"] else item["duration_ms"] - waited
+            result.append({**item, "active_ms": round(active, 3)})
+        return result
+
+    def build_report(self, budget_ms: Optional[float] = None,
+                     phase_budgets_ms: Optional[Mapping[str, float]] = None) -> Dict[str, Any]:
+        """تقرير القياس حتى الآن"""
+        wall_ms = self._elapsed_ms()
+        phases = self._active_phases()
+        waiting_ms = sum(item["duration_ms"] for item in phases if item["waiting"])
+        total_ms = wall_ms - waiting_ms
+
+        phase_budgets_ms = dict(phase_budgets_ms or {})
+        for item in phases:
+            budget = phase_budgets_ms.get(item["name"])
+            item["budget_ms"] = budget
+            item["over_budget"] = budget is not None and item["active_ms"] > budget
+
+        imports = sorted(self._imports.values(), key=lambda item: item["self_ms"], reverse=True)
+        return {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "total_ms": round(total_ms, 3),
+            "wall_ms": round(wall_ms, 3),
+            "waiting_ms": round(waiting_ms, 3),
+            "budget_ms": budget_ms,
+            "over_budget": budget_ms is not None and total_ms > budget_ms,
+            "imports_total_ms": round(sum(item["self_ms"] for item in imports), 3),
+            "phases": phases,
+            "imports": imports,
+        }
+
+    def finish(self, logs_dir: Path, budget_ms: Optional[float] = None,
+               phase_budgets_ms: Optional[Mapping[str, float]] = None) -> Optional[Dict[str, Any]]:
+        """إنهاء القياس (عند أول إطار تفاعلي) وكتابة التقريرين في مجلد السجلات
+
+        Returns:
+            التقرير، أو None إن كان التتبع معطلاً
+        """
+        if not self.enabled:
+            return None
+        try:
+            report = self.build_report(budget_ms, phase_budgets_ms)
+            self.stop()
+
+            logs_dir = Path(logs_dir)
+            logs_dir.mkdir(parents=True, exist_ok=True)
+            json_path = logs_dir / f"{REPORT_NAME}.json"
+
+            # مقارنة بالتشغيل السابق لكشف التراجع
+            report["previous_total_ms"] = None
+            if json_path.exists():
+                try:
+                    report["previous_total_ms"] = json.loads(json_path.read_text(encoding="utf-8")).get("total_ms")
+                except (OSError, ValueError):
+                    pass
+
+            json_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+            (logs_dir / f"{REPORT_NAME}.txt").write_text(format_report(report), encoding="utf-8")
+
+            message = f"زمن بدء التشغيل: {report['total_ms']:.0f} مللي ثانية"
+            if report["over_budget"] or any(item["over_budget"] for item in report["phases"]):
+                logging.warning(f"{message} - تجاوز الميزانية المحددة")
+            else:
+                logging.info(message)
+            return report
+
+        except Exception as e:
+            self.stop()
+            logging.error(f"خطأ في كتابة تقرير بدء التشغيل: {e}")
+            return None
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """التقرير النصي: المراحل بتدرج التداخل ثم أبطأ الوحدات المستوردة"""
+    lines = [
+        f"تقرير بدء التشغيل - {report['created_at']} (Python {report['python']})",
+        f"الزمن الكلي: {report['total_ms']:.1f} مللي ثانية "
+        f"(الزمن الفعلي {report['wall_ms']:.1f}، انتظار المستخدم {report['waiting_ms']:.1f})",
+    ]
+    if report.get("budget_ms") is not None:
+        state = "تجاوز" if report["over_budget"] else "ضمن"
+        lines.append(f"الميزانية: {report['budget_ms']:.0f} مللي ثانية ({state} الميزانية)")
+    if report.get("previous_total_ms") is not None:
+        lines.append(f"التشغيل السابق: {report['previous_total_ms']:.1f} مللي ثانية "
+                     f"(الفرق {report['total_ms'] - report['previous_total_ms']:+.1f})")
+
+    lines += ["", "المراحل (مللي ثانية):"]
+    for item in report["phases"]:
+        note = " [انتظار]" if item["waiting"] else ""
+        if item.get("over_budget"):
+            note += f" [تجاوز الميزانية {item['budget_ms']:.0f}]"
+        lines.append(f"{'  ' * (item['depth'] + 1)}{item['name']}: {item['active_ms']:.1f}{note}")
+
+    imports = report["imports"]
+    lines += ["", f"الاستيراد: {len(imports)} وحدة، {report['imports_total_ms']:.1f} مللي ثانية",
+              f"أبطأ {min(TOP_IMPORTS, len(imports))} وحدة (ذاتي | تراكمي | الوحدة):"]
+    for item in imports[:TOP_IMPORTS]:
+        lines.append(f"  {item['self_ms']:10.2f} | {item['cumulative_ms']:10.2f} | "
+                     f"{'  ' * item['depth']}{item['module']}")
+    return "\n".join(lines) + "\n"
+
+
+# المتتبع المشترك لبدء التشغيل
+startup_profiler = StartupProfiler()
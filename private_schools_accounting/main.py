@@ -13,17 +13,22 @@ from pathlib import Path
 project_root = Path(__file__).resolve().parent
 sys.path.insert(0, str(project_root))
 
-from PyQt5.QtWidgets import QApplication, QMessageBox
-from PyQt5.QtCore import Qt, QDir, QTranslator, QLocale
-from PyQt5.QtGui import QFont, QIcon, QFontDatabase
+# تتبع زمن بدء التشغيل (--profile-startup أو SCHOOLS_PROFILE_STARTUP=1) قبل بقية الاستيرادات
+from core.utils.startup_profiler import startup_profiler
+startup_profiler.enable_from(sys.argv)
 
-# استيراد إعدادات المشروع
-import config
-from core.utils.logger import setup_logging
-from core.database.connection import DatabaseManager
-from core.auth.login_manager import AuthManager
-from ui.auth.login_window import LoginWindow
-from app.main_window import MainWindow
+with startup_profiler.phase("imports"):
+    from PyQt5.QtWidgets import QApplication, QMessageBox
+    from PyQt5.QtCore import Qt, QDir, QTranslator, QLocale, QTimer
+    from PyQt5.QtGui import QFont, QIcon, QFontDatabase
+
+    # استيراد إعدادات المشروع
+    import config
+    from core.utils.logger import setup_logging
+    from core.database.connection import db_manager
+    from core.auth.login_manager import AuthManager
+    from ui.auth.login_window import LoginWindow
+    from app.main_window import MainWindow
 
 
 class SchoolAccountingApp:
@@ -39,7 +44,8 @@ class SchoolAccountingApp:
     def setup_logging(self):
         """إعداد نظام التسجيل"""
         try:
-            setup_logging()
+            with startup_profiler.phase("setup_logging"):
+                setup_logging()
             logging.info("تم تشغيل التطبيق")
         except Exception as e:
             print(f"خطأ في إعداد نظام التسجيل: {e}")
@@ -100,8 +106,9 @@ class SchoolAccountingApp:
     def setup_database(self):
         """إعداد قاعدة البيانات"""
         try:
-            db_manager = DatabaseManager()
             if db_manager.initialize_database():
+                # نقطة تفتيش WAL دورية لإبقاء حجم ملف السجل محدوداً
+                db_manager.start_checkpoint_task()
                 logging.info("تم إعداد قاعدة البيانات بنجاح")
                 return True
             else:
@@ -114,6 +121,15 @@ class SchoolAccountingApp:
             self.show_error_dialog("خطأ", f"خطأ في إعداد قاعدة البيانات: {e}")
             return False
     
+    def write_startup_profile(self):
+        """كتابة تقرير زمن بدء التشغيل في مجلد السجلات"""
+        report = startup_profiler.finish(
+            config.LOGS_DIR, config.STARTUP_BUDGET_MS, config.STARTUP_PHASE_BUDGETS_MS
+        )
+        if report:
+            print(f"زمن بدء التشغيل: {report['total_ms']:.0f} مللي ثانية "
+                  f"(التقرير في {config.LOGS_DIR / 'startup_profile.txt'})")
+    
     def show_error_dialog(self, title, message):
         """عرض رسالة خطأ"""
         msg = QMessageBox()
@@ -145,9 +161,13 @@ class SchoolAccountingApp:
                     return False
             
             # عرض نافذة تسجيل الدخول
-            self.login_window = LoginWindow()
+            with startup_profiler.phase("login_window"):
+                self.login_window = LoginWindow()
             
-            if self.login_window.exec_() == self.login_window.Accepted:
+            with startup_profiler.phase("login_wait", waiting=True):
+                accepted = self.login_window.exec_() == self.login_window.Accepted
+            
+            if accepted:
                 logging.info("تم تسجيل الدخول بنجاح")
                 return True
             else:
@@ -162,26 +182,37 @@ class SchoolAccountingApp:
         """تشغيل التطبيق"""
         try:
             # إعداد التطبيق
-            if not self.setup_application():
+            with startup_profiler.phase("setup_application"):
+                application_ready = self.setup_application()
+            if not application_ready:
                 self.show_error_dialog("خطأ", "فشل في إعداد التطبيق")
                 return 1
             
             # إعداد قاعدة البيانات
-            if not self.setup_database():
+            with startup_profiler.phase("setup_database"):
+                database_ready = self.setup_database()
+            if not database_ready:
                 self.show_error_dialog("خطأ", "فشل في إعداد قاعدة البيانات")
                 return 1
             
             # مصادقة المستخدم
-            if not self.authenticate_user():
+            with startup_profiler.phase("authenticate_user"):
+                authenticated = self.authenticate_user()
+            if not authenticated:
                 logging.info("تم إلغاء تسجيل الدخول")
                 return 0
             
             # عرض النافذة الرئيسية
-            self.main_window = MainWindow()
-            self.main_window.show()
+            with startup_profiler.phase("main_window"):
+                self.main_window = MainWindow()
+                self.main_window.show()
             
             logging.info("تم تشغيل التطبيق الرئيسي")
             
+            # تقرير بدء التشغيل بعد أول إطار تفاعلي (عند تفعيل التتبع)
+            if startup_profiler.enabled:
+                QTimer.singleShot(0, self.write_startup_profile)
+            
             # تشغيل حلقة التطبيق
             return self.app.exec_()
             
@@ -195,6 +226,7 @@ class SchoolAccountingApp:
         
         finally:
             # تنظيف الموارد
+            db_manager.close_connection()
             logging.info("إغلاق التطبيق")
 
 
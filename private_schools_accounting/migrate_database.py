@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+عرض إصدار مخطط قاعدة البيانات وتطبيق الترحيلات المعلقة
+يحل محل سكربتات التحديث السابقة (update_db_schema.py وupdate_db_for_salaries.py
+وupdate_database_for_staff.py وupdate_students_table*.py)، والترحيلات نفسها تُطبق
+تلقائياً عند بدء تشغيل البرنامج
+
+الاستخدام:
+    python migrate_database.py           # تطبيق الترحيلات المعلقة
+    python migrate_database.py --status  # عرض الإصدار والترحيلات المعلقة فقط
+"""
+
+import sys
+import os
+import argparse
+import logging
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import config
+from core.database.connection import db_manager
+from core.database.migrations import SCHEMA_VERSION, migrate, pending_migrations, schema_version
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="ترحيل مخطط قاعدة البيانات إلى الإصدار الحالي")
+    parser.add_argument("--status", action="store_true", help="عرض الإصدار والترحيلات المعلقة دون تطبيقها")
+    args = parser.parse_args()
+
+    try:
+        config.DATABASE_DIR.mkdir(parents=True, exist_ok=True)
+        with db_manager.pool.writer() as conn:
+            version = schema_version(conn)
+        pending = pending_migrations(version)
+        print(f"إصدار المخطط: {version} (إصدار البرنامج {SCHEMA_VERSION})")
+
+        if args.status:
+            for migration in pending:
+                print(f"  - معلق {migration.version}: {migration.description}")
+            return 1 if pending else 0
+
+        applied = migrate(db_manager)
+        if applied:
+            print(f"✅ تم تطبيق الترحيلات: {', '.join(map(str, applied))}")
+        else:
+            print("✅ مخطط قاعدة البيانات محدث")
+        return 0
+
+    except Exception as e:
+        print(f"❌ خطأ في ترحيل قاعدة البيانات: {e}")
+        logging.error(f"خطأ في ترحيل قاعدة البيانات: {e}")
+        return 2
+
+    finally:
+        db_manager.close_connection()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
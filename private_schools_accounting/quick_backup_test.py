@@ -29,6 +29,7 @@ try:
     
     print("6. اختبار backup_manager...")
     from core.backup.backup_manager import backup_manager
+    backup_manager.get()  # انتظار تهيئة خدمة النسخ في الخلفية
     print(f"   backup_manager type: {type(backup_manager)}")
     
     print("7. اختبار create_backup...")
@@ -11,16 +11,17 @@ try:
     print(f"URL: {config.SUPABASE_URL}")
     print(f"Bucket: {config.SUPABASE_BUCKET}")
     
-    from core.backup.backup_manager import backup_manager
+    from core.backup.storage import SupabaseObjectStore
     
-    if backup_manager.supabase is None:
+    supabase = SupabaseObjectStore.from_config().client
+    if supabase is None:
         print("❌ عميل Supabase غير متاح")
     else:
         print("✅ عميل Supabase متاح ومُهيأ")
         
         # اختبار الاتصال
         try:
-            buckets = backup_manager.supabase.storage.list_buckets()
+            buckets = supabase.storage.list_buckets()
             print(f"✅ نجح الاتصال بـ Supabase - عدد البكتات: {len(buckets)}")
             
             # التحقق من البكت المطلوب
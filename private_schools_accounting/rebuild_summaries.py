@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+التحقق من جداول الملخصات (أرصدة الطلاب ومجاميع المدارس والأشهر وأنواع الرسوم) أو إعادة بنائها
+
+الاستخدام:
+    python rebuild_summaries.py            # التحقق فقط
+    python rebuild_summaries.py --rebuild  # إعادة الحساب من الجداول المصدر
+"""
+
+import sys
+import os
+import argparse
+import logging
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.database.connection import db_manager
+from core.database.summaries import rebuild_summaries, verify_summaries
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="التحقق من جداول الملخصات أو إعادة بنائها")
+    parser.add_argument("--rebuild", action="store_true", help="إعادة حساب الملخصات من الجداول المصدر")
+    args = parser.parse_args()
+
+    try:
+        # التهيئة تنشئ جداول الملخصات وtriggers إن لم تكن موجودة
+        db_manager.initialize_database()
+
+        if args.rebuild:
+            with db_manager.transaction() as cursor:
+                rebuild_summaries(cursor)
+            print("✅ تمت إعادة بناء جداول الملخصات")
+
+        mismatches = verify_summaries(db_manager)
+        if not mismatches:
+            print("✅ جداول الملخصات مطابقة للبيانات")
+            return 0
+
+        print("❌ جداول الملخصات غير مطابقة:")
+        for table, count in mismatches.items():
+            print(f"  - {table}: {count} صف مختلف")
+        print("شغّل الأمر مع --rebuild لإصلاحها")
+        return 1
+
+    except Exception as e:
+        print(f"❌ خطأ في فحص جداول الملخصات: {e}")
+        logging.error(f"خطأ في فحص جداول الملخصات: {e}")
+        return 2
+
+    finally:
+        db_manager.close_connection()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
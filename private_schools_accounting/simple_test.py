@@ -14,7 +14,7 @@ try:
     files_to_check = [
         "ui/pages/salaries/salaries_page.py",
         "ui/pages/salaries/add_salary_dialog.py",
-        "update_db_for_salaries.py"
+        "core/database/migrations.py"
     ]
     
     print("\n📁 فحص الملفات:")
@@ -10,6 +10,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 import config
 from core.backup.backup_manager import backup_manager
+from core.backup.storage import SupabaseObjectStore
 import sqlite3
 
 def main():
@@ -17,12 +18,15 @@ def main():
     print("=" * 60)
     
     # التحقق من حالة Supabase
-    if backup_manager.supabase is None:
-        print("❌ عميل Supabase غير متاح")
+    try:
+        SupabaseObjectStore.from_config()
+    except Exception as e:
+        print(f"❌ عميل Supabase غير متاح: {e}")
         print("تحقق من اللوغات للمزيد من التفاصيل")
         return False
-    else:
-        print("✅ عميل Supabase متاح")
+    print("✅ عميل Supabase متاح")
+    if config.BACKUP_STORAGE_BACKEND != "supabase":
+        print(f"⚠️ مخزن النسخ المختار في الإعدادات هو {config.BACKUP_STORAGE_BACKEND} وليس supabase")
     
     # التحقق من وجود قاعدة البيانات أو إنشاؤها
     if not config.DATABASE_PATH.exists():
@@ -46,6 +50,7 @@ def main():
     
     # إنشاء النسخة الاحتياطية
     print("\n🔄 إنشاء النسخة الاحتياطية...")
+    backup_manager.get()  # انتظار تهيئة خدمة النسخ في الخلفية
     success, message = backup_manager.create_backup("نسخة احتياطية تجريبية - اختبار Supabase")
     
     if success:
@@ -10,6 +10,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 try:
     from core.backup.backup_manager import backup_manager
+    backup_manager.get()  # انتظار تهيئة خدمة النسخ في الخلفية
     print("✅ تم تحميل backup_manager بنجاح")
     print(f"نوع backup_manager: {type(backup_manager)}")
     
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار خدمة النسخ الاحتياطية الكسولة وحالة جاهزيتها
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+# إضافة مسار المشروع
+project_root = Path(__file__).resolve().parent
+sys.path.insert(0, str(project_root))
+
+from core.backup.backup_manager import BackupService, backup_manager
+
+
+class FakeManager:
+    """مدير وهمي يسجل عدد مرات إنشائه"""
+    created = 0
+
+    def __init__(self, release: threading.Event = None):
+        if release is not None:
+            release.wait(10)
+        FakeManager.created += 1
+        self.bucket_name = "test"
+
+    def create_backup(self, description="", progress=None, upload_progress=None, kind="manual"):
+        return True, f"تم: {description}"
+
+    def list_backups(self):
+        return [{"filename": "backup_1.zip"}]
+
+
+def test_import_does_not_initialize():
+    """الاستيراد لا يُنشئ عميل التخزين ولا يستورد مكتبة supabase"""
+    assert backup_manager.state == BackupService.NOT_STARTED
+    assert "supabase" not in sys.modules
+
+
+def test_background_start_and_first_use():
+    """التهيئة في الخلفية تمر بحالة 'جاري الاتصال'، والعمليات قبلها لا تنتظر ولا تكررها"""
+    FakeManager.created = 0
+    release = threading.Event()
+    service = BackupService(lambda: FakeManager(release))
+
+    assert service.start()
+    assert service.state == BackupService.INITIALIZING and not service.start()
+    assert "جاري الاتصال" in service.status_text()
+
+    # العمليات قبل الجاهزية تعيد نتيجة "غير جاهز" فوراً
+    success, message = service.create_backup("يومي")
+    assert not success and "قيد التهيئة" in message
+    assert service.list_backups() == [] and service.get_backup_url("x") is None
+
+    release.set()
+    assert service.get(timeout=10) is not None
+    assert service.create_backup("يومي") == (True, "تم: يومي")
+    assert service.is_ready and service.bucket_name == "test"
+    assert FakeManager.created == 1
+
+    # الاستخدام الأول دون start() يبدأ التهيئة في الخلفية ولا يهيئ في الخيط المستدعي
+    release.clear()
+    lazy = BackupService(lambda: FakeManager(release))
+    assert lazy.list_backups() == []
+    assert lazy.state == BackupService.INITIALIZING
+    release.set()
+    assert lazy.get(timeout=10) is not None
+    assert lazy.list_backups() == [{"filename": "backup_1.zip"}]
+    assert lazy.state == BackupService.READY and FakeManager.created == 2
+
+
+def test_failure_is_reported_and_retried():
+    """فشل التهيئة يظهر في الحالة ونتائج العمليات، وstart() يعيد المحاولة"""
+    attempts = []
+
+    def factory():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise Exception("لا يوجد اتصال")
+        return FakeManager()
+
+    service = BackupService(factory)
+    assert service.get(timeout=10) is None
+    assert service.state == BackupService.FAILED and "لا يوجد اتصال" in service.status_text()
+    success, message = service.create_backup()
+    assert not success and "لا يوجد اتصال" in message
+    assert service.list_backups() == [] and len(attempts) == 1
+
+    assert service.start()
+    assert service.get(timeout=10) is not None and service.is_ready
+
+
+if __name__ == "__main__":
+    test_import_does_not_initialize()
+    test_background_start_and_first_use()
+    test_failure_is_reported_and_retried()
+    print("✅ جميع اختبارات خدمة النسخ الاحتياطية نجحت")
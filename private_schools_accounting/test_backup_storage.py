@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار مدير النسخ الاحتياطية على المخزن المحلي دون اتصال بالشبكة
+"""
+
+import sqlite3
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from unittest import mock
+
+# إضافة مسار المشروع
+project_root = Path(__file__).resolve().parent
+sys.path.insert(0, str(project_root))
+
+import config
+from core.backup.backup_manager import BackupManager
+from core.backup.storage import LocalObjectStore, backend_title, create_store
+
+
+def local_settings(temp: Path):
+    """إعدادات نسخ في مجلد مؤقت مع قاعدة بيانات صغيرة"""
+    db_path = temp / "schools.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, body TEXT)")
+    conn.executemany("INSERT INTO t (body) VALUES (?)", [("x" * 200,) for _ in range(500)])
+    conn.commit()
+    conn.close()
+    for directory in ("pending", "manifests"):
+        (temp / directory).mkdir()
+    return mock.patch.multiple(
+        config,
+        DATABASE_PATH=db_path,
+        BACKUP_PENDING_DIR=temp / "pending",
+        BACKUP_MANIFEST_CACHE_DIR=temp / "manifests",
+        BACKUP_LOCAL_ROOT=temp / "store",
+        BACKUP_CATALOG_PATH=temp / "catalog.json",
+        BACKUP_STORAGE_BACKEND="local",
+    )
+
+
+def test_create_store_from_config():
+    """المخزن يُختار بالاسم من الإعدادات، والاسم غير المعروف يُرفض"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with mock.patch.multiple(config, BACKUP_STORAGE_BACKEND="local", BACKUP_LOCAL_ROOT=Path(temp_dir)):
+            store = create_store()
+            assert isinstance(store, LocalObjectStore) and store.root == Path(temp_dir)
+            assert backend_title() == LocalObjectStore.title
+    try:
+        create_store("ftp")
+        assert False, "كان يجب رفض المخزن غير المعروف"
+    except ValueError:
+        pass
+
+
+def test_local_backups_in_kind_folders():
+    """النسخ التزايدية وأرشيفات ZIP تُكتب في مجلدات أنواعها وتظهر في القائمة وتُحذف"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp = Path(temp_dir)
+        with local_settings(temp):
+            manager = BackupManager(reconcile=False)
+            with mock.patch.object(config, "BACKUP_INCREMENTAL", True):
+                success, message = manager.create_backup("يومية", kind="daily")
+            assert success, message
+            with mock.patch.object(config, "BACKUP_INCREMENTAL", False):
+                success, message = manager.create_backup("يدوية")
+            assert success, message
+            assert manager.create_backup(kind="monthly")[0] is False
+
+            backups = manager.list_backups()
+            assert sorted(backup['incremental'] for backup in backups) == [False, True]
+            daily = next(backup for backup in backups if backup['incremental'])
+            archive = next(backup for backup in backups if not backup['incremental'])
+            assert daily['path'].startswith("daily/") and daily['description'] == "يومية"
+            assert archive['path'].startswith("manual/") and archive['size'] > 0
+            assert (temp / "store" / archive['path']).exists()
+            assert manager.get_backup_url(archive['path']).startswith("file://")
+            assert not list((temp / "pending").rglob("*.zip"))
+
+            for backup in backups:
+                assert manager.delete_backup(backup['path'])[0]
+            assert manager.list_backups() == []
+            assert manager.store.list("chunks") == []
+
+
+def test_zip_restore_streams_from_file():
+    """استعادة أرشيف ZIP تنزله إلى ملف بدلاً من قراءته كاملاً في الذاكرة"""
+    from core.database.connection import db_manager
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp = Path(temp_dir)
+        with local_settings(temp), mock.patch.object(config, "BACKUP_INCREMENTAL", False):
+            manager = BackupManager(reconcile=False)
+            assert manager.create_backup("يدوية")[0]
+            (backup,) = manager.list_backups()
+
+            restored = []
+
+            def restore_database(path):
+                conn = sqlite3.connect(path)
+                restored.append(conn.execute("SELECT COUNT(*) FROM t").fetchone()[0])
+                conn.close()
+                return True
+
+            with mock.patch.object(manager.store, "get", side_effect=AssertionError("قراءة في الذاكرة")), \
+                    mock.patch.object(db_manager, "restore_database", side_effect=restore_database):
+                success, message = manager.restore_backup(backup['path'])
+            assert success, message
+            assert restored == [500]
+            assert not [path for path in (temp / "pending").rglob("*") if path.is_file()]
+
+
+def test_catalog_replaces_listing():
+    """القائمة والتنظيف من الفهرس دون تصفح المخزن، والمطابقة تلتقط التغييرات الخارجية"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp = Path(temp_dir)
+        with local_settings(temp), mock.patch.object(config, "BACKUP_INCREMENTAL", False):
+            manager = BackupManager(reconcile=False)
+            # القائمة لا تنتظر المطابقة مع المخزن، والمستمع يُبلغ بانتهائها من الخيط الخلفي
+            with mock.patch.object(manager.store, "list", side_effect=AssertionError("تصفح المخزن")):
+                assert manager.list_backups() == [] and not manager.is_catalog_synced
+            reconciled = threading.Event()
+            manager.add_reconcile_listener(lambda success: success and reconciled.set())
+            assert manager.start_reconcile()
+            assert reconciled.wait(5) and manager.is_catalog_synced
+            assert manager.create_backup("شهرية")[0]
+
+            with mock.patch.object(manager.store, "list", side_effect=AssertionError("تصفح المخزن")):
+                backups = manager.list_backups()
+                assert len(backups) == 1 and backups[0]['description'] == "شهرية"
+
+            # نسخة قديمة أُضيفت إلى المخزن من جهاز آخر تظهر بعد المطابقة ويحذفها التنظيف
+            manager.store.put("weekly/2020/01/backup_20200101_120000.zip", b"zip")
+            assert len(manager.list_backups()) == 1
+            reopened = BackupManager(reconcile=False)
+            assert len(reopened.list_backups()) == 1
+            assert reopened.reconcile_catalog() and len(reopened.list_backups()) == 2
+            with mock.patch.object(reopened.store, "list", side_effect=AssertionError("تصفح المخزن")):
+                assert reopened.cleanup_old_backups(30) == (True, "تم حذف 1 نسخة احتياطية قديمة")
+                assert [backup['description'] for backup in reopened.list_backups()] == ["شهرية"]
+            assert manager.store.list("weekly") == []
+
+            # فهرس محفوظ لمخزن آخر لا يُستخدم، والتنظيف قبل المطابقة يُرفض ويبدأها في الخلفية
+            with mock.patch.object(config, "BACKUP_LOCAL_ROOT", temp / "other"):
+                other = BackupManager(reconcile=False)
+                assert other.catalog.reconciled_at is None
+                reconciled.clear()
+                other.add_reconcile_listener(lambda success: success and reconciled.set())
+                assert not other.cleanup_old_backups(30)[0]
+                assert reconciled.wait(5) and other.is_catalog_synced
+
+
+
+def test_restore_excludes_backups():
+    """الاستعادة لا تبدأ أثناء إنشاء نسخة، ولا تُنشأ نسخة أثناء الاستعادة"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp = Path(temp_dir)
+        with local_settings(temp):
+            manager = BackupManager(reconcile=False)
+            started, release = threading.Event(), threading.Event()
+
+            def blocking(*args):
+                started.set()
+                release.wait(5)
+                return True, "تم"
+
+            for running, operation, other in (
+                ("_create_backup", lambda: manager.create_backup(), lambda: manager.restore_backup("x.zip")),
+                ("_restore_backup", lambda: manager.restore_backup("x.zip"), lambda: manager.create_backup()),
+            ):
+                started.clear()
+                release.clear()
+                with mock.patch.object(manager, running, side_effect=blocking):
+                    thread = threading.Thread(target=operation)
+                    thread.start()
+                    assert started.wait(5)
+                    success, message = other()
+                    assert not success and "بعد انتهائها" in message
+                    release.set()
+                    thread.join(5)
+            assert manager._active_backups == 0 and not manager._restoring
+
+
+if __name__ == "__main__":
+    test_create_store_from_config()
+    test_local_backups_in_kind_folders()
+    test_zip_restore_streams_from_file()
+    test_catalog_replaces_listing()
+    test_restore_excludes_backups()
+    print("✅ جميع اختبارات مخازن النسخ الاحتياطية نجحت")
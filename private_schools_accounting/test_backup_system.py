@@ -26,7 +26,8 @@ def test_backup_system():
         # 1. اختبار الاتصال بـ Supabase
         print("📡 اختبار الاتصال بـ Supabase...")
         
-        # محاولة جلب قائمة النسخ (اختبار بسيط للاتصال)
+        # محاولة جلب قائمة النسخ (اختبار بسيط للاتصال) بعد انتظار تهيئة خدمة النسخ
+        backup_manager.get()
         backups = backup_manager.list_backups()
         print(f"✅ نجح الاتصال! تم العثور على {len(backups)} نسخة احتياطية")
         
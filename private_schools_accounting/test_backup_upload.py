@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار رفع النسخ الاحتياطية على أجزاء واستئناف الرفع المنقطع
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# إضافة مسار المشروع
+project_root = Path(__file__).resolve().parent
+sys.path.insert(0, str(project_root))
+
+from core.backup.upload import LocalUploadTarget, state_path, upload_file
+
+
+class FlakyTarget(LocalUploadTarget):
+    """وجهة محلية تنقطع بعد عدد محدد من الأجزاء وتسجل أحجام الأجزاء المستلمة"""
+
+    def __init__(self, root, fail_after=None):
+        super().__init__(root)
+        self.fail_after = fail_after
+        self.chunks = []
+
+    def append(self, handle, offset, data):
+        if self.fail_after is not None and len(self.chunks) >= self.fail_after:
+            raise ConnectionError("انقطع الاتصال")
+        self.chunks.append(len(data))
+        return super().append(handle, offset, data)
+
+
+def test_upload_in_bounded_chunks():
+    """الملف يُرفع بأجزاء لا تتجاوز الحجم المحدد، ويُحذف ملف الحالة بعد النجاح"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        archive = Path(temp_dir) / "backup_20250101_120000.zip"
+        content = os.urandom(10_000)
+        archive.write_bytes(content)
+        target = FlakyTarget(Path(temp_dir) / "remote")
+        reported = []
+
+        sent = upload_file(target, archive, "backups/2025/01/a.zip",
+                           progress=lambda done, total: reported.append(done), chunk_size=4096)
+
+        assert sent == len(content)
+        assert target.chunks == [4096, 4096, 1808]
+        assert reported == [4096, 8192, 10_000]
+        assert (target.root / "backups/2025/01/a.zip").read_bytes() == content
+        assert not state_path(archive).exists()
+
+
+def test_failed_upload_resumes_from_offset():
+    """الرفع المنقطع يُستأنف من آخر إزاحة مستلمة دون إعادة الأجزاء المرفوعة"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        archive = Path(temp_dir) / "backup_20250101_120000.zip"
+        content = os.urandom(10_000)
+        archive.write_bytes(content)
+        target = FlakyTarget(Path(temp_dir) / "remote", fail_after=2)
+
+        try:
+            upload_file(target, archive, "a.zip", chunk_size=4096)
+            assert False, "كان يجب أن ينقطع الرفع"
+        except ConnectionError:
+            pass
+        assert state_path(archive).exists()
+        assert not (target.root / "a.zip").exists()
+
+        target.fail_after = None
+        sent = upload_file(target, archive, "a.zip", chunk_size=4096)
+        assert sent == 10_000 - 8192
+        assert target.chunks == [4096, 4096, 1808]
+        assert (target.root / "a.zip").read_bytes() == content
+
+        # حالة لمسار آخر لا تُستأنف بل يبدأ رفع جديد
+        archive.write_bytes(content)
+        target.fail_after = 1
+        try:
+            upload_file(target, archive, "b.zip", chunk_size=4096)
+        except ConnectionError:
+            pass
+        target.fail_after = None
+        assert upload_file(target, archive, "c.zip", chunk_size=4096) == 10_000
+        assert (target.root / "c.zip").read_bytes() == content
+
+
+def test_stalled_offset_keeps_state():
+    """خادم لا يتقدم بالإزاحة يوقف الرفع بخطأ ويبقي ملف الحالة للاستئناف"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        archive = Path(temp_dir) / "backup_20250101_120000.zip"
+        content = os.urandom(10_000)
+        archive.write_bytes(content)
+        target = FlakyTarget(Path(temp_dir) / "remote")
+        append = target.append
+        target.append = lambda handle, offset, data: offset if offset >= 4096 else append(handle, offset, data)
+
+        try:
+            upload_file(target, archive, "a.zip", chunk_size=4096)
+            assert False, "كان يجب أن يتوقف الرفع المتعثر"
+        except ValueError:
+            pass
+        assert state_path(archive).exists()
+        assert not (target.root / "a.zip").exists()
+
+        del target.append
+        assert upload_file(target, archive, "a.zip", chunk_size=4096) == 10_000 - 4096
+        assert (target.root / "a.zip").read_bytes() == content
+
+
+if __name__ == "__main__":
+    test_upload_in_bounded_chunks()
+    test_failed_upload_resumes_from_offset()
+    test_stalled_offset_keeps_state()
+    print("✅ جميع اختبارات رفع النسخ الاحتياطية نجحت")
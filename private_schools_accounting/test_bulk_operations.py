@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار عمليات الكتابة المجمعة (execute_many / insert_many / upsert_many)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# إضافة مسار المشروع
+project_root = Path(__file__).resolve().parent
+sys.path.insert(0, str(project_root))
+
+from core.utils.money import Money
+
+
+def student_rows(count: int):
+    """مولد صفوف طلاب تجريبية"""
+    for i in range(count):
+        yield (f"طالب {i}", 1, "الأول", "أ", "ذكر", Money(500000), "2025-09-01")
+
+
+STUDENT_COLUMNS = ("name", "school_id", "grade", "section", "gender", "total_fee", "start_date")
+
+
+def test_insert_many_in_chunks(school_manager):
+    """إدخال قائمة طلاب كاملة على دفعات داخل معاملة واحدة"""
+    inserted = school_manager.insert_many("students", STUDENT_COLUMNS, student_rows(1050), chunk_size=200)
+    assert inserted == 1050
+    assert school_manager.execute_fetch_one("SELECT COUNT(*) AS c FROM students")['c'] == 1050
+
+
+def test_execute_many_rolls_back_on_failure(school_manager):
+    """فشل أي صف يلغي جميع الدفعات السابقة"""
+    rows = list(student_rows(10))
+    rows.append((None, 1, "الأول", "أ", "ذكر", Money(500000), "2025-09-01"))  # name NOT NULL
+    try:
+        school_manager.insert_many("students", STUDENT_COLUMNS, rows, chunk_size=3)
+        assert False, "كان يجب أن يفشل الإدخال"
+    except Exception:
+        pass
+    assert school_manager.execute_fetch_one("SELECT COUNT(*) AS c FROM students")['c'] == 0
+
+
+def test_execute_many_bulk_mark_fees_paid(school_manager):
+    """تحديد عدة رسوم إضافية كمدفوعة دفعة واحدة"""
+    school_manager.insert_many("students", STUDENT_COLUMNS, student_rows(5))
+    school_manager.insert_many(
+        "additional_fees", ("student_id", "fee_type", "amount"),
+        [(student_id, "زي مدرسي", Money(25000)) for student_id in range(1, 6)]
+    )
+    updated = school_manager.execute_many(
+        "UPDATE additional_fees SET paid = 1, payment_date = ? WHERE id = ?",
+        [("2025-10-01", fee_id) for fee_id in (1, 3, 5)]
+    )
+    assert updated == 3
+    assert school_manager.execute_fetch_one(
+        "SELECT COUNT(*) AS c FROM additional_fees WHERE paid = 1"
+    )['c'] == 3
+
+
+def test_upsert_many_updates_existing_rows(manager):
+    """إدخال الإعدادات الجديدة وتحديث الموجودة"""
+    columns = ("setting_key", "setting_value")
+    manager.upsert_many("app_settings", columns, [("a", "1"), ("b", "2")], ["setting_key"])
+    manager.upsert_many("app_settings", columns, [("b", "3"), ("c", "4")], ["setting_key"])
+    rows = manager.execute_query("SELECT setting_key, setting_value FROM app_settings ORDER BY setting_key")
+    assert [tuple(row) for row in rows] == [("a", "1"), ("b", "3"), ("c", "4")]
+
+
+def test_invalid_identifiers_are_rejected(manager):
+    """رفض أسماء الجداول والأعمدة غير الصالحة"""
+    try:
+        manager.insert_many("students; DROP TABLE students", ("name",), [("x",)])
+        assert False, "كان يجب رفض اسم الجدول"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    if pytest.main([__file__, "-q"]) == 0:
+        print("✅ جميع اختبارات العمليات المجمعة نجحت")
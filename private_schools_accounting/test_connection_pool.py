@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار مجمع اتصالات قاعدة البيانات (كاتب واحد وقارئ لكل خيط)
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# إضافة مسار المشروع
+project_root = Path(__file__).resolve().parent
+sys.path.insert(0, str(project_root))
+
+
+def test_reader_per_thread(manager):
+    """كل خيط يحصل على اتصال قراءة خاص به، والكاتب مشترك"""
+    main_reader = manager.get_read_connection()
+    assert manager.get_read_connection() is main_reader
+
+    results = {}
+
+    def worker():
+        results['reader'] = manager.get_read_connection()
+        with manager.get_connection() as conn:
+            results['writer'] = conn
+        results['count'] = manager.execute_query("SELECT COUNT(*) AS c FROM schools")[0]['c']
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+    assert results['reader'] is not main_reader
+    with manager.get_connection() as conn:
+        assert results['writer'] is conn
+    assert results['count'] == 0
+
+
+def test_concurrent_reads_and_writes(manager):
+    """القراءة من خيوط أخرى أثناء الكتابة من الخيط الرئيسي"""
+    errors = []
+
+    def reader():
+        try:
+            for _ in range(50):
+                manager.execute_query("SELECT id, name_ar FROM schools")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for i in range(50):
+        manager.execute_insert(
+            "INSERT INTO schools (name_ar, school_types) VALUES (?, ?)",
+            (f"مدرسة {i}", "ابتدائية")
+        )
+    for thread in threads:
+        thread.join()
+
+    assert not errors, errors
+    assert manager.execute_fetch_one("SELECT COUNT(*) AS c FROM schools")['c'] == 50
+
+
+def test_read_inside_write_sees_uncommitted_rows(manager):
+    """القراءة داخل كتلة كتابة تستخدم اتصال الكتابة نفسه"""
+    with manager.get_cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO schools (name_ar, school_types) VALUES (?, ?)",
+            ("مدرسة النور", "ابتدائية")
+        )
+        row = manager.execute_fetch_one("SELECT COUNT(*) AS c FROM schools")
+        assert row['c'] == 1
+
+
+def test_write_through_execute_query_is_committed(manager):
+    """الشيفرة القديمة التي تمرر INSERT إلى execute_query تُنفذ على اتصال الكتابة وتُؤكد"""
+    manager.execute_query(
+        "INSERT INTO schools (name_ar, school_types) VALUES (?, ?)",
+        ("مدرسة النور", "ابتدائية")
+    )
+    with manager.get_connection() as conn:
+        assert not conn.in_transaction
+    assert manager.execute_fetch_one("SELECT COUNT(*) AS c FROM schools")['c'] == 1
+
+
+def test_dead_thread_readers_are_pruned(manager):
+    """إغلاق اتصالات القراءة الخاصة بالخيوط المنتهية"""
+    for _ in range(3):
+        thread = threading.Thread(target=manager.get_read_connection)
+        thread.start()
+        thread.join()
+    manager.get_read_connection()
+    assert manager.pool.reader_count() <= 2
+
+
+
+def test_exclusive_marks_other_readers_stale(manager):
+    """exclusive() لا يغلق قرّاء الخيوط الأخرى؛ كل خيط يعيد فتح قارئه عند طلبه التالي"""
+    opened = threading.Event()
+    swapped = threading.Event()
+    results = {}
+
+    def worker():
+        results['before'] = manager.get_read_connection()
+        opened.set()
+        swapped.wait(5)
+        # القارئ القديم ما زال مفتوحاً حتى يطلب خيطه قارئاً جديداً
+        results['usable'] = results['before'].execute("SELECT 1").fetchone()[0]
+        results['after'] = manager.get_read_connection()
+        results['count'] = manager.execute_query("SELECT COUNT(*) AS c FROM schools")[0]['c']
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    opened.wait(5)
+    with manager.pool.exclusive():
+        pass
+    swapped.set()
+    thread.join()
+
+    assert results['usable'] == 1
+    assert results['after'] is not results['before']
+    assert results['count'] == 0
+
+
+if __name__ == "__main__":
+    if pytest.main([__file__, "-q"]) == 0:
+        print("✅ جميع اختبارات مجمع الاتصالات نجحت")
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار ملف PRAGMA (WAL وغيره) ونقطة التفتيش الدورية
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from unittest import mock
+
+# إضافة مسار المشروع
+project_root = Path(__file__).resolve().parent
+sys.path.insert(0, str(project_root))
+
+import config
+from core.database.connection import DatabaseManager
+
+
+def test_pragma_profile_applied_to_every_connection():
+    """تطبيق إعدادات PRAGMA على اتصال الكتابة واتصالات القراءة"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = DatabaseManager(Path(temp_dir) / "test.db")
+        manager.initialize_database()
+        try:
+            with manager.get_connection() as writer:
+                connections = [writer, manager.get_read_connection()]
+
+            def worker():
+                connections.append(manager.get_read_connection())
+                check(connections[-1])
+
+            def check(conn):
+                assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+                assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+                assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+                assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+                assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == config.DATABASE_PRAGMAS["busy_timeout"]
+                assert conn.execute("PRAGMA cache_size").fetchone()[0] == config.DATABASE_PRAGMAS["cache_size"]
+
+            for conn in connections:
+                check(conn)
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+            assert len(connections) == 3
+        finally:
+            manager.close_connection()
+
+
+def test_checkpoint_truncates_wal():
+    """نقطة التفتيش تفرغ ملف WAL"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = Path(temp_dir) / "test.db"
+        manager = DatabaseManager(db_path)
+        manager.initialize_database()
+        try:
+            for i in range(20):
+                manager.execute_insert(
+                    "INSERT INTO schools (name_ar, school_types) VALUES (?, ?)",
+                    (f"مدرسة {i}", "ابتدائية")
+                )
+            wal_path = Path(f"{db_path}-wal")
+            assert wal_path.stat().st_size > 0
+
+            busy, _, _ = manager.checkpoint("TRUNCATE")
+            assert busy == 0
+            assert wal_path.stat().st_size == 0
+        finally:
+            manager.close_connection()
+
+
+def test_periodic_checkpoint_task():
+    """المهمة الدورية تعمل وتتوقف عند الإغلاق"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = Path(temp_dir) / "test.db"
+        manager = DatabaseManager(db_path)
+        manager.initialize_database()
+        try:
+            manager.execute_insert(
+                "INSERT INTO schools (name_ar, school_types) VALUES (?, ?)",
+                ("مدرسة النور", "ابتدائية")
+            )
+            manager.start_checkpoint_task(interval=0.05)
+            deadline = time.time() + 5
+            wal_path = Path(f"{db_path}-wal")
+            while wal_path.stat().st_size > 0 and time.time() < deadline:
+                time.sleep(0.05)
+            assert wal_path.stat().st_size == 0
+        finally:
+            manager.close_connection()
+        assert manager._checkpoint_timer is None
+
+
+def test_restore_keeps_checkpoint_task():
+    """الاستعادة تستبدل الملف مع منع القرّاء وتستأنف مهمة نقاط التفتيش"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = Path(temp_dir) / "test.db"
+        backup_path = Path(temp_dir) / "backup.db"
+        manager = DatabaseManager(db_path)
+        manager.initialize_database()
+        try:
+            manager.execute_insert(
+                "INSERT INTO schools (name_ar, school_types) VALUES (?, ?)",
+                ("مدرسة النور", "ابتدائية")
+            )
+            manager.checkpoint("TRUNCATE")
+            shutil.copy2(db_path, backup_path)
+            manager.execute_insert(
+                "INSERT INTO schools (name_ar, school_types) VALUES (?, ?)",
+                ("مدرسة الأمل", "ابتدائية")
+            )
+            manager.start_checkpoint_task(interval=60)
+
+            # خيط يطلب قارئاً أثناء الاستبدال ينتظر حتى ينتهي
+            opened = []
+            reader = threading.Thread(target=lambda: opened.append(manager.pool.get_reader()))
+            original_replace = os.replace
+
+            def replace_while_reading(*args):
+                reader.start()
+                reader.join(0.2)
+                assert not opened
+                return original_replace(*args)
+
+            with mock.patch("os.replace", side_effect=replace_while_reading):
+                assert manager.restore_database(str(backup_path))
+            reader.join(5)
+            assert len(opened) == 1
+            assert manager._checkpoint_timer is not None
+            assert manager._checkpoint_interval == 60
+            assert len(manager.execute_query("SELECT id FROM schools")) == 1
+            assert not (Path(temp_dir) / "test.db.restore").exists()
+        finally:
+            manager.close_connection()
+
+
+def test_failed_restore_keeps_live_database():
+    """فشل التحقق من النسخة أو ترحيلها لا يمس الملف الحالي ويستأنف نقاط التفتيش"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = Path(temp_dir) / "test.db"
+        manager = DatabaseManager(db_path)
+        manager.initialize_database()
+        try:
+            manager.execute_insert(
+                "INSERT INTO schools (name_ar, school_types) VALUES (?, ?)",
+                ("مدرسة النور", "ابتدائية")
+            )
+            manager.start_checkpoint_task(interval=60)
+
+            # ملف ليس قاعدة بيانات
+            corrupt_path = Path(temp_dir) / "corrupt.db"
+            corrupt_path.write_bytes(b"not a database" * 100)
+            assert not manager.restore_database(str(corrupt_path))
+
+            # نسخة سليمة يفشل ترحيلها
+            backup_path = Path(temp_dir) / "backup.db"
+            manager.checkpoint("TRUNCATE")
+            shutil.copy2(db_path, backup_path)
+            with mock.patch("core.database.migrations.migrate", side_effect=RuntimeError("فشل الترحيل")):
+                assert not manager.restore_database(str(backup_path))
+
+            assert len(manager.execute_query("SELECT id FROM schools")) == 1
+            assert manager._checkpoint_timer is not None
+            assert manager._checkpoint_interval == 60
+            assert not any(".restore" in path.name for path in Path(temp_dir).iterdir())
+        finally:
+            manager.close_connection()
+
+
+if __name__ == "__main__":
+    test_pragma_profile_applied_to_every_connection()
+    test_checkpoint_truncates_wal()
+    test_periodic_checkpoint_task()
+    test_restore_keeps_checkpoint_task()
+    test_failed_restore_keeps_live_database()
+    print("✅ جميع اختبارات إعدادات PRAGMA نجحت")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار مسار القراءة فقط والمعاملات المجمعة في مدير قاعدة البيانات
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# إضافة مسار المشروع
+project_root = Path(__file__).resolve().parent
+sys.path.insert(0, str(project_root))
+
+from core.database.connection import DatabaseManager
+
+INSERT_SCHOOL = "INSERT INTO schools (name_ar, school_types) VALUES (?, ?)"
+
+
+def count_schools(manager: DatabaseManager) -> int:
+    """عدد المدارس المؤكدة"""
+    return manager.execute_fetch_one("SELECT COUNT(*) AS c FROM schools")['c']
+
+
+def test_read_cursor_does_not_touch_writer():
+    """cursor القراءة يستخدم اتصال القراءة ولا يفتح اتصال الكتابة"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = DatabaseManager(Path(temp_dir) / "test.db")
+        manager.initialize_database()
+        manager.close_connection()
+        try:
+            with manager.get_read_cursor() as cursor:
+                cursor.execute("SELECT COUNT(*) FROM schools")
+                assert cursor.fetchone()[0] == 0
+                assert cursor.connection is manager.pool.get_reader()
+            assert manager.connection is None
+        finally:
+            manager.close_connection()
+
+
+def test_transaction_commits_once():
+    """المعاملة تجمع عدة عمليات كتابة في تأكيد واحد"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = DatabaseManager(Path(temp_dir) / "test.db")
+        manager.initialize_database()
+        try:
+            with manager.transaction() as cursor:
+                cursor.execute(INSERT_SCHOOL, ("مدرسة 1", "ابتدائية"))
+                manager.execute_insert(INSERT_SCHOOL, ("مدرسة 2", "ابتدائية"))
+                with manager.get_cursor() as inner:
+                    inner.execute(INSERT_SCHOOL, ("مدرسة 3", "ابتدائية"))
+                # لم يتم التأكيد بعد
+                with manager.get_connection() as conn:
+                    assert conn.in_transaction
+            with manager.get_connection() as conn:
+                assert not conn.in_transaction
+            assert count_schools(manager) == 3
+        finally:
+            manager.close_connection()
+
+
+def test_transaction_rolls_back_all_writes():
+    """فشل أي عملية داخل المعاملة يلغي جميع العمليات"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = DatabaseManager(Path(temp_dir) / "test.db")
+        manager.initialize_database()
+        try:
+            try:
+                with manager.transaction() as cursor:
+                    cursor.execute(INSERT_SCHOOL, ("مدرسة 1", "ابتدائية"))
+                    manager.execute_insert(INSERT_SCHOOL, ("مدرسة 2", "ابتدائية"))
+                    cursor.execute("INSERT INTO schools (name_ar) VALUES ('بدون نوع')")
+            except Exception:
+                pass
+            assert count_schools(manager) == 0
+        finally:
+            manager.close_connection()
+
+
+if __name__ == "__main__":
+    test_read_cursor_does_not_touch_writer()
+    test_transaction_commits_once()
+    test_transaction_rolls_back_all_writes()
+    print("✅ جميع اختبارات المعاملات نجحت")
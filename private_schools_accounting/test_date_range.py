@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار حدود فترات التاريخ وفهارس أعمدة التاريخ
+"""
+
+import sys
+import tempfile
+from datetime import date
+from pathlib import Path
+
+# إضافة مسار المشروع
+project_root = Path(__file__).resolve().parent
+sys.path.insert(0, str(project_root))
+
+from core.database.connection import DatabaseManager
+from core.utils.date_range import day_bounds, month_bounds, year_bounds, current_month_bounds, range_condition
+from core.utils.money import Money
+
+
+def test_bounds_are_half_open():
+    """النهاية هي أول يوم بعد الفترة"""
+    assert month_bounds(2025, 1) == ("2025-01-01", "2025-02-01")
+    assert month_bounds(2024, 12) == ("2024-12-01", "2025-01-01")
+    assert year_bounds(2025) == ("2025-01-01", "2026-01-01")
+    assert day_bounds(date(2025, 2, 28), "2025-02-28") == ("2025-02-28", "2025-03-01")
+    assert current_month_bounds(date(2024, 2, 29)) == ("2024-02-01", "2024-03-01")
+
+
+def test_monthly_total_uses_date_index():
+    """مجموع الشهر يطابق strftime لكنه يستخدم فهرس التاريخ"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = DatabaseManager(Path(temp_dir) / "test.db")
+        manager.initialize_database()
+        try:
+            manager.insert_many("schools", ("id", "name_ar", "school_types"), [(1, "أ", "ابتدائية"), (2, "ب", "ابتدائية")])
+            manager.insert_many(
+                "expenses", ("school_id", "title", "amount", "expense_date"),
+                [(1, "قرطاسية", Money(10), "2025-01-31"), (1, "وقود", Money(5), "2025-02-01 09:30"),
+                 (2, "صيانة", Money(7), "2025-02-28"), (1, "كهرباء", Money(3), "2025-03-01")]
+            )
+
+            query = f'SELECT COALESCE(SUM(amount), 0) AS "total [MONEY]" FROM expenses WHERE {range_condition("expense_date")}'
+            assert manager.execute_fetch_one(query, month_bounds(2025, 2))['total'] == Money(12)
+            assert manager.execute_fetch_one(query, year_bounds(2025))['total'] == Money(25)
+
+            plan = " ".join(row['detail'] for row in manager.execute_query("EXPLAIN QUERY PLAN " + query, month_bounds(2025, 2)))
+            assert "idx_expenses_expense_date" in plan
+
+            school_query = query + " AND school_id = ?"
+            plan = " ".join(row['detail'] for row in manager.execute_query(
+                "EXPLAIN QUERY PLAN " + school_query, month_bounds(2025, 2) + (1,)
+            ))
+            assert "idx_expenses_school_id_expense_date" in plan
+        finally:
+            manager.close_connection()
+
+
+if __name__ == "__main__":
+    test_bounds_are_half_open()
+    test_monthly_total_uses_date_index()
+    print("✅ جميع اختبارات فترات التاريخ نجحت")
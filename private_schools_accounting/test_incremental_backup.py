@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار النسخ الاحتياطي التزايدي: رفع الأجزاء الجديدة فقط، والاستعادة من البيان، والحذف
+"""
+
+import sqlite3
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# إضافة مسار المشروع
+project_root = Path(__file__).resolve().parent
+sys.path.insert(0, str(project_root))
+
+from core.backup.incremental import CHUNKS_PREFIX, IncrementalBackupStore
+from core.backup.storage import LocalObjectStore
+from core.database.snapshot import create_snapshot
+
+
+def create_database(path: Path):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE installments (id INTEGER PRIMARY KEY, notes TEXT)")
+    conn.executemany("INSERT INTO installments (notes) VALUES (?)", [(f"قسط {i} " * 20,) for i in range(5000)])
+    conn.commit()
+    conn.close()
+
+
+def test_incremental_backup_uploads_changed_chunks_only():
+    """النسخة الثانية بعد تعديل صف واحد ترفع جزءاً صغيراً، والاستعادة تطابق اللقطة"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp = Path(temp_dir)
+        db_path = temp / "schools.db"
+        create_database(db_path)
+        store = LocalObjectStore(temp / "remote")
+        backups = IncrementalBackupStore(store, temp / "cache")
+
+        create_snapshot(db_path, temp / "first.db", step_sleep=0)
+        first = backups.write(temp / "first.db", "backup_20250101_120000", "أول نسخة", chunk_size=16384)
+        assert first.database_size == (temp / "first.db").stat().st_size
+        first_chunks = len(store.list(CHUNKS_PREFIX))
+
+        conn = sqlite3.connect(db_path)
+        conn.execute("UPDATE installments SET notes = 'معدل' WHERE id = 4000")
+        conn.commit()
+        conn.close()
+        create_snapshot(db_path, temp / "second.db", step_sleep=0)
+        reported = []
+        second = backups.write(temp / "second.db", "backup_20250102_120000",
+                               progress=lambda done, total: reported.append(done), chunk_size=16384)
+
+        assert second.uploaded_size < first.uploaded_size / 10
+        assert len(store.list(CHUNKS_PREFIX)) - first_chunks <= 3
+        assert reported[-1] == second.database_size
+
+        # الاستعادة من مخزن جديد بلا بيانات محلية
+        fresh = IncrementalBackupStore(store, temp / "fresh_cache")
+        keys = fresh.list_keys()
+        assert len(keys) == 2
+        fresh.restore(second.key, temp / "restored.db")
+        assert (temp / "restored.db").read_bytes() == (temp / "second.db").read_bytes()
+        assert fresh.read_manifest(first.key).description == "أول نسخة"
+
+
+def test_delete_removes_unreferenced_chunks():
+    """حذف نسخة يزيل أجزاءها غير المشتركة ويبقي النسخة الأخرى قابلة للاستعادة"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp = Path(temp_dir)
+        store = LocalObjectStore(temp / "remote")
+        backups = IncrementalBackupStore(store, temp / "cache")
+        (temp / "a.db").write_bytes(b"A" * 1000 + b"B" * 1000)
+        (temp / "b.db").write_bytes(b"A" * 1000 + b"C" * 1000)
+
+        first = backups.write(temp / "a.db", "backup_20250101_120000", chunk_size=1000)
+        second = backups.write(temp / "b.db", "backup_20250102_120000", chunk_size=1000)
+        assert len(store.list(CHUNKS_PREFIX)) == 3
+
+        assert backups.delete(first.key) == 1
+        assert len(store.list(CHUNKS_PREFIX)) == 2
+        assert backups.list_keys() == [second.key]
+        backups.restore(second.key, temp / "restored.db")
+        assert (temp / "restored.db").read_bytes() == (temp / "b.db").read_bytes()
+
+
+def test_delete_waits_for_write_in_progress():
+    """حذف نسخة أثناء كتابة نسخة تشاركها أجزاءها لا يحذف تلك الأجزاء"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp = Path(temp_dir)
+        store = LocalObjectStore(temp / "remote")
+        backups = IncrementalBackupStore(store, temp / "cache")
+        (temp / "a.db").write_bytes(b"A" * 1000 + b"B" * 1000)
+        (temp / "b.db").write_bytes(b"A" * 1000 + b"C" * 1000)
+        first = backups.write(temp / "a.db", "backup_20250101_120000", chunk_size=1000)
+
+        # الكتابة تتوقف بعد رفع الجزء الجديد وقبل رفع البيان
+        uploading, resume = threading.Event(), threading.Event()
+        put = store.put
+
+        def slow_put(key, data):
+            put(key, data)
+            if key.startswith(CHUNKS_PREFIX):
+                uploading.set()
+                resume.wait(5)
+
+        store.put = slow_put
+        writer = threading.Thread(
+            target=lambda: backups.write(temp / "b.db", "backup_20250102_120000", chunk_size=1000)
+        )
+        writer.start()
+        assert uploading.wait(5)
+        deleter = threading.Thread(target=backups.delete, args=(first.key,))
+        deleter.start()
+        deleter.join(0.2)
+        assert deleter.is_alive()
+
+        resume.set()
+        writer.join(5)
+        deleter.join(5)
+        assert len(store.list(CHUNKS_PREFIX)) == 2
+        (second_key,) = backups.list_keys()
+        backups.restore(second_key, temp / "restored.db")
+        assert (temp / "restored.db").read_bytes() == (temp / "b.db").read_bytes()
+
+
+if __name__ == "__main__":
+    test_incremental_backup_uploads_changed_chunks_only()
+    test_delete_removes_unreferenced_chunks()
+    test_delete_waits_for_write_in_progress()
+    print("✅ جميع اختبارات النسخ التزايدي نجحت")
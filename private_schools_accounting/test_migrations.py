@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار محرك ترحيل مخطط قاعدة البيانات (PRAGMA user_version)
+"""
+
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+# إضافة مسار المشروع
+project_root = Path(__file__).resolve().parent
+sys.path.insert(0, str(project_root))
+
+from core.database import migrations
+from core.database.connection import DatabaseManager
+from core.database.migrations import SCHEMA_VERSION, Migration, migrate
+from core.utils.money import Money
+
+DDL_KEYWORDS = ("CREATE", "ALTER", "DROP")
+
+
+def user_version(manager: DatabaseManager) -> int:
+    return manager.execute_fetch_one("PRAGMA user_version")[0]
+
+
+def test_new_database_and_current_startup():
+    """قاعدة بيانات جديدة تُنشأ كاملة، والتشغيل التالي لا ينفذ أي DDL"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = DatabaseManager(Path(temp_dir) / "test.db")
+        try:
+            manager.initialize_database()
+            assert user_version(manager) == SCHEMA_VERSION
+            tables = {row['name'] for row in manager.execute_query("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            assert {"students", "expenses", "external_income", "salaries", "student_balances"} <= tables
+
+            statements = []
+            with manager.pool.writer() as conn:
+                conn.set_trace_callback(statements.append)
+            try:
+                manager.initialize_database()
+                assert migrate(manager) == []
+            finally:
+                with manager.pool.writer() as conn:
+                    conn.set_trace_callback(None)
+            assert statements and not any(s.lstrip().upper().startswith(DDL_KEYWORDS) for s in statements)
+        finally:
+            manager.close_connection()
+
+
+def test_legacy_database_is_upgraded():
+    """قاعدة بيانات من قبل نظام الإصدارات: أعمدة ناقصة ومبالغ DECIMAL وجداول غير موجودة"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = Path(temp_dir) / "legacy.db"
+        conn = sqlite3.connect(db_path)
+        conn.executescript("""
+            CREATE TABLE schools (id INTEGER PRIMARY KEY AUTOINCREMENT, name_ar TEXT NOT NULL,
+                                  school_types TEXT NOT NULL);
+            CREATE TABLE students (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL,
+                                   school_id INTEGER NOT NULL, grade TEXT NOT NULL, section TEXT NOT NULL,
+                                   gender TEXT NOT NULL, phone TEXT, total_fee DECIMAL(10,2) NOT NULL,
+                                   start_date DATE NOT NULL,
+                                   FOREIGN KEY (school_id) REFERENCES schools(id) ON DELETE CASCADE);
+            INSERT INTO schools VALUES (1, 'أ', 'ابتدائية');
+            INSERT INTO students VALUES (1, 'طالب', 1, 'الأول', 'أ', 'ذكر', NULL, 1000.5, '2024-09-01');
+        """)
+        conn.commit()
+        conn.close()
+
+        manager = DatabaseManager(db_path)
+        try:
+            assert migrate(manager) == list(range(1, SCHEMA_VERSION + 1))
+            columns = {column['name']: column['type'] for column in manager.get_table_info("students")}
+            assert {"national_id_number", "academic_year", "guardian_name", "status"} <= set(columns)
+            assert columns["total_fee"] == "MONEY"
+            student = manager.execute_fetch_one("SELECT total_fee, status FROM students WHERE id = 1")
+            assert student['total_fee'] == Money("1000.5") and student['status'] == "نشط"
+            balance = manager.execute_fetch_one("SELECT outstanding FROM student_balances WHERE student_id = 1")
+            assert balance['outstanding'] == Money("1000.5")
+            assert user_version(manager) == SCHEMA_VERSION
+        finally:
+            manager.close_connection()
+
+
+def test_failed_migration_rolls_back_everything():
+    """فشل ترحيل يُلغي جميع ترحيلات التشغيل ويبقي الإصدار السابق"""
+    def fail(manager, cursor):
+        raise sqlite3.OperationalError("فشل مقصود")
+
+    original = migrations.MIGRATIONS
+    migrations.MIGRATIONS = original[:2] + (Migration(3, "ترحيل فاشل", fail),)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = DatabaseManager(Path(temp_dir) / "test.db")
+        try:
+            try:
+                migrate(manager)
+                assert False, "كان يجب أن يفشل الترحيل"
+            except sqlite3.OperationalError:
+                pass
+            assert user_version(manager) == 0
+            assert manager.execute_fetch_one("SELECT 1 FROM sqlite_master WHERE name = 'students'") is None
+            assert manager.execute_fetch_one("PRAGMA foreign_keys")[0] == 1
+        finally:
+            migrations.MIGRATIONS = original
+            manager.close_connection()
+
+
+def test_newer_schema_is_rejected():
+    """قاعدة بيانات من إصدار أحدث من البرنامج لا تُفتح"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = DatabaseManager(Path(temp_dir) / "test.db")
+        try:
+            manager.execute_update(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+            try:
+                manager.initialize_database()
+                assert False, "كان يجب رفض الإصدار الأحدث"
+            except sqlite3.DatabaseError as e:
+                assert str(SCHEMA_VERSION + 1) in str(e)
+        finally:
+            manager.close_connection()
+
+
+if __name__ == "__main__":
+    test_new_database_and_current_startup()
+    test_legacy_database_is_upgraded()
+    test_failed_migration_rolls_back_everything()
+    test_newer_schema_is_rejected()
+    print("✅ جميع اختبارات ترحيل قاعدة البيانات نجحت")
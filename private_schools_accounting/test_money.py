@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار نوع المبالغ Money وترحيل أعمدة المبالغ إلى الفلس
+"""
+
+import sys
+import sqlite3
+import tempfile
+from pathlib import Path
+
+# إضافة مسار المشروع
+project_root = Path(__file__).resolve().parent
+sys.path.insert(0, str(project_root))
+
+from core.database.connection import DatabaseManager
+from core.utils.money import Money
+
+
+def test_money_arithmetic_is_exact():
+    """الجمع بالفلس دقيق بخلاف الأرقام العشرية"""
+    total = sum([Money(0.1), Money(0.2)])
+    assert total == Money("0.3")
+    assert total.minor == 300
+    assert Money(1500) - 250.5 == Money("1249.5")
+    assert Money(100) * 3 == 300
+    assert Money(100) / 3 == Money("33.333")
+    assert Money(50) / Money(200) == 0.25
+    assert max([Money(10), Money(20)], default=0) == 20
+
+
+def test_money_hash_matches_equality():
+    """المقارنة مع الأرقام دقيقة دون تقريب، فالمتساويان لهما البصمة نفسها"""
+    assert Money(1) != 1.0004 and len({Money(1), 1.0004}) == 2
+    assert len({Money(1), 1, 1.0, Money("1.000")}) == 1
+    assert Money("0.5") == 0.5 and hash(Money("0.5")) == hash(0.5)
+    assert Money(1) < 1.0004 <= Money("1.001")
+
+
+def test_money_formatting():
+    """التنسيق الحالي في الصفحات يبقى كما هو"""
+    amount = Money("1234567.5")
+    assert f"{amount:,.2f}" == "1,234,567.50"
+    assert f"{amount:,.0f}" == "1,234,568"
+    assert str(Money(1500)) == "1500"
+    assert str(amount) == "1234567.5"
+    assert float(amount) == 1234567.5
+
+
+def test_money_round_trip_through_database():
+    """الكتابة بالفلس والقراءة كـ Money بما في ذلك المجاميع"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = DatabaseManager(Path(temp_dir) / "test.db")
+        manager.initialize_database()
+        try:
+            manager.execute_insert("INSERT INTO schools (id, name_ar, school_types) VALUES (1, 'أ', 'ابتدائية')")
+            student_id = manager.execute_insert(
+                "INSERT INTO students (name, school_id, grade, section, gender, total_fee, start_date) "
+                "VALUES (?, 1, 'الأول', 'أ', 'ذكر', ?, '2025-09-01')",
+                ("طالب", Money(750000))
+            )
+            for amount in (0.1, 0.2):
+                manager.execute_insert(
+                    "INSERT INTO installments (student_id, amount, payment_date, payment_time) "
+                    "VALUES (?, ?, '2025-09-01', '10:00:00')",
+                    (student_id, Money(amount))
+                )
+
+            raw = manager.execute_query("SELECT typeof(amount) AS t, amount + 0 AS v FROM installments")
+            assert [(row['t'], row['v']) for row in raw] == [("integer", 100), ("integer", 200)]
+
+            student = manager.execute_fetch_one("SELECT total_fee, start_date FROM students")
+            assert isinstance(student['total_fee'], Money)
+            assert student['total_fee'] == 750000
+            assert student['start_date'] == "2025-09-01"
+
+            total = manager.execute_fetch_one('SELECT SUM(amount) AS "total [MONEY]" FROM installments')['total']
+            assert total == Money("0.3")
+        finally:
+            manager.close_connection()
+
+
+def test_migrate_legacy_decimal_columns():
+    """ترحيل قاعدة بيانات قديمة بأعمدة DECIMAL دون فقدان السجلات التابعة"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = Path(temp_dir) / "legacy.db"
+        conn = sqlite3.connect(db_path)
+        conn.executescript("""
+            CREATE TABLE schools (id INTEGER PRIMARY KEY AUTOINCREMENT, name_ar TEXT NOT NULL,
+                                  school_types TEXT NOT NULL);
+            CREATE TABLE students (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL,
+                                   school_id INTEGER NOT NULL, grade TEXT, section TEXT, gender TEXT,
+                                   total_fee DECIMAL(10,2) NOT NULL, start_date DATE,
+                                   FOREIGN KEY (school_id) REFERENCES schools(id) ON DELETE CASCADE);
+            CREATE TABLE installments (id INTEGER PRIMARY KEY AUTOINCREMENT, student_id INTEGER NOT NULL,
+                                       amount DECIMAL(10,2) NOT NULL, payment_date DATE NOT NULL,
+                                       payment_time TIME NOT NULL, notes TEXT,
+                                       FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE);
+            CREATE INDEX idx_legacy_installments ON installments(student_id);
+            INSERT INTO schools VALUES (1, 'أ', 'ابتدائية');
+            INSERT INTO students VALUES (1, 'طالب', 1, 'الأول', 'أ', 'ذكر', 1500.25, '2024-09-01');
+            INSERT INTO students VALUES (9, 'محذوف', 1, 'الأول', 'أ', 'ذكر', 10, '2024-09-01');
+            DELETE FROM students WHERE id = 9;
+            INSERT INTO installments VALUES (1, 1, 500.5, '2024-09-02', '10:00', NULL);
+        """)
+        conn.commit()
+        conn.close()
+
+        manager = DatabaseManager(db_path)
+        manager.initialize_database()
+        try:
+            student = manager.execute_fetch_one("SELECT total_fee FROM students WHERE id = 1")
+            installment = manager.execute_fetch_one("SELECT amount FROM installments WHERE id = 1")
+            assert student['total_fee'] == Money("1500.25")
+            assert installment['amount'] == Money("500.5")
+
+            # الفهارس والتسلسل محفوظة، والترحيل لا يتكرر
+            assert manager.execute_fetch_one(
+                "SELECT 1 FROM sqlite_master WHERE name = 'idx_legacy_installments'"
+            ) is not None
+            assert manager.execute_fetch_one("SELECT seq FROM sqlite_sequence WHERE name = 'students'")['seq'] == 9
+            assert manager.migrate_money_columns() == []
+            assert manager.execute_fetch_one("SELECT amount FROM installments")['amount'] == Money("500.5")
+        finally:
+            manager.close_connection()
+
+
+if __name__ == "__main__":
+    test_money_arithmetic_is_exact()
+    test_money_hash_matches_equality()
+    test_money_formatting()
+    test_money_round_trip_through_database()
+    test_migrate_legacy_decimal_columns()
+    print("✅ جميع اختبارات المبالغ نجحت")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار سجل الصفحات: الإنشاء عند أول عرض والاستيراد المسبق في الخلفية
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# إضافة مسار المشروع
+project_root = Path(__file__).resolve().parent
+sys.path.insert(0, str(project_root))
+
+from app.page_registry import PAGE_SPECS, PageRegistry, PageSpec
+
+PAGE_MODULE = '''
+import_count = globals().get("import_count", 0) + 1
+
+class FakePage:
+    created = 0
+
+    def __init__(self):
+        FakePage.created += 1
+'''
+
+
+def create_specs(temp_dir: str, prefix: str):
+    """وحدتا صفحات وهميتان في مجلد مؤقت، وصفحة تفشل وأخرى قيد التطوير"""
+    for name in ("first", "second"):
+        (Path(temp_dir) / f"{prefix}_{name}.py").write_text(PAGE_MODULE, encoding="utf-8")
+    (Path(temp_dir) / f"{prefix}_broken.py").write_text("raise RuntimeError('broken')\n", encoding="utf-8")
+    sys.path.insert(0, temp_dir)
+    return [
+        PageSpec("first", "الأولى", f"{prefix}_first", "FakePage", "بديلة", ("second", "broken", "todo")),
+        PageSpec("second", "الثانية", f"{prefix}_second", "FakePage", "بديلة"),
+        PageSpec("broken", "معطلة", f"{prefix}_broken", "FakePage", "فشل التحميل"),
+        PageSpec("todo", "قيد التطوير", message="قريباً"),
+    ]
+
+
+def test_pages_are_built_on_first_use():
+    """لا يُستورد أو يُنشأ شيء قبل أول عرض، والصفحة تُنشأ مرة واحدة"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        specs = create_specs(temp_dir, "lazy_pages")
+        created = []
+        registry = PageRegistry(specs, fallback=lambda spec: ("fallback", spec.message),
+                                on_created=lambda name, page: created.append(name), prefetch=False)
+        try:
+            assert "lazy_pages_first" not in sys.modules and registry.loaded_pages() == {}
+
+            page = registry.page("first")
+            assert registry.page("first") is page and type(page).created == 1
+            assert registry.page("broken") == ("fallback", "فشل التحميل")
+            assert registry.page("todo") == ("fallback", "قريباً")
+            assert created == ["first", "broken", "todo"]
+            assert not registry.is_loaded("second") and "lazy_pages_second" not in sys.modules
+
+            # الاستيراد المسبق معطل
+            assert registry.prefetch_after("first") == []
+
+            # الصفحات المُسقطة تُبنى من جديد عند طلبها التالي
+            unloaded = registry.unload(keep=["todo"])
+            assert set(unloaded) == {"first", "broken"} and unloaded["first"] is page
+            assert list(registry.loaded_pages()) == ["todo"]
+            assert registry.page("first") is not page and type(page).created == 2
+        finally:
+            registry.shutdown()
+            sys.path.remove(temp_dir)
+
+
+def test_prefetch_imports_without_building():
+    """الاستيراد المسبق يحمّل الوحدات في الخلفية دون إنشاء الصفحات أو تكرار الاستيراد"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        specs = create_specs(temp_dir, "prefetch_pages")
+        registry = PageRegistry(specs, fallback=lambda spec: None)
+        try:
+            registry.page("first")
+            assert registry.prefetch_after("first") == ["second", "broken"]
+            registry.wait_for_prefetch(timeout=10)
+            assert registry.prefetch_after("first") == []
+
+            module = sys.modules["prefetch_pages_second"]
+            assert module.import_count == 1 and module.FakePage.created == 0
+            assert not registry.is_loaded("second")
+
+            registry.page("second")
+            assert module.FakePage.created == 1 and module.import_count == 1
+        finally:
+            registry.shutdown()
+            sys.path.remove(temp_dir)
+
+
+def test_page_specs_are_consistent():
+    """أسماء الصفحات فريدة والصفحات المتوقعة معرفة"""
+    names = [spec.name for spec in PAGE_SPECS]
+    assert len(names) == len(set(names))
+    for spec in PAGE_SPECS:
+        assert set(spec.prefetch) <= set(names) and spec.name not in spec.prefetch
+        assert bool(spec.module) == bool(spec.class_name)
+
+
+if __name__ == "__main__":
+    test_pages_are_built_on_first_use()
+    test_prefetch_imports_without_building()
+    test_page_specs_are_consistent()
+    print("✅ جميع اختبارات سجل الصفحات نجحت")
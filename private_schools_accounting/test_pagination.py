@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار تحميل القوائم على صفحات (KeysetPager)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# إضافة مسار المشروع
+project_root = Path(__file__).resolve().parent
+sys.path.insert(0, str(project_root))
+
+from core.database.pagination import KeysetPager
+from core.utils.money import Money
+
+STUDENTS_QUERY = """
+    SELECT s.id, s.name, sc.name_ar as school_name, s.total_fee
+    FROM students s
+    LEFT JOIN schools sc ON s.school_id = sc.id
+    WHERE s.school_id = ?
+"""
+
+
+@pytest.fixture
+def paged_manager(school_manager):
+    """المدرستان مع طلاب بأسماء مكررة موزعين عليهما"""
+    school_manager.insert_many(
+        "students",
+        ("name", "school_id", "grade", "section", "gender", "total_fee", "start_date"),
+        [(f"طالب {i % 7}", 1 + i % 2, "الأول", "أ", "ذكر", Money(1000 + i), "2025-09-01") for i in range(45)]
+    )
+    return school_manager
+
+
+def read_all_pages(pager: KeysetPager):
+    """قراءة جميع الصفحات كما يفعل النموذج أثناء التمرير"""
+    rows, pages = [], 0
+    while True:
+        page = pager.fetch_page(rows[-1] if rows else None)
+        rows.extend(page)
+        pages += 1
+        if len(page) < pager.page_size:
+            return rows, pages
+
+
+def test_pages_match_full_ordered_query(paged_manager):
+    """الصفحات المتتالية تطابق الاستعلام الكامل دون تكرار أو فقدان مع الأسماء المكررة"""
+    pager = KeysetPager(STUDENTS_QUERY, (1,), order_by=[("name", "ASC"), ("id", "ASC")],
+                        page_size=5, manager=paged_manager)
+    rows, pages = read_all_pages(pager)
+    expected = paged_manager.execute_query(STUDENTS_QUERY + " ORDER BY s.name, s.id", (1,))
+    assert [row['id'] for row in rows] == [row['id'] for row in expected]
+    assert len(rows) == 23 and pages == 5
+    assert [row['id'] for row in pager.fetch_all()] == [row['id'] for row in rows]
+
+
+def test_descending_pages_and_aggregates(paged_manager):
+    """الترتيب التنازلي والمجاميع على كامل النتيجة المفلترة"""
+    pager = KeysetPager(STUDENTS_QUERY, (2,), order_by=[("id", "DESC")], page_size=10, manager=paged_manager)
+    rows, _ = read_all_pages(pager)
+    ids = [row['id'] for row in rows]
+    assert ids == sorted(ids, reverse=True) and len(ids) == 22
+    assert isinstance(rows[0]['total_fee'], Money)
+
+    assert pager.count() == 22
+    summary = pager.aggregate('SUM(total_fee) AS "total [MONEY]", SUM(total_fee > ?) AS above', (Money(1040),))
+    assert summary['total'] == sum((Money(1000 + i) for i in range(1, 45, 2)), Money(0))
+    assert summary['above'] == 2
+
+
+def test_mixed_directions_are_rejected():
+    """رفض الترتيب المختلط لأن مقارنة الصفوف تفترض اتجاهاً واحداً"""
+    try:
+        KeysetPager("SELECT id, name FROM students", order_by=[("name", "ASC"), ("id", "DESC")])
+        assert False, "كان يجب رفض الترتيب المختلط"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    if pytest.main([__file__, "-q"]) == 0:
+        print("✅ جميع اختبارات تحميل الصفحات نجحت")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار سجل الاستعلامات المسماة وثبات نصوصها
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# إضافة مسار المشروع
+project_root = Path(__file__).resolve().parent
+sys.path.insert(0, str(project_root))
+
+import config
+from core.database.connection import DatabaseManager
+from core.database.queries import build_query, canonical_sql, query_shape
+from core.database.search_index import match_expression
+from core.utils.date_range import day_bounds
+from core.utils.money import Money
+
+
+def test_stable_query_shapes():
+    """نفس الفلاتر النشطة بقيم مختلفة تعطي النص نفسه، والمعاملات بترتيب تعريف الفلاتر"""
+    first, first_params = build_query("students.list", grade="الأول", school_id=1)
+    second, second_params = build_query("students.list", school_id=2, grade="الثاني", status=None)
+    assert first == second
+    assert first_params == (1, "الأول") and second_params == (2, "الثاني")
+    assert first.index("s.school_id = ?") < first.index("s.grade = ?")
+    assert "\n" not in first and "  " not in first
+
+    unfiltered, params = build_query("students.list", has_outstanding=False, search=None)
+    assert "WHERE" not in unfiltered and params == ()
+    balance, params = build_query("students.list", has_outstanding=True)
+    assert balance.endswith("WHERE b.outstanding > 0") and params == ()
+
+    expenses, params = build_query("expenses.list", date_range=day_bounds("2025-01-01", "2025-01-31"))
+    assert expenses.endswith("ORDER BY e.expense_date DESC, e.created_at DESC")
+    assert params == ("2025-01-01", "2025-02-01")
+    assert query_shape.cache_info().hits > 0
+
+    assert canonical_sql("SELECT  'a  b'\n  FROM t") == "SELECT 'a  b' FROM t"
+    for bad in ({"unknown": 1}, {"date_range": ("2025-01-01",)}):
+        try:
+            build_query("expenses.list", **bad)
+            assert False, "كان يجب رفض الفلتر"
+        except ValueError:
+            pass
+
+
+def test_registered_query_filters_rows():
+    """استعلام الطلاب المسجل يعمل مع فلاتر الرصيد والبحث، والاتصالات بحجم ذاكرة العبارات المحدد"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = DatabaseManager(Path(temp_dir) / "test.db")
+        manager.initialize_database()
+        try:
+            assert manager.pool.cached_statements == config.DATABASE_STATEMENT_CACHE_SIZE
+            manager.insert_many("schools", ("id", "name_ar", "school_types"), [(1, "أ", "ابتدائية")])
+            manager.insert_many(
+                "students",
+                ("id", "name", "school_id", "grade", "section", "gender", "total_fee", "start_date"),
+                [(1, "أحمد علي", 1, "الأول", "أ", "ذكر", Money(100), "2025-09-01"),
+                 (2, "سارة", 1, "الأول", "أ", "أنثى", Money(0), "2025-09-01")]
+            )
+
+            query, params = build_query("students.list", school_id=1, has_outstanding=True)
+            assert [row['id'] for row in manager.execute_query(query, params)] == [1]
+            query, params = build_query("students.list", settled=True)
+            assert [row['id'] for row in manager.execute_query(query, params)] == [2]
+            query, params = build_query("students.list", search=match_expression("احمد"))
+            assert [row['name'] for row in manager.execute_query(query, params)] == ["أحمد علي"]
+        finally:
+            manager.close_connection()
+
+
+if __name__ == "__main__":
+    test_stable_query_shapes()
+    test_registered_query_filters_rows()
+    print("✅ جميع اختبارات سجل الاستعلامات نجحت")
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار فهارس البحث النصي (FTS5) وتوحيد الكتابة العربية
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+# إضافة مسار المشروع
+project_root = Path(__file__).resolve().parent
+sys.path.insert(0, str(project_root))
+
+from core.database.connection import DatabaseManager
+from core.database.search_index import ensure_search_index, match_expression, normalized_select, search_condition
+from core.utils.arabic import DIACRITICS, normalize_arabic
+from core.utils.money import Money
+
+
+@pytest.fixture
+def search_manager(school_manager):
+    """طلاب بأسماء مكتوبة بأشكال مختلفة"""
+    school_manager.insert_many(
+        "students",
+        ("id", "name", "school_id", "grade", "section", "gender", "total_fee", "start_date"),
+        [
+            (1, "أحمد علي", 1, "الأول", "أ", "ذكر", Money(1000), "2025-09-01"),
+            (2, "فاطمة حسن", 1, "الأول", "أ", "أنثى", Money(1000), "2025-09-01"),
+            (3, "مُصْطَفَى إبراهيم", 1, "الأول", "أ", "ذكر", Money(1000), "2025-09-01"),
+        ]
+    )
+    return school_manager
+
+
+def search_students(manager: DatabaseManager, text: str):
+    condition = search_condition("students", "id", text)
+    rows = manager.execute_query(f"SELECT id FROM students WHERE {condition[0]} ORDER BY id", (condition[1],))
+    return [row['id'] for row in rows]
+
+
+def test_normalize_arabic():
+    """توحيد الهمزات والتاء المربوطة والألف المقصورة وحذف التشكيل"""
+    assert normalize_arabic("أَحْمَد") == "احمد"
+    assert normalize_arabic("إبراهيم") == normalize_arabic("ابراهيم")
+    assert normalize_arabic("فاطمة") == normalize_arabic("فاطمه")
+    assert normalize_arabic("مصطفى") == normalize_arabic("مصطفي")
+    assert normalize_arabic("٠٧٧٠") == "0770"
+    assert normalize_arabic(None) is None
+
+
+def test_search_matches_spelling_variants(search_manager):
+    """البحث بأي شكل من أشكال الكتابة يطابق الاسم المخزن"""
+    assert search_students(search_manager, "احمد") == [1]
+    assert search_students(search_manager, "فاطمه") == [2]
+    assert search_students(search_manager, "مصطفي ابراهيم") == [3]
+    assert search_students(search_manager, "مصط") == [3]
+    assert search_students(search_manager, "علي") == [1]
+    # الرموز لا تُفسر كصيغة FTS5
+    assert search_students(search_manager, 'علي"*') == [1]
+
+
+def test_triggers_keep_index_in_sync(search_manager):
+    """الإضافة والتعديل والحذف تنعكس على الفهرس، وإعادة الإنشاء تعيد ملأه"""
+    search_manager.execute_update("UPDATE students SET name = ? WHERE id = ?", ("زينب كريم", 1))
+    assert search_students(search_manager, "احمد") == []
+    assert search_students(search_manager, "زينب") == [1]
+
+    search_manager.execute_update("DELETE FROM students WHERE id = ?", (2,))
+    assert search_students(search_manager, "فاطمة") == []
+
+    # فقدان triggers (كما بعد إعادة بناء الجدول) يؤدي لإعادة بناء الفهرس
+    with search_manager.get_cursor() as cursor:
+        cursor.execute("DROP TRIGGER students_fts_ai")
+        cursor.execute("DELETE FROM students_fts")
+        assert ensure_search_index(cursor, "students")
+    assert search_students(search_manager, "زينب") == [1]
+    search_manager.execute_insert(
+        "INSERT INTO students (name, school_id, grade, section, gender, total_fee, start_date) "
+        "VALUES (?, 1, 'الأول', 'أ', 'ذكر', ?, '2025-09-01')", ("حسين", Money(500))
+    )
+    assert len(search_students(search_manager, "حسين")) == 1
+
+
+def test_sql_normalization_matches_python():
+    """توحيد SQL في triggers يطابق normalize_arabic"""
+    texts = ["مُصْطَفَى إبراهيم", "فاطمة", "آمنة المؤمن", "هاتف ٠٧٧٠١٢٣", "ABC", "بـــاب" + DIACRITICS, None]
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.execute("CREATE TABLE people (id INTEGER PRIMARY KEY, name TEXT)")
+        conn.executemany("INSERT INTO people (name) VALUES (?)", [(text,) for text in texts])
+        rows = conn.execute(normalized_select(("name",), source=" FROM people") + " ORDER BY id").fetchall()
+        assert [name for _, name in rows] == [normalize_arabic(text) for text in texts]
+    finally:
+        conn.close()
+
+
+def test_external_writes_without_registered_function(search_manager):
+    """الكتابة من اتصال sqlite3 عادي (دون normalize_ar) تنجح وتُفهرس"""
+    search_manager.close_connection()
+    conn = sqlite3.connect(search_manager.db_path)
+    try:
+        conn.execute(
+            "INSERT INTO students (name, school_id, grade, section, gender, total_fee, start_date) "
+            "VALUES ('مُرْتَضى', 1, 'الأول', 'أ', 'ذكر', 0, '2025-09-01')"
+        )
+        conn.execute("UPDATE students SET name = 'فاطمة علي' WHERE id = 2")
+        conn.commit()
+    finally:
+        conn.close()
+    assert len(search_students(search_manager, "مرتضي")) == 1
+    assert search_students(search_manager, "علي") == [1, 2]
+
+
+def test_match_expression_quotes_terms():
+    """الكلمات تُقتبس لتجنب تفسير الرموز، مع تقييد الأعمدة عند الطلب"""
+    assert match_expression("أحمد علي") == '"احمد"* "علي"*'
+    assert match_expression('a"b', columns=("name",)) == '{name} : ("a""b"*)'
+    assert match_expression("   ") is None
+
+
+if __name__ == "__main__":
+    if pytest.main([__file__, "-q"]) == 0:
+        print("✅ جميع اختبارات فهارس البحث نجحت")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار لقطات قاعدة البيانات بواجهة النسخ الاحتياطي في SQLite
+"""
+
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+# إضافة مسار المشروع
+project_root = Path(__file__).resolve().parent
+sys.path.insert(0, str(project_root))
+
+from core.database.connection import DatabaseManager
+from core.database.migrations import SCHEMA_VERSION
+from core.database.snapshot import SnapshotService, create_snapshot
+from core.utils.money import Money
+
+
+def create_source(temp_dir: str) -> Path:
+    """قاعدة بيانات WAL بعدة مئات من الصفحات"""
+    path = Path(temp_dir) / "source.db"
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, body TEXT)")
+    conn.executemany("INSERT INTO items (body) VALUES (?)", [("x" * 500,) for _ in range(3000)])
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_snapshot_is_consistent_during_writes():
+    """الكتابة من اتصال آخر بين الخطوات لا تعيد النسخ ولا تظهر في اللقطة"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        source_path = create_source(temp_dir)
+        writer = sqlite3.connect(source_path)
+        steps = []
+
+        def progress(copied, total):
+            steps.append((copied, total))
+            writer.execute("INSERT INTO items (body) VALUES ('جديد')")
+            writer.commit()
+
+        target = Path(temp_dir) / "out" / "snapshot.db"
+        info = create_snapshot(source_path, target, progress, pages_per_step=50, step_sleep=0)
+        writer.close()
+
+        assert len(steps) > 2 and steps[-1][0] == steps[-1][1] == info.page_count
+        assert [copied for copied, _ in steps] == sorted(copied for copied, _ in steps)
+        assert info.size == target.stat().st_size and not Path(f"{target}.part").exists()
+
+        snapshot = sqlite3.connect(target)
+        try:
+            assert snapshot.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 3000
+            assert snapshot.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+            assert snapshot.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+        finally:
+            snapshot.close()
+
+
+def test_async_snapshot_and_manager_backup():
+    """اللقطة في الخيط العامل، وbackup_database يلتقط ما في WAL دون نقطة تفتيش"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = DatabaseManager(Path(temp_dir) / "test.db")
+        manager.initialize_database()
+        service = SnapshotService(manager.db_path)
+        try:
+            manager.insert_many("schools", ("id", "name_ar", "school_types"), [(1, "أ", "ابتدائية")])
+            manager.insert_many(
+                "students", ("name", "school_id", "grade", "section", "gender", "total_fee", "start_date"),
+                [("طالب", 1, "الأول", "أ", "ذكر", Money(250), "2025-09-01")]
+            )
+
+            info = service.snapshot_async(Path(temp_dir) / "async.db").result(timeout=30)
+            assert info.schema_version == SCHEMA_VERSION
+
+            backup_path = Path(temp_dir) / "backup.db"
+            assert manager.backup_database(str(backup_path))
+            for path in (info.path, backup_path):
+                copy = DatabaseManager(path)
+                try:
+                    row = copy.execute_fetch_one("SELECT outstanding FROM student_balances")
+                    assert row['outstanding'] == Money(250)
+                finally:
+                    copy.close_connection()
+        finally:
+            service.shutdown()
+            manager.close_connection()
+
+
+if __name__ == "__main__":
+    test_snapshot_is_consistent_during_writes()
+    test_async_snapshot_and_manager_backup()
+    print("✅ جميع اختبارات لقطات قاعدة البيانات نجحت")
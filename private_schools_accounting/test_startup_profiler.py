@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار متتبع زمن بدء التشغيل وتقاريره
+"""
+
+import builtins
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# إضافة مسار المشروع
+project_root = Path(__file__).resolve().parent
+sys.path.insert(0, str(project_root))
+
+from core.utils.startup_profiler import STARTUP_FLAG, StartupProfiler
+
+
+def test_enable_from_flag_or_environment():
+    """التفعيل بالخيار (مع إزالته من argv) أو بمتغير البيئة فقط"""
+    original_import = builtins.__import__
+    profiler = StartupProfiler()
+    argv = ["main.py", STARTUP_FLAG]
+    assert profiler.enable_from(argv, environ={}) and argv == ["main.py"]
+    profiler.stop()
+    assert builtins.__import__ is original_import
+
+    assert not StartupProfiler().enable_from(["main.py"], environ={})
+    env_profiler = StartupProfiler()
+    assert env_profiler.enable_from(["main.py"], environ={"SCHOOLS_PROFILE_STARTUP": "1"})
+    env_profiler.stop()
+
+
+def test_phases_imports_and_reports():
+    """المراحل المتداخلة، طرح زمن الانتظار، زمن الاستيراد، والتقريران مع الميزانية والتشغيل السابق"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        (Path(temp_dir) / "profiled_outer.py").write_text(
+            "import time\nimport profiled_inner\ntime.sleep(0.02)\n", encoding="utf-8")
+        (Path(temp_dir) / "profiled_inner.py").write_text(
+            "import time\ntime.sleep(0.03)\n", encoding="utf-8")
+        sys.path.insert(0, temp_dir)
+        logs_dir = Path(temp_dir) / "logs"
+        try:
+            profiler = StartupProfiler()
+            profiler.start()
+            with profiler.phase("imports"):
+                import profiled_outer  # noqa: F401
+            with profiler.phase("authenticate_user"):
+                with profiler.phase("login_wait", waiting=True):
+                    time.sleep(0.05)
+            report = profiler.finish(logs_dir, budget_ms=1, phase_budgets_ms={"imports": 100000})
+            assert not profiler.enabled and profiler.finish(logs_dir) is None
+
+            phases = {item["name"]: item for item in report["phases"]}
+            assert phases["login_wait"]["waiting"] and phases["login_wait"]["depth"] == 1
+            assert phases["authenticate_user"]["active_ms"] < 40
+            assert report["waiting_ms"] >= 50 and report["total_ms"] < report["wall_ms"]
+            assert report["over_budget"] and not phases["imports"]["over_budget"]
+
+            imports = {item["module"]: item for item in report["imports"]}
+            outer, inner = imports["profiled_outer"], imports["profiled_inner"]
+            assert inner["depth"] == 1 and inner["self_ms"] >= 30
+            assert outer["cumulative_ms"] >= outer["self_ms"] + inner["cumulative_ms"] - 1
+            assert 20 <= outer["self_ms"] < 45
+
+            saved = json.loads((logs_dir / "startup_profile.json").read_text(encoding="utf-8"))
+            assert saved["total_ms"] == report["total_ms"] and saved["previous_total_ms"] is None
+            text = (logs_dir / "startup_profile.txt").read_text(encoding="utf-8")
+            assert "profiled_inner" in text and "[انتظار]" in text
+
+            # التشغيل التالي يقارن بالسابق
+            second = StartupProfiler()
+            second.start()
+            report = second.finish(logs_dir)
+            assert report["previous_total_ms"] == saved["total_ms"]
+        finally:
+            sys.path.remove(temp_dir)
+            for name in ("profiled_outer", "profiled_inner"):
+                sys.modules.pop(name, None)
+
+
+if __name__ == "__main__":
+    test_enable_from_flag_or_environment()
+    test_phases_imports_and_reports()
+    print("✅ جميع اختبارات متتبع بدء التشغيل نجحت")
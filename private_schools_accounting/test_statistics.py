@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار استعلامات لوحات الإحصائيات (مرور واحد بتجميع شرطي)
+"""
+
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+# إضافة مسار المشروع
+project_root = Path(__file__).resolve().parent
+sys.path.insert(0, str(project_root))
+
+from core.database.statistics import (
+    SalaryStatistics, StudentStatistics, dashboard_statistics, salary_statistics, student_statistics
+)
+from core.utils.money import Money
+
+TODAY = date(2025, 3, 15)
+
+
+@pytest.fixture
+def stats_manager(seeded_manager):
+    """الطلاب الأساسيون (علي منقطع) مع أقساط ورسوم إضافية ورواتب"""
+    seeded_manager.execute_update("UPDATE students SET status = 'منقطع' WHERE id = 2")
+    seeded_manager.insert_many(
+        "installments", ("student_id", "amount", "payment_date", "payment_time"),
+        [(1, Money(400), "2025-03-01", "10:00"), (3, Money(250), "2025-03-02", "10:00")]
+    )
+    seeded_manager.insert_many(
+        "additional_fees", ("student_id", "fee_type", "amount", "paid"),
+        [(1, "زي", Money(30), 1), (2, "كتب", Money(20), 0)]
+    )
+    seeded_manager.insert_many(
+        "salaries", ("staff_type", "staff_id", "staff_name", "base_salary", "paid_amount",
+                     "from_date", "to_date", "days_count", "payment_date", "payment_time"),
+        [(staff_type, staff_id, name, amount, amount, "2025-02-01", "2025-02-28", 28, payment_date, "10:00")
+         for staff_type, staff_id, name, amount, payment_date in (
+             ("teacher", 1, "م1", Money(600), "2025-03-01"), ("teacher", 2, "م2", Money(650), "2025-02-28"),
+             ("employee", 1, "و1", Money(300), "2025-03-31"), ("employee", 2, "و2", Money(310), "2025-04-01"))]
+    )
+    return seeded_manager
+
+
+def test_panel_statistics(stats_manager):
+    """كل لوحة تطابق القيم المحسوبة يدوياً"""
+    assert salary_statistics(stats_manager, TODAY) == SalaryStatistics(
+        total_count=4, total_amount=Money(1860), teachers_count=2, employees_count=2,
+        monthly_count=2, monthly_amount=Money(900), monthly_teachers=1, monthly_employees=1
+    )
+    assert student_statistics(stats_manager) == StudentStatistics(total_count=3, active_count=2)
+
+    dashboard = dashboard_statistics(stats_manager)
+    assert (dashboard.schools_count, dashboard.students_count) == (2, 3)
+    assert dashboard.total_fees == Money(2250) and dashboard.paid_fees == Money(650)
+    assert dashboard.remaining_fees == Money(1600)
+    assert dashboard.additional_fees_paid == Money(30)
+
+
+def test_empty_tables_give_zero_money(manager):
+    """الجداول الفارغة تعطي أصفاراً بنوع Money وليس None"""
+    dashboard = dashboard_statistics(manager)
+    assert dashboard.students_count == 0
+    assert isinstance(dashboard.total_fees, Money) and dashboard.remaining_fees == Money(0)
+
+
+if __name__ == "__main__":
+    if pytest.main([__file__, "-q"]) == 0:
+        print("✅ جميع اختبارات الإحصائيات نجحت")
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار جداول الملخصات المحدثة عبر triggers
+"""
+
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+# إضافة مسار المشروع
+project_root = Path(__file__).resolve().parent
+sys.path.insert(0, str(project_root))
+
+from core.database.connection import DatabaseManager
+from core.database.statistics import dashboard_statistics, period_totals, student_balance
+from core.database.summaries import ensure_summaries, verify_summaries
+from core.utils.money import Money
+
+
+@pytest.fixture
+def summary_manager(seeded_manager):
+    """الطلاب الأساسيون مع بيانات في جميع الجداول المصدر للملخصات"""
+    seeded_manager.insert_many(
+        "installments", ("id", "student_id", "amount", "payment_date", "payment_time"),
+        [(1, 1, Money(400), "2025-09-05", "10:00"), (2, 1, Money(100), "2025-10-01", "10:00"),
+         (3, 2, Money(250), "2025-09-07", "10:00")]
+    )
+    seeded_manager.insert_many(
+        "additional_fees", ("id", "student_id", "fee_type", "amount", "paid"),
+        [(1, 1, "زي", Money(30), 1), (2, 2, "كتب", Money(20), 0), (3, 3, "زي", Money(30), 0)]
+    )
+    seeded_manager.insert_many(
+        "expenses", ("school_id", "title", "amount", "expense_date"),
+        [(1, "قرطاسية", Money(15), "2025-09-10"), (2, "وقود", Money(5), "2025-10-02")]
+    )
+    seeded_manager.insert_many(
+        "salaries", ("staff_type", "staff_id", "staff_name", "base_salary", "paid_amount",
+                     "from_date", "to_date", "days_count", "payment_date", "payment_time"),
+        [("teacher", 1, "م1", Money(600), Money(600), "2025-09-01", "2025-09-30", 30, "2025-09-30", "10:00")]
+    )
+    return seeded_manager
+
+
+def school_row(manager: DatabaseManager, school_id: int):
+    return manager.execute_fetch_one("SELECT * FROM school_summary WHERE school_id = ?", (school_id,))
+
+
+def test_triggers_maintain_summaries(summary_manager):
+    """كل إضافة وتعديل وحذف ينعكس على الملخصات ويطابق إعادة الحساب"""
+    school = school_row(summary_manager, 1)
+    assert school['students_count'] == 2 and school['total_fees'] == Money(1500)
+    assert school['installments_paid'] == Money(750) and school['additional_fees_paid'] == Money(30)
+    assert school['expenses_total'] == Money(15)
+    balance = summary_manager.execute_fetch_one("SELECT * FROM student_balances WHERE student_id = 1")
+    assert balance['installments_paid'] == Money(500) and balance['installments_count'] == 2
+    assert balance['outstanding'] == Money(500) and balance['last_payment_date'] == "2025-10-01"
+    assert verify_summaries(summary_manager) == {}
+
+    # تعديل المبلغ والدفع ونقل طالب إلى مدرسة أخرى
+    summary_manager.execute_update("UPDATE installments SET amount = ? WHERE id = 2", (Money(150),))
+    summary_manager.execute_update("UPDATE additional_fees SET paid = 1 WHERE id = 3")
+    summary_manager.execute_update("UPDATE students SET school_id = 2 WHERE id = 2")
+    assert school_row(summary_manager, 1)['installments_paid'] == Money(550)
+    assert school_row(summary_manager, 2)['students_count'] == 2
+    assert school_row(summary_manager, 2)['installments_paid'] == Money(250)
+    month = summary_manager.execute_fetch_one(
+        "SELECT total FROM monthly_summary WHERE month = '2025-09' AND school_id = 2 AND kind = 'installments'"
+    )
+    assert month['total'] == Money(250)
+    assert verify_summaries(summary_manager) == {}
+
+    # تعديل القسط الكلي وحذف آخر دفعة يحدّثان المتبقي وتاريخ آخر دفعة
+    summary_manager.execute_update("UPDATE students SET total_fee = ? WHERE id = 1", (Money(1200),))
+    summary_manager.execute_update("DELETE FROM installments WHERE id = 2")
+    balance = student_balance(1, summary_manager)
+    assert balance.total_fee == Money(1200) and balance.installments_paid == Money(400)
+    assert balance.outstanding == Money(800) and balance.last_payment_date == "2025-09-05"
+    assert student_balance(2, summary_manager).additional_fees_due == Money(20)
+    assert student_balance(3, summary_manager).last_payment_date is None
+    assert verify_summaries(summary_manager) == {}
+
+    # الحذف المتتالي للأقساط والرسوم مع الطالب
+    summary_manager.execute_update("DELETE FROM students WHERE id = 1")
+    summary_manager.execute_update("DELETE FROM expenses WHERE school_id = 2")
+    school = school_row(summary_manager, 1)
+    assert school['students_count'] == 0 and school['installments_paid'] == Money(0)
+    fee_type = summary_manager.execute_fetch_one("SELECT * FROM fee_type_summary WHERE fee_type = 'زي'")
+    assert fee_type['entries'] == 1 and fee_type['paid_total'] == Money(30)
+    assert verify_summaries(summary_manager) == {}
+
+
+def test_verify_detects_drift_and_rebuild_repairs_it(summary_manager):
+    """التحقق يكشف الاختلاف دون تعديل، وإعادة الإنشاء بعد فقدان trigger تصلحه"""
+    summary_manager.execute_update("UPDATE school_summary SET total_fees = 0 WHERE school_id = 1")
+    assert verify_summaries(summary_manager) == {"school_summary": 2}
+    assert verify_summaries(summary_manager) == {"school_summary": 2}
+
+    with summary_manager.get_cursor() as cursor:
+        cursor.execute("DROP TRIGGER expenses_summary_ai")
+        assert ensure_summaries(cursor)
+    assert school_row(summary_manager, 1)['total_fees'] == Money(1500)
+    assert verify_summaries(summary_manager) == {}
+
+
+def test_changed_definitions_are_recreated(summary_manager):
+    """جدول ملخص أو trigger بتعريف قديم يُعاد إنشاؤه وتعبئته"""
+    with summary_manager.get_cursor() as cursor:
+        # تعريف إصدار سابق بلا عمودي المتبقي وتاريخ آخر دفعة
+        cursor.execute("DROP TABLE student_balances")
+        cursor.execute("""
+            CREATE TABLE student_balances (
+                student_id INTEGER PRIMARY KEY, school_id INTEGER NOT NULL,
+                total_fee MONEY NOT NULL DEFAULT 0, installments_paid MONEY NOT NULL DEFAULT 0,
+                installments_count INTEGER NOT NULL DEFAULT 0,
+                additional_fees_total MONEY NOT NULL DEFAULT 0, additional_fees_paid MONEY NOT NULL DEFAULT 0
+            )
+        """)
+        cursor.execute("DROP TRIGGER installments_summary_ai")
+        cursor.execute("CREATE TRIGGER installments_summary_ai AFTER INSERT ON installments BEGIN SELECT 1; END")
+        assert ensure_summaries(cursor)
+        assert not ensure_summaries(cursor)
+
+    summary_manager.execute_update(
+        "INSERT INTO installments (student_id, amount, payment_date, payment_time) VALUES (3, ?, '2025-10-03', '09:00')",
+        (Money(50),)
+    )
+    balance = student_balance(3, summary_manager)
+    assert balance.outstanding == Money(700) and balance.last_payment_date == "2025-10-03"
+    assert verify_summaries(summary_manager) == {}
+
+
+def test_statistics_read_summaries(summary_manager):
+    """لوحة التحكم ومجاميع الأشهر تُقرأ من الملخصات"""
+    dashboard = dashboard_statistics(summary_manager)
+    assert (dashboard.schools_count, dashboard.students_count) == (2, 3)
+    assert dashboard.total_fees == Money(2250) and dashboard.paid_fees == Money(750)
+    assert dashboard.additional_fees_paid == Money(30)
+
+    totals = period_totals("expenses", summary_manager, today=date(2025, 10, 20))
+    assert totals.month_total == Money(5) and totals.year_total == Money(20)
+
+
+if __name__ == "__main__":
+    if pytest.main([__file__, "-q"]) == 0:
+        print("✅ جميع اختبارات جداول الملخصات نجحت")
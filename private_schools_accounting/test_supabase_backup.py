@@ -13,6 +13,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 import config
 from core.backup.backup_manager import backup_manager
+from core.backup.storage import SupabaseObjectStore
 
 def test_supabase_connection():
     """اختبار الاتصال بـ Supabase"""
@@ -20,8 +21,10 @@ def test_supabase_connection():
     print("اختبار اتصال Supabase")
     print("=" * 50)
     
-    if backup_manager.supabase is None:
-        print("❌ خطأ: عميل Supabase غير متاح")
+    try:
+        supabase = SupabaseObjectStore.from_config().client
+    except Exception as e:
+        print(f"❌ خطأ: عميل Supabase غير متاح: {e}")
         print("تحقق من:")
         print("1. تثبيت مكتبة supabase: pip install supabase")
         print("2. صحة إعدادات SUPABASE_URL و SUPABASE_KEY في config.py")
@@ -29,7 +32,7 @@ def test_supabase_connection():
     
     try:
         # اختبار الاتصال بالتحقق من البكت
-        buckets = backup_manager.supabase.storage.list_buckets()
+        buckets = supabase.storage.list_buckets()
         print(f"✅ تم الاتصال بـ Supabase بنجاح")
         print(f"عدد البكتات المتاحة: {len(buckets)}")
         
@@ -65,7 +68,8 @@ def test_backup_creation():
             conn.commit()
         print("✅ تم إنشاء قاعدة بيانات تجريبية")
     
-    # إنشاء نسخة احتياطية تجريبية
+    # إنشاء نسخة احتياطية تجريبية بعد انتظار تهيئة خدمة النسخ
+    backup_manager.get()
     success, message = backup_manager.create_backup("نسخة احتياطية تجريبية - اختبار النظام")
     
     if success:
@@ -20,7 +20,8 @@ def test_supabase_only_backup():
     print("=" * 60)
     
     try:
-        from core.backup.backup_manager import backup_manager
+        from core.backup.backup_manager import get_backup_manager
+        backup_manager = get_backup_manager()
         
         if backup_manager is None:
             print("❌ فشل في تهيئة مدير النسخ الاحتياطية")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار نموذج الجدول المشترك (RowTableModel) ووسيط الترتيب ومفوض أزرار الإجراءات ومتحكم البحث
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# إضافة مسار المشروع
+project_root = Path(__file__).resolve().parent
+sys.path.insert(0, str(project_root))
+
+pytest.importorskip("PyQt5.QtCore")
+
+from PyQt5.QtCore import Qt, QPoint, QRect
+from PyQt5.QtWidgets import QApplication, QStyleOptionViewItem, QLineEdit
+
+from core.utils.money import Money
+from ui.widgets.table_model import RowTableModel, RowFilterProxyModel, SORT_ROLE
+from ui.widgets.action_delegate import ActionButtonsDelegate
+from ui.widgets.search_controller import SearchController
+
+HEADERS = ["المعرف", "الاسم", "المبلغ", "الإجراءات"]
+FIELDS = [0, 1, 2, None]
+ROWS = [
+    (1, "أحمد", Money(900)),
+    (2, "علي", Money(50)),
+    (3, "سارة", Money(1200)),
+]
+
+
+def create_model() -> RowTableModel:
+    """نموذج بثلاثة صفوف ومبلغ منسق"""
+    model = RowTableModel(HEADERS, FIELDS, formatters={2: lambda amount: f"{amount:,.2f}"})
+    model.set_rows(ROWS)
+    return model
+
+
+def test_display_and_sort_roles():
+    """النص المنسق للعرض والقيمة الخام للترتيب"""
+    model = create_model()
+    assert model.rowCount() == 3
+    assert model.columnCount() == 4
+    assert model.headerData(1, Qt.Horizontal) == "الاسم"
+    assert model.data(model.index(2, 2)) == "1,200.00"
+    assert model.data(model.index(2, 2), SORT_ROLE) == 1200.0
+    assert model.data(model.index(0, 3)) == ""
+
+
+def test_proxy_sorts_money_numerically():
+    """ترتيب المبالغ رقمياً وليس كنصوص، مع إرجاع الصف الأصلي"""
+    model = create_model()
+    proxy = RowFilterProxyModel(model)
+    proxy.sort(2, Qt.AscendingOrder)
+    assert [proxy.row_data(row)[0] for row in range(proxy.rowCount())] == [2, 1, 3]
+
+
+def test_action_delegate_hit_testing():
+    """تحديد الزر المنقور مع مراعاة اتجاه اليمين إلى اليسار"""
+    app = QApplication.instance() or QApplication([])
+    delegate = ActionButtonsDelegate([("edit", "تعديل", "#17A2B8"), ("delete", "حذف", "#DC3545")])
+    option = QStyleOptionViewItem()
+    option.rect = QRect(0, 0, 175, 40)  # زران بعرض 80 ومسافة 5 يملآن الخلية
+
+    option.direction = Qt.LeftToRight
+    assert delegate.action_at(option, QPoint(10, 20)) == "edit"
+    assert delegate.action_at(option, QPoint(87, 20)) is None
+    assert delegate.action_at(option, QPoint(170, 20)) == "delete"
+
+    option.direction = Qt.RightToLeft
+    assert delegate.action_at(option, QPoint(170, 20)) == "edit"
+    assert delegate.action_at(option, QPoint(10, 20)) == "delete"
+
+
+def test_search_controller_debounce_and_stale_results():
+    """البحث يُنفذ مرة واحدة لآخر نص، ونتيجة البحث الملغى تُهمل"""
+    app = QApplication.instance() or QApplication([])
+    line_edit = QLineEdit()
+    searches = []
+    controller = SearchController(line_edit, searches.append, delay_ms=10_000)
+
+    for text in ("أ", "أح", "أحمد"):
+        line_edit.setText(text)
+    assert searches == []
+    controller.flush()
+    controller.flush()
+    assert searches == ["أحمد"]
+
+    shown = []
+    controller._callbacks[0] = shown.append
+    controller.cancel()
+    controller._on_finished(0, "قديم", None)
+    controller._callbacks[controller._generation] = shown.append
+    controller._on_finished(controller._generation, "جديد", None)
+    assert shown == ["جديد"]
+
+
+if __name__ == "__main__":
+    test_display_and_sort_roles()
+    test_proxy_sorts_money_numerically()
+    test_action_delegate_hit_testing()
+    test_search_controller_debounce_and_stale_results()
+    print("✅ جميع اختبارات نموذج الجدول نجحت")
@@ -8,17 +8,21 @@ import logging
 import json
 from datetime import datetime, date
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, 
-    QTableWidgetItem, QPushButton, QLabel, QLineEdit,
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView,
+    QPushButton, QLabel, QLineEdit,
     QFrame, QMessageBox, QHeaderView, QAbstractItemView,
     QMenu, QComboBox, QDateEdit, QSpinBox, QDoubleSpinBox,
     QCheckBox, QTextEdit, QAction
 )
 from PyQt5.QtCore import Qt, pyqtSignal, QDate
-from PyQt5.QtGui import QFont, QPixmap, QIcon
+from PyQt5.QtGui import QFont, QPixmap, QIcon, QColor
 
 from core.database.connection import db_manager
+from core.database.pagination import KeysetPager
+from core.database.search_index import search_condition
 from core.utils.logger import log_user_action, log_database_operation
+from ui.widgets.table_model import PagedRowTableModel, RowFilterProxyModel
+from ui.widgets.search_controller import SearchController
 
 
 
@@ -31,7 +35,7 @@ class AdditionalFeesPage(QWidget):
     
     def __init__(self):
         super().__init__()
-        self.current_fees = []
+        self.fees_pager = None
         self.selected_school_id = None
         self.selected_student_id = None
         
@@ -219,7 +223,7 @@ class AdditionalFeesPage(QWidget):
             table_layout.setContentsMargins(0, 0, 0, 0)
             
             # إنشاء الجدول
-            self.fees_table = QTableWidget()
+            self.fees_table = QTableView()
             self.fees_table.setObjectName("dataTable")
             
             # إعداد الأعمدة
@@ -228,14 +232,27 @@ class AdditionalFeesPage(QWidget):
                 "حالة الدفع", "تاريخ الدفع", "ملاحظات", "تاريخ الإنشاء"
             ]
             
-            self.fees_table.setColumnCount(len(columns))
-            self.fees_table.setHorizontalHeaderLabels(columns)
+            # (id, student_name, school_name, fee_type, amount, paid, payment_date, notes, created_at)
+            self.fees_model = PagedRowTableModel(
+                columns, list(range(len(columns))),
+                formatters={
+                    4: lambda amount: f"{amount or 0:,.0f}",
+                    5: lambda paid: "مدفوع" if paid else "غير مدفوع",
+                    8: self.format_created_at
+                },
+                alignments={5: Qt.AlignCenter},
+                backgrounds={5: lambda paid: QColor(Qt.green) if paid else QColor(Qt.yellow)},
+                parent=self
+            )
+            self.fees_proxy = RowFilterProxyModel(self.fees_model, self)
+            self.fees_table.setModel(self.fees_proxy)
             
             # إعداد خصائص الجدول
             self.fees_table.setAlternatingRowColors(True)
             self.fees_table.setSelectionBehavior(QAbstractItemView.SelectRows)
             self.fees_table.setSelectionMode(QAbstractItemView.SingleSelection)
-            self.fees_table.setSortingEnabled(True)
+            # الترتيب يتم في الاستعلام (الأحدث أولاً) لأن الصفوف تُحمل على دفعات
+            self.fees_table.setSortingEnabled(False)
             self.fees_table.setShowGrid(False)
             self.fees_table.setEditTriggers(QAbstractItemView.NoEditTriggers) # منع التعديل المباشر
             
@@ -383,7 +400,10 @@ class AdditionalFeesPage(QWidget):
             self.student_combo.currentTextChanged.connect(self.apply_filters)
             self.fee_type_combo.currentTextChanged.connect(self.apply_filters)
             self.status_combo.currentTextChanged.connect(self.apply_filters)
-            self.search_input.textChanged.connect(self.apply_filters)
+            # البحث بعد توقف الكتابة بدلاً من استعلام لكل حرف
+            self.search_controller = SearchController(
+                self.search_input, lambda _text: self.apply_filters(), parent=self
+            )
             
         except Exception as e:
             logging.error(f"خطأ في ربط الإشارات: {e}")
@@ -509,29 +529,30 @@ class AdditionalFeesPage(QWidget):
                 params.append(paid_status)
             
             # فلتر البحث
-            search_text = self.search_input.text().strip()
-            if search_text:
-                query += " AND (af.notes LIKE ? OR s.name LIKE ?)"
-                search_param = f"%{search_text}%"
-                params.extend([search_param, search_param])
-            
-            query += " ORDER BY af.created_at DESC"
-            
-            # تنفيذ الاستعلام
-            # تنفيذ الاستعلام مع معالجة غياب العمود full_name
+            search_text = self.search_input.text()
+            notes_condition = search_condition("additional_fees", "af.id", search_text)
+            if notes_condition:
+                name_condition = search_condition("students", "af.student_id", search_text)
+                query += f" AND ({notes_condition[0]} OR {name_condition[0]})"
+                params.extend([notes_condition[1], name_condition[1]])
+            
+            # الأحدث أولاً (المعرف يتبع ترتيب الإنشاء ويصلح مفتاحاً للصفحات)
+            self.fees_pager = KeysetPager(query, params, order_by=[("id", "DESC")])
+            
+            # حساب الملخص يتحقق من الاستعلام قبل تحميل الصفحة الأولى
+            # مع معالجة غياب العمود full_name
             try:
-                fees = db_manager.execute_query(query, params)
+                self.update_summary(raise_errors=True)
             except Exception as e:
                 # في حال عمود full_name غير موجود، استخدم اسم الطالب العادي
                 if 'no such column' in str(e) and 's.full_name' in str(e):
                     fallback_query = query.replace('COALESCE(s.full_name, s.name)', 's.name')
-                    fees = db_manager.execute_query(fallback_query, params)
+                    self.fees_pager = KeysetPager(fallback_query, params, order_by=[("id", "DESC")])
+                    self.update_summary()
                 else:
                     raise
             
-            self.current_fees = fees or []
             self.populate_fees_table()
-            self.update_summary()
             
         except Exception as e:
             logging.error(f"خطأ في تحميل الرسوم الإضافية: {e}")
@@ -540,98 +561,52 @@ class AdditionalFeesPage(QWidget):
     def populate_fees_table(self):
         """ملء جدول الرسوم الإضافية"""
         try:
-            self.fees_table.setRowCount(len(self.current_fees))
-            
-            for row, fee in enumerate(self.current_fees):
-                # (id, student_name, school_name, fee_type, amount, paid, payment_date, notes, created_at)
-                
-                # المعرف (مخفي)
-                self.fees_table.setItem(row, 0, QTableWidgetItem(str(fee[0])))
-                
-                # الطالب
-                self.fees_table.setItem(row, 1, QTableWidgetItem(fee[1] or ""))
-                
-                # المدرسة
-                self.fees_table.setItem(row, 2, QTableWidgetItem(fee[2] or ""))
-                
-                # نوع الرسم
-                self.fees_table.setItem(row, 3, QTableWidgetItem(fee[3] or ""))
-                
-                # المبلغ
-                amount = fee[4] or 0
-                self.fees_table.setItem(row, 4, QTableWidgetItem(f"{amount:,.0f}"))
-                
-                # حالة الدفع
-                paid = fee[5]
-                status_text = "مدفوع" if paid else "غير مدفوع"
-                status_item = QTableWidgetItem(status_text)
-                status_item.setTextAlignment(Qt.AlignCenter)
-                if paid:
-                    status_item.setBackground(Qt.green)
-                else:
-                    status_item.setBackground(Qt.yellow)
-                self.fees_table.setItem(row, 5, status_item)
-
-                # تاريخ الدفع
-                payment_date = fee[6] or ""
-                self.fees_table.setItem(row, 6, QTableWidgetItem(str(payment_date)))
-
-                # الملاحظات
-                notes = fee[7] or ""
-                self.fees_table.setItem(row, 7, QTableWidgetItem(notes))
-
-                # تاريخ الإنشاء
-                created_at = fee[8]
-                formatted_date = ""
-                if created_at:
-                    try:
-                        date_obj = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                        formatted_date = date_obj.strftime("%Y-%m-%d %H:%M")
-                    except:
-                        formatted_date = str(created_at)[:16]
-                self.fees_table.setItem(row, 8, QTableWidgetItem(formatted_date))
-
-            # تحديث إحصائية العدد المعروض
-            self.displayed_count_label.setText(f"عدد الرسوم المعروضة: {len(self.current_fees)}")
+            # تحميل الصفحة الأولى فقط، وبقية الصفحات عند التمرير
+            self.fees_model.set_pager(self.fees_pager)
             
         except Exception as e:
             logging.error(f"خطأ في ملء جدول الرسوم الإضافية: {e}")
     
-    def update_summary(self):
+    @staticmethod
+    def format_created_at(created_at) -> str:
+        """تنسيق تاريخ الإنشاء للعرض"""
+        if not created_at:
+            return ""
+        try:
+            date_obj = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
+            return date_obj.strftime("%Y-%m-%d %H:%M")
+        except:
+            return str(created_at)[:16]
+    
+    def update_summary(self, raise_errors: bool = False):
         """تحديث ملخص الرسوم"""
         try:
-            # حساب الإجماليات للرسوم المعروضة
-            total_amount = 0
-            collected_amount = 0
-            pending_amount = 0
-            pending_count = 0
-            collected_count = 0
+            # الأنواع المعروضة في الإحصائيات حسب النوع
+            fee_types = ["رسوم التسجيل", "الزي المدرسي", "الكتب", "القرطاسية", "رسم مخصص"]
+            
+            # حساب الإجماليات للرسوم المعروضة في استعلام واحد على كامل النتيجة المفلترة
+            select_list = """
+                COUNT(*) AS count,
+                SUM(amount) AS "total [MONEY]",
+                SUM(CASE WHEN paid THEN amount ELSE 0 END) AS "collected [MONEY]",
+                SUM(CASE WHEN paid THEN 0 ELSE amount END) AS "pending [MONEY]",
+                SUM(CASE WHEN paid THEN 1 ELSE 0 END) AS collected_count,
+                SUM(CASE WHEN paid THEN 0 ELSE 1 END) AS pending_count
+            """
+            # المحصل حسب النوع
+            for index in range(len(fee_types)):
+                select_list += f', SUM(CASE WHEN paid AND fee_type = ? THEN amount ELSE 0 END) AS "type_{index} [MONEY]"'
             
-            # إحصائيات حسب النوع
-            type_amounts = {
-                "رسوم التسجيل": 0,
-                "الزي المدرسي": 0,
-                "الكتب": 0,
-                "القرطاسية": 0,
-                "رسم مخصص": 0
-            }
-            
-            for fee in self.current_fees:
-                # (id, student_name, school_name, fee_type, amount, paid, payment_date, notes, created_at)
-                amount = fee[4] or 0
-                paid = fee[5]
-                fee_type = fee[3] or ""
-                
-                total_amount += amount
-                
-                if paid:
-                    collected_amount += amount
-                    collected_count += 1
-                    if fee_type in type_amounts:
-                        type_amounts[fee_type] += amount
-                else:
-                    pending_amount += amount
-                    pending_count += 1
+            summary = self.fees_pager.aggregate(select_list, fee_types) if self.fees_pager else None
+            
+            def value(key):
+                return (summary[key] if summary else None) or 0
+            
+            fees_count = value('count')
+            total_amount = value('total')
+            collected_amount = value('collected')
+            pending_amount = value('pending')
+            type_amounts = {fee_type: value(f'type_{index}') for index, fee_type in enumerate(fee_types)}
             
             # تحديث الملصقات الرئيسية
             self.total_amount_value.setText(f"{total_amount:,.0f} د.ع")
@@ -639,7 +614,7 @@ class AdditionalFeesPage(QWidget):
             self.pending_summary_value.setText(f"{pending_amount:,.0f} د.ع")
             
             # تحديث ملصقات الرأس
-            self.total_fees_label.setText(f"إجمالي الرسوم: {len(self.current_fees)}")
+            self.total_fees_label.setText(f"إجمالي الرسوم: {fees_count}")
             self.collected_amount_label.setText(f"المحصل: {collected_amount:,.0f} د.ع")
             self.pending_fees_label.setText(f"المستحق: {pending_amount:,.0f} د.ع")
             
@@ -651,10 +626,15 @@ class AdditionalFeesPage(QWidget):
             self.custom_fees_label.setText(f"رسم مخصص: {type_amounts['رسم مخصص']:,.0f} د.ع")
 
             # تحديث الإحصائيات الأخرى
-            self.pending_count_label.setText(f"الرسوم غير المدفوعة: {pending_count}")
-            self.collected_count_label.setText(f"الرسوم المدفوعة: {collected_count}")
+            self.pending_count_label.setText(f"الرسوم غير المدفوعة: {value('pending_count')}")
+            self.collected_count_label.setText(f"الرسوم المدفوعة: {value('collected_count')}")
+            
+            # تحديث إحصائية العدد المعروض
+            self.displayed_count_label.setText(f"عدد الرسوم المعروضة: {fees_count}")
             
         except Exception as e:
+            if raise_errors:
+                raise
             logging.error(f"خطأ في تحديث ملخص الرسوم: {e}")
     
     def apply_filters(self):
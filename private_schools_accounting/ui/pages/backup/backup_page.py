@@ -2,7 +2,7 @@
 # -*- coding: utf-8 -*-
 """
 صفحة إدارة النسخ الاحتياطية
-عرض وإدارة النسخ الاحتياطية المحفوظة على Supabase
+عرض وإدارة النسخ الاحتياطية المحفوظة على مخزن النسخ (مجلد محلي أو S3 أو Supabase)
 """
 
 import logging
@@ -18,6 +18,7 @@ from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
 from PyQt5.QtGui import QFont, QIcon, QPixmap
 
 from core.backup.backup_manager import backup_manager
+from core.backup.storage import backend_title
 from core.utils.logger import log_user_action
 
 
@@ -26,6 +27,7 @@ class BackupWorker(QThread):
     
     finished = pyqtSignal(bool, str)  # نجح العملية، رسالة
     progress = pyqtSignal(str)  # رسالة التقدم
+    percent = pyqtSignal(int)  # نسبة المرحلة الحالية (نسخ قاعدة البيانات ثم الرفع)
     
     def __init__(self, description=""):
         super().__init__()
@@ -35,10 +37,49 @@ class BackupWorker(QThread):
         """تنفيذ عملية النسخ الاحتياطي"""
         try:
             self.progress.emit("جاري إنشاء النسخة الاحتياطية...")
-            success, message = backup_manager.create_backup(self.description)
+            success, message = backup_manager.create_backup(
+                self.description, self.report_snapshot_progress, self.report_upload_progress
+            )
             self.finished.emit(success, message)
         except Exception as e:
             self.finished.emit(False, f"خطأ في إنشاء النسخة الاحتياطية: {e}")
+    
+    def report_snapshot_progress(self, copied, total):
+        """تقدم لقطة قاعدة البيانات (يُستدعى من هذا الخيط، والإشارات تنقله إلى الواجهة)"""
+        value = int(copied * 100 / total) if total else 100
+        self.percent.emit(value)
+        if copied >= total:
+            self.progress.emit("جاري ضغط النسخة الاحتياطية...")
+        else:
+            self.progress.emit(f"جاري نسخ قاعدة البيانات... {value}%")
+    
+    def report_upload_progress(self, sent, total):
+        """تقدم رفع الأرشيف على أجزاء"""
+        value = int(sent * 100 / total) if total else 100
+        self.percent.emit(value)
+        self.progress.emit(f"جاري رفع النسخة الاحتياطية... {value}%")
+
+
+class RestoreWorker(QThread):
+    """عامل استعادة نسخة احتياطية في خيط منفصل"""
+    
+    finished = pyqtSignal(bool, str)  # نجح العملية، رسالة
+    percent = pyqtSignal(int)  # نسبة إعادة بناء قاعدة البيانات
+    
+    def __init__(self, file_path):
+        super().__init__()
+        self.file_path = file_path
+    
+    def run(self):
+        """تنفيذ عملية الاستعادة"""
+        try:
+            success, message = backup_manager.restore_backup(self.file_path, self.report_progress)
+            self.finished.emit(success, message)
+        except Exception as e:
+            self.finished.emit(False, f"خطأ في استعادة النسخة الاحتياطية: {e}")
+    
+    def report_progress(self, done, total):
+        self.percent.emit(int(done * 100 / total) if total else 100)
 
 
 class CreateBackupDialog(QDialog):
@@ -94,14 +135,27 @@ class CreateBackupDialog(QDialog):
 class BackupPage(QWidget):
     """صفحة إدارة النسخ الاحتياطيات"""
     
+    # انتهاء مطابقة فهرس النسخ مع المخزن (يُطلق من خيط المطابقة ويُعالج في خيط الواجهة)
+    catalog_reconciled = pyqtSignal(bool)
+    # بدء استعادة قاعدة البيانات وانتهاؤها (نجحت أم لا)، لتوقف النافذة الرئيسية بقية
+    # الصفحات أثناءها وتعيد بناءها من البيانات المستعادة
+    restore_started = pyqtSignal()
+    restore_completed = pyqtSignal(bool)
+    
     def __init__(self):
         super().__init__()
+        self.catalog_listener = None
+        self.catalog_reconciled.connect(self.on_catalog_reconciled)
         self.backup_worker = None
+        self.restore_worker = None
         self.progress_dialog = None
+        self.service_timer = QTimer(self)
+        self.service_timer.timeout.connect(self.check_service_state)
         self.setup_ui()
         self.setup_styles()
         self.setup_connections()
-        self.refresh_backups()
+        # القائمة تُحمّل بعد جاهزية خدمة النسخ الاحتياطية دون حجب الواجهة
+        self.wait_for_service()
     
     def setup_ui(self):
         """إعداد واجهة المستخدم"""
@@ -177,10 +231,15 @@ class BackupPage(QWidget):
         info_layout = QHBoxLayout(info_frame)
         
         # معلومات التخزين
-        storage_info = QLabel("التخزين: Supabase Storage")
+        storage_info = QLabel(f"التخزين: {backend_title()}")
         storage_info.setStyleSheet("color: #666; font-size: 12px;")
         info_layout.addWidget(storage_info)
         
+        # حالة الاتصال بخدمة النسخ الاحتياطية
+        self.service_status_label = QLabel(backup_manager.status_text())
+        self.service_status_label.setStyleSheet("color: #666; font-size: 12px;")
+        info_layout.addWidget(self.service_status_label)
+        
         info_layout.addStretch()
         
         # آخر تحديث
@@ -319,6 +378,34 @@ class BackupPage(QWidget):
         self.refresh_btn.clicked.connect(self.refresh_backups)
         self.cleanup_btn.clicked.connect(self.cleanup_old_backups)
     
+    def wait_for_service(self):
+        """بدء تهيئة خدمة النسخ الاحتياطية (أو إعادة محاولتها) ومتابعة حالتها حتى تجهز"""
+        if backup_manager.is_ready:
+            self.check_service_state()
+            return
+        backup_manager.start()
+        self.check_service_state()
+        self.service_timer.start(300)
+    
+    def check_service_state(self):
+        """تحديث حالة الخدمة في الصفحة وتحميل القائمة عند الجاهزية"""
+        self.service_status_label.setText(backup_manager.status_text())
+        ready = backup_manager.is_ready
+        self.create_backup_btn.setEnabled(ready)
+        self.cleanup_btn.setEnabled(ready)
+        # زر التحديث يبقى متاحاً لإعادة المحاولة بعد الفشل
+        self.refresh_btn.setEnabled(backup_manager.state != backup_manager.INITIALIZING)
+        
+        if backup_manager.state in (backup_manager.READY, backup_manager.FAILED):
+            self.service_timer.stop()
+            if ready:
+                if self.catalog_listener is None:
+                    listener = self.catalog_listener = self.catalog_reconciled.emit
+                    backup_manager.add_reconcile_listener(listener)
+                    # لا يبقى المستمع مسجلاً بعد حذف الصفحة
+                    self.destroyed.connect(lambda: backup_manager.remove_reconcile_listener(listener))
+                self.refresh_backups()
+    
     def create_new_backup(self):
         """إنشاء نسخة احتياطية جديدة"""
         try:
@@ -330,7 +417,7 @@ class BackupPage(QWidget):
                 # عرض حوار التقدم
                 self.progress_dialog = QProgressDialog(
                     "جاري إنشاء النسخة الاحتياطية...",
-                    None, 0, 0, self
+                    None, 0, 100, self
                 )
                 self.progress_dialog.setWindowTitle("إنشاء نسخة احتياطية")
                 self.progress_dialog.setModal(True)
@@ -339,6 +426,7 @@ class BackupPage(QWidget):
                 # بدء عملية النسخ الاحتياطي
                 self.backup_worker = BackupWorker(description)
                 self.backup_worker.progress.connect(self.update_progress)
+                self.backup_worker.percent.connect(self.progress_dialog.setValue)
                 self.backup_worker.finished.connect(self.backup_finished)
                 self.backup_worker.start()
                 
@@ -371,8 +459,16 @@ class BackupPage(QWidget):
     def refresh_backups(self):
         """تحديث قائمة النسخ الاحتياطية"""
         try:
-            # جلب النسخ الاحتياطية
+            if not backup_manager.is_ready:
+                self.wait_for_service()
+                return
+            
+            # القائمة من الفهرس المحلي فوراً؛ قبل أول مطابقة مع المخزن تُطلب المطابقة
+            # في الخلفية ويُعاد تحميل القائمة عند انتهائها (on_catalog_reconciled)
             backups = backup_manager.list_backups()
+            synced = backup_manager.is_catalog_synced
+            if not synced:
+                backup_manager.start_reconcile()
             
             # تحديث الجدول
             self.backups_table.setRowCount(len(backups))
@@ -393,8 +489,8 @@ class BackupPage(QWidget):
                 size_item.setFlags(size_item.flags() & ~Qt.ItemIsEditable)
                 self.backups_table.setItem(row, 2, size_item)
                 
-                # الوصف (يمكن استخراجه من معلومات النسخة)
-                description_item = QTableWidgetItem("--")
+                # الوصف (محفوظ في بيان النسخ التزايدية)
+                description_item = QTableWidgetItem(backup.get('description') or "--")
                 description_item.setFlags(description_item.flags() & ~Qt.ItemIsEditable)
                 self.backups_table.setItem(row, 3, description_item)
                 
@@ -404,7 +500,10 @@ class BackupPage(QWidget):
             
             # تحديث وقت آخر تحديث
             current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            self.last_update_label.setText(f"آخر تحديث: {current_time}")
+            if synced:
+                self.last_update_label.setText(f"آخر تحديث: {current_time}")
+            else:
+                self.last_update_label.setText(f"آخر تحديث: {current_time} (جاري المزامنة مع المخزن...)")
             
             logging.info(f"تم تحديث قائمة النسخ الاحتياطية: {len(backups)} نسخة")
             
@@ -412,6 +511,13 @@ class BackupPage(QWidget):
             logging.error(f"خطأ في تحديث قائمة النسخ الاحتياطية: {e}")
             QMessageBox.critical(self, "خطأ", f"خطأ في تحديث القائمة:\n{e}")
     
+    def on_catalog_reconciled(self, success):
+        """إعادة تحميل القائمة بعد مطابقة الفهرس مع المخزن"""
+        if success:
+            self.refresh_backups()
+        elif not backup_manager.is_catalog_synced:
+            self.last_update_label.setText("آخر تحديث: تعذرت المزامنة مع المخزن، اضغط تحديث لإعادة المحاولة")
+    
     def create_operations_widget(self, backup):
         """إنشاء ويجيت العمليات لكل نسخة احتياطية"""
         widget = QWidget()
@@ -419,11 +525,18 @@ class BackupPage(QWidget):
         layout.setContentsMargins(5, 5, 5, 5)
         layout.setSpacing(5)
         
-        # زر التحميل
-        download_btn = QPushButton("تحميل")
-        download_btn.setObjectName("smallButton")
-        download_btn.clicked.connect(lambda: self.download_backup(backup))
-        layout.addWidget(download_btn)
+        # زر التحميل (النسخ التزايدية أجزاء متفرقة لا ملف واحد يُحمل)
+        if not backup.get('incremental'):
+            download_btn = QPushButton("تحميل")
+            download_btn.setObjectName("smallButton")
+            download_btn.clicked.connect(lambda: self.download_backup(backup))
+            layout.addWidget(download_btn)
+        
+        # زر الاستعادة
+        restore_btn = QPushButton("استعادة")
+        restore_btn.setObjectName("smallButton")
+        restore_btn.clicked.connect(lambda: self.restore_backup(backup))
+        layout.addWidget(restore_btn)
         
         # زر الحذف
         delete_btn = QPushButton("حذف")
@@ -454,6 +567,54 @@ class BackupPage(QWidget):
             logging.error(f"خطأ في تحميل النسخة الاحتياطية: {e}")
             QMessageBox.critical(self, "خطأ", f"خطأ في التحميل:\n{e}")
     
+    def restore_backup(self, backup):
+        """استعادة قاعدة البيانات من نسخة احتياطية"""
+        try:
+            reply = QMessageBox.question(
+                self, "تأكيد الاستعادة",
+                f"هل أنت متأكد من استعادة النسخة الاحتياطية؟\n\n"
+                f"الملف: {backup['filename']}\n"
+                f"التاريخ: {backup['formatted_date']}\n\n"
+                f"ستُستبدل جميع البيانات الحالية ببيانات هذه النسخة!",
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.No
+            )
+            
+            if reply == QMessageBox.Yes:
+                self.progress_dialog = QProgressDialog(
+                    "جاري استعادة النسخة الاحتياطية...",
+                    None, 0, 100, self
+                )
+                self.progress_dialog.setWindowTitle("استعادة نسخة احتياطية")
+                self.progress_dialog.setModal(True)
+                self.progress_dialog.show()
+                
+                self.restore_started.emit()
+                self.restore_worker = RestoreWorker(backup['path'])
+                self.restore_worker.percent.connect(self.progress_dialog.setValue)
+                self.restore_worker.finished.connect(self.restore_finished)
+                self.restore_worker.start()
+                
+                log_user_action(f"backup - restore_backup: {backup['filename']}")
+                
+        except Exception as e:
+            logging.error(f"خطأ في استعادة النسخة الاحتياطية: {e}")
+            QMessageBox.critical(self, "خطأ", f"خطأ في الاستعادة:\n{e}")
+    
+    def restore_finished(self, success, message):
+        """معالجة انتهاء عملية الاستعادة"""
+        if self.progress_dialog:
+            self.progress_dialog.close()
+            self.progress_dialog = None
+        
+        self.restore_worker = None
+        self.restore_completed.emit(success)
+        
+        if success:
+            QMessageBox.information(self, "نجح", message)
+        else:
+            QMessageBox.critical(self, "خطأ", message)
+    
     def delete_backup(self, backup):
         """حذف نسخة احتياطية"""
         try:
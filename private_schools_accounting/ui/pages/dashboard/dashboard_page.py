@@ -13,6 +13,7 @@ from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont, QPixmap
 
 from core.database.connection import db_manager
+from core.database.statistics import dashboard_statistics
 from core.utils.logger import log_user_action
 
 
@@ -25,8 +26,8 @@ class DashboardPage(QWidget):
         self.setup_styles()
         self.load_statistics()
         
-        # تحديث الإحصائيات كل 5 دقائق
-        self.refresh_timer = QTimer()
+        # تحديث الإحصائيات كل 5 دقائق (المؤقت يُحذف مع الصفحة عند إزالتها)
+        self.refresh_timer = QTimer(self)
         self.refresh_timer.timeout.connect(self.load_statistics)
         self.refresh_timer.start(300000)  # 5 دقائق
     
@@ -244,23 +245,18 @@ class DashboardPage(QWidget):
     def load_statistics(self):
         """تحميل الإحصائيات من قاعدة البيانات"""
         try:
-            # إحصائيات المدارس
-            schools_count = self.get_schools_count()
-            self.update_stat_card(self.schools_card, str(schools_count))
-            
-            # إحصائيات الطلاب
-            students_count = self.get_students_count()
-            self.update_stat_card(self.students_card, str(students_count))
+            # جميع البطاقات من استعلام واحد
+            stats = dashboard_statistics()
+            self.update_stat_card(self.schools_card, str(stats.schools_count))
+            self.update_stat_card(self.students_card, str(stats.students_count))
             
             # إحصائيات الأقساط
-            total_fees, paid_fees, remaining_fees = self.get_fees_statistics()
-            self.update_stat_card(self.total_fees_card, f"{total_fees:,.0f} د.ع")
-            self.update_stat_card(self.paid_fees_card, f"{paid_fees:,.0f} د.ع")
-            self.update_stat_card(self.remaining_fees_card, f"{remaining_fees:,.0f} د.ع")
+            self.update_stat_card(self.total_fees_card, f"{stats.total_fees:,.0f} د.ع")
+            self.update_stat_card(self.paid_fees_card, f"{stats.paid_fees:,.0f} د.ع")
+            self.update_stat_card(self.remaining_fees_card, f"{stats.remaining_fees:,.0f} د.ع")
             
             # إحصائيات الرسوم الإضافية
-            additional_fees = self.get_additional_fees_total()
-            self.update_stat_card(self.additional_fees_card, f"{additional_fees:,.0f} د.ع")
+            self.update_stat_card(self.additional_fees_card, f"{stats.additional_fees_paid:,.0f} د.ع")
             
             # تحديث معلومات النظام
             self.update_system_info()
@@ -270,61 +266,6 @@ class DashboardPage(QWidget):
         except Exception as e:
             logging.error(f"خطأ في تحميل الإحصائيات: {e}")
     
-    def get_schools_count(self) -> int:
-        """الحصول على عدد المدارس"""
-        try:
-            query = "SELECT COUNT(*) as count FROM schools"
-            result = db_manager.execute_query(query)
-            return result[0]['count'] if result else 0
-            
-        except Exception as e:
-            logging.error(f"خطأ في الحصول على عدد المدارس: {e}")
-            return 0
-    
-    def get_students_count(self) -> int:
-        """الحصول على عدد الطلاب"""
-        try:
-            query = "SELECT COUNT(*) as count FROM students"
-            result = db_manager.execute_query(query)
-            return result[0]['count'] if result else 0
-            
-        except Exception as e:
-            logging.error(f"خطأ في الحصول على عدد الطلاب: {e}")
-            return 0
-    
-    def get_fees_statistics(self) -> tuple:
-        """الحصول على إحصائيات الأقساط"""
-        try:
-            # إجمالي الأقساط
-            total_query = "SELECT SUM(total_fee) as total FROM students"
-            total_result = db_manager.execute_query(total_query)
-            total_fees = total_result[0]['total'] if total_result and total_result[0]['total'] else 0
-            
-            # المبالغ المدفوعة
-            paid_query = "SELECT SUM(amount) as paid FROM installments"
-            paid_result = db_manager.execute_query(paid_query)
-            paid_fees = paid_result[0]['paid'] if paid_result and paid_result[0]['paid'] else 0
-            
-            # المبالغ المتبقية
-            remaining_fees = total_fees - paid_fees
-            
-            return float(total_fees), float(paid_fees), float(remaining_fees)
-            
-        except Exception as e:
-            logging.error(f"خطأ في الحصول على إحصائيات الأقساط: {e}")
-            return 0.0, 0.0, 0.0
-    
-    def get_additional_fees_total(self) -> float:
-        """الحصول على إجمالي الرسوم الإضافية"""
-        try:
-            query = "SELECT SUM(amount) as total FROM additional_fees WHERE paid = 1"
-            result = db_manager.execute_query(query)
-            return float(result[0]['total']) if result and result[0]['total'] else 0.0
-            
-        except Exception as e:
-            logging.error(f"خطأ في الحصول على إجمالي الرسوم الإضافية: {e}")
-            return 0.0
-    
     def update_stat_card(self, card: QFrame, value: str):
         """تحديث قيمة بطاقة الإحصائية"""
         try:
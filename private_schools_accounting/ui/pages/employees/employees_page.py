@@ -15,7 +15,9 @@ from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QFont
 
 from core.database.connection import db_manager
+from core.database.search_index import search_condition
 from core.utils.logger import log_user_action, log_database_operation
+from ui.widgets.search_controller import SearchController
 
 # استيراد نوافذ إدارة الموظفين
 from .add_employee_dialog import AddEmployeeDialog
@@ -125,9 +127,10 @@ class EmployeesPage(QWidget):
             # ربط الأحداث
             search_btn.clicked.connect(self.search_employees)
             clear_btn.clicked.connect(self.clear_search)
-            self.search_input.returnPressed.connect(self.search_employees)
-            # بحث لحظي عند الكتابة بدلاً من استخدام زر البحث
-            self.search_input.textChanged.connect(self.search_employees)
+            # بحث لحظي بعد توقف الكتابة (أو فوراً عند Enter) بدلاً من استخدام زر البحث
+            self.search_controller = SearchController(
+                self.search_input, lambda _text: self.search_employees(), parent=self
+            )
             # إخفاء زر البحث لأنه لم يعد ضروريًا مع البحث اللحظي
             search_btn.hide()
             self.school_filter.currentTextChanged.connect(self.on_filter_changed)
@@ -336,7 +339,7 @@ class EmployeesPage(QWidget):
     def load_schools(self):
         """تحميل قائمة المدارس"""
         try:
-            with db_manager.get_cursor() as cursor:
+            with db_manager.get_read_cursor() as cursor:
                 cursor.execute("SELECT id, name_ar FROM schools ORDER BY name_ar")
                 schools = cursor.fetchall()
                 
@@ -379,7 +382,7 @@ class EmployeesPage(QWidget):
             if conditions:
                 query = query.replace("ORDER BY", f"WHERE {' AND '.join(conditions)} ORDER BY")
             
-            with db_manager.get_cursor() as cursor:
+            with db_manager.get_read_cursor() as cursor:
                 cursor.execute(query, params)
                 employees = cursor.fetchall()
                 
@@ -459,17 +462,22 @@ class EmployeesPage(QWidget):
     def search_employees(self):
         """البحث في الموظفين"""
         try:
-            search_text = self.search_input.text().strip().lower()
+            search_text = self.search_input.text().strip()
+            condition = search_condition("employees", "id", search_text)
             
-            if not search_text:
+            if not condition:
                 self.populate_table(self.current_employees)
                 return
-                
-            filtered_employees = []
-            for employee in self.current_employees:
-                if (search_text in (employee['name'] or '').lower() or
-                    search_text in (employee['phone'] or '').lower()):
-                    filtered_employees.append(employee)
+            
+            # الاسم من فهرس البحث (بادئة الكلمة)، ورقم الهاتف بمطابقة جزئية في أي موضع
+            # كما كان سابقاً، ثم التصفية ضمن القائمة المحملة
+            matching_ids = {
+                row['id'] for row in db_manager.execute_query(
+                    f"SELECT id FROM employees WHERE {condition[0]} OR phone LIKE ?",
+                    (condition[1], f"%{search_text}%")
+                )
+            }
+            filtered_employees = [employee for employee in self.current_employees if employee['id'] in matching_ids]
             
             self.populate_table(filtered_employees)
             
@@ -8,8 +8,8 @@ import logging
 import json
 from datetime import datetime, date
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, 
-    QTableWidgetItem, QPushButton, QLabel, QLineEdit,
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView,
+    QPushButton, QLabel, QLineEdit,
     QFrame, QMessageBox, QHeaderView, QAbstractItemView,
     QMenu, QComboBox, QDateEdit, QAction, QDialog,
     QSpinBox, QTextEdit, QFormLayout, QGroupBox
@@ -18,7 +18,14 @@ from PyQt5.QtCore import Qt, pyqtSignal, QDate
 from PyQt5.QtGui import QFont, QPixmap, QIcon
 
 from core.database.connection import db_manager
-from core.utils.logger import log_user_action, log_database_operation
+from core.database.queries import build_query
+from core.database.search_index import match_expression
+from core.database.statistics import period_totals
+from core.utils.logger import log_user_action
+from core.utils.date_range import day_bounds
+from ui.widgets.table_model import RowTableModel, RowFilterProxyModel
+from ui.widgets.action_delegate import ActionButtonsDelegate
+from ui.widgets.search_controller import SearchController
 
 from .add_expense_dialog import AddExpenseDialog
 from .edit_expense_dialog import EditExpenseDialog
@@ -39,33 +46,9 @@ class ExpensesPage(QWidget):
         self.setup_styles()
         self.setup_connections()
         self.load_schools()
-        self.create_expenses_table_if_not_exists()
         
         log_user_action("فتح صفحة إدارة المصروفات")
     
-    def create_expenses_table_if_not_exists(self):
-        """إنشاء جدول المصروفات إذا لم يكن موجوداً"""
-        try:
-            create_table_query = """
-                CREATE TABLE IF NOT EXISTS expenses (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    school_id INTEGER NOT NULL,
-                    title VARCHAR(255) NOT NULL,
-                    amount DECIMAL(10,2) NOT NULL,
-                    category VARCHAR(100),
-                    expense_date DATE NOT NULL,
-                    notes TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (school_id) REFERENCES schools(id)
-                )
-            """
-            db_manager.execute_update(create_table_query)
-            log_database_operation("إنشاء جدول المصروفات", "نجح")
-            
-        except Exception as e:
-            logging.error(f"خطأ في إنشاء جدول المصروفات: {e}")
-    
     def setup_ui(self):
         """إعداد واجهة المستخدم"""
         try:
@@ -247,14 +230,32 @@ class ExpensesPage(QWidget):
             table_layout.setContentsMargins(0, 0, 0, 0)  # إزالة الهوامش تمامًا
 
             # الجدول
-            self.expenses_table = QTableWidget()
+            self.expenses_table = QTableView()
             self.expenses_table.setObjectName("dataTable")
-            self.expenses_table.setStyleSheet("QTableWidget::item { padding: 0px; }")  # إزالة الحشو لإظهار أزرار الإجراءات بشكل صحيح
+            self.expenses_table.setStyleSheet("QTableView::item { padding: 0px; }")  # إزالة الحشو لإظهار أزرار الإجراءات بشكل صحيح
 
             # إعداد أعمدة الجدول
             columns = ["المعرف", "العنوان", "المبلغ", "الفئة", "التاريخ", "المدرسة", "الملاحظات", "الإجراءات"]
-            self.expenses_table.setColumnCount(len(columns))
-            self.expenses_table.setHorizontalHeaderLabels(columns)
+            fields = ["id", "title", "amount", "category", "expense_date", "school_name", "notes", None]
+            self.expenses_model = RowTableModel(
+                columns, fields,
+                formatters={
+                    2: lambda amount: f"{amount:,.2f} د.ع",
+                    6: lambda notes: (notes or "")[:50] + ("..." if len(notes or "") > 50 else "")
+                },
+                alignments={2: Qt.AlignRight | Qt.AlignVCenter},
+                parent=self
+            )
+            self.expenses_proxy = RowFilterProxyModel(self.expenses_model, self)
+            self.expenses_table.setModel(self.expenses_proxy)
+
+            # أزرار الإجراءات ترسم بمفوض واحد بدلاً من ويدجت لكل صف
+            self.actions_delegate = ActionButtonsDelegate(
+                [("edit", "تعديل", "#17A2B8"), ("delete", "حذف", "#DC3545")], parent=self
+            )
+            self.actions_delegate.action_clicked.connect(self.on_action_clicked)
+            self.expenses_table.setItemDelegateForColumn(7, self.actions_delegate)
+            self.expenses_table.verticalHeader().setDefaultSectionSize(36)
 
             # إعداد خصائص الجدول
             self.expenses_table.setSelectionBehavior(QAbstractItemView.SelectRows)
@@ -269,7 +270,7 @@ class ExpensesPage(QWidget):
                 header.setSectionResizeMode(i, QHeaderView.ResizeToContents)
 
             # ربط الأحداث
-            self.expenses_table.cellDoubleClicked.connect(self.edit_expense)
+            self.expenses_table.doubleClicked.connect(self.on_row_double_clicked)
             self.expenses_table.setContextMenuPolicy(Qt.CustomContextMenu)
             self.expenses_table.customContextMenuRequested.connect(self.show_context_menu)
 
@@ -330,7 +331,10 @@ class ExpensesPage(QWidget):
             self.category_combo.currentTextChanged.connect(self.apply_filters)
             self.start_date.dateChanged.connect(self.apply_filters)
             self.end_date.dateChanged.connect(self.apply_filters)
-            self.search_input.textChanged.connect(self.apply_filters)
+            # البحث بعد توقف الكتابة بدلاً من استعلام لكل حرف
+            self.search_controller = SearchController(
+                self.search_input, lambda _text: self.apply_filters(), parent=self
+            )
             
         except Exception as e:
             logging.error(f"خطأ في ربط الإشارات: {e}")
@@ -355,45 +359,18 @@ class ExpensesPage(QWidget):
     def load_expenses(self):
         """تحميل قائمة المصروفات"""
         try:
-            # بناء الاستعلام مع الفلاتر
-            query = """
-                SELECT e.id, e.title, e.amount, e.category, e.expense_date,
-                       e.notes, s.name_ar as school_name, e.created_at
-                FROM expenses e
-                LEFT JOIN schools s ON e.school_id = s.id
-                WHERE 1=1
-            """
-            params = []
-            
-            # فلتر المدرسة
-            selected_school_id = self.school_combo.currentData()
-            if selected_school_id:
-                query += " AND e.school_id = ?"
-                params.append(selected_school_id)
-            
-            # فلتر الفئة
+            # الاستعلام المسجل مع الفلاتر (نص ثابت لكل مجموعة فلاتر نشطة)
             selected_category = self.category_combo.currentText()
-            if selected_category and selected_category != "جميع الفئات":
-                query += " AND e.category = ?"
-                params.append(selected_category)
-            
-            
-            # فلتر التاريخ
-            start_date = self.start_date.date().toPyDate()
-            end_date = self.end_date.date().toPyDate()
-            query += " AND e.expense_date BETWEEN ? AND ?"
-            params.extend([start_date, end_date])
-            
-            # فلتر البحث
-            search_text = self.search_input.text().strip()
-            if search_text:
-                query += " AND (e.title LIKE ? OR e.notes LIKE ?)"
-                params.extend([f"%{search_text}%", f"%{search_text}%"])
-            
-            query += " ORDER BY e.expense_date DESC, e.created_at DESC"
+            query, params = build_query(
+                "expenses.list",
+                school_id=self.school_combo.currentData() or None,
+                category=selected_category if selected_category and selected_category != "جميع الفئات" else None,
+                date_range=day_bounds(self.start_date.date().toPyDate(), self.end_date.date().toPyDate()),
+                search=match_expression(self.search_input.text()),
+            )
             
             # تنفيذ الاستعلام
-            self.current_expenses = db_manager.execute_query(query, tuple(params))
+            self.current_expenses = db_manager.execute_query(query, params)
             
             # ملء الجدول
             self.fill_expenses_table()
@@ -408,41 +385,8 @@ class ExpensesPage(QWidget):
     def fill_expenses_table(self):
         """ملء جدول المصروفات بالبيانات"""
         try:
-            # تنظيف الجدول
-            self.expenses_table.setRowCount(0)
-            
-            if not self.current_expenses:
-                self.displayed_count_label.setText("عدد المصروفات المعروضة: 0")
-                return
-            
-            # ملء الجدول
-            for row_idx, expense in enumerate(self.current_expenses):
-                self.expenses_table.insertRow(row_idx)
-                
-                # البيانات الأساسية
-                items = [
-                    str(expense['id']),
-                    expense['title'] or "",
-                    f"{expense['amount']:,.2f} د.ع",
-                    expense['category'] or "",
-                    expense['expense_date'] or "",
-                    expense['school_name'] or "",
-                    (expense['notes'] or "")[:50] + ("..." if len(expense['notes'] or "") > 50 else "")
-                ]
-                
-                for col_idx, item_text in enumerate(items):
-                    item = QTableWidgetItem(item_text)
-                    item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-                    
-                    # تنسيق خاص للمبلغ
-                    if col_idx == 2:  # عمود المبلغ
-                        item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-                    
-                    self.expenses_table.setItem(row_idx, col_idx, item)
-                
-                # أزرار الإجراءات
-                actions_widget = self.create_actions_widget(expense['id'])
-                self.expenses_table.setCellWidget(row_idx, 7, actions_widget)
+            # استبدال بيانات النموذج (يعرض الجدول الصفوف الظاهرة فقط)
+            self.expenses_model.set_rows(self.current_expenses)
             
             # تحديث العداد
             self.displayed_count_label.setText(f"عدد المصروفات المعروضة: {len(self.current_expenses)}")
@@ -450,33 +394,25 @@ class ExpensesPage(QWidget):
         except Exception as e:
             logging.error(f"خطأ في ملء جدول المصروفات: {e}")
     
-    def create_actions_widget(self, expense_id):
-        """إنشاء ويدجت الإجراءات لكل صف"""
+    def on_action_clicked(self, action, row):
+        """معالجة النقر على أحد أزرار الإجراءات في الصف"""
         try:
-            widget = QWidget()
-            layout = QHBoxLayout(widget)
-            layout.setContentsMargins(5, 2, 5, 2)
-            layout.setSpacing(5)
-
-            # زر التعديل
-            edit_btn = QPushButton("تعديل")
-            edit_btn.setObjectName("editButton")
-            edit_btn.setFixedSize(80, 30)
-            edit_btn.clicked.connect(lambda: self.edit_expense_by_id(expense_id))
-            layout.addWidget(edit_btn)
-
-            # زر الحذف
-            delete_btn = QPushButton("حذف")
-            delete_btn.setObjectName("deleteButton")
-            delete_btn.setFixedSize(80, 30)
-            delete_btn.clicked.connect(lambda: self.delete_expense(expense_id))
-            layout.addWidget(delete_btn)
+            expense = self.expenses_proxy.row_data(row)
+            if expense is None:
+                return
 
-            return widget
+            if action == "edit":
+                self.edit_expense_by_id(expense['id'])
+            elif action == "delete":
+                self.delete_expense(expense['id'])
 
         except Exception as e:
-            logging.error(f"خطأ في إنشاء ويدجت الإجراءات: {e}")
-            return QWidget()
+            logging.error(f"خطأ في تنفيذ إجراء المصروف: {e}")
+
+    def on_row_double_clicked(self, index):
+        """فتح التعديل عند النقر المزدوج خارج عمود الإجراءات"""
+        if not ActionButtonsDelegate.is_action_cell(self.expenses_table, index):
+            self.edit_expense(index.row())
     
     def update_stats(self):
         """تحديث الإحصائيات"""
@@ -487,23 +423,10 @@ class ExpensesPage(QWidget):
             avg_displayed = total_displayed / count_displayed if count_displayed > 0 else 0
             max_displayed = max([expense['amount'] for expense in self.current_expenses], default=0)
             
-            # إحصائيات الشهر الحالي
-            current_month = datetime.now().month
-            current_year = datetime.now().year
-            monthly_query = """
-                SELECT COALESCE(SUM(amount), 0) FROM expenses 
-                WHERE strftime('%Y', expense_date) = ? AND strftime('%m', expense_date) = ?
-            """
-            monthly_result = db_manager.execute_query(monthly_query, (str(current_year), f"{current_month:02d}"))
-            monthly_total = monthly_result[0][0] if monthly_result else 0
-            
-            # إحصائيات السنة الحالية
-            yearly_query = """
-                SELECT COALESCE(SUM(amount), 0) FROM expenses 
-                WHERE strftime('%Y', expense_date) = ?
-            """
-            yearly_result = db_manager.execute_query(yearly_query, (str(current_year),))
-            yearly_total = yearly_result[0][0] if yearly_result else 0
+            # إحصائيات الشهر والسنة الحاليين من ملخص الأشهر
+            totals = period_totals("expenses")
+            monthly_total = totals.month_total
+            yearly_total = totals.year_total
             
             # تحديث التسميات
             self.monthly_total_label.setText(f"إجمالي هذا الشهر: {monthly_total:,.2f} د.ع")
@@ -564,16 +487,12 @@ class ExpensesPage(QWidget):
     def edit_expense(self, row):
         """تعديل بيانات مصروف"""
         try:
-            if row < 0 or row >= self.expenses_table.rowCount():
-                return
-            
-            # الحصول على ID المصروف من الصف المحدد
-            expense_id_item = self.expenses_table.item(row, 0)
-            if not expense_id_item:
+            # الحصول على المصروف من الصف المحدد
+            expense = self.expenses_proxy.row_data(row)
+            if expense is None:
                 return
             
-            expense_id = int(expense_id_item.text())
-            self.edit_expense_by_id(expense_id)
+            self.edit_expense_by_id(expense['id'])
                 
         except Exception as e:
             logging.error(f"خطأ في تعديل المصروف: {e}")
@@ -652,17 +571,17 @@ class ExpensesPage(QWidget):
     def show_context_menu(self, position):
         """عرض قائمة السياق للجدول"""
         try:
-            if self.expenses_table.itemAt(position) is None:
+            if not self.expenses_table.indexAt(position).isValid():
                 return
             
             menu = QMenu(self)
             
             edit_action = QAction("تعديل", self)
-            edit_action.triggered.connect(lambda: self.edit_expense(self.expenses_table.currentRow()))
+            edit_action.triggered.connect(lambda: self.edit_expense(self.expenses_table.currentIndex().row()))
             menu.addAction(edit_action)
             
             delete_action = QAction("حذف", self)
-            delete_action.triggered.connect(lambda: self.delete_expense_by_row(self.expenses_table.currentRow()))
+            delete_action.triggered.connect(lambda: self.delete_expense_by_row(self.expenses_table.currentIndex().row()))
             menu.addAction(delete_action)
             
             menu.exec_(self.expenses_table.mapToGlobal(position))
@@ -673,15 +592,11 @@ class ExpensesPage(QWidget):
     def delete_expense_by_row(self, row):
         """حذف مصروف بواسطة رقم الصف"""
         try:
-            if row < 0 or row >= self.expenses_table.rowCount():
-                return
-            
-            expense_id_item = self.expenses_table.item(row, 0)
-            if not expense_id_item:
+            expense = self.expenses_proxy.row_data(row)
+            if expense is None:
                 return
             
-            expense_id = int(expense_id_item.text())
-            self.delete_expense(expense_id)
+            self.delete_expense(expense['id'])
             
         except Exception as e:
             logging.error(f"خطأ في حذف المصروف: {e}")
@@ -816,7 +731,7 @@ class ExpensesPage(QWidget):
                 }
                 
                 /* الجدول */
-                QTableWidget {
+                QTableView {
                     background-color: white;
                     border: 2px solid #E9ECEF;
                     border-radius: 12px;
@@ -825,13 +740,13 @@ class ExpensesPage(QWidget):
                     margin: 10px 0px;
                 }
                 
-                QTableWidget::item {
+                QTableView::item {
                     padding: 12px 8px;
                     border-bottom: 1px solid #E9ECEF;
                     font-size: 18px;
                 }
                 
-                QTableWidget::item:selected {
+                QTableView::item:selected {
                     background-color: #F8E5E5;
                     color: #721C24;
                 }
@@ -15,6 +15,7 @@ from PyQt5.QtCore import Qt, QDate
 from PyQt5.QtGui import QFont
 
 from core.database.connection import db_manager
+from core.utils.money import Money
 from core.utils.logger import log_user_action, log_database_operation
 
 
@@ -295,7 +296,7 @@ class EditIncomeDialog(QDialog):
             # تحضير البيانات المحدثة
             updated_data = {
                 'title': self.title_input.text().strip(),
-                'amount': self.amount_input.value(),
+                'amount': Money(self.amount_input.value()),
                 'category': self.category_combo.currentText() if self.category_combo.currentIndex() > 0 else None,
                 'income_date': self.income_date.date().toPyDate(),
                 'notes': self.notes_input.toPlainText().strip() or None,
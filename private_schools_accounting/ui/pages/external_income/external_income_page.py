@@ -18,7 +18,12 @@ from PyQt5.QtCore import Qt, pyqtSignal, QDate
 from PyQt5.QtGui import QFont, QPixmap, QIcon
 
 from core.database.connection import db_manager
-from core.utils.logger import log_user_action, log_database_operation
+from core.database.search_index import search_condition
+from core.database.statistics import period_totals
+from core.utils.logger import log_user_action
+from core.utils.date_range import day_bounds, range_condition
+from ui.widgets.action_delegate import ActionButtonsDelegate
+from ui.widgets.search_controller import SearchController
 
 from .add_income_dialog import AddIncomeDialog
 from .edit_income_dialog import EditIncomeDialog
@@ -40,33 +45,9 @@ class ExternalIncomePage(QWidget):
         self.setup_styles()
         self.setup_connections()
         self.load_schools()
-        self.create_income_table_if_not_exists()
         
         log_user_action("فتح صفحة إدارة الواردات الخارجية")
     
-    def create_income_table_if_not_exists(self):
-        """إنشاء جدول الواردات الخارجية إذا لم يكن موجوداً"""
-        try:
-            create_table_query = """
-                CREATE TABLE IF NOT EXISTS external_income (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    school_id INTEGER NOT NULL,
-                    title VARCHAR(255) NOT NULL,
-                    amount DECIMAL(10,2) NOT NULL,
-                    category VARCHAR(100),
-                    income_date DATE NOT NULL,
-                    notes TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (school_id) REFERENCES schools(id)
-                )
-            """
-            db_manager.execute_update(create_table_query)
-            log_database_operation("إنشاء جدول الواردات الخارجية", "نجح")
-            
-        except Exception as e:
-            logging.error(f"خطأ في إنشاء جدول الواردات الخارجية: {e}")
-    
     def setup_ui(self):
         """إعداد واجهة المستخدم"""
         try:
@@ -293,6 +274,14 @@ class ExternalIncomePage(QWidget):
             self.income_table.setColumnCount(len(columns))
             self.income_table.setHorizontalHeaderLabels(columns)
 
+            # أزرار الإجراءات ترسم بمفوض واحد بدلاً من ويدجت لكل صف
+            self.actions_delegate = ActionButtonsDelegate(
+                [("edit", "تعديل", "#17A2B8"), ("delete", "حذف", "#DC3545")], parent=self
+            )
+            self.actions_delegate.action_clicked.connect(self.on_action_clicked)
+            self.income_table.setItemDelegateForColumn(7, self.actions_delegate)
+            self.income_table.verticalHeader().setDefaultSectionSize(36)
+
             # إعداد خصائص الجدول
             self.income_table.setSelectionBehavior(QAbstractItemView.SelectRows)
             self.income_table.setSelectionMode(QAbstractItemView.SingleSelection)
@@ -306,7 +295,7 @@ class ExternalIncomePage(QWidget):
                 header.setSectionResizeMode(i, QHeaderView.ResizeToContents)
 
             # ربط الأحداث
-            self.income_table.cellDoubleClicked.connect(self.edit_income)
+            self.income_table.cellDoubleClicked.connect(self.on_cell_double_clicked)
             self.income_table.setContextMenuPolicy(Qt.CustomContextMenu)
             self.income_table.customContextMenuRequested.connect(self.show_context_menu)
 
@@ -367,7 +356,10 @@ class ExternalIncomePage(QWidget):
             self.category_combo.currentTextChanged.connect(self.apply_filters)
             self.start_date.dateChanged.connect(self.apply_filters)
             self.end_date.dateChanged.connect(self.apply_filters)
-            self.search_input.textChanged.connect(self.apply_filters)
+            # البحث بعد توقف الكتابة بدلاً من استعلام لكل حرف
+            self.search_controller = SearchController(
+                self.search_input, lambda _text: self.apply_filters(), parent=self
+            )
             
         except Exception as e:
             logging.error(f"خطأ في ربط الإشارات: {e}")
@@ -421,14 +413,14 @@ class ExternalIncomePage(QWidget):
             # فلتر التاريخ
             start_date = self.start_date.date().toPyDate()
             end_date = self.end_date.date().toPyDate()
-            query += " AND ei.income_date BETWEEN ? AND ?"
-            params.extend([start_date, end_date])
+            query += f" AND {range_condition('ei.income_date')}"
+            params.extend(day_bounds(start_date, end_date))
             
             # فلتر البحث
-            search_text = self.search_input.text().strip()
-            if search_text:
-                query += " AND (ei.title LIKE ? OR ei.notes LIKE ?)"
-                params.extend([f"%{search_text}%", f"%{search_text}%"])
+            condition = search_condition("external_income", "ei.id", self.search_input.text())
+            if condition:
+                query += f" AND {condition[0]}"
+                params.append(condition[1])
             
             query += " ORDER BY ei.income_date DESC, ei.created_at DESC"
             
@@ -479,10 +471,6 @@ class ExternalIncomePage(QWidget):
                         item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
                     
                     self.income_table.setItem(row_idx, col_idx, item)
-                
-                # أزرار الإجراءات
-                actions_widget = self.create_actions_widget(income['id'])
-                self.income_table.setCellWidget(row_idx, 7, actions_widget)
             
             # تحديث العداد
             self.displayed_count_label.setText(f"عدد الواردات المعروضة: {len(self.current_incomes)}")
@@ -490,33 +478,21 @@ class ExternalIncomePage(QWidget):
         except Exception as e:
             logging.error(f"خطأ في ملء جدول الواردات: {e}")
     
-    def create_actions_widget(self, income_id):
-        """إنشاء ويدجت الإجراءات لكل صف"""
+    def on_action_clicked(self, action, row):
+        """معالجة النقر على أحد أزرار الإجراءات في الصف"""
         try:
-            widget = QWidget()
-            layout = QHBoxLayout(widget)
-            layout.setContentsMargins(5, 2, 5, 2)
-            layout.setSpacing(5)
-
-            # زر التعديل
-            edit_btn = QPushButton("تعديل")
-            edit_btn.setObjectName("editButton")
-            edit_btn.setFixedSize(80, 30)
-            edit_btn.clicked.connect(lambda: self.edit_income_by_id(income_id))
-            layout.addWidget(edit_btn)
-
-            # زر الحذف
-            delete_btn = QPushButton("حذف")
-            delete_btn.setObjectName("deleteButton")
-            delete_btn.setFixedSize(80, 30)
-            delete_btn.clicked.connect(lambda: self.delete_income(income_id))
-            layout.addWidget(delete_btn)
-
-            return widget
+            if action == "edit":
+                self.edit_income(row)
+            elif action == "delete":
+                self.delete_income_by_row(row)
 
         except Exception as e:
-            logging.error(f"خطأ في إنشاء ويدجت الإجراءات: {e}")
-            return QWidget()
+            logging.error(f"خطأ في تنفيذ إجراء الوارد: {e}")
+
+    def on_cell_double_clicked(self, row, column):
+        """فتح التعديل عند النقر المزدوج خارج عمود الإجراءات"""
+        if column != 7:
+            self.edit_income(row)
     
     def update_stats(self):
         """تحديث الإحصائيات"""
@@ -527,23 +503,10 @@ class ExternalIncomePage(QWidget):
             avg_displayed = total_displayed / count_displayed if count_displayed > 0 else 0
             max_displayed = max([income['amount'] for income in self.current_incomes], default=0)
             
-            # إحصائيات الشهر الحالي
-            current_month = datetime.now().month
-            current_year = datetime.now().year
-            monthly_query = """
-                SELECT COALESCE(SUM(amount), 0) FROM external_income 
-                WHERE strftime('%Y', income_date) = ? AND strftime('%m', income_date) = ?
-            """
-            monthly_result = db_manager.execute_query(monthly_query, (str(current_year), f"{current_month:02d}"))
-            monthly_total = monthly_result[0][0] if monthly_result else 0
-            
-            # إحصائيات السنة الحالية
-            yearly_query = """
-                SELECT COALESCE(SUM(amount), 0) FROM external_income 
-                WHERE strftime('%Y', income_date) = ?
-            """
-            yearly_result = db_manager.execute_query(yearly_query, (str(current_year),))
-            yearly_total = yearly_result[0][0] if yearly_result else 0
+            # إحصائيات الشهر والسنة الحاليين من ملخص الأشهر
+            totals = period_totals("external_income")
+            monthly_total = totals.month_total
+            yearly_total = totals.year_total
             
             # تحديث التسميات
             self.monthly_total_label.setText(f"إجمالي هذا الشهر: {monthly_total:,.2f} د.ع")
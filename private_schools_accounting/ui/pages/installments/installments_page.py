@@ -8,8 +8,8 @@ import logging
 import json
 from datetime import datetime, date
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, 
-    QTableWidgetItem, QPushButton, QLabel, QLineEdit,
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView,
+    QPushButton, QLabel, QLineEdit,
     QFrame, QMessageBox, QHeaderView, QAbstractItemView,
     QMenu, QComboBox, QDateEdit, QSpinBox, QDoubleSpinBox,
     QCheckBox, QProgressBar, QAction
@@ -18,7 +18,9 @@ from PyQt5.QtCore import Qt, pyqtSignal, QDate
 from PyQt5.QtGui import QFont, QPixmap, QIcon
 
 from core.database.connection import db_manager
+from core.database.pagination import KeysetPager
 from core.utils.logger import log_user_action, log_database_operation
+from ui.widgets.table_model import PagedRowTableModel, RowFilterProxyModel
 
 
 
@@ -31,7 +33,7 @@ class InstallmentsPage(QWidget):
     
     def __init__(self):
         super().__init__()
-        self.current_installments = []
+        self.installments_pager = None
         self.selected_school_id = None
         self.selected_student_id = None
         
@@ -201,7 +203,7 @@ class InstallmentsPage(QWidget):
             table_layout.setContentsMargins(0, 0, 0, 0)
             
             # إنشاء الجدول
-            self.installments_table = QTableWidget()
+            self.installments_table = QTableView()
             self.installments_table.setObjectName("dataTable")
             
             # إعداد الأعمدة بناءً على المخطط الجديد
@@ -210,14 +212,20 @@ class InstallmentsPage(QWidget):
                 "تاريخ الدفع", "وقت الدفع", "ملاحظات"
             ]
             
-            self.installments_table.setColumnCount(len(columns))
-            self.installments_table.setHorizontalHeaderLabels(columns)
+            self.installments_model = PagedRowTableModel(
+                columns, list(range(len(columns))),
+                formatters={3: lambda amount: f"{amount or 0:,.2f}"},
+                parent=self
+            )
+            self.installments_proxy = RowFilterProxyModel(self.installments_model, self)
+            self.installments_table.setModel(self.installments_proxy)
             
             # إعداد خصائص الجدول
             self.installments_table.setAlternatingRowColors(True)
             self.installments_table.setSelectionBehavior(QAbstractItemView.SelectRows)
             self.installments_table.setSelectionMode(QAbstractItemView.SingleSelection)
-            self.installments_table.setSortingEnabled(True)
+            # الترتيب يتم في الاستعلام (الأحدث أولاً) لأن الصفوف تُحمل على دفعات
+            self.installments_table.setSortingEnabled(False)
             self.installments_table.setShowGrid(False)
             
             # تخصيص عرض الأعمدة
@@ -406,12 +414,10 @@ class InstallmentsPage(QWidget):
                 params.append(selected_student_id)
             
             
-            query += " ORDER BY i.payment_date DESC, i.created_at DESC"
-            
-            # تنفيذ الاستعلام
-            installments = db_manager.execute_query(query, params)
-            
-            self.current_installments = installments or []
+            # الأحدث أولاً؛ المعرف يكسر التعادل بين أقساط اليوم نفسه بترتيب الإدخال
+            self.installments_pager = KeysetPager(
+                query, params, order_by=[("payment_date", "DESC"), ("id", "DESC")]
+            )
             self.populate_installments_table()
             # تحديث الملخص المالي بمجموع الأقساط
             self.update_financial_summary()
@@ -423,42 +429,33 @@ class InstallmentsPage(QWidget):
     def populate_installments_table(self):
         """ملء جدول الأقساط"""
         try:
-            self.installments_table.setRowCount(len(self.current_installments))
-            
-            for row, installment in enumerate(self.current_installments):
-                # المعرف (مخفي)
-                self.installments_table.setItem(row, 0, QTableWidgetItem(str(installment[0])))
-                # الطالب
-                self.installments_table.setItem(row, 1, QTableWidgetItem(installment[1] or ""))
-                # المدرسة
-                self.installments_table.setItem(row, 2, QTableWidgetItem(installment[2] or ""))
-                # المبلغ
-                amount = installment[3] or 0
-                self.installments_table.setItem(row, 3, QTableWidgetItem(f"{amount:,.2f}"))
-                # تاريخ الدفع
-                payment_date = installment[4] or ""
-                self.installments_table.setItem(row, 4, QTableWidgetItem(str(payment_date)))
-                # وقت الدفع
-                payment_time = installment[5] or ""
-                self.installments_table.setItem(row, 5, QTableWidgetItem(str(payment_time)))
-                # الملاحظات
-                notes = installment[6] or ""
-                self.installments_table.setItem(row, 6, QTableWidgetItem(notes))
-            
-            # تحديث إحصائية العدد المعروض
-            self.displayed_count_label.setText(f"عدد الأقساط المعروضة: {len(self.current_installments)}")
+            # تحميل الصفحة الأولى فقط، وبقية الصفحات عند التمرير
+            self.installments_model.set_pager(self.installments_pager)
             
         except Exception as e:
             logging.error(f"خطأ في ملء جدول الأقساط: {e}")
     
     def update_financial_summary(self):
         """تحديث الملخص المالي"""
-        # تبسيط الملخص المالي: مجموع قيمة الأقساط وعددها
-        total_amount = sum((inst[3] or 0) for inst in self.current_installments)
-        # تحديث عرض المجموع
-        self.total_amount_value.setText(f"{total_amount:,.2f} د.ع")
-        # تحديث عدد الأقساط في رأس الصفحة
-        self.total_installments_label.setText(f"إجمالي الأقساط: {len(self.current_installments)}")
+        try:
+            # مجموع قيمة الأقساط وعددها من استعلام واحد على كامل النتيجة المفلترة
+            summary = None
+            if self.installments_pager:
+                summary = self.installments_pager.aggregate(
+                    'COUNT(*) AS count, SUM(amount) AS "total [MONEY]"'
+                )
+            count = summary['count'] if summary else 0
+            total_amount = (summary['total'] if summary else None) or 0
+            
+            # تحديث عرض المجموع
+            self.total_amount_value.setText(f"{total_amount:,.2f} د.ع")
+            # تحديث عدد الأقساط في رأس الصفحة
+            self.total_installments_label.setText(f"إجمالي الأقساط: {count}")
+            # تحديث إحصائية العدد المعروض
+            self.displayed_count_label.setText(f"عدد الأقساط المعروضة: {count}")
+            
+        except Exception as e:
+            logging.error(f"خطأ في تحديث الملخص المالي: {e}")
     
     def apply_filters(self):
         """تطبيق الفلاتر وإعادة تحميل البيانات"""
@@ -480,7 +477,7 @@ class InstallmentsPage(QWidget):
     def show_context_menu(self, position):
         """عرض قائمة السياق للجدول"""
         try:
-            if self.installments_table.itemAt(position):
+            if self.installments_table.indexAt(position).isValid():
                 menu = QMenu()
                 
                 
@@ -16,6 +16,7 @@ from PyQt5.QtCore import Qt, QDate, pyqtSignal
 from PyQt5.QtGui import QFont, QDoubleValidator, QIntValidator
 
 from core.database.connection import db_manager
+from core.utils.money import Money
 from core.utils.logger import log_user_action
 
 
@@ -363,7 +364,7 @@ class AddSalaryDialog(QDialog):
                     ORDER BY e.name
                 """
             
-            with db_manager.get_cursor() as cursor:
+            with db_manager.get_read_cursor() as cursor:
                 cursor.execute(query)
                 staff_data = cursor.fetchall()
                 
@@ -394,7 +395,7 @@ class AddSalaryDialog(QDialog):
                 self.base_salary_label.setText(f"{salary:.2f} دينار")
                 
                 # تعبئة المبلغ المدفوع بالراتب المسجل كقيمة افتراضية
-                self.paid_amount_input.setValue(salary)
+                self.paid_amount_input.setValue(float(salary))
             else:
                 self.base_salary_label.setText("0.00 دينار")
                 self.paid_amount_input.setValue(0)
@@ -458,7 +459,7 @@ class AddSalaryDialog(QDialog):
                     staff['id'],
                     staff['name'],
                     staff['salary'],
-                    self.paid_amount_input.value(),
+                    Money(self.paid_amount_input.value()),
                     from_date,
                     to_date,
                     days_count,
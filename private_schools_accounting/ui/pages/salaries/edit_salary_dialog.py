@@ -13,6 +13,7 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, QDate, pyqtSignal
 
 from core.database.connection import db_manager
+from core.utils.money import Money
 from core.utils.logger import log_user_action
 
 class EditSalaryDialog(QDialog):
@@ -111,7 +112,7 @@ class EditSalaryDialog(QDialog):
             query = ("UPDATE salaries SET paid_amount = ?, from_date = ?, to_date = ?, "
                      "days_count = ?, payment_date = ?, notes = ? WHERE id = ?")
             params = (
-                self.paid_amount_input.value(),
+                Money(self.paid_amount_input.value()),
                 self.from_date_input.date().toString(Qt.ISODate),
                 self.to_date_input.date().toString(Qt.ISODate),
                 days,
@@ -5,10 +5,9 @@
 """
 
 import logging
-from datetime import datetime, timedelta
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, 
-    QTableWidgetItem, QPushButton, QLabel, QLineEdit,
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView,
+    QPushButton, QLabel, QLineEdit,
     QFrame, QMessageBox, QHeaderView, QAbstractItemView,
     QComboBox, QDateEdit, QGroupBox, QFormLayout, QSplitter
 )
@@ -16,7 +15,13 @@ from PyQt5.QtCore import Qt, pyqtSignal, QDate
 from PyQt5.QtGui import QFont
 
 from core.database.connection import db_manager
+from core.database.pagination import KeysetPager
+from core.database.search_index import search_condition
+from core.database.statistics import salary_statistics
 from core.utils.logger import log_user_action
+from core.utils.date_range import day_bounds, range_condition
+from ui.widgets.table_model import PagedRowTableModel, RowFilterProxyModel, ROW_NUMBER
+from ui.widgets.search_controller import SearchController
 
 # استيراد نوافذ إدارة الرواتب
 from .add_salary_dialog import AddSalaryDialog
@@ -26,9 +31,12 @@ from .edit_salary_dialog import EditSalaryDialog
 class SalariesPage(QWidget):
     """صفحة إدارة الرواتب"""
     
+    # الأحدث أولاً؛ المعرف يفصل بين رواتب نفس اليوم ويجعل مفتاح الصفحات فريداً
+    SALARIES_ORDER = [("payment_date", "DESC"), ("id", "DESC")]
+    
     def __init__(self):
         super().__init__()
-        self.current_salaries = []
+        self.salaries_pager = None
         self.setup_ui()
         self.setup_connections()
         self.load_salaries()
@@ -158,7 +166,7 @@ class SalariesPage(QWidget):
             table_layout.addWidget(table_header)
             
             # الجدول
-            self.salaries_table = QTableWidget()
+            self.salaries_table = QTableView()
             self.salaries_table.setObjectName("dataTable")
             
             # إعداد أعمدة الجدول
@@ -167,14 +175,28 @@ class SalariesPage(QWidget):
                 "المبلغ المدفوع", "فترة الراتب", "عدد الأيام", 
                 "تاريخ الدفع", "ملاحظات"
             ]
-            self.salaries_table.setColumnCount(len(columns))
-            self.salaries_table.setHorizontalHeaderLabels(columns)
+            amount_format = lambda amount: f"{float(amount):.2f}" if amount else "0.00"
+            # تُحمل الرواتب صفحة بعد صفحة أثناء التمرير
+            self.salaries_model = PagedRowTableModel(
+                columns,
+                [ROW_NUMBER, "staff_name", "staff_type_ar", "base_salary", "paid_amount",
+                 "period", "days_count", "payment_date", "notes"],
+                formatters={
+                    3: amount_format,
+                    4: amount_format,
+                    6: lambda days: str(days) if days else "0"
+                },
+                parent=self
+            )
+            self.salaries_proxy = RowFilterProxyModel(self.salaries_model, self)
+            self.salaries_table.setModel(self.salaries_proxy)
             
             # إعداد خصائص الجدول
             self.salaries_table.setSelectionBehavior(QAbstractItemView.SelectRows)
             self.salaries_table.setSelectionMode(QAbstractItemView.SingleSelection)
             self.salaries_table.setAlternatingRowColors(True)
-            self.salaries_table.setSortingEnabled(True)
+            # الترتيب بالنقر على العناوين يرتب الصفوف المحملة فقط، لذا يبقى ترتيب الاستعلام
+            self.salaries_table.setSortingEnabled(False)
             
             # تكوين عرض الأعمدة
             header = self.salaries_table.horizontalHeader()
@@ -288,7 +310,9 @@ class SalariesPage(QWidget):
         """إعداد الاتصالات والأحداث"""
         try:
             # أحداث البحث والفلترة
-            self.search_input.textChanged.connect(self.apply_filters)
+            self.search_controller = SearchController(
+                self.search_input, lambda _text: self.apply_filters(), parent=self
+            )
             self.type_filter.currentTextChanged.connect(self.apply_filters)
             self.from_date_filter.dateChanged.connect(self.apply_filters)
             self.to_date_filter.dateChanged.connect(self.apply_filters)
@@ -328,7 +352,7 @@ class SalariesPage(QWidget):
                     border-bottom: 1px solid #bdc3c7;
                 }
                 
-                QTableWidget#dataTable {
+                QTableView#dataTable {
                     border: none;
                     gridline-color: #dee2e6;
                     selection-background-color: #3498db;
@@ -417,170 +441,86 @@ class SalariesPage(QWidget):
     
     def load_salaries(self):
         """تحميل بيانات الرواتب"""
-        try:
-            query = """
-                SELECT s.*, 
-                       CASE s.staff_type 
-                           WHEN 'teacher' THEN 'معلم'
-                           WHEN 'employee' THEN 'موظف'
-                           ELSE s.staff_type
-                       END as staff_type_ar
-                FROM salaries s
-                ORDER BY s.payment_date DESC, s.created_at DESC
-            """
-            
-            with db_manager.get_cursor() as cursor:
-                cursor.execute(query)
-                salaries = cursor.fetchall()
-                
-                self.current_salaries = salaries
-                self.apply_filters()
-                
-        except Exception as e:
-            logging.error(f"خطأ في تحميل بيانات الرواتب: {e}")
-            QMessageBox.critical(self, "خطأ", f"فشل في تحميل بيانات الرواتب:\n{e}")
+        self.apply_filters()
     
-    def apply_filters(self):
-        """تطبيق الفلاتر على البيانات"""
-        try:
-            search_text = self.search_input.text().strip().lower()
-            staff_type = self.type_filter.currentData()
-            from_date = self.from_date_filter.date().toPyDate()
-            to_date = self.to_date_filter.date().toPyDate()
-            
-            filtered_salaries = []
-            
-            for salary in self.current_salaries:
-                # فلتر البحث بالاسم
-                if search_text and search_text not in (salary['staff_name'] or '').lower():
-                    continue
-                
-                # فلتر نوع الموظف
-                if staff_type and salary['staff_type'] != staff_type:
-                    continue
-                
-                # فلتر التاريخ
-                payment_date = datetime.strptime(salary['payment_date'], '%Y-%m-%d').date()
-                if payment_date < from_date or payment_date > to_date:
-                    continue
-                
-                filtered_salaries.append(salary)
-            
-            self.populate_table(filtered_salaries)
-            
-        except Exception as e:
-            logging.error(f"خطأ في تطبيق الفلاتر: {e}")
+    def build_salaries_query(self):
+        """بناء استعلام الرواتب مع الفلاتر الحالية، ويعيد (الاستعلام، المعاملات)"""
+        query = """
+            SELECT s.id, s.staff_name, s.staff_type, s.base_salary, s.paid_amount,
+                   s.days_count, s.payment_date, s.notes,
+                   CASE s.staff_type 
+                       WHEN 'teacher' THEN 'معلم'
+                       WHEN 'employee' THEN 'موظف'
+                       ELSE s.staff_type
+                   END as staff_type_ar,
+                   CASE WHEN COALESCE(s.from_date, '') != '' AND COALESCE(s.to_date, '') != ''
+                       THEN s.from_date || ' إلى ' || s.to_date
+                       ELSE 'غير محدد'
+                   END as period
+            FROM salaries s
+            WHERE 1=1
+        """
+        params = []
+        
+        # فلتر نوع الموظف
+        staff_type = self.type_filter.currentData()
+        if staff_type:
+            query += " AND s.staff_type = ?"
+            params.append(staff_type)
+        
+        # فلتر التاريخ (نطاق على فهرس تاريخ الدفع)
+        query += f" AND {range_condition('s.payment_date')}"
+        params.extend(day_bounds(self.from_date_filter.date().toPyDate(), self.to_date_filter.date().toPyDate()))
+        
+        # فلتر البحث بالاسم
+        condition = search_condition("salaries", "s.id", self.search_input.text())
+        if condition:
+            query += f" AND {condition[0]}"
+            params.append(condition[1])
+        
+        return query, params
     
-    def populate_table(self, salaries):
-        """ملء الجدول بالبيانات"""
+    def apply_filters(self):
+        """تطبيق الفلاتر وتحميل الصفحة الأولى من الرواتب"""
         try:
-            self.salaries_table.setRowCount(len(salaries))
-            
-            for row, salary in enumerate(salaries):
-                # رقم التسلسل
-                self.salaries_table.setItem(row, 0, QTableWidgetItem(str(row + 1)))
-                
-                # اسم الموظف/المعلم
-                self.salaries_table.setItem(row, 1, QTableWidgetItem(salary['staff_name'] or ''))
-                
-                # النوع
-                self.salaries_table.setItem(row, 2, QTableWidgetItem(salary['staff_type_ar'] or ''))
-                
-                # الراتب المسجل
-                base_salary = f"{float(salary['base_salary']):.2f}" if salary['base_salary'] else "0.00"
-                self.salaries_table.setItem(row, 3, QTableWidgetItem(base_salary))
-                
-                # المبلغ المدفوع
-                paid_amount = f"{float(salary['paid_amount']):.2f}" if salary['paid_amount'] else "0.00"
-                self.salaries_table.setItem(row, 4, QTableWidgetItem(paid_amount))
-                
-                # فترة الراتب
-                from_date = salary['from_date'] or ''
-                to_date = salary['to_date'] or ''
-                period = f"{from_date} إلى {to_date}" if from_date and to_date else "غير محدد"
-                self.salaries_table.setItem(row, 5, QTableWidgetItem(period))
-                
-                # عدد الأيام
-                days_count = str(salary['days_count']) if salary['days_count'] else "0"
-                self.salaries_table.setItem(row, 6, QTableWidgetItem(days_count))
-                
-                # تاريخ الدفع
-                self.salaries_table.setItem(row, 7, QTableWidgetItem(salary['payment_date'] or ''))
-                
-                # الملاحظات
-                self.salaries_table.setItem(row, 8, QTableWidgetItem(salary['notes'] or ''))
-                
-                # إخفاء ID في البيانات
-                self.salaries_table.item(row, 0).setData(Qt.UserRole, salary['id'])
+            query, params = self.build_salaries_query()
+            self.salaries_pager = KeysetPager(query, params, order_by=self.SALARIES_ORDER)
+            self.salaries_model.set_pager(self.salaries_pager)
             
-            # تحديث العداد
-            self.count_label.setText(f"إجمالي الرواتب: {len(salaries)}")
+            # تحديث العداد (على كامل النتيجة المفلترة وليس الصفحة المحملة فقط)
+            self.count_label.setText(f"إجمالي الرواتب: {self.salaries_pager.count()}")
             
             # تعديل أعمدة الجدول
             self.salaries_table.resizeColumnsToContents()
             
         except Exception as e:
-            logging.error(f"خطأ في ملء الجدول: {e}")
+            logging.error(f"خطأ في تحميل بيانات الرواتب: {e}")
+            QMessageBox.critical(self, "خطأ", f"فشل في تحميل بيانات الرواتب:\n{e}")
+    
+    def selected_salary_id(self):
+        """معرف الراتب المحدد في الجدول، أو None"""
+        row = self.salaries_table.currentIndex().row()
+        if row < 0:
+            return None
+        salary = self.salaries_proxy.row_data(row)
+        return salary['id'] if salary is not None else None
     
     def update_statistics(self):
         """تحديث الإحصائيات"""
         try:
-            with db_manager.get_cursor() as cursor:
-                # إحصائيات عامة
-                cursor.execute("SELECT COUNT(*) as count FROM salaries")
-                total_count = cursor.fetchone()['count']
-                
-                cursor.execute("SELECT SUM(paid_amount) as total FROM salaries")
-                total_amount = cursor.fetchone()['total'] or 0
-                
-                cursor.execute("SELECT COUNT(*) as count FROM salaries WHERE staff_type = 'teacher'")
-                teachers_count = cursor.fetchone()['count']
-                
-                cursor.execute("SELECT COUNT(*) as count FROM salaries WHERE staff_type = 'employee'")
-                employees_count = cursor.fetchone()['count']
-                
-                # إحصائيات الشهر الحالي
-                current_month = datetime.now().strftime('%Y-%m')
-                
-                cursor.execute("""
-                    SELECT COUNT(*) as count 
-                    FROM salaries 
-                    WHERE strftime('%Y-%m', payment_date) = ?
-                """, (current_month,))
-                monthly_count = cursor.fetchone()['count']
-                
-                cursor.execute("""
-                    SELECT SUM(paid_amount) as total 
-                    FROM salaries 
-                    WHERE strftime('%Y-%m', payment_date) = ?
-                """, (current_month,))
-                monthly_amount = cursor.fetchone()['total'] or 0
-                
-                cursor.execute("""
-                    SELECT COUNT(*) as count 
-                    FROM salaries 
-                    WHERE staff_type = 'teacher' AND strftime('%Y-%m', payment_date) = ?
-                """, (current_month,))
-                monthly_teachers = cursor.fetchone()['count']
-                
-                cursor.execute("""
-                    SELECT COUNT(*) as count 
-                    FROM salaries 
-                    WHERE staff_type = 'employee' AND strftime('%Y-%m', payment_date) = ?
-                """, (current_month,))
-                monthly_employees = cursor.fetchone()['count']
-                
-                # تحديث التسميات
-                self.total_salaries_label.setText(str(total_count))
-                self.total_amount_label.setText(f"{total_amount:.2f} دينار")
-                self.teachers_count_label.setText(str(teachers_count))
-                self.employees_count_label.setText(str(employees_count))
-                
-                self.monthly_count_label.setText(str(monthly_count))
-                self.monthly_amount_label.setText(f"{monthly_amount:.2f} دينار")
-                self.monthly_teachers_label.setText(str(monthly_teachers))
-                self.monthly_employees_label.setText(str(monthly_employees))
-                
+            stats = salary_statistics()
+            
+            # تحديث التسميات
+            self.total_salaries_label.setText(str(stats.total_count))
+            self.total_amount_label.setText(f"{stats.total_amount:.2f} دينار")
+            self.teachers_count_label.setText(str(stats.teachers_count))
+            self.employees_count_label.setText(str(stats.employees_count))
+            
+            self.monthly_count_label.setText(str(stats.monthly_count))
+            self.monthly_amount_label.setText(f"{stats.monthly_amount:.2f} دينار")
+            self.monthly_teachers_label.setText(str(stats.monthly_teachers))
+            self.monthly_employees_label.setText(str(stats.monthly_employees))
+            
         except Exception as e:
             logging.error(f"خطأ في تحديث الإحصائيات: {e}")
     
@@ -609,11 +549,10 @@ class SalariesPage(QWidget):
     
     def handle_edit_selected(self):
         """معالجة تعديل الراتب المحدد في الجدول"""
-        row = self.salaries_table.currentRow()
-        if row < 0:
+        salary_id = self.selected_salary_id()
+        if salary_id is None:
             QMessageBox.warning(self, "خطأ", "يرجى اختيار راتب للتعديل.")
             return
-        salary_id = self.salaries_table.item(row, 0).data(Qt.UserRole)
         # فتح نافذة تعديل الراتب
         dialog = EditSalaryDialog(salary_id, self)
         dialog.salary_updated.connect(self.refresh_data)
@@ -621,11 +560,10 @@ class SalariesPage(QWidget):
 
     def handle_delete_selected(self):
         """معالجة حذف الراتب المحدد في الجدول"""
-        row = self.salaries_table.currentRow()
-        if row < 0:
+        salary_id = self.selected_salary_id()
+        if salary_id is None:
             QMessageBox.warning(self, "خطأ", "يرجى اختيار راتب للحذف.")
             return
-        salary_id = self.salaries_table.item(row, 0).data(Qt.UserRole)
         reply = QMessageBox.question(
             self, "تأكيد الحذف",
             "هل أنت متأكد من حذف هذا الراتب؟",
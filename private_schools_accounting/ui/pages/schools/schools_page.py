@@ -12,11 +12,13 @@ from PyQt5.QtWidgets import (
     QFrame, QMessageBox, QHeaderView, QAbstractItemView,
     QMenu, QFileDialog
 )
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, pyqtSignal, QSize
 from PyQt5.QtGui import QFont, QPixmap, QIcon
 
 from core.database.connection import db_manager
 from core.utils.logger import log_user_action, log_database_operation
+from ui.widgets.action_delegate import ActionButtonsDelegate
+from ui.widgets.search_controller import SearchController
 from .add_school_dialog import AddSchoolDialog
 from .edit_school_dialog import EditSchoolDialog
 
@@ -86,7 +88,7 @@ class SchoolsPage(QWidget):
             self.search_input.setObjectName("searchInput")
             self.search_input.setPlaceholderText("ابحث في المدارس...")
             self.search_input.setMaximumWidth(200)
-            self.search_input.textChanged.connect(self.filter_schools)
+            self.search_controller = SearchController(self.search_input, self.filter_schools, parent=self)
             toolbar_layout.addWidget(self.search_input)
             
             # أزرار الإجراءات
@@ -126,6 +128,15 @@ class SchoolsPage(QWidget):
             self.schools_table.setColumnCount(len(columns))
             self.schools_table.setHorizontalHeaderLabels(columns)
             
+            # أزرار الإجراءات ترسم بمفوض واحد بدلاً من ويدجت لكل صف
+            self.actions_delegate = ActionButtonsDelegate(
+                [("edit", "تعديل", "#F39C12"), ("delete", "حذف", "#E74C3C")],
+                button_size=QSize(60, 25), parent=self
+            )
+            self.actions_delegate.action_clicked.connect(self.on_action_clicked)
+            self.schools_table.setItemDelegateForColumn(6, self.actions_delegate)
+            self.schools_table.verticalHeader().setDefaultSectionSize(31)
+            
             # إعداد خصائص الجدول
             self.schools_table.setSelectionBehavior(QAbstractItemView.SelectRows)
             self.schools_table.setSelectionMode(QAbstractItemView.SingleSelection)
@@ -233,10 +244,6 @@ class SchoolsPage(QWidget):
                 phone_item = QTableWidgetItem(school['phone'] or "")
                 phone_item.setFlags(phone_item.flags() & ~Qt.ItemIsEditable)
                 self.schools_table.setItem(row_idx, 5, phone_item)
-                
-                # أزرار الإجراءات
-                actions_widget = self.create_actions_widget(school['id'])
-                self.schools_table.setCellWidget(row_idx, 6, actions_widget)
             
             # تحديث العداد
             self.update_schools_count()
@@ -265,33 +272,21 @@ class SchoolsPage(QWidget):
         except (json.JSONDecodeError, TypeError):
             return [types_json] if types_json else []
     
-    def create_actions_widget(self, school_id: int):
-        """إنشاء ويدجت الإجراءات لكل صف"""
+    def on_action_clicked(self, action: str, row: int):
+        """معالجة النقر على أحد أزرار الإجراءات في الصف"""
         try:
-            widget = QWidget()
-            layout = QHBoxLayout(widget)
-            layout.setContentsMargins(5, 2, 5, 2)
-            layout.setSpacing(5)
-            
-            # زر التعديل
-            edit_btn = QPushButton("تعديل")
-            edit_btn.setObjectName("editButton")
-            edit_btn.setMaximumSize(60, 25)
-            edit_btn.clicked.connect(lambda: self.edit_school_by_id(school_id))
-            layout.addWidget(edit_btn)
-            
-            # زر الحذف
-            delete_btn = QPushButton("حذف")
-            delete_btn.setObjectName("deleteButton")
-            delete_btn.setMaximumSize(60, 25)
-            delete_btn.clicked.connect(lambda: self.delete_school_by_id(school_id))
-            layout.addWidget(delete_btn)
-            
-            return widget
+            id_item = self.schools_table.item(row, 0)
+            if id_item is None:
+                return
             
+            school_id = int(id_item.text())
+            if action == "edit":
+                self.edit_school_by_id(school_id)
+            elif action == "delete":
+                self.delete_school_by_id(school_id)
+                
         except Exception as e:
-            logging.error(f"خطأ في إنشاء ويدجت الإجراءات: {e}")
-            return QWidget()
+            logging.error(f"خطأ في تنفيذ إجراء المدرسة: {e}")
     
     def show_context_menu(self, position):
         """عرض القائمة السياقية"""
@@ -403,7 +398,8 @@ class SchoolsPage(QWidget):
     def edit_school(self, row, column):
         """تعديل مدرسة عند الضغط المزدوج"""
         try:
-            if row >= 0:
+            # النقر المزدوج على عمود الإجراءات تعالجه الأزرار
+            if row >= 0 and column != 6:
                 school_id = int(self.schools_table.item(row, 0).text())
                 self.edit_school_by_id(school_id)
                 
@@ -15,6 +15,7 @@ from PyQt5.QtCore import Qt, QDate
 from PyQt5.QtGui import QFont
 
 from core.database.connection import db_manager
+from core.utils.money import Money
 from core.utils.logger import log_user_action, log_database_operation
 
 
@@ -268,7 +269,7 @@ class AddAdditionalFeeDialog(QDialog):
                 VALUES (?, ?, ?, ?, ?, ?)
             """
             params = (
-                self.student_id, fee_type, amount,
+                self.student_id, fee_type, Money(amount),
                 paid, payment_date, notes if notes else None
             )
             
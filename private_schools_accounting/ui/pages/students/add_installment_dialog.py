@@ -15,6 +15,7 @@ from PyQt5.QtCore import Qt, QDate
 from PyQt5.QtGui import QFont
 
 from core.database.connection import db_manager
+from core.utils.money import Money
 from core.utils.logger import log_user_action, log_database_operation
 
 
@@ -24,7 +25,7 @@ class AddInstallmentDialog(QDialog):
     def __init__(self, student_id, max_amount, parent=None):
         super().__init__(parent)
         self.student_id = student_id
-        self.max_amount = max_amount
+        self.max_amount = float(max_amount)
         
         self.setup_ui()
         self.setup_styles()
@@ -206,7 +207,7 @@ class AddInstallmentDialog(QDialog):
             """
             params = (
                 self.student_id,
-                amount,
+                Money(amount),
                 payment_date,
                 current_time,
                 notes if notes else None
@@ -17,6 +17,7 @@ import logging
 
 # Import the database manager
 from core.database.connection import db_manager
+from core.utils.money import Money
 
 class AddStudentDialog(QDialog):
     student_added = pyqtSignal()
@@ -396,9 +397,9 @@ class AddStudentDialog(QDialog):
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """
             
-            total_fee = 0.0
+            total_fee = Money(0)
             if self.total_fee_edit.text().strip():
-                total_fee = float(self.total_fee_edit.text().strip())
+                total_fee = Money(self.total_fee_edit.text().strip())
             
             student_data = (
                 self.full_name_edit.text().strip(),
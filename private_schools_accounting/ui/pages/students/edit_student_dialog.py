@@ -17,6 +17,7 @@ import logging
 
 # Import the database manager
 from core.database.connection import db_manager
+from core.utils.money import Money
 
 class EditStudentDialog(QDialog):
     student_updated = pyqtSignal()
@@ -452,9 +453,9 @@ class EditStudentDialog(QDialog):
                 WHERE id = ?
             """
             
-            total_fee = 0.0
+            total_fee = Money(0)
             if self.total_fee_edit.text().strip():
-                total_fee = float(self.total_fee_edit.text().strip())
+                total_fee = Money(self.total_fee_edit.text().strip())
             
             student_data = (
                 self.full_name_edit.text().strip(),
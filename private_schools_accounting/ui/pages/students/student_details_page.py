@@ -17,6 +17,7 @@ from PyQt5.QtCore import Qt, QDate, QTime, pyqtSignal
 from PyQt5.QtGui import QFont, QPixmap, QIcon
 
 from core.database.connection import db_manager
+from core.database.statistics import student_balance
 from core.utils.logger import log_user_action, log_database_operation
 from .add_installment_dialog import AddInstallmentDialog
 from .add_additional_fee_dialog import AddAdditionalFeeDialog
@@ -528,38 +529,17 @@ class StudentDetailsPage(QWidget):
                 self.installments_count_label.setText("عدد الدفعات: 0")
                 return
             
-            # حساب المبلغ المدفوع من الأقساط
-            total_paid = 0
-            for installment in self.installments_data:
-                try:
-                    # استخدام المبلغ المدفوع إذا كان موجود، وإلا استخدم المبلغ الكامل
-                    paid_amount = installment[6] if len(installment) > 6 and installment[6] else installment[1]
-                    total_paid += float(paid_amount)
-                except (ValueError, TypeError, IndexError):
-                    logging.warning(f"تجاهل قسط غير صحيح: {installment}")
-                    continue
-            
-            # القسط الكلي - total_fee هو الحقل رقم 11
-            try:
-                total_fee = float(self.student_data[11])
-            except (ValueError, TypeError):
-                logging.error(f"خطأ في تحويل القسط الكلي: {self.student_data[11]}")
-                total_fee = 0
-            
-            # المتبقي
-            remaining = total_fee - total_paid
-            
-            # عدد الدفعات
-            installments_count = len(self.installments_data)
+            # الرصيد من جدول أرصدة الطلاب المحدث عبر triggers بدلاً من جمع الأقساط هنا
+            balance = student_balance(self.student_id)
             
             # تحديث التسميات
-            self.total_fee_label.setText(f"القسط الكلي: {total_fee:,.0f} د.ع")
-            self.paid_amount_label.setText(f"المدفوع: {total_paid:,.0f} د.ع")
-            self.remaining_amount_label.setText(f"المتبقي: {remaining:,.0f} د.ع")
-            self.installments_count_label.setText(f"عدد الدفعات: {installments_count}")
+            self.total_fee_label.setText(f"القسط الكلي: {balance.total_fee:,.0f} د.ع")
+            self.paid_amount_label.setText(f"المدفوع: {balance.installments_paid:,.0f} د.ع")
+            self.remaining_amount_label.setText(f"المتبقي: {balance.outstanding:,.0f} د.ع")
+            self.installments_count_label.setText(f"عدد الدفعات: {balance.installments_count}")
             
             # تلوين المتبقي
-            if remaining > 0:
+            if balance.outstanding > 0:
                 self.remaining_amount_label.setStyleSheet("color: #E74C3C; font-weight: bold;")
             else:
                 self.remaining_amount_label.setStyleSheet("color: #27AE60; font-weight: bold;")
@@ -579,24 +559,8 @@ class StudentDetailsPage(QWidget):
                 QMessageBox.warning(self, "خطأ", "لا توجد بيانات صحيحة للطالب")
                 return
             
-            # حساب المتبقي
-            total_paid = 0
-            for installment in self.installments_data:
-                try:
-                    # استخدام المبلغ المدفوع إذا كان موجود، وإلا استخدم المبلغ الكامل
-                    paid_amount = installment[6] if len(installment) > 6 and installment[6] else installment[1]
-                    total_paid += float(paid_amount)
-                except (ValueError, TypeError, IndexError):
-                    continue
-            
-            # القسط الكلي - total_fee هو الحقل رقم 11
-            try:
-                total_fee = float(self.student_data[11])
-            except (ValueError, TypeError):
-                QMessageBox.warning(self, "خطأ", "قيمة القسط الكلي غير صحيحة")
-                return
-            
-            remaining = total_fee - total_paid
+            # المتبقي من رصيد الطالب
+            remaining = student_balance(self.student_id).outstanding
             
             if remaining <= 0:
                 QMessageBox.information(self, "تنبيه", "تم دفع القسط بالكامل")
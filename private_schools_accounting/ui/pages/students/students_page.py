@@ -7,18 +7,25 @@
 import logging
 import json
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, 
-    QTableWidgetItem, QPushButton, QLabel, QLineEdit,
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView,
+    QPushButton, QLabel, QLineEdit,
     QFrame, QMessageBox, QHeaderView, QAbstractItemView,
     QMenu, QComboBox, QDateEdit, QSpinBox, QAction, QDialog,
     QSizePolicy
 )
-from PyQt5.QtCore import Qt, pyqtSignal, QDate
+from PyQt5.QtCore import Qt, pyqtSignal, QDate, QSize
 from PyQt5.QtGui import QFont, QPixmap, QIcon
 
 from core.database.connection import db_manager
+from core.database.pagination import KeysetPager
+from core.database.queries import build_query
+from core.database.search_index import match_expression
+from core.database.statistics import student_statistics
 from core.utils.logger import log_user_action, log_database_operation
 from core.printing.print_manager import print_students_list  # استيراد دالة الطباعة
+from ui.widgets.table_model import PagedRowTableModel, RowFilterProxyModel
+from ui.widgets.action_delegate import ActionButtonsDelegate
+from ui.widgets.search_controller import SearchController
 
 # استيراد نوافذ إدارة الطلاب
 from .add_student_dialog import AddStudentDialog
@@ -31,9 +38,14 @@ class StudentsPage(QWidget):
     # إشارات النافذة
     page_loaded = pyqtSignal()
     
+    # الترتيب بالاسم ثم المعرف ليكون مفتاح الصفحات فريداً
+    STUDENTS_ORDER = [("name", "ASC"), ("id", "ASC")]
+    # الترتيب بالمتبقي (الأعلى أولاً) من جدول أرصدة الطلاب
+    BALANCE_ORDER = [("outstanding", "DESC"), ("id", "DESC")]
+    
     def __init__(self):
         super().__init__()
-        self.current_students = []
+        self.students_pager = None
         self.selected_school_id = None
         
         self.setup_ui()
@@ -120,6 +132,24 @@ class StudentsPage(QWidget):
             self.gender_combo.addItems(["جميع الطلاب", "ذكر", "أنثى"])
             filters_layout.addWidget(self.gender_combo)
 
+            # فلتر الرصيد
+            balance_label = QLabel("الرصيد:")
+            balance_label.setObjectName("filterLabel")
+            filters_layout.addWidget(balance_label)
+            self.balance_combo = QComboBox()
+            self.balance_combo.setObjectName("filterCombo")
+            self.balance_combo.addItems(["جميع الأرصدة", "عليه متبقي", "مسدد بالكامل"])
+            filters_layout.addWidget(self.balance_combo)
+
+            # الترتيب
+            order_label = QLabel("الترتيب:")
+            order_label.setObjectName("filterLabel")
+            filters_layout.addWidget(order_label)
+            self.order_combo = QComboBox()
+            self.order_combo.setObjectName("filterCombo")
+            self.order_combo.addItems(["الاسم", "المتبقي (الأعلى أولاً)"])
+            filters_layout.addWidget(self.order_combo)
+
             # مربع البحث
             search_label = QLabel("البحث:")
             search_label.setObjectName("filterLabel")
@@ -165,19 +195,35 @@ class StudentsPage(QWidget):
             table_layout.setContentsMargins(0, 0, 0, 0)  # إزالة الهوامش تمامًا
 
             # الجدول
-            self.students_table = QTableWidget()
+            self.students_table = QTableView()
             self.students_table.setObjectName("dataTable")
 
-            # إعداد أعمدة الجدول
-            columns = ["المعرف", "الاسم", "المدرسة", "الصف", "الشعبة", "الجنس", "الهاتف", "الحالة", "الرسوم الدراسية", "الإجراءات"]
-            self.students_table.setColumnCount(len(columns))
-            self.students_table.setHorizontalHeaderLabels(columns)
+            # إعداد أعمدة الجدول ونموذج البيانات (يحمّل الصفوف صفحة بعد صفحة أثناء التمرير)
+            columns = ["المعرف", "الاسم", "المدرسة", "الصف", "الشعبة", "الجنس", "الهاتف", "الحالة", "الرسوم الدراسية",
+                       "المتبقي", "الإجراءات"]
+            fields = ["id", "name", "school_name", "grade", "section", "gender", "phone", "status", "total_fee",
+                      "outstanding", None]
+            self.students_model = PagedRowTableModel(
+                columns, fields,
+                formatters={8: lambda fee: str(fee) if fee else "0",
+                            9: lambda amount: str(amount) if amount else "0"},
+                parent=self
+            )
+            self.students_proxy = RowFilterProxyModel(self.students_model, self)
+            self.students_table.setModel(self.students_proxy)
+
+            # أزرار الإجراءات ترسم بمفوض واحد بدلاً من ويدجت لكل صف
+            self.actions_delegate = ActionButtonsDelegate(button_size=QSize(120, 40), spacing=10, parent=self)
+            self.actions_delegate.action_clicked.connect(self.on_action_clicked)
+            self.students_table.setItemDelegateForColumn(len(columns) - 1, self.actions_delegate)
+            self.students_table.verticalHeader().setDefaultSectionSize(46)
 
             # إعداد خصائص الجدول
             self.students_table.setSelectionBehavior(QAbstractItemView.SelectRows)
             self.students_table.setSelectionMode(QAbstractItemView.SingleSelection)
             self.students_table.setAlternatingRowColors(True)
-            self.students_table.setSortingEnabled(True)
+            # الترتيب يتم في الاستعلام (بالاسم أو المتبقي) لأن الصفوف تُحمل على دفعات
+            self.students_table.setSortingEnabled(False)
 
             # إعداد حجم الأعمدة
             header = self.students_table.horizontalHeader()
@@ -186,10 +232,10 @@ class StudentsPage(QWidget):
                 header.setSectionResizeMode(i, QHeaderView.ResizeToContents)
 
             # إزالة الحشوات داخل الصفوف
-            self.students_table.setStyleSheet("QTableWidget::item { padding: 0px; }")
+            self.students_table.setStyleSheet("QTableView::item { padding: 0px; }")
 
             # ربط الأحداث
-            self.students_table.cellDoubleClicked.connect(self.edit_student)
+            self.students_table.doubleClicked.connect(self.on_row_double_clicked)
             self.students_table.setContextMenuPolicy(Qt.CustomContextMenu)
             self.students_table.customContextMenuRequested.connect(self.show_context_menu)
 
@@ -255,7 +301,10 @@ class StudentsPage(QWidget):
             self.grade_combo.currentTextChanged.connect(self.apply_filters)
             self.status_combo.currentTextChanged.connect(self.apply_filters)
             self.gender_combo.currentTextChanged.connect(self.apply_filters)
-            self.search_input.textChanged.connect(self.apply_filters)
+            self.balance_combo.currentTextChanged.connect(self.apply_filters)
+            self.order_combo.currentTextChanged.connect(self.apply_filters)
+            # البحث بعد توقف الكتابة، والاستعلام في الخلفية يُلغى عند متابعة الكتابة
+            self.search_controller = SearchController(self.search_input, self.search_students, parent=self)
             
         except Exception as e:
             logging.error(f"خطأ في ربط الإشارات: {e}")
@@ -280,54 +329,39 @@ class StudentsPage(QWidget):
         except Exception as e:
             logging.error(f"خطأ في تحميل المدارس: {e}")
     
+    def build_students_query(self):
+        """استعلام الطلاب المسجل مع الفلاتر الحالية (بدون ترتيب)"""
+        selected_grade = self.grade_combo.currentText()
+        selected_status = self.status_combo.currentText()
+        selected_gender = self.gender_combo.currentText()
+        # فلتر الرصيد من جدول أرصدة الطلاب بدلاً من جمع أقساط كل صف
+        selected_balance = self.balance_combo.currentText()
+        return build_query(
+            "students.list",
+            school_id=self.school_combo.currentData() or None,
+            grade=selected_grade if selected_grade and selected_grade != "جميع الصفوف" else None,
+            status=selected_status if selected_status and selected_status != "جميع الحالات" else None,
+            gender=selected_gender if selected_gender and selected_gender != "جميع الطلاب" else None,
+            has_outstanding=selected_balance == "عليه متبقي",
+            settled=selected_balance == "مسدد بالكامل",
+            # فهرس FTS يطابق اختلافات كتابة الهمزات والتاء المربوطة
+            search=match_expression(self.search_input.text()),
+        )
+    
+    def students_order(self):
+        """أعمدة الترتيب المختارة للقائمة"""
+        if self.order_combo.currentIndex() == 1:
+            return self.BALANCE_ORDER
+        return self.STUDENTS_ORDER
+    
     def load_students(self):
         """تحميل قائمة الطلاب"""
         try:
-            # بناء الاستعلام مع الفلاتر
-            query = """
-                SELECT s.id, s.name, sc.name_ar as school_name,
-                       s.grade, s.section, s.gender,
-                       s.phone, s.status, s.start_date, s.total_fee
-                FROM students s
-                LEFT JOIN schools sc ON s.school_id = sc.id
-                WHERE 1=1
-            """
-            params = []
-            
-            # فلتر المدرسة
-            selected_school_id = self.school_combo.currentData()
-            if selected_school_id:
-                query += " AND s.school_id = ?"
-                params.append(selected_school_id)
-            
-            # فلتر الصف
-            selected_grade = self.grade_combo.currentText()
-            if selected_grade and selected_grade != "جميع الصفوف":
-                query += " AND s.grade = ?"
-                params.append(selected_grade)
-            
-            # فلتر الحالة
-            selected_status = self.status_combo.currentText()
-            if selected_status and selected_status != "جميع الحالات":
-                query += " AND s.status = ?"
-                params.append(selected_status)
-            
-            # فلتر الجنس
-            selected_gender = self.gender_combo.currentText()
-            if selected_gender and selected_gender != "جميع الطلاب":
-                query += " AND s.gender = ?"
-                params.append(selected_gender)
-            
-            # فلتر البحث
-            search_text = self.search_input.text().strip()
-            if search_text:
-                query += " AND s.name LIKE ?"
-                params.append(f"%{search_text}%")
+            # أي بحث جارٍ في الخلفية أصبح قديماً
+            self.search_controller.cancel()
             
-            query += " ORDER BY s.name"
-            
-            # تنفيذ الاستعلام
-            self.current_students = db_manager.execute_query(query, tuple(params))
+            query, params = self.build_students_query()
+            self.students_pager = KeysetPager(query, params, order_by=self.students_order())
             
             # ملء الجدول
             self.fill_students_table()
@@ -339,97 +373,69 @@ class StudentsPage(QWidget):
             logging.error(f"خطأ في تحميل الطلاب: {e}")
             QMessageBox.warning(self, "خطأ", f"حدث خطأ في تحميل بيانات الطلاب:\\n{str(e)}")
     
-    def fill_students_table(self):
-        """ملء جدول الطلاب بالبيانات"""
+    def search_students(self, search_text):
+        """البحث في أسماء الطلاب مع تنفيذ الاستعلام خارج خيط الواجهة"""
         try:
-            # تنظيف الجدول
-            self.students_table.setRowCount(0)
+            query, params = self.build_students_query()
+            pager = KeysetPager(query, params, order_by=self.students_order())
             
-            if not self.current_students:
-                self.displayed_count_label.setText("عدد الطلاب المعروضين: 0")
-                return
+            # العدد والصفحة الأولى في الخلفية؛ متابعة الكتابة تقاطع هذا الاستعلام
+            self.search_controller.run_async(
+                lambda: (pager.count(), pager.fetch_page()),
+                lambda result: self.show_search_results(pager, *result)
+            )
             
-            # ملء الجدول
-            for row_idx, student in enumerate(self.current_students):
-                self.students_table.insertRow(row_idx)
-                
-                # البيانات الأساسية
-                items = [
-                    str(student['id']),
-                    student['name'] or "",
-                    student['school_name'] or "",
-                    student['grade'] or "",
-                    student['section'] or "",
-                    student['gender'] or "",
-                    student['phone'] or "",
-                    student['status'] or "",
-                    str(student['total_fee']) if student['total_fee'] else "0"
-                ]
-                
-                for col_idx, item_text in enumerate(items):
-                    item = QTableWidgetItem(item_text)
-                    item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-                    self.students_table.setItem(row_idx, col_idx, item)
-                
-                # أزرار الإجراءات
-                actions_widget = self.create_actions_widget(student['id'])
-                self.students_table.setCellWidget(row_idx, 9, actions_widget)
+        except Exception as e:
+            logging.error(f"خطأ في البحث عن الطلاب: {e}")
+    
+    def show_search_results(self, pager, count, first_page):
+        """عرض نتائج البحث بعد اكتمالها"""
+        self.students_pager = pager
+        self.students_model.set_pager(pager, first_page)
+        self.displayed_count_label.setText(f"عدد الطلاب المعروضين: {count}")
+    
+    def fill_students_table(self):
+        """ملء جدول الطلاب بالبيانات"""
+        try:
+            # تحميل الصفحة الأولى فقط، وبقية الصفحات عند التمرير
+            self.students_model.set_pager(self.students_pager)
             
-            # تحديث العداد
-            self.displayed_count_label.setText(f"عدد الطلاب المعروضين: {len(self.current_students)}")
+            # العدد الكلي من استعلام COUNT منفصل
+            displayed_count = self.students_pager.count() if self.students_pager else 0
+            self.displayed_count_label.setText(f"عدد الطلاب المعروضين: {displayed_count}")
             
         except Exception as e:
             logging.error(f"خطأ في ملء جدول الطلاب: {e}")
     
-    def create_actions_widget(self, student_id):
-        """إنشاء ويدجت الإجراءات لكل صف"""
+    def on_action_clicked(self, action, row):
+        """معالجة النقر على أحد أزرار الإجراءات في الصف"""
         try:
-            widget = QWidget()
-            layout = QHBoxLayout(widget)
-            layout.setContentsMargins(0, 0, 0, 0)  # إزالة الهوامش لتحسين استخدام المساحة
-            layout.setSpacing(10)  # تقليل التباعد بين الأزرار
-
-            # زر التعديل
-            edit_btn = QPushButton("تعديل")
-            edit_btn.setObjectName("editButton")
-            edit_btn.setFixedSize(120, 40)  # ضبط حجم الزر بشكل ثابت
-            edit_btn.clicked.connect(lambda: self.edit_student_by_id(student_id))
-            layout.addWidget(edit_btn)
-
-            # زر الحذف
-            delete_btn = QPushButton("حذف")
-            delete_btn.setObjectName("deleteButton")
-            delete_btn.setFixedSize(120, 40)  # ضبط حجم الزر بشكل ثابت
-            delete_btn.clicked.connect(lambda: self.delete_student(student_id))
-            layout.addWidget(delete_btn)
-
-            # زر التفاصيل
-            details_btn = QPushButton("تفاصيل")
-            details_btn.setObjectName("detailsButton")
-            details_btn.setFixedSize(120, 40)  # ضبط حجم الزر بشكل ثابت
-            details_btn.clicked.connect(lambda: self.show_student_details(student_id))
-            layout.addWidget(details_btn)
+            student = self.students_proxy.row_data(row)
+            if student is None:
+                return
 
-            return widget
+            if action == "edit":
+                self.edit_student_by_id(student['id'])
+            elif action == "delete":
+                self.delete_student(student['id'])
+            elif action == "details":
+                self.show_student_details(student['id'])
 
         except Exception as e:
-            logging.error(f"خطأ في إنشاء ويدجت الإجراءات: {e}")
-            return QWidget()
+            logging.error(f"خطأ في تنفيذ إجراء الطالب: {e}")
+
+    def on_row_double_clicked(self, index):
+        """فتح التعديل عند النقر المزدوج خارج عمود الإجراءات"""
+        if not ActionButtonsDelegate.is_action_cell(self.students_table, index):
+            self.edit_student(index.row())
     
     def update_stats(self):
         """تحديث الإحصائيات"""
         try:
             # إحصائيات عامة
-            total_query = "SELECT COUNT(*) FROM students"
-            total_result = db_manager.execute_query(total_query)
-            total_count = total_result[0][0] if total_result else 0
-            
-            active_query = "SELECT COUNT(*) FROM students WHERE status = 'نشط'"
-            active_result = db_manager.execute_query(active_query)
-            active_count = active_result[0][0] if active_result else 0
-            
-            self.total_students_label.setText(f"إجمالي الطلاب: {total_count}")
-            self.active_students_label.setText(f"الطلاب النشطون: {active_count}")
+            stats = student_statistics()
+            self.total_students_label.setText(f"إجمالي الطلاب: {stats.total_count}")
+            self.active_students_label.setText(f"الطلاب النشطون: {stats.active_count}")
             
             # تحديث وقت آخر تحديث
             from datetime import datetime
@@ -475,29 +481,33 @@ class StudentsPage(QWidget):
             gender = self.gender_combo.currentText()
             if gender and gender != "جميع الطلاب":
                 filters.append(f"الجنس: {gender}")
+            balance = self.balance_combo.currentText()
+            if balance and balance != "جميع الأرصدة":
+                filters.append(f"الرصيد: {balance}")
             search = self.search_input.text().strip()
             if search:
                 filters.append(f"بحث: {search}")
             filter_info = "؛ ".join(filters) if filters else None
             # استدعاء دالة الطباعة مع المعاينة
-            print_students_list(self.current_students, filter_info, parent=self)
+            students = self.students_pager.fetch_all() if self.students_pager else []
+            print_students_list(students, filter_info, parent=self)
         except Exception as e:
             logging.error(f"خطأ في طباعة قائمة الطلاب: {e}")
     
     def show_context_menu(self, position):
         """عرض قائمة السياق للجدول"""
         try:
-            if self.students_table.itemAt(position) is None:
+            if not self.students_table.indexAt(position).isValid():
                 return
             
             menu = QMenu(self)
             
             edit_action = QAction("تعديل", self)
-            edit_action.triggered.connect(lambda: self.edit_student(self.students_table.currentRow()))
+            edit_action.triggered.connect(lambda: self.edit_student(self.students_table.currentIndex().row()))
             menu.addAction(edit_action)
             
             delete_action = QAction("حذف", self)
-            delete_action.triggered.connect(lambda: self.delete_student_by_row(self.students_table.currentRow()))
+            delete_action.triggered.connect(lambda: self.delete_student_by_row(self.students_table.currentIndex().row()))
             menu.addAction(delete_action)
             
             menu.exec_(self.students_table.mapToGlobal(position))
@@ -641,7 +651,7 @@ class StudentsPage(QWidget):
                 }
                 
                 /* الجدول */
-                QTableWidget {
+                QTableView {
                     background-color: white;
                     border: 2px solid #E9ECEF;
                     border-radius: 12px;
@@ -650,13 +660,13 @@ class StudentsPage(QWidget):
                     margin: 10px 0px;
                 }
                 
-                QTableWidget::item {
+                QTableView::item {
                     padding: 15px 10px;
                     border-bottom: 1px solid #E9ECEF;
                     font-size: 18px;
                 }
                 
-                QTableWidget::item:selected {
+                QTableView::item:selected {
                     background-color: #E3F2FD;
                     color: #1976D2;
                 }
@@ -708,16 +718,12 @@ class StudentsPage(QWidget):
     def edit_student(self, row):
         """تعديل بيانات طالب"""
         try:
-            if row < 0 or row >= self.students_table.rowCount():
-                return
-            
-            # الحصول على ID الطالب من الصف المحدد
-            student_id_item = self.students_table.item(row, 0)
-            if not student_id_item:
+            # الحصول على الطالب من الصف المحدد
+            student = self.students_proxy.row_data(row)
+            if student is None:
                 return
             
-            student_id = int(student_id_item.text())
-            self.edit_student_by_id(student_id)
+            self.edit_student_by_id(student['id'])
                 
         except Exception as e:
             logging.error(f"خطأ في تعديل الطالب: {e}")
@@ -764,15 +770,11 @@ class StudentsPage(QWidget):
     def delete_student_by_row(self, row):
         """حذف طالب بواسطة رقم الصف"""
         try:
-            if row < 0 or row >= self.students_table.rowCount():
-                return
-            
-            student_id_item = self.students_table.item(row, 0)
-            if not student_id_item:
+            student = self.students_proxy.row_data(row)
+            if student is None:
                 return
             
-            student_id = int(student_id_item.text())
-            self.delete_student(student_id)
+            self.delete_student(student['id'])
             
         except Exception as e:
             logging.error(f"خطأ في حذف الطالب: {e}")
@@ -15,6 +15,7 @@ from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont
 
 from core.database.connection import db_manager
+from core.utils.money import Money
 from core.utils.logger import log_database_operation
 
 
@@ -202,7 +203,7 @@ class AddTeacherDialog(QDialog):
     def load_schools(self):
         """تحميل قائمة المدارس"""
         try:
-            with db_manager.get_cursor() as cursor:
+            with db_manager.get_read_cursor() as cursor:
                 cursor.execute("SELECT id, name_ar FROM schools ORDER BY name_ar")
                 schools = cursor.fetchall()
                 
@@ -257,7 +258,7 @@ class AddTeacherDialog(QDialog):
                 'name': self.name_input.text().strip(),
                 'school_id': self.school_combo.currentData(),
                 'class_hours': self.class_hours_input.value(),
-                'monthly_salary': self.salary_input.value(),
+                'monthly_salary': Money(self.salary_input.value()),
                 'phone': self.phone_input.text().strip() or None,
                 'notes': self.notes_input.toPlainText().strip() or None
             }
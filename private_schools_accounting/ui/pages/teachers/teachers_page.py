@@ -15,7 +15,9 @@ from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QFont
 
 from core.database.connection import db_manager
+from core.database.search_index import search_condition
 from core.utils.logger import log_user_action, log_database_operation
+from ui.widgets.search_controller import SearchController
 
 # استيراد نوافذ إدارة المعلمين
 from .add_teacher_dialog import AddTeacherDialog
@@ -112,9 +114,10 @@ class TeachersPage(QWidget):
             # ربط الأحداث
             search_btn.clicked.connect(self.search_teachers)
             clear_btn.clicked.connect(self.clear_search)
-            self.search_input.returnPressed.connect(self.search_teachers)
-            # بحث لحظي عند الكتابة بدلاً من استخدام زر البحث
-            self.search_input.textChanged.connect(self.search_teachers)
+            # بحث لحظي بعد توقف الكتابة (أو فوراً عند Enter) بدلاً من استخدام زر البحث
+            self.search_controller = SearchController(
+                self.search_input, lambda _text: self.search_teachers(), parent=self
+            )
             # إخفاء زر البحث لأنه لم يعد ضروريًا مع البحث اللحظي
             search_btn.hide()
             self.school_filter.currentTextChanged.connect(self.on_school_filter_changed)
@@ -322,7 +325,7 @@ class TeachersPage(QWidget):
     def load_schools(self):
         """تحميل قائمة المدارس"""
         try:
-            with db_manager.get_cursor() as cursor:
+            with db_manager.get_read_cursor() as cursor:
                 cursor.execute("SELECT id, name_ar FROM schools ORDER BY name_ar")
                 schools = cursor.fetchall()
                 
@@ -361,7 +364,7 @@ class TeachersPage(QWidget):
                 """
                 params = [self.selected_school_id]
             
-            with db_manager.get_cursor() as cursor:
+            with db_manager.get_read_cursor() as cursor:
                 cursor.execute(query, params)
                 teachers = cursor.fetchall()
                 
@@ -441,17 +444,22 @@ class TeachersPage(QWidget):
     def search_teachers(self):
         """البحث في المعلمين"""
         try:
-            search_text = self.search_input.text().strip().lower()
+            search_text = self.search_input.text().strip()
+            condition = search_condition("teachers", "id", search_text)
             
-            if not search_text:
+            if not condition:
                 self.populate_table(self.current_teachers)
                 return
-                
-            filtered_teachers = []
-            for teacher in self.current_teachers:
-                if (search_text in (teacher['name'] or '').lower() or
-                    search_text in (teacher['phone'] or '').lower()):
-                    filtered_teachers.append(teacher)
+            
+            # الاسم من فهرس البحث (بادئة الكلمة)، ورقم الهاتف بمطابقة جزئية في أي موضع
+            # كما كان سابقاً، ثم التصفية ضمن القائمة المحملة
+            matching_ids = {
+                row['id'] for row in db_manager.execute_query(
+                    f"SELECT id FROM teachers WHERE {condition[0]} OR phone LIKE ?",
+                    (condition[1], f"%{search_text}%")
+                )
+            }
+            filtered_teachers = [teacher for teacher in self.current_teachers if teacher['id'] in matching_ids]
             
             self.populate_table(filtered_teachers)
             
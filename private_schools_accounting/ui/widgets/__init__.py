@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+حزمة العناصر المشتركة بين صفحات الواجهة
+"""
+
+from .table_model import RowTableModel, PagedRowTableModel, RowFilterProxyModel, SORT_ROLE, ROW_ROLE, ROW_NUMBER
+from .action_delegate import ActionButtonsDelegate
+from .search_controller import SearchController
+
+__all__ = [
+    'RowTableModel',
+    'PagedRowTableModel',
+    'RowFilterProxyModel',
+    'SORT_ROLE',
+    'ROW_ROLE',
+    'ROW_NUMBER',
+    'ActionButtonsDelegate',
+    'SearchController'
+]
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+مفوض رسم أزرار الإجراءات داخل خلايا الجدول
+يرسم أزرار (تعديل، حذف، تفاصيل) لكل صف بدون إنشاء QWidget وQPushButton لكل صف
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+from PyQt5.QtCore import Qt, QEvent, QRect, QSize, pyqtSignal
+from PyQt5.QtGui import QColor, QFont, QPainter
+from PyQt5.QtWidgets import QStyledItemDelegate
+
+# (مفتاح الإجراء، النص، لون الخلفية)
+ActionSpec = Tuple[str, str, str]
+
+# الأزرار المعتادة بألوان صفحات الطلاب
+DEFAULT_ACTIONS: List[ActionSpec] = [
+    ("edit", "تعديل", "#3498DB"),
+    ("delete", "حذف", "#E74C3C"),
+    ("details", "تفاصيل", "#9B59B6"),
+]
+
+
+class ActionButtonsDelegate(QStyledItemDelegate):
+    """يرسم أزرار الإجراءات ويلتقط النقرات عبر editorEvent
+
+    يُرسل action_clicked(مفتاح الإجراء، رقم الصف في العرض) عند النقر على زر
+    """
+
+    action_clicked = pyqtSignal(str, int)
+
+    def __init__(self, actions: Optional[Sequence[ActionSpec]] = None,
+                 button_size: QSize = QSize(80, 30), spacing: int = 5, parent=None):
+        super().__init__(parent)
+        self._actions = list(actions or DEFAULT_ACTIONS)
+        self._button_size = button_size
+        self._spacing = spacing
+        self._pressed: Optional[Tuple[int, str]] = None
+
+    def button_rects(self, option) -> List[Tuple[str, QRect]]:
+        """مواقع الأزرار داخل الخلية بحسب اتجاه التخطيط"""
+        count = len(self._actions)
+        width = self._button_size.width()
+        height = self._button_size.height()
+        total_width = count * width + (count - 1) * self._spacing
+
+        cell = option.rect
+        x = cell.x() + max(0, (cell.width() - total_width) // 2)
+        y = cell.y() + max(0, (cell.height() - height) // 2)
+
+        actions = self._actions
+        if option.direction == Qt.RightToLeft:
+            # الزر الأول على اليمين كما في QHBoxLayout
+            actions = list(reversed(actions))
+
+        rects = []
+        for key, _label, _color in actions:
+            rects.append((key, QRect(x, y, width, height)))
+            x += width + self._spacing
+        return rects
+
+    def action_at(self, option, pos) -> Optional[str]:
+        """مفتاح الزر الموجود عند النقطة، أو None"""
+        for key, rect in self.button_rects(option):
+            if rect.contains(pos):
+                return key
+        return None
+
+    def paint(self, painter, option, index):
+        # رسم الخلفية (التحديد والتلوين المتناوب) دون نص
+        super().paint(painter, option, index)
+
+        labels = {key: (label, color) for key, label, color in self._actions}
+        painter.save()
+        try:
+            painter.setRenderHint(QPainter.Antialiasing)
+            font = QFont(option.font)
+            font.setBold(True)
+            painter.setFont(font)
+            for key, rect in self.button_rects(option):
+                label, color = labels[key]
+                background = QColor(color)
+                if self._pressed == (index.row(), key):
+                    background = background.darker(115)
+                painter.setPen(Qt.NoPen)
+                painter.setBrush(background)
+                painter.drawRoundedRect(rect, 5, 5)
+                painter.setPen(QColor("white"))
+                painter.drawText(rect, Qt.AlignCenter, label)
+        finally:
+            painter.restore()
+
+    def sizeHint(self, option, index):
+        count = len(self._actions)
+        width = count * self._button_size.width() + (count - 1) * self._spacing + 10
+        return QSize(width, self._button_size.height() + 4)
+
+    def editorEvent(self, event, model, option, index):
+        event_type = event.type()
+        if event_type not in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease,
+                              QEvent.MouseButtonDblClick):
+            return super().editorEvent(event, model, option, index)
+        if event.button() != Qt.LeftButton:
+            return False
+
+        key = self.action_at(option, event.pos())
+        if event_type == QEvent.MouseButtonPress:
+            self._pressed = (index.row(), key) if key else None
+            self._repaint(option)
+            return key is not None
+        if event_type == QEvent.MouseButtonRelease:
+            pressed, self._pressed = self._pressed, None
+            self._repaint(option)
+            if key and pressed == (index.row(), key):
+                self.action_clicked.emit(key, index.row())
+                return True
+            return False
+        # ابتلاع النقر المزدوج على الزر (تتجاهل الصفحات doubleClicked في عمود الإجراءات)
+        return key is not None
+
+    @staticmethod
+    def _repaint(option):
+        """إعادة رسم الخلية لإظهار حالة الضغط"""
+        if option.widget is not None:
+            option.widget.viewport().update(option.rect)
+
+    @staticmethod
+    def is_action_cell(view, index) -> bool:
+        """هل الخلية في عمود يرسمه هذا المفوض"""
+        return isinstance(view.itemDelegateForColumn(index.column()), ActionButtonsDelegate)
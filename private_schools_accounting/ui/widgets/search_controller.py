@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+متحكم البحث أثناء الكتابة
+يؤخر البحث حتى يتوقف المستخدم عن الكتابة، ويلغي الاستعلام القديم عند بدء بحث جديد
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+import config
+from core.database.connection import db_manager
+
+
+class SearchController(QObject):
+    """بحث مؤجل (debounce) لمربع بحث واحد
+
+    on_search(text) يُستدعى مرة واحدة بعد توقف الكتابة لمدة delay_ms،
+    أو فوراً عند الضغط على Enter. ويمكن تشغيل الاستعلام نفسه خارج خيط الواجهة
+    عبر run_async، فيُقاطع الاستعلام السابق بـ Connection.interrupt وتُهمل نتيجته
+    """
+
+    # (رقم البحث، النتيجة، الخطأ) من خيط العامل إلى خيط الواجهة
+    _finished = pyqtSignal(int, object, object)
+
+    def __init__(self, line_edit, on_search: Callable[[str], None],
+                 delay_ms: Optional[int] = None, parent=None):
+        super().__init__(parent)
+        self.line_edit = line_edit
+        self.on_search = on_search
+        self._last_text: Optional[str] = None
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(config.SEARCH_DEBOUNCE_MS if delay_ms is None else delay_ms)
+        self._timer.timeout.connect(self.flush)
+
+        line_edit.textChanged.connect(self._on_text_changed)
+        line_edit.returnPressed.connect(lambda: self.flush(force=True))
+
+        # حالة التشغيل في الخلفية
+        self._generation = 0
+        self._callbacks: Dict[int, Callable[[Any], None]] = {}
+        self._jobs: "queue.Queue" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._active_connection: Optional[sqlite3.Connection] = None
+        self._active_lock = threading.Lock()
+        self._finished.connect(self._on_finished)
+
+    # التأخير
+
+    def _on_text_changed(self, _text):
+        self._timer.start()
+
+    def flush(self, force: bool = False):
+        """تنفيذ البحث المؤجل فوراً (إن تغير النص، أو دائماً مع force)"""
+        self._timer.stop()
+        text = self.line_edit.text().strip()
+        if text == self._last_text and not force:
+            return
+        self._last_text = text
+        try:
+            self.on_search(text)
+        except Exception as e:
+            logging.error(f"خطأ في تنفيذ البحث: {e}")
+
+    def reset(self):
+        """نسيان آخر نص بحث ليُعاد تنفيذه حتى لو لم يتغير"""
+        self._last_text = None
+
+    # التشغيل في الخلفية
+
+    def run_async(self, job: Callable[[], Any], on_done: Callable[[Any], None]):
+        """تشغيل job على خيط العامل واستدعاء on_done(result) على خيط الواجهة
+
+        أي بحث سابق لم ينتهِ بعد يُقاطع وتُهمل نتيجته
+        """
+        self.cancel()
+        generation = self._generation
+        self._callbacks[generation] = on_done
+        self._ensure_worker()
+        self._jobs.put((generation, job))
+
+    def cancel(self):
+        """إلغاء البحث الجاري في الخلفية (إن وجد)"""
+        self._generation += 1
+        self._callbacks.clear()
+        with self._active_lock:
+            if self._active_connection is not None:
+                self._active_connection.interrupt()
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._work, name="search-worker", daemon=True)
+            self._worker.start()
+
+    def _work(self):
+        """حلقة خيط العامل: ينفذ آخر بحث فقط ويتجاوز الطلبات القديمة"""
+        while True:
+            generation, job = self._jobs.get()
+            if generation != self._generation:
+                continue
+
+            # اتصال القراءة الخاص بهذا الخيط، ليقاطعه cancel() من خيط الواجهة
+            with self._active_lock:
+                self._active_connection = db_manager.get_read_connection()
+            result, error = None, None
+            try:
+                if generation == self._generation:
+                    result = job()
+            except Exception as e:
+                error = e
+            finally:
+                with self._active_lock:
+                    self._active_connection = None
+            self._finished.emit(generation, result, error)
+
+    def _on_finished(self, generation: int, result, error):
+        on_done = self._callbacks.pop(generation, None)
+        if generation != self._generation or on_done is None:
+            # نتيجة بحث قديم (أو مُقاطع)
+            return
+        if error is not None:
+            logging.error(f"خطأ في البحث: {error}")
+            return
+        try:
+            on_done(result)
+        except Exception as e:
+            logging.error(f"خطأ في عرض نتائج البحث: {e}")
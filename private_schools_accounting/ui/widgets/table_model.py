@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+نموذج جدول مشترك مبني على صفوف الاستعلام
+يعرض QTableView الصفوف الظاهرة فقط بدلاً من إنشاء QTableWidgetItem لكل خلية
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+
+from core.database.pagination import KeysetPager
+from core.utils.money import Money
+
+# دور الترتيب: القيمة الخام بدلاً من النص المنسق (لترتيب المبالغ والأرقام بشكل صحيح)
+SORT_ROLE = Qt.UserRole + 1
+# دور الصف الكامل كما جاء من قاعدة البيانات
+ROW_ROLE = Qt.UserRole + 2
+# مفتاح حقل يعرض رقم الصف التسلسلي (1، 2، ...) بدلاً من قيمة من الصف
+ROW_NUMBER = object()
+
+FieldKey = Union[int, str, None]  # أو ROW_NUMBER
+Formatter = Callable[[Any], str]
+
+
+def _sort_value(value: Any) -> Any:
+    """تحويل القيمة إلى نوع يستطيع Qt مقارنته"""
+    if value is None:
+        return ""
+    if isinstance(value, Money):
+        return float(value)
+    if isinstance(value, (int, float, str)):
+        return value
+    return str(value)
+
+
+class RowTableModel(QAbstractTableModel):
+    """نموذج للقراءة فقط يعرض قائمة صفوف (sqlite3.Row أو tuple)
+
+    كل عمود يُربط بمفتاح داخل الصف (رقم أو اسم عمود)، والعمود بمفتاح None
+    يبقى فارغاً (مثل عمود الإجراءات)، والعمود بمفتاح ROW_NUMBER يعرض رقم الصف
+    """
+
+    def __init__(self, headers: Sequence[str], fields: Sequence[FieldKey],
+                 formatters: Optional[Dict[int, Formatter]] = None,
+                 alignments: Optional[Dict[int, int]] = None,
+                 backgrounds: Optional[Dict[int, Callable[[Any], Any]]] = None, parent=None):
+        super().__init__(parent)
+        if len(headers) != len(fields):
+            raise ValueError("عدد العناوين يجب أن يساوي عدد الحقول")
+        self._headers = list(headers)
+        self._fields = list(fields)
+        self._formatters = formatters or {}
+        self._alignments = alignments or {}
+        self._backgrounds = backgrounds or {}
+        self._rows: List[Sequence] = []
+
+    # البيانات
+
+    def set_rows(self, rows: Optional[Sequence[Sequence]]):
+        """استبدال جميع الصفوف دفعة واحدة"""
+        self.beginResetModel()
+        self._rows = list(rows or [])
+        self.endResetModel()
+
+    def rows(self) -> List[Sequence]:
+        """جميع الصفوف المحملة"""
+        return self._rows
+
+    def row_data(self, row: int) -> Optional[Sequence]:
+        """الصف الخام حسب رقمه في النموذج"""
+        if 0 <= row < len(self._rows):
+            return self._rows[row]
+        return None
+
+    def value(self, row: int, column: int) -> Any:
+        """القيمة الخام لخلية"""
+        field = self._fields[column]
+        if field is None:
+            return None
+        if field is ROW_NUMBER:
+            return row + 1
+        return self._rows[row][field]
+
+    # واجهة QAbstractTableModel
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            if 0 <= section < len(self._headers):
+                return self._headers[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+
+        if role == Qt.DisplayRole:
+            value = self.value(row, column)
+            formatter = self._formatters.get(column)
+            if formatter is not None:
+                return formatter(value)
+            return "" if value is None else str(value)
+        if role == SORT_ROLE:
+            return _sort_value(self.value(row, column))
+        if role == ROW_ROLE:
+            return self._rows[row]
+        if role == Qt.TextAlignmentRole:
+            alignment = self._alignments.get(column)
+            return int(alignment) if alignment is not None else None
+        if role == Qt.BackgroundRole:
+            background = self._backgrounds.get(column)
+            if background is not None:
+                return background(self.value(row, column))
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+
+class PagedRowTableModel(RowTableModel):
+    """نموذج يحمّل الصفوف صفحة بعد صفحة من KeysetPager أثناء التمرير
+
+    يستدعي QTableView الدالة fetchMore تلقائياً عند الوصول لنهاية الصفوف المحملة
+    """
+
+    def __init__(self, headers: Sequence[str], fields: Sequence[FieldKey], **kwargs):
+        super().__init__(headers, fields, **kwargs)
+        self._pager: Optional[KeysetPager] = None
+        self._exhausted = True
+
+    def set_pager(self, pager: Optional[KeysetPager], first_page: Optional[Sequence] = None):
+        """بدء تحميل نتيجة جديدة من الصفحة الأولى
+
+        first_page: الصفحة الأولى إن كانت قد جُلبت مسبقاً (مثلاً في خيط البحث)
+        """
+        self.beginResetModel()
+        self._pager = pager
+        if pager is not None and first_page is not None:
+            self._rows = list(first_page)
+            self._exhausted = len(self._rows) < pager.page_size
+        else:
+            self._rows = []
+            self._exhausted = pager is None
+        self.endResetModel()
+        if first_page is None and self.canFetchMore():
+            self.fetchMore()
+
+    def pager(self) -> Optional[KeysetPager]:
+        """مصدر الصفحات الحالي"""
+        return self._pager
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted:
+            return
+        try:
+            after = self._rows[-1] if self._rows else None
+            rows = self._pager.fetch_page(after)
+        except Exception as e:
+            logging.error(f"خطأ في تحميل الصفحة التالية: {e}")
+            self._exhausted = True
+            return
+
+        if len(rows) < self._pager.page_size:
+            self._exhausted = True
+        if rows:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+            self._rows.extend(rows)
+            self.endInsertRows()
+
+
+class RowFilterProxyModel(QSortFilterProxyModel):
+    """وسيط ترتيب وتصفية فوق RowTableModel يرتب حسب القيم الخام"""
+
+    def __init__(self, source: RowTableModel, parent=None):
+        super().__init__(parent)
+        self.setSourceModel(source)
+        self.setSortRole(SORT_ROLE)
+        self.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.setFilterKeyColumn(-1)
+
+    def row_data(self, row: int) -> Optional[Sequence]:
+        """الصف الخام حسب رقمه في العرض (بعد الترتيب والتصفية)"""
+        index = self.index(row, 0)
+        if not index.isValid():
+            return None
+        return self.sourceModel().row_data(self.mapToSource(index).row())